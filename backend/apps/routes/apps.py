@@ -5,3 +5,17 @@ class RoutesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.routes"
     verbose_name = "경주 관리"
+
+    def ready(self):
+        from django.conf import settings
+
+        # Worker에서 Redis에 누적한 카운터를 /metrics로 노출
+        from .utils.metrics import register_collector
+
+        register_collector()
+
+        # 벤치마크 재생용 외부 API 응답 기록
+        if settings.API_RECORD_PATH:
+            from .utils.api_replay import start_recording
+
+            start_recording(settings.API_RECORD_PATH)
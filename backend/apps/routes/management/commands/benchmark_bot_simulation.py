@@ -0,0 +1,740 @@
+"""
+봇 시뮬레이션 처리량 벤치마크 커맨드
+
+외부 서비스 없이 봇 경주 N개를 처음부터 끝까지 실행하고
+Worker 1개 기준 처리량을 측정합니다.
+
+대체 구성:
+- Redis: fakeredis (Lua 지원 필요: pip install "fakeredis[lua]")
+- DB: 임시 SQLite 파일 (migrate 후 사용, 실행 후 삭제)
+- RabbitMQ: 메모리 발행기 (이벤트 수/크기만 집계)
+- 공공데이터/TMAP API: 합성 교통 데이터 또는 기록된 cassette 재생
+- 시계: 가상 시계 (다음 틱 예정 시각으로 바로 이동, 실제 대기 없음)
+
+측정 항목:
+- ticks/sec (틱 처리 시간만 합산한 처리량)
+- 틱 지연 p50/p99
+- 봇·분당 외부 API 호출 수
+- 틱당 Redis 왕복 수
+
+사용법:
+    python manage.py benchmark_bot_simulation
+    python manage.py benchmark_bot_simulation --races 200 --bots-per-race 3
+    python manage.py benchmark_bot_simulation --cassette /tmp/api.jsonl
+    BOT_TICK_REDIS_PIPELINE=false python manage.py benchmark_bot_simulation
+"""
+
+import heapq
+import logging
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.itineraries.models import RouteItinerary, RouteLeg
+from apps.routes.models import Bot, Route, SubwayStation
+from apps.routes.services.bot_state import BotStateManager
+from apps.routes.services.id_converter import PublicAPIIdConverter
+from apps.routes.services.leg_geometry import LegGeometryCache
+from apps.routes.services.route_cache import RouteCache
+from apps.routes.tasks.bot_simulation import (
+    _bot_tick_session,
+    _run_bot_tick,
+    _should_schedule_next_tick,
+)
+from apps.routes.tasks.subway_positions import collect_subway_positions
+from apps.routes.utils import api_replay, clock, codec
+from apps.routes.utils.path_geometry import CompiledPath
+from apps.routes.utils.rabbitmq_client import rabbitmq_client
+from apps.routes.utils.redis_client import redis_client
+
+# 서울 시청 근처
+CENTER_LON, CENTER_LAT = 126.978, 37.566
+METERS_PER_DEG_LAT = 111_000.0
+METERS_PER_DEG_LON = METERS_PER_DEG_LAT * math.cos(math.radians(CENTER_LAT))
+
+BUS_SPEED_MPS = 7.0  # 약 25km/h
+BUS_HEADWAY_S = 360
+BUS_STATION_SPACING_M = 500
+BUS_STATIONS_PER_ROUTE = 17
+
+SUBWAY_SECONDS_PER_STATION = 120
+SUBWAY_HEADWAY_S = 240
+SUBWAY_STATION_SPACING_M = 1200
+SUBWAY_STATIONS_PER_LINE = 20
+
+WALK_SPEED_MPS = 1.2
+
+
+def _offset(lon: float, lat: float, east_m: float, north_m: float) -> tuple:
+    return lon + east_m / METERS_PER_DEG_LON, lat + north_m / METERS_PER_DEG_LAT
+
+
+def _linestring(coords: List[tuple]) -> str:
+    return " ".join(f"{lon:.6f},{lat:.6f}" for lon, lat in coords)
+
+
+def _random_polyline(rng: random.Random, vertices: int, spacing_m: float) -> list:
+    """도심 안에서 완만하게 휘어지는 경로선"""
+    lon, lat = _offset(
+        CENTER_LON, CENTER_LAT, rng.uniform(-4000, 4000), rng.uniform(-4000, 4000)
+    )
+    heading = rng.uniform(0, 2 * math.pi)
+    coords = [(lon, lat)]
+    for _ in range(vertices - 1):
+        heading += rng.uniform(-0.3, 0.3)
+        lon, lat = _offset(
+            lon, lat, spacing_m * math.cos(heading), spacing_m * math.sin(heading)
+        )
+        coords.append((lon, lat))
+    return coords
+
+
+class _BusRoute:
+    """합성 버스 노선 (일정 배차 간격, 일정 속도)"""
+
+    def __init__(self, index: int, rng: random.Random, base_time: float):
+        self.bus_route_id = f"9{index:08d}"
+        self.number = str(100 + index)
+        coords = _random_polyline(rng, BUS_STATIONS_PER_ROUTE, BUS_STATION_SPACING_M)
+        self.path = CompiledPath.from_coords(coords)
+        self.stations = [
+            {
+                "stId": f"{self.bus_route_id}{i:03d}",
+                "arsId": f"{index:02d}{i:03d}",
+                "name": f"벤치{self.number}-{i:02d}",
+                "lon": lon,
+                "lat": lat,
+                "along_m": self.path.cum_m[i],
+            }
+            for i, (lon, lat) in enumerate(coords)
+        ]
+        self.base_time = base_time
+
+    def _departure(self, k: int) -> float:
+        return self.base_time + k * BUS_HEADWAY_S
+
+    def arrivals(self, st_id: str, now: float) -> Optional[Dict]:
+        station = next((s for s in self.stations if s["stId"] == st_id), None)
+        if station is None:
+            return None
+        travel = station["along_m"] / BUS_SPEED_MPS
+        k = max(0, math.ceil((now - travel - self.base_time) / BUS_HEADWAY_S))
+        item = {"stId": st_id, "busRouteId": self.bus_route_id}
+        for n, veh in ((1, k), (2, k + 1)):
+            tra_time = int(self._departure(veh) + travel - now)
+            item[f"vehId{n}"] = f"{self.bus_route_id}{veh:04d}"
+            item[f"traTime{n}"] = str(tra_time)
+            item[f"arrmsg{n}"] = (
+                "곧 도착"
+                if tra_time <= 60
+                else f"{tra_time // 60}분{tra_time % 60}초후"
+            )
+        return item
+
+    def position(self, veh_id: str, now: float) -> Optional[Dict]:
+        k = int(veh_id[len(self.bus_route_id) :])
+        along = (now - self._departure(k)) * BUS_SPEED_MPS
+        if along < 0 or along > self.path.total_m:
+            return None
+        lon, lat = self.path.point_at_distance(along)
+        near_station = min(abs(along - s["along_m"]) for s in self.stations) < 30
+        return {
+            "vehId": veh_id,
+            "tmX": f"{lon:.6f}",
+            "tmY": f"{lat:.6f}",
+            "stopFlag": "1" if near_station else "0",
+        }
+
+
+class _SubwayLine:
+    """합성 지하철 노선 (외부코드 증가 방향 단방향 운행)"""
+
+    def __init__(self, number: int, rng: random.Random, base_time: float):
+        self.name = f"{number}호선"
+        self.line_id = f"100{number}"
+        self.number = number
+        coords = _random_polyline(
+            rng, SUBWAY_STATIONS_PER_LINE, SUBWAY_STATION_SPACING_M
+        )
+        self.stations = [
+            {"name": f"벤치{number}역{i:02d}", "lon": lon, "lat": lat}
+            for i, (lon, lat) in enumerate(coords)
+        ]
+        self.index = {s["name"]: i for i, s in enumerate(self.stations)}
+        # 외부코드 증가 방향 (2호선은 내선)
+        self.direction = "내선" if number == 2 else "상행"
+        self.base_time = base_time
+
+    def _departure(self, k: int) -> float:
+        return self.base_time + k * SUBWAY_HEADWAY_S
+
+    def arrivals(self, station_name: str, now: float) -> List[Dict]:
+        i = self.index.get(station_name)
+        if i is None or i == len(self.stations) - 1:
+            return []
+        terminal = self.stations[-1]["name"]
+        offset = i * SUBWAY_SECONDS_PER_STATION
+        k = max(0, math.ceil((now - offset - self.base_time) / SUBWAY_HEADWAY_S))
+        result = []
+        for train in (k, k + 1):
+            barvl = int(self._departure(train) + offset - now)
+            result.append(
+                {
+                    "subwayId": self.line_id,
+                    "updnLine": self.direction,
+                    "trainLineNm": (
+                        f"{terminal}행 - {self.stations[i + 1]['name']}방면"
+                    ),
+                    "btrainNo": f"{self.number}{train:04d}",
+                    "barvlDt": str(barvl),
+                    "arvlCd": "1" if barvl <= 10 else "0" if barvl <= 30 else "99",
+                    "arvlMsg2": "도착" if barvl <= 10 else f"{barvl // 60}분 후",
+                    "arvlMsg3": self.stations[max(0, i - 1)]["name"],
+                    "bstatnNm": terminal,
+                }
+            )
+        return result
+
+    def positions(self, now: float) -> List[Dict]:
+        last = len(self.stations) - 1
+        k_max = math.floor((now - self.base_time) / SUBWAY_HEADWAY_S)
+        k_min = max(
+            0,
+            math.ceil(
+                (now - last * SUBWAY_SECONDS_PER_STATION - self.base_time)
+                / SUBWAY_HEADWAY_S
+            ),
+        )
+        result = []
+        for k in range(k_min, k_max + 1):
+            progress = (now - self._departure(k)) / SUBWAY_SECONDS_PER_STATION
+            if not 0 <= progress <= last:
+                continue
+            station = self.stations[int(progress)]
+            result.append(
+                {
+                    "trainNo": f"{self.number}{k:04d}",
+                    "statnNm": station["name"],
+                    "updnLine": "0",
+                    "trainSttus": "1" if progress % 1 < 0.25 else "2",
+                    "statnTnm": self.stations[-1]["name"],
+                }
+            )
+        return result
+
+
+class SyntheticTransit:
+    """합성 교통 데이터 (api_replay 응답 함수)"""
+
+    def __init__(self, rng: random.Random, bus_routes: int, subway_lines: int):
+        base_time = clock.time() - 3600  # 시작 시점에 이미 운행 중인 차량 포함
+        self.bus_routes = [_BusRoute(i, rng, base_time) for i in range(bus_routes)]
+        self.subway_lines = [
+            _SubwayLine(n, rng, base_time) for n in range(1, subway_lines + 1)
+        ]
+        self._bus_by_id = {r.bus_route_id: r for r in self.bus_routes}
+        self._subway_by_name = {line.name: line for line in self.subway_lines}
+
+    def __call__(self, api: str, args: tuple, kwargs: dict):
+        now = clock.time()
+        if api == "bus.get_arrival_info":
+            route = self._bus_by_id.get(args[1])
+            return route.arrivals(args[0], now) if route else None
+        if api == "bus.get_bus_position":
+            veh_id = args[0]
+            route = self._bus_by_id.get(veh_id[:9])
+            return route.position(veh_id, now) if route else None
+        if api == "bus.get_station_by_route":
+            route = self._bus_by_id.get(args[0])
+            if route is None:
+                return []
+            return [
+                {"stationId": s["stId"], "seq": str(i + 1), "stationNm": s["name"]}
+                for i, s in enumerate(route.stations)
+            ]
+        if api == "subway.get_arrival_info":
+            return [
+                arrival
+                for line in self.subway_lines
+                for arrival in line.arrivals(args[0], now)
+            ]
+        if api == "subway.get_train_position":
+            line = self._subway_by_name.get(args[0])
+            return line.positions(now) if line else []
+        return api_replay.API_TARGETS[api][3]
+
+    def create_subway_stations(self) -> None:
+        """방향 판단용 역 외부코드 (증가 방향 = 상행)"""
+        SubwayStation.objects.bulk_create(
+            SubwayStation(
+                station_code=f"{line.number}{i:03d}",
+                station_name=station["name"],
+                line=f"0{line.number}호선",
+                line_num=line.number,
+                external_code=str(line.number * 100 + i),
+                external_code_num=line.number * 100 + i,
+            )
+            for line in self.subway_lines
+            for i, station in enumerate(line.stations)
+        )
+
+    def build_race(self, rng: random.Random, index: int) -> Tuple[list, dict]:
+        """도보 → 버스 → 도보 → 지하철 → 도보 경로와 공공데이터 ID 생성"""
+        bus = self.bus_routes[index % len(self.bus_routes)]
+        line = self.subway_lines[index % len(self.subway_lines)]
+
+        board = rng.randint(1, 8)
+        alight = board + rng.randint(3, 6)
+        board_st, alight_st = bus.stations[board], bus.stations[alight]
+        # 환승 도보가 짧도록 하차 정류소에서 가장 가까운 역에서 승차
+        enter = min(
+            range(SUBWAY_STATIONS_PER_LINE - 7),
+            key=lambda i: (line.stations[i]["lon"] - alight_st["lon"]) ** 2
+            + (line.stations[i]["lat"] - alight_st["lat"]) ** 2,
+        )
+        leave = enter + rng.randint(3, 6)
+
+        enter_st, leave_st = line.stations[enter], line.stations[leave]
+        origin = _offset(board_st["lon"], board_st["lat"], -250, 150)
+        destination = _offset(leave_st["lon"], leave_st["lat"], 200, -100)
+
+        def point(name, lon, lat):
+            return {"name": name, "lon": lon, "lat": lat}
+
+        def walk(start, end):
+            coords = [(start["lon"], start["lat"]), (end["lon"], end["lat"])]
+            distance = CompiledPath.from_coords(coords).total_m
+            return {
+                "mode": "WALK",
+                "sectionTime": int(distance / WALK_SPEED_MPS),
+                "distance": int(distance),
+                "start": start,
+                "end": end,
+                "steps": [{"linestring": _linestring(coords)}],
+            }
+
+        bus_stops = bus.stations[board : alight + 1]
+        bus_leg = {
+            "mode": "BUS",
+            "route": f"간선:{bus.number}",
+            "sectionTime": int(
+                (alight_st["along_m"] - board_st["along_m"]) / BUS_SPEED_MPS
+            ),
+            "distance": int(alight_st["along_m"] - board_st["along_m"]),
+            "start": point(board_st["name"], board_st["lon"], board_st["lat"]),
+            "end": point(alight_st["name"], alight_st["lon"], alight_st["lat"]),
+            "passShape": {
+                "linestring": _linestring([(s["lon"], s["lat"]) for s in bus_stops])
+            },
+            "passStopList": {
+                "stations": [
+                    {"stationName": s["name"], "lon": s["lon"], "lat": s["lat"]}
+                    for s in bus_stops
+                ]
+            },
+        }
+
+        subway_stops = line.stations[enter : leave + 1]
+        subway_leg = {
+            "mode": "SUBWAY",
+            "route": line.name,
+            "sectionTime": (leave - enter) * SUBWAY_SECONDS_PER_STATION,
+            "distance": (leave - enter) * SUBWAY_STATION_SPACING_M,
+            "start": point(enter_st["name"], enter_st["lon"], enter_st["lat"]),
+            "end": point(leave_st["name"], leave_st["lon"], leave_st["lat"]),
+            "passShape": {
+                "linestring": _linestring([(s["lon"], s["lat"]) for s in subway_stops])
+            },
+            "passStopList": {
+                "stations": [
+                    {"stationName": s["name"], "lon": s["lon"], "lat": s["lat"]}
+                    for s in subway_stops
+                ]
+            },
+        }
+
+        legs = [
+            walk(point("출발지", *origin), bus_leg["start"]),
+            bus_leg,
+            walk(bus_leg["end"], subway_leg["start"]),
+            subway_leg,
+            walk(subway_leg["end"], point("도착지", *destination)),
+        ]
+
+        def bus_station(station):
+            return {
+                key: station[key] for key in ("stId", "arsId", "name", "lon", "lat")
+            }
+
+        public_ids = {
+            "legs": [
+                {"mode": "WALK"},
+                {
+                    "mode": "BUS",
+                    "bus_route_id": bus.bus_route_id,
+                    "bus_route_name": bus.number,
+                    "start_station": bus_station(board_st),
+                    "end_station": bus_station(alight_st),
+                    "pass_shape": bus_leg["passShape"]["linestring"],
+                },
+                {"mode": "WALK"},
+                {
+                    "mode": "SUBWAY",
+                    "subway_line": line.name,
+                    "subway_line_id": line.line_id,
+                    "start_station": enter_st["name"],
+                    "end_station": leave_st["name"],
+                    "pass_stops": [s["name"] for s in subway_stops],
+                    "pass_shape": subway_leg["passShape"]["linestring"],
+                },
+                {"mode": "WALK"},
+            ]
+        }
+        return legs, public_ids
+
+
+class InMemoryBroker:
+    """RabbitMQ 발행 대체 (이벤트 타입별 수/직렬화 크기 집계)"""
+
+    def __init__(self):
+        self.events: Counter = Counter()
+        self.bytes = 0
+
+    def publish(
+        self,
+        route_itinerary_id: int,
+        event_type: str,
+        data: dict,
+        event_id: Optional[str] = None,
+    ) -> bool:
+        message = {"event": event_type, "data": data}
+        if event_id:
+            message["id"] = event_id
+        body = codec.dumps(message)
+        self.events[event_type] += 1
+        self.bytes += len(body)
+        return True
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = "외부 서비스 없이 봇 경주를 실행해 Worker 처리량을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--races", type=int, default=50, help="동시 경주 수 (기본 50)"
+        )
+        parser.add_argument(
+            "--bots-per-race", type=int, default=2, help="경주당 봇 수 (기본 2)"
+        )
+        parser.add_argument(
+            "--bus-routes", type=int, default=5, help="합성 버스 노선 수 (기본 5)"
+        )
+        parser.add_argument(
+            "--subway-lines",
+            type=int,
+            default=3,
+            help="합성 지하철 노선 수 (기본 3, 최대 9)",
+        )
+        parser.add_argument(
+            "--max-minutes",
+            type=int,
+            default=180,
+            help="가상 시간 상한 (분, 기본 180)",
+        )
+        parser.add_argument(
+            "--cassette",
+            help="기록된 API cassette(JSON Lines) 재생 (TMAP 경로 탐색 응답으로 경주 생성)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+
+    def handle(self, *args, **options):
+        try:
+            import fakeredis
+        except ImportError:
+            raise CommandError('fakeredis가 필요합니다: pip install "fakeredis[lua]"')
+
+        if options["verbosity"] < 2:
+            # 틱 경로의 INFO 로그 출력 제외 (측정값은 로그 비용 제외)
+            logging.disable(logging.INFO)
+
+        rng = random.Random(options["seed"])
+        broker = InMemoryBroker()
+
+        with tempfile.TemporaryDirectory() as tmp_dir, ExitStack() as stack:
+            self._use_temporary_database(os.path.join(tmp_dir, "benchmark.sqlite3"))
+            stack.enter_context(
+                mock.patch.object(redis_client, "_client", fakeredis.FakeRedis())
+            )
+            stack.enter_context(
+                mock.patch.object(rabbitmq_client, "publish", broker.publish)
+            )
+
+            virtual_clock = clock.VirtualClock()
+            if options["cassette"]:
+                cassette = api_replay.ApiCassette.load(options["cassette"])
+                start = cassette.start_time("tmap.") or cassette.start_time()
+                if start is None:
+                    raise CommandError("cassette에 기록된 호출이 없습니다.")
+                virtual_clock = clock.VirtualClock(
+                    datetime.fromtimestamp(start, tz=dt_timezone.utc)
+                )
+            stack.enter_context(clock.use_clock(virtual_clock))
+            # 공유 캐시/락 TTL도 가상 시각 기준으로 만료 (fakeredis 명령 시각 교체)
+            stack.enter_context(
+                mock.patch(
+                    "fakeredis._socket._base.time",
+                    SimpleNamespace(time=virtual_clock.time),
+                )
+            )
+
+            if options["cassette"]:
+                responder = api_replay.CassetteResponder(cassette)
+            else:
+                transit = SyntheticTransit(
+                    rng, options["bus_routes"], min(options["subway_lines"], 9)
+                )
+                transit.create_subway_stations()
+                responder = transit
+
+            stats = stack.enter_context(api_replay.intercept_api_calls(responder))
+
+            if options["cassette"]:
+                races = self._races_from_cassette(cassette, options["races"])
+            else:
+                races = [transit.build_race(rng, i) for i in range(options["races"])]
+            if not races:
+                raise CommandError("생성된 경주가 없습니다.")
+
+            bot_routes = self._start_races(races, options["bots_per_race"])
+            setup_calls = sum(stats.values())
+            result = self._run(virtual_clock, bot_routes, options["max_minutes"] * 60)
+            api_calls = Counter(stats)
+
+        self._report(result, api_calls, setup_calls, broker, responder)
+
+    # =========================================================================
+    # 환경 구성
+    # =========================================================================
+
+    def _use_temporary_database(self, path: str) -> None:
+        """기본 DB 연결을 임시 SQLite 파일로 교체 후 migrate"""
+        connections["default"].close()
+        connections.settings["default"].update(
+            ENGINE="django.db.backends.sqlite3", NAME=path, OPTIONS={}
+        )
+        del connections["default"]
+        call_command("migrate", verbosity=0, interactive=False)
+
+    def _races_from_cassette(
+        self, cassette: api_replay.ApiCassette, limit: int
+    ) -> List[Tuple[list, dict]]:
+        """기록된 TMAP 경로 탐색 응답의 첫 번째 경로로 경주 생성"""
+        races = []
+        for record in cassette.records:
+            if record["api"] != "tmap.search_routes":
+                continue
+            itineraries = (
+                (record["response"] or {})
+                .get("metaData", {})
+                .get("plan", {})
+                .get("itineraries", [])
+            )
+            if not itineraries:
+                continue
+            legs = itineraries[0].get("legs", [])
+            races.append((legs, PublicAPIIdConverter.convert_legs(legs)))
+            if len(races) >= limit:
+                break
+        return races
+
+    def _start_races(self, races: List[Tuple[list, dict]], bots_per_race: int) -> list:
+        """경주 시작 처리 (views의 경주 생성과 같은 순서로 캐시/봇 상태 준비)"""
+        bot_routes = []
+        now = clock.now()
+        for race_index, (legs, public_ids) in enumerate(races):
+            start, end = legs[0].get("start", {}), legs[-1].get("end", {})
+            itinerary = RouteItinerary.objects.create(
+                start_x=str(start.get("lon")),
+                start_y=str(start.get("lat")),
+                end_x=str(end.get("lon")),
+                end_y=str(end.get("lat")),
+            )
+            route_leg = RouteLeg.objects.create(
+                route_itinerary=itinerary,
+                leg_index=0,
+                path_type=3,
+                total_time=sum(int(leg.get("sectionTime", 0)) for leg in legs),
+                total_distance=sum(int(leg.get("distance", 0)) for leg in legs),
+                raw_data={"legs": legs},
+            )
+            race_routes = []
+            for bot_index in range(bots_per_race):
+                bot = Bot.objects.create(name=f"벤치봇{race_index}-{bot_index}")
+                route = Route.objects.create(
+                    participant_type=Route.ParticipantType.BOT,
+                    bot=bot,
+                    route_itinerary=itinerary,
+                    route_leg=route_leg,
+                    start_time=now,
+                )
+                redis_client.set_public_ids(route.id, public_ids)
+                LegGeometryCache.build(route.id, legs)
+                RouteCache.set_status(route.id, Route.Status.RUNNING)
+                BotStateManager.initialize(
+                    route_id=route.id,
+                    bot_id=bot.id,
+                    legs=legs,
+                    start_lon=start.get("lon"),
+                    start_lat=start.get("lat"),
+                )
+                race_routes.append(route.id)
+            RouteCache.start_race(itinerary.id, race_routes)
+            bot_routes.extend(race_routes)
+        return bot_routes
+
+    # =========================================================================
+    # 실행
+    # =========================================================================
+
+    def _run(
+        self, virtual_clock: clock.VirtualClock, bot_routes: list, max_seconds: int
+    ) -> dict:
+        """
+        이산 이벤트 실행 (chain 모드의 update_bot_position과 같은 틱 처리)
+
+        다음 틱 예정 시각이 가장 이른 봇부터 가상 시계를 옮겨 처리하고,
+        지하철 위치 수집 Task도 Beat 주기에 맞춰 함께 실행합니다.
+        """
+        started_at = virtual_clock.time()
+        deadline = started_at + max_seconds
+        collect_interval = settings.SUBWAY_POSITION_COLLECT_INTERVAL
+
+        queue = [(started_at, route_id) for route_id in bot_routes]
+        heapq.heapify(queue)
+        next_collect = started_at + collect_interval
+        finished_at: Dict[int, float] = {}
+        latencies: List[float] = []
+        statuses: Counter = Counter()
+        round_trips = 0
+
+        wall_start = time.perf_counter()
+        while queue:
+            due, route_id = heapq.heappop(queue)
+            if due > deadline:
+                heapq.heappush(queue, (due, route_id))
+                break
+
+            while next_collect <= due:
+                virtual_clock.advance_to(next_collect)
+                collect_subway_positions()
+                next_collect += collect_interval
+
+            virtual_clock.advance_to(due)
+            tick_start = time.perf_counter()
+            with _bot_tick_session(route_id) as session:
+                result = _run_bot_tick(route_id)
+                reschedule = _should_schedule_next_tick(route_id, result)
+            latencies.append(time.perf_counter() - tick_start)
+            round_trips += session.round_trips
+            statuses[result.get("status")] += 1
+
+            if reschedule:
+                heapq.heappush(queue, (due + result["next_interval"], route_id))
+            else:
+                finished_at[route_id] = virtual_clock.time()
+        wall_total = time.perf_counter() - wall_start
+
+        end_time = virtual_clock.time()
+        bot_seconds = sum(
+            finished_at.get(route_id, end_time) - started_at for route_id in bot_routes
+        )
+        return {
+            "bots": len(bot_routes),
+            "finished": Route.objects.filter(
+                id__in=bot_routes, status=Route.Status.FINISHED
+            ).count(),
+            "unfinished": len(queue),
+            "ticks": len(latencies),
+            "redis_round_trips": round_trips,
+            "latencies": sorted(latencies),
+            "statuses": statuses,
+            "virtual_minutes": (end_time - started_at) / 60,
+            "bot_minutes": bot_seconds / 60,
+            "wall_seconds": wall_total,
+        }
+
+    def _report(
+        self,
+        result: dict,
+        api_calls: Counter,
+        setup_calls: int,
+        broker: InMemoryBroker,
+        responder,
+    ) -> None:
+        latencies = result["latencies"]
+        tick_seconds = sum(latencies)
+        run_calls = sum(api_calls.values()) - setup_calls
+        bot_minutes = max(result["bot_minutes"], 1e-9)
+
+        self.stdout.write(
+            f"bots: {result['bots']} (finished {result['finished']}, "
+            f"unfinished {result['unfinished']}), "
+            f"virtual time: {result['virtual_minutes']:.1f} min"
+        )
+        self.stdout.write(
+            f"ticks: {result['ticks']}  "
+            f"({', '.join(f'{k}={v}' for k, v in result['statuses'].most_common())})"
+        )
+        self.stdout.write(
+            f"ticks/sec: {result['ticks'] / tick_seconds if tick_seconds else 0:.1f}  "
+            f"(wall {result['wall_seconds']:.2f}s, tick time {tick_seconds:.2f}s)"
+        )
+        self.stdout.write(
+            f"tick latency: p50 {_percentile(latencies, 50) * 1000:.2f}ms, "
+            f"p99 {_percentile(latencies, 99) * 1000:.2f}ms, "
+            f"max {(latencies[-1] if latencies else 0) * 1000:.2f}ms"
+        )
+        self.stdout.write(
+            f"Redis round trips per tick: "
+            f"{result['redis_round_trips'] / max(result['ticks'], 1):.2f} "
+            f"(BOT_TICK_REDIS_PIPELINE={settings.BOT_TICK_REDIS_PIPELINE})"
+        )
+        self.stdout.write(
+            f"API calls: {run_calls} ({run_calls / bot_minutes:.2f} per bot-minute, "
+            f"setup {setup_calls})"
+        )
+        for api, count in sorted(api_calls.items()):
+            if count:
+                self.stdout.write(f"  {api}: {count}")
+        misses = getattr(responder, "misses", None)
+        if misses:
+            self.stdout.write(
+                self.style.WARNING(f"cassette에 없는 호출: {sum(misses.values())}")
+            )
+            for api, count in misses.most_common():
+                self.stdout.write(f"  {api}: {count}")
+        self.stdout.write(
+            f"SSE events: {sum(broker.events.values())} "
+            f"({broker.bytes / 1024:.1f} KiB)"
+        )
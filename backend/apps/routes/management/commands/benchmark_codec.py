@@ -0,0 +1,155 @@
+"""
+직렬화 코덱 벤치마크 커맨드
+
+SSE/RabbitMQ로 나가는 대표 이벤트(bot_status_update)를 형식별로 인코딩/디코딩해
+이벤트당 바이트 수와 인코딩/디코딩 시간을 비교합니다.
+
+- json (기존): 표준 json + ISO 시각 + 전체 자릿수 좌표
+- json: 표준 json + epoch 밀리초 + 소수점 6자리 좌표
+- orjson: utils.codec JSON (SSE data, SERIALIZATION_FORMAT=json)
+- msgpack: utils.codec MessagePack (SERIALIZATION_FORMAT=msgpack, 내부 구간)
+
+사용법:
+    python manage.py benchmark_codec
+    python manage.py benchmark_codec --iterations 50000 --shape-points 300
+"""
+
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+
+from apps.routes.utils import codec
+
+SEOUL = dt_timezone(timedelta(hours=9))
+
+
+def _sample_events(shape_points: int, rng: random.Random) -> dict:
+    """대표 이벤트 (원본 형식: ISO 시각, 전체 자릿수 좌표)"""
+    lon, lat = 126.9779692, 37.566535
+    shape = []
+    for _ in range(shape_points):
+        lon += rng.uniform(-0.0005, 0.0005)
+        lat += rng.uniform(-0.0005, 0.0005)
+        shape.append(f"{lon:.7f},{lat:.7f}")
+
+    base = {
+        "route_id": 1234,
+        "bot_id": 3,
+        "leg_index": 2,
+        "next_update_in": 5,
+        "timestamp": datetime.now(SEOUL).isoformat(),
+    }
+    return {
+        "bot_status_update (BUS)": {
+            **base,
+            "status": "RIDING_BUS",
+            "progress_percent": 41.37288135593221,
+            "arrival_time": None,
+            "vehicle": {
+                "type": "BUS",
+                "route": "472",
+                "vehId": "111033115",
+                "position": {"lon": lon + 0.000123456789, "lat": lat - 0.00009876543},
+                "stopFlag": "0",
+                "pass_shape": " ".join(shape),
+            },
+            "position": {"lon": lon, "lat": lat},
+        },
+        "bot_status_update (WALKING)": {
+            **base,
+            "status": "WALKING",
+            "progress_percent": 12.5,
+            "arrival_time": None,
+            "position": {"lon": 126.97796921234567, "lat": 37.56653512345678},
+        },
+    }
+
+
+def _compact(data: dict, timestamp_ms: int) -> dict:
+    """발행 형식으로 변환 (SSEPublisher와 동일: epoch 밀리초, 소수점 6자리 좌표)"""
+    data = {**data, "timestamp": timestamp_ms}
+    if data.get("position"):
+        data["position"] = codec.compact_position(data["position"])
+    if data.get("vehicle", {}).get("position"):
+        data["vehicle"] = {
+            **data["vehicle"],
+            "position": codec.compact_position(data["vehicle"]["position"]),
+        }
+    return data
+
+
+def _stdlib_dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode()
+
+
+class Command(BaseCommand):
+    help = "SSE/RabbitMQ 이벤트 직렬화 형식별 크기와 속도를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20000,
+            help="형식별 인코딩/디코딩 반복 횟수 (기본 20000)",
+        )
+        parser.add_argument(
+            "--shape-points",
+            type=int,
+            default=120,
+            help="버스 경로선(pass_shape) 좌표 수 (기본 120)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        iterations = options["iterations"]
+        timestamp_ms = codec.epoch_ms()
+
+        formats = [
+            ("json (기존)", False, _stdlib_dumps, json.loads),
+            ("json", True, _stdlib_dumps, json.loads),
+        ]
+        if codec.orjson is not None:
+            formats.append(("orjson", True, codec.dumps_json, codec.loads))
+        else:
+            self.stdout.write(self.style.WARNING("orjson 미설치: 측정 생략"))
+        if codec.msgpack is not None:
+            formats.append(("msgpack", True, codec.dumps_msgpack, codec.loads))
+        else:
+            self.stdout.write(self.style.WARNING("msgpack 미설치: 측정 생략"))
+
+        for name, data in _sample_events(options["shape_points"], rng).items():
+            self.stdout.write(f"\n{name}")
+            self.stdout.write(
+                f"{'format':<12} {'bytes':>7} {'encode(us)':>11} {'decode(us)':>11}"
+            )
+            baseline = None
+            for label, compact, dumps, loads in formats:
+                message = {
+                    "event": "bot_status_update",
+                    "data": _compact(data, timestamp_ms) if compact else data,
+                    "id": "1768179960000-0",
+                }
+                body = dumps(message)
+                if loads(body) != json.loads(json.dumps(message)):
+                    self.stdout.write(self.style.ERROR(f"{label}: 왕복 결과 불일치"))
+
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    dumps(message)
+                encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    loads(body)
+                decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+                baseline = baseline or len(body)
+                self.stdout.write(
+                    f"{label:<12} {len(body):>7} {encode_us:>11.2f} "
+                    f"{decode_us:>11.2f}  ({len(body) / baseline:.0%})"
+                )
@@ -0,0 +1,116 @@
+"""
+경로 스냅핑 벤치마크 커맨드
+
+DB에 저장된 실제 경로(RouteLeg.raw_data)의 버스/지하철 경로선으로
+기준 구현(세그먼트마다 Haversine)과 벡터화 스냅핑의 속도/결과 차이를 비교합니다.
+
+사용법:
+    python manage.py benchmark_path_snapping
+    python manage.py benchmark_path_snapping --legs 50 --samples 200 --noise 30
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.itineraries.models import RouteLeg
+from apps.routes.services.leg_geometry import leg_linestring
+from apps.routes.utils.geo_utils import calculate_distance
+from apps.routes.utils.path_geometry import CompiledPath
+
+
+class Command(BaseCommand):
+    help = "실제 경로선으로 경로 스냅핑 성능을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--legs", type=int, default=30, help="측정할 최대 경로선 수 (기본 30)"
+        )
+        parser.add_argument(
+            "--samples", type=int, default=100, help="경로선당 스냅핑 횟수 (기본 100)"
+        )
+        parser.add_argument(
+            "--noise",
+            type=float,
+            default=30.0,
+            help="GPS 오차 흉내 (미터, 기본 30)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        paths = self._load_paths(options["legs"])
+        if not paths:
+            self.stdout.write(self.style.WARNING("측정할 경로선이 없습니다."))
+            return
+
+        # 미터 → 도 (서울 위도 기준 근사)
+        noise_deg = options["noise"] / 111_000
+
+        total_ref = total_vec = 0.0
+        max_diff = 0.0
+        self.stdout.write(
+            f"{'vertices':>8} {'ref(ms)':>9} {'vec(ms)':>9} {'speedup':>8}"
+        )
+
+        for path in sorted(paths, key=len):
+            points = []
+            for _ in range(options["samples"]):
+                i = rng.randrange(len(path))
+                points.append(
+                    (
+                        path.lons[i] + rng.uniform(-noise_deg, noise_deg),
+                        path.lats[i] + rng.uniform(-noise_deg, noise_deg),
+                    )
+                )
+
+            # 격자/배열 생성 비용은 경주 시작 시 1회이므로 측정에서 제외
+            path.snap(*points[0])
+
+            start = time.perf_counter()
+            ref_results = [path.snap_reference(lon, lat) for lon, lat in points]
+            ref_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            vec_results = [path.snap(lon, lat) for lon, lat in points]
+            vec_elapsed = time.perf_counter() - start
+
+            for (ref_lon, ref_lat), (vec_lon, vec_lat) in zip(ref_results, vec_results):
+                max_diff = max(
+                    max_diff, calculate_distance(ref_lat, ref_lon, vec_lat, vec_lon)
+                )
+
+            total_ref += ref_elapsed
+            total_vec += vec_elapsed
+            samples = len(points)
+            self.stdout.write(
+                f"{len(path):>8} {ref_elapsed / samples * 1000:>9.3f} "
+                f"{vec_elapsed / samples * 1000:>9.3f} "
+                f"{ref_elapsed / vec_elapsed:>7.1f}x"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"경로선 {len(paths)}개: 전체 {total_ref / total_vec:.1f}배 빠름, "
+                f"최대 결과 차이 {max_diff * 100:.2f}cm"
+            )
+        )
+
+    def _load_paths(self, limit: int) -> list:
+        """최근 경로 탐색 결과에서 버스/지하철 경로선 로드"""
+        paths = []
+        for raw_data in (
+            RouteLeg.objects.order_by("-id")
+            .values_list("raw_data", flat=True)
+            .iterator()
+        ):
+            for leg in (raw_data or {}).get("legs", []):
+                if leg.get("mode") not in ("BUS", "SUBWAY"):
+                    continue
+                path = CompiledPath.from_linestring(leg_linestring(leg))
+                if path is not None:
+                    paths.append(path)
+                if len(paths) >= limit:
+                    return paths
+        return paths
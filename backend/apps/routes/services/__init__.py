@@ -4,10 +4,26 @@ routes 앱 서비스 모듈
 - bot_state: 봇 상태 관리 서비스 (v3)
 - sse_publisher: SSE 이벤트 발행 서비스 (v3)
 - id_converter: TMAP → 공공데이터 ID 변환 서비스 (v3)
+- leg_geometry: 봇 leg 경로선 geometry 캐시
+- route_cache: 봇 Task용 경주 데이터 캐시 + 경주 상태 플래그
+- realtime_cache: 실시간 공공데이터 API 공유 캐시 (single-flight)
+- sse_hub: ASGI Worker당 1개 RabbitMQ 구독을 SSE 클라이언트에 분배
+- sse_delta: SSE 봇 상태 델타 인코딩 (?delta=1)
+- bus_position_index: 버스 위치 지도 타일 인덱스 (영역 조회)
+- bus_position_feed: 버스 위치 변경분 피드 (최근 수집 세대 대비)
+- bus_route_demand: 버스 위치 수집 노선 선정 (진행 중 경주 + 최근 조회 수요)
+- bus_dead_reckoning: 수집 사이 버스 위치 추정 (노선 경로선 + 차량별 최근 위치)
 """
 
 from .bot_state import BotStateManager, BotStatus
+from .bus_dead_reckoning import BusDeadReckoning
+from .bus_position_feed import BusPositionFeed
+from .bus_position_index import BusPositionIndex
+from .bus_route_demand import BusRouteDemand
 from .id_converter import SUBWAY_LINE_MAP, PublicAPIIdConverter
+from .leg_geometry import LegGeometryCache
+from .realtime_cache import RealtimeCache
+from .route_cache import RouteCache
 from .sse_publisher import SSEPublisher
 
 __all__ = [
@@ -16,4 +32,11 @@ __all__ = [
     "SSEPublisher",
     "PublicAPIIdConverter",
     "SUBWAY_LINE_MAP",
+    "LegGeometryCache",
+    "RouteCache",
+    "RealtimeCache",
+    "BusPositionIndex",
+    "BusPositionFeed",
+    "BusRouteDemand",
+    "BusDeadReckoning",
 ]
@@ -13,12 +13,15 @@ from typing import Optional
 
 from django.utils import timezone
 
+from ..utils import clock
 from ..utils.redis_client import redis_client
+from .leg_geometry import LegGeometryCache
+from .route_cache import RouteCache
 
 
 def get_seoul_timestamp() -> str:
     """서울 시간대 타임스탬프 반환"""
-    return timezone.localtime(timezone.now()).isoformat()
+    return timezone.localtime(clock.now()).isoformat()
 
 
 class BotStatus(str, Enum):
@@ -32,6 +35,10 @@ class BotStatus(str, Enum):
     FINISHED = "FINISHED"
 
 
+# 진행 중 상태 (FINISHED 외 전체)
+_ACTIVE_STATUSES = tuple(status for status in BotStatus if status != BotStatus.FINISHED)
+
+
 class BotStateManager:
     """봇 상태 관리 서비스 (v3)"""
 
@@ -111,27 +118,50 @@ class BotStateManager:
         return redis_client.get_bot_state(route_id)
 
     @staticmethod
-    def update(route_id: int, **kwargs) -> Optional[dict]:
+    def update(route_id: int, **kwargs) -> bool:
         """
-        봇 상태 부분 업데이트 (원자적 업데이트)
-
-        분산 락을 사용하여 동시성 문제를 방지합니다.
+        봇 상태 부분 업데이트 (변경 필드만 원자 적용, Redis 1회 왕복)
 
         Args:
             route_id: 경주 ID
             **kwargs: 업데이트할 필드들
 
         Returns:
-            업데이트된 봇 상태 또는 None
+            업데이트 여부 (봇 상태가 없으면 False)
+        """
+        return redis_client.update_bot_state(route_id, **kwargs)
+
+    @staticmethod
+    def _transition(route_id: int, allowed_from: tuple, **fields) -> bool:
+        """
+        상태 전환 (현재 상태 확인 + 필드 변경을 Lua 스크립트로 원자 적용)
+
+        중복 틱이 같은 전환을 두 번 적용하거나 종료된 봇을 되살리지 않도록
+        현재 상태가 allowed_from에 있을 때만 적용합니다.
+
+        Args:
+            route_id: 경주 ID
+            allowed_from: 전환 가능한 현재 상태들
+            **fields: 변경할 필드들
+
+        Returns:
+            전환 여부
         """
-        return redis_client.update_bot_state_atomic(route_id, **kwargs)
+        return bool(
+            redis_client.apply_bot_state(
+                route_id,
+                fields,
+                allowed_from=[status.value for status in allowed_from],
+            )
+        )
 
     @staticmethod
     def delete(route_id: int) -> None:
         """
         봇 상태 삭제
 
-        봇 상태와 함께 공공데이터 ID 캐시도 삭제합니다.
+        봇 상태와 함께 공공데이터 ID 캐시, leg geometry, 경주 데이터 캐시,
+        배치 모드 틱 예약도 삭제합니다.
 
         Args:
             route_id: 경주 ID
@@ -139,9 +169,12 @@ class BotStateManager:
         redis_client.delete_bot_state(route_id)
         redis_client.delete_public_ids(route_id)
         redis_client.delete_api_call_cache(route_id)
+        redis_client.unschedule_bot_tick(route_id)
+        LegGeometryCache.delete(route_id)
+        RouteCache.evict(route_id)
 
     @staticmethod
-    def transition_to_waiting_bus(route_id: int, leg_index: int) -> Optional[dict]:
+    def transition_to_waiting_bus(route_id: int, leg_index: int) -> bool:
         """
         WAITING_BUS 상태로 전환
 
@@ -150,20 +183,23 @@ class BotStateManager:
             leg_index: 현재 leg 인덱스
 
         Returns:
-            업데이트된 봇 상태
+            전환 여부 (현재 상태에서 전환할 수 없으면 False)
         """
-        return BotStateManager.update(
+        return BotStateManager._transition(
             route_id,
+            _ACTIVE_STATUSES,
             status=BotStatus.WAITING_BUS.value,
             current_leg_index=leg_index,
             leg_started_at=get_seoul_timestamp(),
             vehicle_id=None,
             arrival_time=None,
             next_poll_interval=30,
+            api_retry_count=0,
+            pending_alight=False,
         )
 
     @staticmethod
-    def transition_to_riding_bus(route_id: int, vehicle_id: str) -> Optional[dict]:
+    def transition_to_riding_bus(route_id: int, vehicle_id: str) -> bool:
         """
         RIDING_BUS 상태로 전환
 
@@ -172,18 +208,20 @@ class BotStateManager:
             vehicle_id: 버스 차량 ID (vehId)
 
         Returns:
-            업데이트된 봇 상태
+            전환 여부 (현재 상태에서 전환할 수 없으면 False)
         """
-        return BotStateManager.update(
+        return BotStateManager._transition(
             route_id,
+            (BotStatus.WAITING_BUS,),
             status=BotStatus.RIDING_BUS.value,
             vehicle_id=vehicle_id,
             arrival_time=None,
             next_poll_interval=30,
+            api_retry_count=0,
         )
 
     @staticmethod
-    def transition_to_waiting_subway(route_id: int, leg_index: int) -> Optional[dict]:
+    def transition_to_waiting_subway(route_id: int, leg_index: int) -> bool:
         """
         WAITING_SUBWAY 상태로 전환
 
@@ -192,20 +230,23 @@ class BotStateManager:
             leg_index: 현재 leg 인덱스
 
         Returns:
-            업데이트된 봇 상태
+            전환 여부 (현재 상태에서 전환할 수 없으면 False)
         """
-        return BotStateManager.update(
+        return BotStateManager._transition(
             route_id,
+            _ACTIVE_STATUSES,
             status=BotStatus.WAITING_SUBWAY.value,
             current_leg_index=leg_index,
             leg_started_at=get_seoul_timestamp(),
             vehicle_id=None,
             arrival_time=None,
             next_poll_interval=30,
+            api_retry_count=0,
+            pending_alight=False,
         )
 
     @staticmethod
-    def transition_to_riding_subway(route_id: int, train_no: str) -> Optional[dict]:
+    def transition_to_riding_subway(route_id: int, train_no: str) -> bool:
         """
         RIDING_SUBWAY 상태로 전환
 
@@ -214,18 +255,20 @@ class BotStateManager:
             train_no: 열차번호
 
         Returns:
-            업데이트된 봇 상태
+            전환 여부 (현재 상태에서 전환할 수 없으면 False)
         """
-        return BotStateManager.update(
+        return BotStateManager._transition(
             route_id,
+            (BotStatus.WAITING_SUBWAY,),
             status=BotStatus.RIDING_SUBWAY.value,
             vehicle_id=train_no,
             arrival_time=None,
             next_poll_interval=30,
+            api_retry_count=0,
         )
 
     @staticmethod
-    def transition_to_walking(route_id: int, leg_index: int) -> Optional[dict]:
+    def transition_to_walking(route_id: int, leg_index: int) -> bool:
         """
         WALKING 상태로 전환
 
@@ -234,20 +277,23 @@ class BotStateManager:
             leg_index: 현재 leg 인덱스
 
         Returns:
-            업데이트된 봇 상태
+            전환 여부 (현재 상태에서 전환할 수 없으면 False)
         """
-        return BotStateManager.update(
+        return BotStateManager._transition(
             route_id,
+            _ACTIVE_STATUSES,
             status=BotStatus.WALKING.value,
             current_leg_index=leg_index,
             leg_started_at=get_seoul_timestamp(),
             vehicle_id=None,
             arrival_time=None,
             next_poll_interval=30,
+            api_retry_count=0,
+            pending_alight=False,
         )
 
     @staticmethod
-    def transition_to_finished(route_id: int) -> Optional[dict]:
+    def transition_to_finished(route_id: int) -> bool:
         """
         FINISHED 상태로 전환
 
@@ -255,12 +301,14 @@ class BotStateManager:
             route_id: 경주 ID
 
         Returns:
-            업데이트된 봇 상태
+            전환 여부 (현재 상태에서 전환할 수 없으면 False)
         """
-        return BotStateManager.update(
+        return BotStateManager._transition(
             route_id,
+            _ACTIVE_STATUSES,
             status=BotStatus.FINISHED.value,
             next_poll_interval=None,
+            pending_alight=False,
         )
 
     @staticmethod
@@ -290,7 +338,7 @@ class BotStateManager:
         return next_interval
 
     @staticmethod
-    def update_position(route_id: int, lon: float, lat: float) -> Optional[dict]:
+    def update_position(route_id: int, lon: float, lat: float) -> bool:
         """
         현재 위치 좌표 업데이트
 
@@ -300,15 +348,51 @@ class BotStateManager:
             lat: 위도
 
         Returns:
-            업데이트된 봇 상태
+            업데이트 여부
+        """
+        return BotStateManager.update(
+            route_id,
+            current_position={"lon": lon, "lat": lat},
+        )
+
+    @staticmethod
+    def update_snapped_position(
+        route_id: int,
+        lon: float,
+        lat: float,
+        leg_index: int,
+        segment_index: int,
+        along_m: float,
+        progress_percent: float,
+    ) -> bool:
+        """
+        경로 스냅핑 결과로 위치/진행률 업데이트
+
+        다음 틱의 스냅핑은 저장된 세그먼트 인덱스부터 앞쪽만 탐색합니다.
+
+        Args:
+            route_id: 경주 ID
+            lon: 스냅된 경도
+            lat: 스냅된 위도
+            leg_index: 스냅핑한 leg 인덱스
+            segment_index: 매칭된 경로선 세그먼트 인덱스
+            along_m: leg 시작점부터 경로선을 따라 이동한 거리 (미터)
+            progress_percent: 전체 진행률
+
+        Returns:
+            업데이트 여부
         """
         return BotStateManager.update(
             route_id,
             current_position={"lon": lon, "lat": lat},
+            snap_leg_index=leg_index,
+            snap_segment_index=segment_index,
+            snap_along_m=along_m,
+            progress_percent=progress_percent,
         )
 
     @staticmethod
-    def update_retry_count(route_id: int, count: int) -> Optional[dict]:
+    def update_retry_count(route_id: int, count: int) -> bool:
         """
         API 재시도 카운터 업데이트
 
@@ -317,7 +401,7 @@ class BotStateManager:
             count: 재시도 횟수
 
         Returns:
-            업데이트된 봇 상태
+            업데이트 여부
         """
         return BotStateManager.update(
             route_id,
@@ -325,7 +409,7 @@ class BotStateManager:
         )
 
     @staticmethod
-    def reset_retry_count(route_id: int) -> Optional[dict]:
+    def reset_retry_count(route_id: int) -> bool:
         """
         API 재시도 카운터 리셋
 
@@ -333,7 +417,7 @@ class BotStateManager:
             route_id: 경주 ID
 
         Returns:
-            업데이트된 봇 상태
+            업데이트 여부
         """
         return BotStateManager.update(
             route_id,
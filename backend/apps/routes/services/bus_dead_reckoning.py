@@ -0,0 +1,317 @@
+"""
+버스 위치 추정 서비스 (dead reckoning)
+
+역할:
+- fetch_all_bus_positions가 수집할 때마다 차량별 최근 BUS_PROJECTION_HISTORY_SIZE개 위치를
+  (dataTm 시각, 노선 경로선 위 거리) 기록으로 저장
+- 기록의 처음/마지막 위치로 경로선을 따라가는 속도를 계산
+- 조회 시각까지 마지막 GPS 좌표를 경로선 방향으로 이동시킨 위치 추정
+  (BUS_PROJECTION_STEP초 단위로 한 번만 계산해 공유, 공공 API 호출 없음)
+
+노선 경로선:
+- 정류소 좌표를 순서대로 이은 CompiledPath (노선당 ROUTE_PATH_TTL마다 정류소 API 1회)
+- 프로세스 내 LRU → Redis → 정류소 API 순으로 조회
+- 차량 좌표는 sectOrd(현재 구간) 근처 세그먼트에 먼저 스냅
+  (왕복 노선에서 반대 방향 구간에 붙지 않도록)
+"""
+
+import logging
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..utils import codec, metrics
+from ..utils.bus_api_client import bus_api_client
+from ..utils.lru_cache import LRUCache
+from ..utils.path_geometry import CompiledPath
+from ..utils.redis_client import RedisConnectionError, redis_client
+
+logger = logging.getLogger(__name__)
+
+PROJECTIONS_METRIC = "hadbetter_bus_projections_total"
+
+# 노선 경로선 유지 시간 (초) / 정류소 좌표가 없는 노선 재조회 간격 (초)
+ROUTE_PATH_TTL = 24 * 3600
+MISSING_ROUTE_PATH_TTL = 3600
+
+# sectOrd 기준 스냅 탐색 범위 (앞뒤 세그먼트 수)
+SECT_SNAP_WINDOW = 3
+# 경로선에서 이보다 먼 좌표는 경로 밖으로 봄 (미터, 추정하지 않음)
+MAX_SNAP_DISTANCE_M = 300.0
+# 최대 속도 (m/s, 약 90km/h)
+MAX_SPEED_MPS = 25.0
+# 이보다 크게 뒤로 간 위치는 기점 복귀/오스냅으로 보고 기록 초기화 (미터)
+BACKTRACK_RESET_M = 50.0
+
+# 프로세스 내 캐시: 노선 ID → CompiledPath
+_path_cache = LRUCache(max_size=512)
+
+
+def parse_data_time(data_time: Optional[str]) -> Optional[float]:
+    """
+    dataTm(yyyyMMddHHmmss, 서울 시각) → epoch 초
+
+    Returns:
+        epoch 초 또는 None (형식이 맞지 않는 경우)
+    """
+    digits = "".join(ch for ch in str(data_time or "") if ch.isdigit())[:14]
+    if len(digits) != 14:
+        return None
+    try:
+        parsed = datetime.strptime(digits, "%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+    return timezone.make_aware(parsed, timezone.get_default_timezone()).timestamp()
+
+
+class BusRoutePath:
+    """버스 노선 경로선 캐시 (정류소 좌표 기반)"""
+
+    @staticmethod
+    def get(bus_route_id: str, fetch: bool = True) -> Optional[CompiledPath]:
+        """
+        노선 경로선 조회 (LRU → Redis → 정류소 API 순)
+
+        Args:
+            bus_route_id: 노선 ID
+            fetch: 캐시에 없을 때 정류소 API로 생성할지 여부 (조회 API는 False)
+
+        Returns:
+            CompiledPath 또는 None (정류소 좌표 부족/캐시 없음)
+        """
+        path = _path_cache.get(bus_route_id)
+        if path is not None:
+            return path
+
+        try:
+            data = redis_client.get_bus_route_path(bus_route_id)
+        except RedisConnectionError as e:
+            logger.warning(f"노선 경로선 캐시 사용 불가: route_id={bus_route_id}, {e}")
+            return None
+        if data == b"":
+            # 정류소 좌표가 없는 노선 (MISSING_ROUTE_PATH_TTL 동안 재조회 안 함)
+            return None
+
+        path = CompiledPath.from_bytes(data)
+        if path is None and fetch:
+            path = BusRoutePath.build(bus_route_id)
+        if path is not None:
+            _path_cache.set(bus_route_id, path)
+        return path
+
+    @staticmethod
+    def build(bus_route_id: str) -> Optional[CompiledPath]:
+        """
+        정류소 목록으로 노선 경로선 생성 및 저장
+
+        Args:
+            bus_route_id: 노선 ID
+
+        Returns:
+            CompiledPath 또는 None (정류소 좌표 부족)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        stations = bus_api_client.get_station_by_route(bus_route_id)
+        coords = []
+        for station in sorted(stations, key=lambda x: int(x.get("seq", 0))):
+            try:
+                lon = float(station.get("gpsX") or station.get("tmX") or 0)
+                lat = float(station.get("gpsY") or station.get("tmY") or 0)
+            except (ValueError, TypeError):
+                continue
+            if lon and lat:
+                coords.append((lon, lat))
+
+        path = CompiledPath.from_coords(coords)
+        if path is None:
+            logger.warning(f"노선 경로선 생성 실패 (정류소 좌표 부족): {bus_route_id}")
+            redis_client.set_bus_route_path(bus_route_id, b"", MISSING_ROUTE_PATH_TTL)
+            return None
+
+        redis_client.set_bus_route_path(bus_route_id, path.to_bytes(), ROUTE_PATH_TTL)
+        return path
+
+
+def _snap_along(
+    path: CompiledPath, lon: float, lat: float, sect_ord: Optional[int]
+) -> Optional[float]:
+    """좌표 → 경로선 위 거리 (sectOrd 근처 우선, 경로 밖이면 None)"""
+    if sect_ord:
+        segment = sect_ord - 1
+        result = path.snap_detail(
+            lon,
+            lat,
+            start=segment - SECT_SNAP_WINDOW,
+            end=segment + SECT_SNAP_WINDOW + 1,
+        )
+        if result.distance_m <= MAX_SNAP_DISTANCE_M:
+            return result.along_m
+
+    result = path.snap_detail(lon, lat)
+    if result.distance_m <= MAX_SNAP_DISTANCE_M:
+        return result.along_m
+    return None
+
+
+def _speed(fixes: List[List[float]]) -> float:
+    """기록의 처음/마지막 위치로 경로선 방향 속도 (m/s)"""
+    (t0, along0), (t1, along1) = fixes[0], fixes[-1]
+    if t1 <= t0:
+        return 0.0
+    return min(max((along1 - along0) / (t1 - t0), 0.0), MAX_SPEED_MPS)
+
+
+class BusDeadReckoning:
+    """버스 위치 기록/추정"""
+
+    @staticmethod
+    def track(previous: Optional[Dict], bus: Dict, now: float) -> Dict:
+        """
+        차량 1대 기록 갱신
+
+        Args:
+            previous: 이전 기록 (없으면 None)
+            bus: fetch_route_buses() 결과 항목
+            now: 수집 시각 (dataTm이 없을 때 사용)
+
+        Returns:
+            { route_id, bus_number, coordinates, fixes: [[시각, 경로 거리], ...], speed }
+            경로선이 없거나 스냅하지 못하면 fixes는 빈 목록
+        """
+        lon, lat = bus["coordinates"]
+        fixed_at = parse_data_time(bus.get("data_time")) or now
+        # 경로선은 수집 시 fetch_route_buses가 준비 (여기서는 정류소 API 호출 안 함)
+        path = BusRoutePath.get(bus["route_id"], fetch=False)
+        along = _snap_along(path, lon, lat, bus.get("sect_ord")) if path else None
+
+        fixes = []
+        if previous and previous.get("route_id") == bus["route_id"]:
+            fixes = previous.get("fixes") or []
+        if along is None:
+            fixes = []
+        elif fixes and fixed_at <= fixes[-1][0]:
+            # 새 GPS 없음 (같은 dataTm)
+            pass
+        elif fixes and along < fixes[-1][1] - BACKTRACK_RESET_M:
+            fixes = [[fixed_at, along]]
+        else:
+            fixes = (fixes + [[fixed_at, along]])[
+                -settings.BUS_PROJECTION_HISTORY_SIZE :
+            ]
+
+        return {
+            "route_id": bus["route_id"],
+            "bus_number": bus.get("bus_number"),
+            "coordinates": [lon, lat],
+            "fixes": fixes,
+            "speed": _speed(fixes) if fixes else 0.0,
+        }
+
+    @staticmethod
+    def update(buses: List[Dict], now: float, ttl: int) -> int:
+        """
+        수집한 전체 버스 위치로 차량별 기록 교체
+
+        Args:
+            buses: fetch_route_buses() 결과 목록
+            now: 수집 시각 (epoch 초)
+            ttl: 기록 유지 시간 (다음 수집까지)
+
+        Returns:
+            기록한 차량 수
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        previous = redis_client.get_bus_tracks()
+        tracks = {
+            bus["veh_id"]: BusDeadReckoning.track(previous.get(bus["veh_id"]), bus, now)
+            for bus in buses
+            if bus.get("veh_id")
+        }
+        redis_client.set_bus_tracks(tracks, ttl)
+        return len(tracks)
+
+    @staticmethod
+    def project(track: Dict, at: float) -> Tuple[List[float], float]:
+        """
+        차량 1대의 at 시각 추정 위치
+
+        마지막 GPS 좌표에서 경로선 방향 이동량만 더하므로
+        경로선(정류소 직선 연결)과 실제 도로의 차이만큼 위치가 튀지 않습니다.
+
+        Args:
+            track: track() 결과
+            at: 추정 시각 (epoch 초)
+
+        Returns:
+            ([경도, 위도], 추정 시간(초, 마지막 GPS 이후))
+        """
+        lon, lat = track["coordinates"]
+        fixes = track.get("fixes")
+        path = BusRoutePath.get(track["route_id"], fetch=False) if fixes else None
+        if path is None or not track.get("speed"):
+            return [lon, lat], 0.0
+
+        fixed_at, along = fixes[-1]
+        elapsed = min(max(at - fixed_at, 0.0), settings.BUS_PROJECTION_MAX_SECONDS)
+        start_lon, start_lat = path.point_at_distance(along)
+        end_lon, end_lat = path.point_at_distance(along + track["speed"] * elapsed)
+        return [lon + end_lon - start_lon, lat + end_lat - start_lat], elapsed
+
+    @staticmethod
+    def project_all(at: float) -> List[Dict]:
+        """
+        전체 차량 at 시각 추정 위치
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        positions = []
+        for veh_id, track in redis_client.get_bus_tracks().items():
+            coordinates, elapsed = BusDeadReckoning.project(track, at)
+            positions.append(
+                {
+                    "veh_id": veh_id,
+                    "route_id": track["route_id"],
+                    "bus_number": track.get("bus_number"),
+                    "coordinates": [
+                        round(value, codec.COORD_PRECISION) for value in coordinates
+                    ],
+                    "speed": round(track.get("speed", 0.0), 1),
+                    "projected_s": round(elapsed, 1),
+                }
+            )
+        return positions
+
+    @staticmethod
+    def positions(now: float) -> Tuple[float, List[Dict]]:
+        """
+        현재 추정 위치 (BUS_PROJECTION_STEP초 단위로 계산 결과를 Worker 간 공유)
+
+        Args:
+            now: 현재 시각 (epoch 초)
+
+        Returns:
+            (추정 기준 시각, 추정 위치 목록)
+        """
+        step = settings.BUS_PROJECTION_STEP
+        tick = int(now // step)
+        at = tick * step
+        try:
+            positions, result = redis_client.get_or_fetch_json(
+                f"bus_proj:{tick}",
+                max(1, math.ceil(step * 2)),
+                lambda: BusDeadReckoning.project_all(at),
+            )
+        except RedisConnectionError as e:
+            logger.warning(f"버스 추정 위치 조회 실패: {e}")
+            positions, result = [], "error"
+
+        metrics.incr(PROJECTIONS_METRIC, result=result)
+        return at, positions
@@ -0,0 +1,184 @@
+"""
+버스 위치 변경분 피드 서비스
+
+역할:
+- fetch_all_bus_positions가 수집할 때마다 최근 BUS_FEED_RING_SIZE개 세대 각각에서
+  새 세대로의 변경분(추가/이동/제거)을 계산하고, 압축 방식별 본문을 미리 만들어 저장
+- 지도를 켜 둔 클라이언트는 since=<마지막으로 받은 버전>으로 변경분만 받음
+- since가 링에 없으면(너무 오래됨/처음) 전체 목록으로 대체
+
+이동 판정:
+- 좌표를 BUS_FEED_MOVE_THRESHOLD_M 크기 격자로 나누고, 격자가 바뀐 버스만 이동으로 봄
+  (이전 세대 좌표끼리 비교하면 조금씩 움직이는 버스가 계속 생략되어
+   클라이언트 위치가 점점 벌어지지만, 격자 기준이면 오차가 격자 한 칸 이내로 유지됨)
+
+응답 형식:
+    {"version": 새 세대, "since": 요청 세대 또는 null, "full": false,
+     "added": [버스 위치, ...], "moved": [{"veh_id", "coordinates"}, ...],
+     "removed": [veh_id, ...]}
+    full=true면 added가 전체 목록 (클라이언트는 기존 목록을 교체)
+"""
+
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..utils import codec, metrics
+from ..utils.redis_client import redis_client
+from .bus_position_index import compress_body
+
+logger = logging.getLogger(__name__)
+
+RESPONSES_METRIC = "hadbetter_bus_positions_delta_responses_total"
+
+# 격자 크기 계산 기준 위도 (서울)
+REFERENCE_LAT = 37.5
+METERS_PER_DEGREE_LAT = 111_320
+
+
+def _cell_steps(threshold_m: float) -> Tuple[float, float]:
+    """격자 한 칸 크기 (경도, 위도 도 단위)"""
+    step_lat = threshold_m / METERS_PER_DEGREE_LAT
+    return step_lat / math.cos(math.radians(REFERENCE_LAT)), step_lat
+
+
+def _compact_coordinates(coordinates: List[float]) -> List[float]:
+    return [round(value, codec.COORD_PRECISION) for value in coordinates]
+
+
+def _feed_body(
+    version: str, since: Optional[str], added: list, moved: list, removed: list
+) -> bytes:
+    return codec.dumps_json(
+        {
+            "status": "success",
+            "data": {
+                "version": version,
+                "since": since,
+                "full": since is None,
+                "added": added,
+                "moved": moved,
+                "removed": removed,
+            },
+            "meta": {
+                "added": len(added),
+                "moved": len(moved),
+                "removed": len(removed),
+            },
+        }
+    )
+
+
+class BusPositionFeed:
+    """버스 위치 변경분 피드 저장/조회"""
+
+    @staticmethod
+    def to_cells(buses: List[Dict], threshold_m: float) -> Dict[str, List[int]]:
+        """버스 위치 목록 → { veh_id: [격자 x, 격자 y] } (veh_id 없는 버스 제외)"""
+        step_lon, step_lat = _cell_steps(threshold_m)
+        cells = {}
+        for bus in buses:
+            if bus.get("veh_id"):
+                lon, lat = bus["coordinates"]
+                cells[bus["veh_id"]] = [int(lon // step_lon), int(lat // step_lat)]
+        return cells
+
+    @staticmethod
+    def diff(
+        previous: Dict[str, List[int]],
+        current: Dict[str, List[int]],
+        buses_by_id: Dict[str, Dict],
+    ) -> Tuple[list, list, list]:
+        """
+        이전 세대 → 현재 세대 변경분
+
+        Returns:
+            (추가된 버스 목록, 이동한 버스 [{veh_id, coordinates}], 제거된 veh_id 목록)
+        """
+        added, moved = [], []
+        for veh_id, cell in current.items():
+            old = previous.get(veh_id)
+            if old is None:
+                added.append(buses_by_id[veh_id])
+            elif old != cell:
+                moved.append(
+                    {
+                        "veh_id": veh_id,
+                        "coordinates": _compact_coordinates(
+                            buses_by_id[veh_id]["coordinates"]
+                        ),
+                    }
+                )
+        removed = [veh_id for veh_id in previous if veh_id not in current]
+        return added, moved, removed
+
+    @staticmethod
+    def publish(version: str, buses: List[Dict], ttl: int) -> bool:
+        """
+        새 세대 피드 저장 (최근 세대별 변경분 + 전체 본문을 미리 압축)
+
+        Args:
+            version: 새 세대 (타일 인덱스와 같은 버전)
+            buses: 수집한 전체 버스 위치 목록
+            ttl: 본문 Time To Live (다음 수집까지)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        buses_by_id = {bus["veh_id"]: bus for bus in buses if bus.get("veh_id")}
+        cells = BusPositionFeed.to_cells(buses, settings.BUS_FEED_MOVE_THRESHOLD_M)
+
+        bodies = {
+            "full": compress_body(
+                _feed_body(version, None, list(buses_by_id.values()), [], [])
+            )
+        }
+        for since, previous in redis_client.get_bus_feed_ring():
+            if previous is None or since == version:
+                continue
+            added, moved, removed = BusPositionFeed.diff(previous, cells, buses_by_id)
+            bodies[since] = compress_body(
+                _feed_body(version, since, added, moved, removed)
+            )
+
+        return redis_client.set_bus_feed(
+            version, cells, bodies, settings.BUS_FEED_RING_SIZE, ttl
+        )
+
+    @staticmethod
+    def body(
+        since: Optional[str], version: str, encoding: str
+    ) -> Optional[Tuple[bytes, str, str]]:
+        """
+        since 이후 변경분 본문 (링에 없으면 전체 본문)
+
+        Args:
+            since: 클라이언트가 마지막으로 받은 버전 (없으면 전체)
+            version: 현재 버전
+            encoding: negotiate_encoding() 결과
+
+        Returns:
+            (본문, 실제 압축 방식, 본문 종류 since 또는 "full") 또는 None (피드 없음)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        if since == version:
+            metrics.incr(RESPONSES_METRIC, result="unchanged")
+            return _feed_body(version, since, [], [], []), "identity", since
+
+        for kind in (since, "full") if since else ("full",):
+            cached, identity = redis_client.get_bus_feed_body(kind, version, encoding)
+            if cached is not None or identity is not None:
+                metrics.incr(
+                    RESPONSES_METRIC, result="delta" if kind != "full" else "full"
+                )
+                if cached is not None:
+                    return cached, encoding, kind
+                return identity, "identity", kind
+        return None
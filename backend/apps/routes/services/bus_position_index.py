@@ -0,0 +1,335 @@
+"""
+버스 위치 타일 인덱스 서비스
+
+역할:
+- fetch_all_bus_positions가 수집한 버스 위치를 지도 타일(z12, z14)별로 나눠 Redis에 저장
+- 지도 영역(bounds) 조회 시 영역과 겹치는 타일만 읽어서 반환
+  (전체 버스 목록을 읽고 필터링하지 않으므로 조회 비용이 화면 안 버스 수에 비례)
+- 수집 세대(version)와 타일 묶음별 ETag, 압축 방식별 응답 본문을 한 번만 만들어 공유
+  (같은 세대에 같은 타일을 보는 요청은 304 또는 저장된 본문을 그대로 반환)
+
+줌 레벨 선택:
+- 작은 영역은 z14(서울 기준 타일 약 1.9km × 1.6km)로 조회
+- z14 타일이 MAX_QUERY_TILES개를 넘는 넓은 영역은 z12(약 7.8km × 6.2km)로 조회
+- z12 타일도 MAX_COARSE_TILES개를 넘으면 타일 인덱스를 쓰지 않음 (전체 목록 캐시로 대체)
+- 타일 수는 목록을 만들기 전에 타일 번호 범위로 계산
+
+영역은 clamp_bounds()로 검증하고 서비스 영역(SERVICE_AREA_SW ~ SERVICE_AREA_NE)으로 자릅니다.
+
+응답은 영역과 겹치는 타일의 버스 전체입니다. (영역 밖 가장자리 버스 포함)
+정확한 영역으로 거르면 요청마다 본문이 달라져 ETag/압축 본문을 공유할 수 없습니다.
+"""
+
+import gzip
+import hashlib
+import logging
+import math
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..utils import codec, metrics
+from ..utils.geo_utils import count_tiles_in_bounds, lonlat_to_tile, tiles_in_bounds
+from ..utils.redis_client import redis_client
+
+try:
+    import brotli
+except ImportError:  # br 없이 gzip만 제공
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+RESPONSES_METRIC = "hadbetter_bus_positions_responses_total"
+
+# 인덱스 줌 레벨 (넓은 영역용, 좁은 영역용)
+INDEX_ZOOMS = (12, 14)
+
+# z14로 조회할 최대 타일 수 (넘으면 z12로 조회)
+MAX_QUERY_TILES = 16
+
+# z12로 조회할 최대 타일 수 (넘으면 타일 인덱스 대신 전체 목록 캐시)
+MAX_COARSE_TILES = 64
+
+# 서비스 영역 (서울 + 광역버스 운행 구간, [경도, 위도]) - 영역은 이 범위로 자름
+SERVICE_AREA_SW = (126.5, 37.0)
+SERVICE_AREA_NE = (127.6, 38.0)
+
+# 이보다 작은 본문은 압축하지 않음 (바이트)
+MIN_COMPRESS_SIZE = 512
+
+# 세대당 한 번만 압축하므로 높은 압축률 사용
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+
+def _tile_id(zoom: int, x: int, y: int) -> str:
+    return f"{zoom}/{x}/{y}"
+
+
+class AreaSnapshot(NamedTuple):
+    """영역 조회 대상 (수집 세대 + 타일 묶음)"""
+
+    version: str
+    zoom: int
+    tiles: List[str]
+    body_key: str
+    etag: str
+    meta: Dict[str, Any]
+
+
+def available_encodings() -> List[str]:
+    """제공 가능한 압축 방식 (선호 순)"""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Accept-Encoding 헤더로 압축 방식 선택
+
+    Args:
+        accept_encoding: Accept-Encoding 헤더 값
+
+    Returns:
+        "br", "gzip" 또는 "identity"
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+def clamp_bounds(sw: Any, ne: Any) -> Optional[Tuple[float, float, float, float]]:
+    """
+    영역 검증 후 서비스 영역으로 자르기
+
+    Args:
+        sw: 남서 좌표 [경도, 위도]
+        ne: 북동 좌표 [경도, 위도]
+
+    Returns:
+        (sw_lng, sw_lat, ne_lng, ne_lat) 또는 None
+        (형식 오류, NaN/무한대, 남서/북동 뒤집힘, 서비스 영역 밖)
+    """
+    try:
+        sw_lng, sw_lat = (float(value) for value in sw)
+        ne_lng, ne_lat = (float(value) for value in ne)
+    except (TypeError, ValueError):
+        return None
+
+    values = (sw_lng, sw_lat, ne_lng, ne_lat)
+    if not all(math.isfinite(value) for value in values):
+        return None
+    if sw_lng > ne_lng or sw_lat > ne_lat:
+        return None
+
+    sw_lng, sw_lat = max(sw_lng, SERVICE_AREA_SW[0]), max(sw_lat, SERVICE_AREA_SW[1])
+    ne_lng, ne_lat = min(ne_lng, SERVICE_AREA_NE[0]), min(ne_lat, SERVICE_AREA_NE[1])
+    if sw_lng > ne_lng or sw_lat > ne_lat:
+        return None
+    return sw_lng, sw_lat, ne_lng, ne_lat
+
+
+def compress_body(body: bytes) -> Dict[str, bytes]:
+    """
+    응답 본문을 압축 방식별로 준비 (작은 본문은 압축하지 않음)
+
+    Returns:
+        { "identity": 본문, "gzip": ..., "br": ... }
+    """
+    bodies = {"identity": body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        bodies["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return bodies
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(",")
+    )
+
+
+class BusPositionIndex:
+    """버스 위치 타일 인덱스 저장/조회"""
+
+    @staticmethod
+    def build_tiles(buses: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        버스 위치 목록 → 타일별 목록 (INDEX_ZOOMS 각각에 저장)
+
+        Args:
+            buses: 버스 위치 목록 (coordinates = [경도, 위도])
+
+        Returns:
+            { "z/x/y": [버스 위치, ...] }
+        """
+        tiles: Dict[str, List[Dict]] = defaultdict(list)
+        for bus in buses:
+            lon, lat = bus["coordinates"]
+            for zoom in INDEX_ZOOMS:
+                tiles[_tile_id(zoom, *lonlat_to_tile(lon, lat, zoom))].append(bus)
+        return tiles
+
+    @staticmethod
+    def new_version() -> str:
+        """새 수집 세대(버전) ID"""
+        return uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def store(
+        buses: List[Dict],
+        routes_count: int,
+        ttl: int,
+        version: Optional[str] = None,
+    ) -> bool:
+        """
+        타일 인덱스 교체
+
+        Args:
+            buses: 수집한 전체 버스 위치 목록
+            routes_count: 수집 노선 수
+            ttl: Time To Live (수집 중단 시 만료)
+            version: 수집 세대 (없으면 새로 생성)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        tiles = BusPositionIndex.build_tiles(buses)
+        return redis_client.set_bus_tiles(
+            version or BusPositionIndex.new_version(),
+            tiles,
+            {"routes_count": routes_count, "total_buses": len(buses), "ttl": ttl},
+            ttl,
+        )
+
+    @staticmethod
+    def choose_zoom(
+        sw_lng: float, sw_lat: float, ne_lng: float, ne_lat: float
+    ) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        영역 크기에 맞는 줌 레벨과 겹치는 타일 목록
+
+        Returns:
+            (줌 레벨, 타일 목록) 또는 None (z12로도 MAX_COARSE_TILES 초과)
+        """
+        coarse, fine = INDEX_ZOOMS
+        for zoom, limit in ((fine, MAX_QUERY_TILES), (coarse, MAX_COARSE_TILES)):
+            if count_tiles_in_bounds(sw_lng, sw_lat, ne_lng, ne_lat, zoom) <= limit:
+                return zoom, tiles_in_bounds(sw_lng, sw_lat, ne_lng, ne_lat, zoom)
+        return None
+
+    @staticmethod
+    def snapshot(
+        sw_lng: float, sw_lat: float, ne_lng: float, ne_lat: float
+    ) -> Optional[AreaSnapshot]:
+        """
+        영역 조회 대상 계산 (Redis 1회 왕복, 본문은 읽지 않음)
+
+        Args:
+            sw_lng: 남서 경도
+            sw_lat: 남서 위도
+            ne_lng: 북동 경도
+            ne_lat: 북동 위도
+
+        Returns:
+            AreaSnapshot 또는 None (인덱스 없음, 타일이 너무 많은 영역)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        chosen = BusPositionIndex.choose_zoom(sw_lng, sw_lat, ne_lng, ne_lat)
+        if chosen is None:
+            return None
+        current = redis_client.get_bus_tiles_current()
+        if current is None:
+            return None
+
+        zoom, tiles = chosen
+        tile_ids = [_tile_id(zoom, x, y) for x, y in tiles]
+        body_key = hashlib.sha1(",".join(tile_ids).encode()).hexdigest()[:16]
+        version = current["generation"]
+        return AreaSnapshot(
+            version=version,
+            zoom=zoom,
+            tiles=tile_ids,
+            body_key=body_key,
+            etag=f'W/"{version}-{body_key}"',
+            meta=current,
+        )
+
+    @staticmethod
+    def body(snapshot: AreaSnapshot, encoding: str) -> Tuple[bytes, str]:
+        """
+        응답 본문 (세대 + 타일 묶음마다 한 번만 만들고 압축 방식별로 저장)
+
+        Args:
+            snapshot: snapshot() 결과
+            encoding: negotiate_encoding() 결과
+
+        Returns:
+            (본문, 실제 압축 방식) - 작은 본문은 압축하지 않으므로 identity일 수 있음
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        cached, identity = redis_client.get_bus_tiles_body(
+            snapshot.version, snapshot.body_key, encoding
+        )
+        if cached is not None:
+            metrics.incr(RESPONSES_METRIC, result="cached", encoding=encoding)
+            return cached, encoding
+        if identity is not None:
+            # 압축하지 않은 작은 본문
+            metrics.incr(RESPONSES_METRIC, result="cached", encoding="identity")
+            return identity, "identity"
+
+        buses = redis_client.get_bus_tiles(snapshot.version, snapshot.tiles)
+        body = codec.dumps_json(
+            {
+                "status": "success",
+                "data": buses,
+                "meta": {
+                    "total_buses": len(buses),
+                    "routes_count": snapshot.meta.get("routes_count", 0),
+                    "cache": "hit",
+                    "version": snapshot.version,
+                    "zoom": snapshot.zoom,
+                    "tiles": len(snapshot.tiles),
+                },
+            }
+        )
+        bodies = compress_body(body)
+        redis_client.set_bus_tiles_body(
+            snapshot.version,
+            snapshot.body_key,
+            bodies,
+            ttl=snapshot.meta.get("ttl", 60),
+        )
+
+        encoding = encoding if encoding in bodies else "identity"
+        metrics.incr(RESPONSES_METRIC, result="built", encoding=encoding)
+        return bodies[encoding], encoding
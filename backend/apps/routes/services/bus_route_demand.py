@@ -0,0 +1,142 @@
+"""
+버스 위치 수집 노선 선정 서비스 (수요 기반)
+
+역할:
+- 노선 버스 위치 조회(track/realtime API)마다 노선 조회 수를 분 단위로 기록
+- fetch_all_bus_positions가 수집할 노선을 매번 새로 선정
+  1. 진행 중 경주의 버스 노선 (public_ids, 경주가 많은 순)
+  2. 최근 BUS_POSITION_DEMAND_WINDOW초 동안 조회가 많은 노선
+  3. 기본 노선 (BUS_POSITION_BASELINE_ROUTES, 기본값 없음)
+  위 순서로 BUS_POSITION_ROUTE_BUDGET개까지 (노선당 API 1회)
+  사용자와 경주가 없고 기본 노선도 없으면 API를 호출하지 않음
+
+수집한 노선은 공유 캐시(RealtimeCache.get_bus_route_positions)에 미리 저장되므로
+사용자가 보고 있는 노선 조회는 API를 호출하지 않고 캐시에서 응답합니다.
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..utils import clock
+from ..utils.redis_client import RedisConnectionError, redis_client
+
+logger = logging.getLogger(__name__)
+
+# 서울시 버스 노선 ID 형식 (예: 100100057) - 형식이 다른 ID는 수요로 기록하지 않음
+BUS_ROUTE_ID_PATTERN = re.compile(r"\d{9}")
+
+
+def is_valid_route_id(bus_route_id: Optional[str]) -> bool:
+    """서울시 버스 노선 ID 형식인지 확인"""
+    return (
+        bool(bus_route_id) and BUS_ROUTE_ID_PATTERN.fullmatch(bus_route_id) is not None
+    )
+
+
+def baseline_routes() -> List[Tuple[str, str]]:
+    """
+    기본 수집 노선 (조회/경주가 없어도 항상 수집, 기본값 없음)
+
+    BUS_POSITION_BASELINE_ROUTES="100100057:360,100100118:472" 형식
+    (노선 번호 생략 시 노선 ID로 표시)
+
+    Returns:
+        [(노선 ID, 노선 번호), ...]
+    """
+    routes = []
+    for item in (settings.BUS_POSITION_BASELINE_ROUTES or "").split(","):
+        route_id, _, route_name = item.strip().partition(":")
+        if route_id:
+            routes.append((route_id, route_name or route_id))
+    return routes
+
+
+class BusRouteDemand:
+    """버스 위치 수집 노선 수요 기록/선정"""
+
+    @staticmethod
+    def record(bus_route_id: str, route_name: Optional[str] = None) -> None:
+        """
+        노선 버스 위치 조회 1회 기록 (Redis 장애 시 기록 생략)
+
+        운행 중인 버스가 조회된 노선만 호출하세요. (없는 노선 ID가 쌓이지 않도록)
+
+        Args:
+            bus_route_id: 노선 ID (서울시 노선 ID 형식이 아니면 무시)
+            route_name: 노선 번호 (노선 검색 API로 확인한 값, 수집 결과의 bus_number 표시용)
+        """
+        if not is_valid_route_id(bus_route_id):
+            return
+        try:
+            redis_client.record_bus_route_demand(
+                bus_route_id,
+                route_name,
+                clock.time(),
+                settings.BUS_POSITION_DEMAND_WINDOW,
+            )
+        except RedisConnectionError as e:
+            logger.warning(
+                f"노선 조회 수 기록 실패: route_id={bus_route_id}, error={e}"
+            )
+
+    @staticmethod
+    def racing_routes() -> List[Tuple[str, str]]:
+        """
+        진행 중 경주의 버스 노선 (경주가 많은 순)
+
+        Returns:
+            [(노선 ID, 노선 번호), ...]
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        counts: Counter = Counter()
+        names: Dict[str, str] = {}
+        for public_ids in redis_client.get_active_public_ids().values():
+            for leg in public_ids.get("legs", []):
+                route_id = leg.get("bus_route_id")
+                if leg.get("mode") != "BUS" or not route_id:
+                    continue
+                counts[route_id] += 1
+                names[route_id] = leg.get("bus_route_name") or route_id
+        return [(route_id, names[route_id]) for route_id, _ in counts.most_common()]
+
+    @staticmethod
+    def select_routes(budget: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        이번 수집 노선 선정 (진행 중 경주 → 최근 조회 수 → 기본 노선 순)
+
+        Redis 장애 시 기본 노선만 수집합니다.
+
+        Args:
+            budget: 최대 노선 수 (기본 BUS_POSITION_ROUTE_BUDGET)
+
+        Returns:
+            [(노선 ID, 노선 번호), ...]
+        """
+        if budget is None:
+            budget = settings.BUS_POSITION_ROUTE_BUDGET
+
+        candidates: List[Tuple[str, str]] = []
+        try:
+            candidates.extend(BusRouteDemand.racing_routes())
+            demand = redis_client.get_bus_route_demand(
+                clock.time(), settings.BUS_POSITION_DEMAND_WINDOW
+            )
+            candidates.extend(
+                (route_id, route_name or route_id) for route_id, _, route_name in demand
+            )
+        except RedisConnectionError as e:
+            logger.warning(f"수집 노선 수요 조회 실패 (기본 노선만 수집): {e}")
+        candidates.extend(baseline_routes())
+
+        selected: Dict[str, str] = {}
+        for route_id, route_name in candidates:
+            if len(selected) >= budget:
+                break
+            selected.setdefault(route_id, route_name)
+        return list(selected.items())
@@ -0,0 +1,116 @@
+"""
+봇 Leg 경로 geometry 캐시 서비스
+
+역할:
+- 경주 시작 시 각 leg의 경로선을 CompiledPath로 한 번만 파싱해 Redis에 저장
+- 매 틱마다 문자열 파싱 대신 프로세스 내 LRU → Redis 순으로 조회
+- 캐시에 없으면 첫 틱에서 파싱 후 저장 (lazy)
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from ..utils.lru_cache import LRUCache
+from ..utils.path_geometry import CompiledPath
+from ..utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 내 캐시: (route_id, leg_index) → CompiledPath
+_local_cache = LRUCache(max_size=1024)
+
+
+def leg_linestring(leg: dict) -> Optional[str]:
+    """
+    TMAP leg에서 경로선 문자열 추출
+
+    passShape가 없는 도보 구간은 steps의 linestring을 이어 붙입니다.
+
+    Args:
+        leg: TMAP leg 데이터
+
+    Returns:
+        "lon,lat lon,lat ..." 또는 None
+    """
+    pass_shape = leg.get("passShape")
+    if isinstance(pass_shape, dict) and pass_shape.get("linestring"):
+        return pass_shape["linestring"]
+
+    step_lines = [
+        step.get("linestring")
+        for step in leg.get("steps") or []
+        if isinstance(step, dict) and step.get("linestring")
+    ]
+    return " ".join(step_lines) if step_lines else None
+
+
+class LegGeometryCache:
+    """Leg 경로 geometry 캐시"""
+
+    @staticmethod
+    def build(route_id: int, legs: List[dict], ttl: int = 3600) -> int:
+        """
+        전체 leg geometry 생성 및 저장 (경주 시작 시)
+
+        Args:
+            route_id: 경주 ID
+            legs: TMAP legs
+            ttl: Time To Live (기본 1시간)
+
+        Returns:
+            저장된 leg 수
+        """
+        geometries: Dict[int, bytes] = {}
+        for leg_index, leg in enumerate(legs):
+            path = CompiledPath.from_linestring(leg_linestring(leg))
+            if path is None:
+                continue
+            _local_cache.set((route_id, leg_index), path)
+            geometries[leg_index] = path.to_bytes()
+
+        redis_client.set_leg_geometries(route_id, geometries, ttl)
+        return len(geometries)
+
+    @staticmethod
+    def get(route_id: int, leg_index: int, leg: dict) -> Optional[CompiledPath]:
+        """
+        Leg geometry 조회 (LRU → Redis → 파싱 순)
+
+        Args:
+            route_id: 경주 ID
+            leg_index: leg 인덱스
+            leg: TMAP leg 데이터 (캐시에 없을 때 파싱용)
+
+        Returns:
+            CompiledPath 또는 None (경로선이 없는 leg)
+        """
+        cache_key = (route_id, leg_index)
+        path = _local_cache.get(cache_key)
+        if path is not None:
+            return path
+
+        path = CompiledPath.from_bytes(
+            redis_client.get_leg_geometry(route_id, leg_index)
+        )
+        if path is None:
+            path = CompiledPath.from_linestring(leg_linestring(leg))
+            if path is None:
+                return None
+            logger.info(
+                f"Leg geometry 생성 (lazy): route_id={route_id}, leg={leg_index}"
+            )
+            redis_client.set_leg_geometries(route_id, {leg_index: path.to_bytes()})
+
+        _local_cache.set(cache_key, path)
+        return path
+
+    @staticmethod
+    def delete(route_id: int) -> None:
+        """
+        Leg geometry 삭제 (Redis + 현재 프로세스 LRU)
+
+        Args:
+            route_id: 경주 ID
+        """
+        redis_client.delete_leg_geometries(route_id)
+        _local_cache.delete_where(lambda key: key[0] == route_id)
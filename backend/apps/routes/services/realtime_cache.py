@@ -0,0 +1,301 @@
+"""
+실시간 공공데이터 API 공유 캐시 서비스
+
+역할:
+- 여러 봇/Worker가 같은 대상을 조회할 때 API는 TTL 구간마다 1회만 호출
+- Redis single-flight 락으로 동시 조회를 하나로 합침
+- hit/miss 카운터를 /metrics로 노출
+- 노선 전체 버스 위치는 노선별로 공유 (fetch_all_bus_positions가 수집 노선을 미리 채움)
+- 버스 정류소 순번(ord)은 (노선, 정류소)별로 영구 캐시
+- 지하철 도착정보는 역별로 호선/방향 인덱스를 만들어 공유
+- 지하철 열차 위치는 노선별 스냅샷(trainNo 인덱스)에서 조회
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from ..utils import clock, metrics
+from ..utils.bus_api_client import bus_api_client
+from ..utils.lru_cache import LRUCache
+from ..utils.redis_client import RedisConnectionError, redis_client
+from ..utils.subway_api_client import subway_api_client
+from .bus_route_demand import BusRouteDemand
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS_METRIC = "hadbetter_realtime_cache_requests_total"
+
+# 프로세스 내 ord 캐시: (bus_route_id, st_id) → ord
+_station_ord_cache = LRUCache(max_size=4096)
+
+
+def _get_or_fetch(kind: str, key: str, ttl: int, fetcher: Callable[[], Any]) -> Any:
+    """
+    공유 캐시 조회 (Redis 장애 시 API 직접 호출)
+
+    Args:
+        kind: 조회 종류 (메트릭 라벨)
+        key: 캐시 키
+        ttl: 결과 유지 시간 (초)
+        fetcher: API 호출 함수
+
+    Returns:
+        API 결과
+    """
+    try:
+        value, result = redis_client.get_or_fetch_json(key, ttl, fetcher)
+    except RedisConnectionError as e:
+        logger.warning(f"실시간 캐시 사용 불가 (API 직접 호출): key={key}, error={e}")
+        value, result = fetcher(), "fallback"
+
+    metrics.incr(CACHE_REQUESTS_METRIC, kind=kind, result=result)
+    return value
+
+
+class RealtimeCache:
+    """실시간 API 공유 캐시"""
+
+    @staticmethod
+    def get_bus_position(veh_id: str) -> Optional[Dict]:
+        """
+        버스 실시간 위치 조회 (vehId 기준 공유)
+
+        Args:
+            veh_id: 차량 ID
+
+        Returns:
+            bus_api_client.get_bus_position() 결과
+        """
+        if not veh_id or veh_id == "0":
+            return None
+
+        return _get_or_fetch(
+            "bus_position",
+            f"rt:bus_pos:{veh_id}",
+            settings.REALTIME_BUS_POSITION_TTL,
+            lambda: bus_api_client.get_bus_position(veh_id),
+        )
+
+    @staticmethod
+    def get_bus_route_positions(
+        bus_route_id: str, route_name: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        노선 전체 버스 위치 조회 (노선 기준 공유, 조회 수는 수집 노선 선정에 반영)
+
+        fetch_all_bus_positions가 수집 중인 노선은 항상 캐시에서 응답합니다.
+        운행 중인 버스가 있는 노선만 조회 수로 기록합니다.
+
+        Args:
+            bus_route_id: 노선 ID
+            route_name: 노선 번호 (노선 검색 API로 확인한 경우, 수집 결과 표시에 사용)
+
+        Returns:
+            bus_api_client.get_bus_positions_by_route() 결과
+        """
+        buses = (
+            _get_or_fetch(
+                "bus_route_positions",
+                f"rt:bus_route_pos:{bus_route_id}",
+                settings.REALTIME_BUS_POSITION_TTL,
+                lambda: bus_api_client.get_bus_positions_by_route(bus_route_id),
+            )
+            or []
+        )
+        if buses:
+            BusRouteDemand.record(bus_route_id, route_name)
+        return buses
+
+    @staticmethod
+    def store_bus_route_positions(
+        bus_route_id: str, buses: List[Dict], ttl: int
+    ) -> None:
+        """
+        수집한 노선 버스 위치를 공유 캐시에 저장
+
+        Args:
+            bus_route_id: 노선 ID
+            buses: bus_api_client.get_bus_positions_by_route() 결과
+            ttl: 유지 시간 (초, 다음 수집까지)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        redis_client.set_fetched_json(
+            f"rt:bus_route_pos:{bus_route_id}",
+            buses,
+            ttl,
+        )
+
+    @staticmethod
+    def get_station_ord(st_id: str, bus_route_id: str) -> Optional[int]:
+        """
+        노선 내 정류소 순번 조회 (LRU → Redis → 노선 정류소 목록 순)
+
+        정류소 순번은 노선이 바뀌지 않는 한 고정이므로 찾은 값은 만료 없이 저장합니다.
+        찾지 못한 경우는 저장하지 않고, 짧은 공유 캐시로 동시 재조회만 막습니다.
+
+        Args:
+            st_id: 정류소 ID
+            bus_route_id: 노선 ID
+
+        Returns:
+            정류소 순번 또는 None
+        """
+        cache_key = (bus_route_id, st_id)
+        ord = _station_ord_cache.get(cache_key)
+        if ord is not None:
+            metrics.incr(CACHE_REQUESTS_METRIC, kind="bus_station_ord", result="hit")
+            return ord
+
+        try:
+            ord = redis_client.get_bus_station_ord(bus_route_id, st_id)
+        except RedisConnectionError as e:
+            logger.warning(f"정류소 순번 캐시 사용 불가: error={e}")
+        if ord is not None:
+            metrics.incr(CACHE_REQUESTS_METRIC, kind="bus_station_ord", result="hit")
+            _station_ord_cache.set(cache_key, ord)
+            return ord
+
+        ord = _get_or_fetch(
+            "bus_station_ord",
+            f"rt:bus_ord:{bus_route_id}:{st_id}",
+            60,
+            lambda: bus_api_client.find_station_ord(st_id, bus_route_id),
+        )
+        if ord is not None:
+            _station_ord_cache.set(cache_key, ord)
+            try:
+                redis_client.set_bus_station_ord(bus_route_id, st_id, ord)
+            except RedisConnectionError as e:
+                logger.warning(f"정류소 순번 저장 실패: error={e}")
+        return ord
+
+    @staticmethod
+    def get_bus_arrival(
+        st_id: str, bus_route_id: str, ord: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        버스 도착정보 조회 ((정류소, 노선) 기준 공유)
+
+        Args:
+            st_id: 정류소 ID
+            bus_route_id: 노선 ID
+            ord: 정류소 순번 (None이면 캐시에서 조회)
+
+        Returns:
+            bus_api_client.get_arrival_info() 결과
+        """
+        if ord is None:
+            ord = RealtimeCache.get_station_ord(st_id, bus_route_id)
+
+        return _get_or_fetch(
+            "bus_arrival",
+            f"rt:bus_arr:{st_id}:{bus_route_id}",
+            settings.REALTIME_BUS_ARRIVAL_TTL,
+            lambda: bus_api_client.get_arrival_info(
+                st_id, bus_route_id, ord, resolve_ord=False
+            ),
+        )
+
+    @staticmethod
+    def get_subway_arrivals(station_name: str) -> Dict[str, Dict]:
+        """
+        지하철 역 도착정보 조회 (역 기준 공유, 호선/방향 인덱스)
+
+        Args:
+            station_name: 역명 (예: "강남")
+
+        Returns:
+            subway_api_client.index_arrivals() 결과
+        """
+        return (
+            _get_or_fetch(
+                "subway_arrival",
+                f"rt:subway_arr:{station_name}",
+                settings.REALTIME_SUBWAY_ARRIVAL_TTL,
+                lambda: subway_api_client.index_arrivals(
+                    subway_api_client.get_arrival_info(station_name)
+                ),
+            )
+            or {}
+        )
+
+    @staticmethod
+    def refresh_subway_snapshot(subway_line: str) -> int:
+        """
+        노선 열차 위치 조회 후 스냅샷 교체
+
+        API 응답이 비어 있으면(오류 포함) 이전 스냅샷을 TTL까지 유지합니다.
+
+        Args:
+            subway_line: 호선명 (예: "2호선")
+
+        Returns:
+            저장된 열차 수
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        positions = subway_api_client.get_train_position(subway_line)
+        if not positions:
+            return 0
+
+        redis_client.set_subway_snapshot(
+            subway_line,
+            positions,
+            fetched_at=clock.time(),
+            ttl=settings.SUBWAY_SNAPSHOT_TTL,
+        )
+        return len(positions)
+
+    @staticmethod
+    def get_subway_train_position(subway_line: str, train_no: str) -> Optional[Dict]:
+        """
+        지하철 열차 위치 조회 (노선 스냅샷에서 trainNo로 조회)
+
+        조회 시 노선을 활성으로 표시해 collect_subway_positions가 수집하도록 합니다.
+        스냅샷이 아직 없으면(첫 탑승 직후) 한 Worker만 노선을 조회해 스냅샷을 만듭니다.
+
+        Args:
+            subway_line: 호선명 (예: "2호선")
+            train_no: 열차번호
+
+        Returns:
+            realtimePosition 열차 정보 또는 None
+        """
+        if not subway_line or not train_no:
+            return None
+
+        try:
+            fetched_at, position = redis_client.get_subway_train_position(
+                subway_line, train_no, clock.time()
+            )
+            if fetched_at is not None:
+                metrics.incr(
+                    CACHE_REQUESTS_METRIC, kind="subway_position", result="hit"
+                )
+                return position
+
+            _get_or_fetch(
+                "subway_position",
+                f"rt:subway_refresh:{subway_line}",
+                settings.SUBWAY_POSITION_COLLECT_INTERVAL,
+                lambda: RealtimeCache.refresh_subway_snapshot(subway_line),
+            )
+            _, position = redis_client.get_subway_train_position(
+                subway_line, train_no, clock.time()
+            )
+            return position
+        except RedisConnectionError as e:
+            logger.warning(
+                f"지하철 위치 스냅샷 사용 불가 (API 직접 호출): "
+                f"line={subway_line}, error={e}"
+            )
+            metrics.incr(
+                CACHE_REQUESTS_METRIC, kind="subway_position", result="fallback"
+            )
+            positions = subway_api_client.get_train_position(subway_line)
+            return subway_api_client.filter_by_train_no(positions, train_no)
@@ -0,0 +1,175 @@
+"""
+봇 Task용 경주 데이터 캐시 서비스
+
+역할:
+- 경주 중 바뀌지 않는 데이터(legs, route_itinerary_id, 공공데이터 ID)를
+  Worker 프로세스 내 LRU에 보관해 매 틱 DB 조회/JSON 역직렬화 제거
+- 경주 상태는 Redis 플래그로 조회 (없으면 DB 조회 후 플래그 복구)
+- 경로 탐색 결과별 진행 중 참가자 Set으로 경주 종료 감지 (DB COUNT 조회 대체)
+"""
+
+import logging
+from typing import List, NamedTuple, Optional
+
+from ..models import Route
+from ..utils.lru_cache import LRUCache
+from ..utils.redis_client import RedisConnectionError, redis_client
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 내 캐시: route_id → RouteContext
+_local_cache = LRUCache(max_size=512)
+
+
+class RouteContext(NamedTuple):
+    """봇 틱 처리에 필요한 경주 데이터 (경주 중 불변)"""
+
+    legs: list
+    route_itinerary_id: int
+    public_ids: dict
+
+
+class RouteCache:
+    """경주 데이터 캐시"""
+
+    @staticmethod
+    def get(route_id: int) -> Optional[RouteContext]:
+        """
+        경주 데이터 조회 (LRU → Redis 공공데이터 ID + DB 순)
+
+        Args:
+            route_id: 경주 ID
+
+        Returns:
+            RouteContext 또는 None (공공데이터 ID 없음)
+
+        Raises:
+            Route.DoesNotExist: 경주가 없는 경우
+            RedisConnectionError: 연결 오류 시
+        """
+        context = _local_cache.get(route_id)
+        if context is not None:
+            return context
+
+        public_ids = redis_client.get_public_ids(route_id)
+        if not public_ids:
+            return None
+
+        route = (
+            Route.objects.select_related("route_leg")
+            .only("id", "route_itinerary_id", "route_leg__raw_data")
+            .get(id=route_id)
+        )
+        context = RouteContext(
+            legs=route.route_leg.raw_data.get("legs", []),
+            route_itinerary_id=route.route_itinerary_id,
+            public_ids=public_ids,
+        )
+        _local_cache.set(route_id, context)
+        return context
+
+    @staticmethod
+    def get_status(route_id: int) -> str:
+        """
+        경주 상태 조회 (Redis 플래그 → DB 순)
+
+        Args:
+            route_id: 경주 ID
+
+        Returns:
+            경주 상태 (RUNNING/FINISHED/CANCELED)
+
+        Raises:
+            Route.DoesNotExist: 경주가 없는 경우
+            RedisConnectionError: 연결 오류 시
+        """
+        status = redis_client.get_route_status(route_id)
+        if status is not None:
+            return status
+
+        status = Route.objects.only("id", "status").get(id=route_id).status
+        redis_client.set_route_status(route_id, status)
+        return status
+
+    @staticmethod
+    def set_status(route_id: int, status: str) -> None:
+        """
+        경주 상태 플래그 갱신 (경주 생성/상태 변경 시 호출)
+
+        Redis 오류는 로그만 남깁니다. 플래그가 없으면 다음 틱에서 DB를 조회합니다.
+
+        Args:
+            route_id: 경주 ID
+            status: 경주 상태
+        """
+        try:
+            redis_client.set_route_status(route_id, status)
+        except Exception as e:
+            logger.warning(
+                f"경주 상태 플래그 저장 실패: route_id={route_id}, error={e}"
+            )
+
+    @staticmethod
+    def start_race(route_itinerary_id: int, route_ids: List[int]) -> None:
+        """
+        진행 중 참가자 등록 (경주 생성 시 호출)
+
+        Redis 오류는 로그만 남깁니다.
+        등록에 실패하면 참가자 Set이 없으므로 finish_participant가 DB 조회로 종료 여부를 판단합니다.
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+            route_ids: 참가자 경주 ID 목록 (유저 + 봇)
+        """
+        try:
+            redis_client.add_running_participants(route_itinerary_id, route_ids)
+        except RedisConnectionError as e:
+            logger.warning(
+                f"진행 중 참가자 등록 실패: "
+                f"route_itinerary_id={route_itinerary_id}, error={e}"
+            )
+
+    @staticmethod
+    def finish_participant(route: Route) -> bool:
+        """
+        참가자 종료 기록 (완주/취소 후 DB 저장 다음에 호출)
+
+        진행 중 참가자 Set에서 제거하고, 마지막 참가자였는지 반환합니다.
+        같은 참가자를 여러 번 기록해도 경주 종료는 한 번만 True입니다.
+        Redis를 사용할 수 없거나 참가자 Set이 없으면 (등록 실패/만료)
+        같은 경주의 미종료 참가자를 DB에서 조회합니다.
+
+        Args:
+            route: 종료된 참가자 Route
+
+        Returns:
+            경주 종료 여부 (True면 호출 측에서 route_ended 발행)
+        """
+        try:
+            ended = redis_client.remove_running_participant(
+                route.route_itinerary_id, route.id
+            )
+        except RedisConnectionError as e:
+            logger.warning(
+                f"진행 중 참가자 제거 실패 (DB 조회): route_id={route.id}, error={e}"
+            )
+            ended = None
+        if ended is not None:
+            return ended
+
+        return not Route.objects.filter(
+            route_itinerary_id=route.route_itinerary_id,
+            start_time=route.start_time,
+            end_time__isnull=True,
+            deleted_at__isnull=True,
+        ).exists()
+
+    @staticmethod
+    def evict(route_id: int) -> None:
+        """
+        현재 프로세스 LRU에서 경주 데이터 제거
+
+        Args:
+            route_id: 경주 ID
+        """
+        _local_cache.delete(route_id)
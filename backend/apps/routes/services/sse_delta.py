@@ -0,0 +1,123 @@
+"""
+SSE 봇 상태 델타 인코딩 (SSE 클라이언트 1명 단위)
+
+역할:
+- ?delta=1로 연결한 클라이언트에게 bot_status_update를 봇별 변경 필드만 전송
+- 봇별 첫 이벤트와 keyframe_interval번째마다 전체 상태(keyframe) 전송
+- SSE 스트림 전송 바이트/연결 시간 메트릭 (모드별, 분당 바이트 계산용)
+
+전송 형식:
+    event: bot_status_update   (keyframe, 기존 형식 + seq, keyframe=true)
+    data: {"route_id": 101, ..., "seq": 1, "keyframe": true}
+
+    event: bot_status_delta    (이전 이벤트 대비 바뀐 필드만)
+    data: {"route_id": 101, "seq": 2, "position": {...}, "timestamp": ...}
+
+델타 적용 규칙 (클라이언트):
+- 객체 값은 재귀적으로 합치고, 그 외 값은 교체
+- null은 필드 삭제 (예: 하차 후 vehicle)
+- seq는 봇별 1씩 증가, 건너뛰면 재연결해서 keyframe을 다시 받아야 함
+
+클라이언트 버퍼(ClientEventBuffer)가 합친 뒤 실제로 보낸 이벤트 기준으로
+비교하므로, 중간 위치 업데이트가 생략되어도 델타가 어긋나지 않습니다.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils import metrics
+
+SENT_BYTES_METRIC = "hadbetter_sse_sent_bytes_total"
+STREAM_SECONDS_METRIC = "hadbetter_sse_stream_seconds_total"
+
+DELTA_EVENT = "bot_status_delta"
+
+
+def diff_fields(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    previous → current 변경 필드 (객체는 재귀 비교, 삭제된 필드는 None)
+
+    Args:
+        previous: 이전 전송 값
+        current: 현재 값
+
+    Returns:
+        변경된 필드만 담은 딕셔너리 (변경 없으면 빈 딕셔너리)
+    """
+    changed = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if old == value and key in previous:
+            continue
+        if isinstance(old, dict) and isinstance(value, dict):
+            changed[key] = diff_fields(old, value)
+        else:
+            changed[key] = value
+    for key in previous.keys() - current.keys():
+        if previous[key] is not None:
+            changed[key] = None
+    return changed
+
+
+class BotStatusDeltaEncoder:
+    """
+    bot_status_update → keyframe / 델타 변환 (봇별 마지막 전송 상태 유지)
+    """
+
+    def __init__(self, keyframe_interval: int = 20):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._last: Dict[int, Dict[str, Any]] = {}
+        self._seq: Dict[int, int] = {}
+
+    def encode(self, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        봇 상태 이벤트 인코딩
+
+        Args:
+            data: bot_status_update 이벤트 데이터 (route_id 포함)
+
+        Returns:
+            (이벤트 타입, 데이터)
+        """
+        route_id = data.get("route_id")
+        if route_id is None:
+            return "bot_status_update", data
+
+        seq = self._seq.get(route_id, 0) + 1
+        self._seq[route_id] = seq
+        previous = self._last.get(route_id)
+        self._last[route_id] = data
+
+        if previous is None or (seq - 1) % self.keyframe_interval == 0:
+            return "bot_status_update", {**data, "seq": seq, "keyframe": True}
+
+        return DELTA_EVENT, {
+            "route_id": route_id,
+            "seq": seq,
+            **diff_fields(previous, data),
+        }
+
+
+class SSEStreamMeter:
+    """SSE 스트림 1개의 전송 바이트/연결 시간 메트릭 (mode=full/delta)"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._accounted_at: Optional[float] = time.monotonic()
+
+    def sent(self, message: str) -> None:
+        """전송한 SSE 메시지 기록 (연결 시간도 함께 누적)"""
+        metrics.incr(SENT_BYTES_METRIC, len(message.encode()), mode=self.mode)
+        self._account_time()
+
+    def close(self) -> None:
+        """스트림 종료 (남은 연결 시간 누적)"""
+        self._account_time()
+        self._accounted_at = None
+
+    def _account_time(self) -> None:
+        if self._accounted_at is None:
+            return
+        now = time.monotonic()
+        metrics.incr(STREAM_SECONDS_METRIC, now - self._accounted_at, mode=self.mode)
+        self._accounted_at = now
@@ -0,0 +1,370 @@
+"""
+SSE 이벤트 허브 (ASGI Worker당 1개)
+
+역할:
+- Worker(이벤트 루프)당 RabbitMQ 연결 1개를 aio-pika로 유지 (스레드 없이 asyncio로 수신)
+- 경주(route_itinerary) Exchange는 첫 SSE 클라이언트가 접속할 때 구독하고,
+  마지막 클라이언트가 떠나면 해제 (참조 카운트)
+- 수신한 이벤트를 같은 경주를 보는 클라이언트별 버퍼(ClientEventBuffer)로 분배
+- 클라이언트 버퍼는 봇별 최신 bot_status_update만 유지하고 전송 속도를 제한
+  (느린 클라이언트도 메모리 사용이 제한되고, 밀린 위치 대신 최신 위치를 받음)
+
+기존 방식(rabbitmq_client.subscribe)은 클라이언트마다 연결 1개 + 스레드 1개를
+점유했지만, 허브는 클라이언트 수와 무관하게 Worker당 연결 1개, 경주당 Queue 1개만 사용합니다.
+
+사용법:
+    async with sse_hub.listen(route_itinerary_id) as events:
+        event = await asyncio.wait_for(events.get(), timeout=5)
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Hashable, Optional, Set
+
+from django.conf import settings
+
+import aio_pika
+from aio_pika.abc import (
+    AbstractIncomingMessage,
+    AbstractQueue,
+    AbstractRobustChannel,
+    AbstractRobustConnection,
+)
+from aio_pika.exceptions import AMQPError
+
+from ..utils import codec, metrics
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTIONS_METRIC = "hadbetter_sse_hub_subscriptions_total"
+DROPPED_METRIC = "hadbetter_sse_hub_dropped_events_total"
+COALESCED_METRIC = "hadbetter_sse_coalesced_events_total"
+
+# 봇별 최신 값만 유지하는 이벤트 (나머지 생명주기 이벤트는 모두 순서대로 전송)
+COALESCED_EVENTS = frozenset({"bot_status_update"})
+
+
+class ClientBufferOverflow(Exception):
+    """버리면 안 되는 이벤트로 클라이언트 버퍼가 넘침 (스트림을 닫고 재접속 유도)"""
+
+    pass
+
+
+class ClientEventBuffer:
+    """
+    SSE 클라이언트 1명의 전송 대기 이벤트 버퍼
+
+    - bot_status_update는 route_id별로 최신 1개만 유지 (이전 값은 버리고 뒤로 이동)
+    - 탑승/하차/도착/경주 종료 등 나머지 이벤트는 도착 순서대로 유지
+    - 최대 maxsize개 (넘치면 가장 오래된 bot_status_update부터 버림)
+      버릴 위치 업데이트가 없으면 생명주기 이벤트는 버리지 않고 overflowed 표시 →
+      get()이 ClientBufferOverflow를 발생시켜 스트림을 닫음
+      (클라이언트가 Last-Event-ID로 재접속해 놓친 이벤트를 재전송받음)
+    - get()은 초당 rate개(버스트 burst개)까지만 이벤트를 꺼냄 (token bucket)
+      제한에 걸려 기다리는 동안 들어온 위치 업데이트는 계속 합쳐짐
+    """
+
+    def __init__(self, maxsize: int, rate: float = 0, burst: int = 1):
+        self.maxsize = maxsize
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._items: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._seq = 0
+        self._ready = asyncio.Event()
+        self._tokens = float(self.burst)
+        self._refilled_at: Optional[float] = None
+        self.overflowed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _key(self, event: Dict[str, Any]) -> Hashable:
+        if event.get("event") in COALESCED_EVENTS:
+            route_id = (event.get("data") or {}).get("route_id")
+            if route_id is not None:
+                return (event["event"], route_id)
+        self._seq += 1
+        return self._seq
+
+    def put(self, event: Dict[str, Any]) -> None:
+        """이벤트 추가 (대기 중인 같은 봇의 위치 업데이트는 교체)"""
+        if self.overflowed:
+            # 스트림 종료 예정 (재접속 시 이벤트 로그에서 재전송)
+            metrics.incr(DROPPED_METRIC)
+            return
+
+        key = self._key(event)
+        if self._items.pop(key, None) is not None:
+            metrics.incr(COALESCED_METRIC)
+        self._items[key] = event
+
+        while len(self._items) > self.maxsize:
+            coalesced = next(
+                (item for item in self._items if isinstance(item, tuple)), None
+            )
+            if coalesced is None:
+                # 생명주기 이벤트만 남음 → 버리지 않고 스트림 종료
+                self.overflowed = True
+                self._items.clear()
+                metrics.incr(DROPPED_METRIC)
+                break
+            del self._items[coalesced]
+            metrics.incr(DROPPED_METRIC)
+        self._ready.set()
+
+    def _refill(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._refilled_at is not None:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled_at) * self.rate
+            )
+        self._refilled_at = now
+
+    async def _throttle(self) -> None:
+        """전송 토큰 1개 사용 (없으면 생길 때까지 대기)"""
+        if self.rate <= 0:
+            return
+        self._refill()
+        while self._tokens < 1:
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._refill()
+        self._tokens -= 1
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        다음 이벤트 꺼내기 (없거나 속도 제한에 걸리면 대기)
+
+        대기 중 취소(asyncio.wait_for 타임아웃)되어도 이벤트는 버퍼에 남습니다.
+
+        Returns:
+            이벤트 딕셔너리 { "event": str, "data": dict }
+
+        Raises:
+            ClientBufferOverflow: 생명주기 이벤트로 버퍼가 넘친 경우
+        """
+        while not self._items:
+            if self.overflowed:
+                raise ClientBufferOverflow()
+            self._ready.clear()
+            await self._ready.wait()
+        await self._throttle()
+        _, event = self._items.popitem(last=False)
+        return event
+
+
+class _Subscription:
+    """경주 1개에 대한 구독 (AMQP Queue 1개 + 클라이언트 버퍼 목록)"""
+
+    def __init__(self, route_itinerary_id: int):
+        self.route_itinerary_id = route_itinerary_id
+        self.clients: Set[ClientEventBuffer] = set()
+        self.queue: Optional[AbstractQueue] = None
+        self.consumer_tag: Optional[str] = None
+
+
+class SSEHub:
+    """ASGI Worker 내 SSE 클라이언트가 공유하는 RabbitMQ 구독 허브"""
+
+    def __init__(self):
+        self._reset(None)
+
+    def _reset(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._connection: Optional[AbstractRobustConnection] = None
+        self._channel: Optional[AbstractRobustChannel] = None
+        self._subscriptions: Dict[int, _Subscription] = {}
+        # 실행 중인 해제 태스크 (완료 전 GC 방지)
+        self._unbind_tasks: Set[asyncio.Task] = set()
+
+    def _bind_loop(self) -> None:
+        """
+        현재 이벤트 루프에 허브 상태 연결
+
+        uvicorn Worker는 루프가 하나뿐이지만, 루프가 바뀌면(테스트 등)
+        이전 루프의 연결은 사용할 수 없으므로 상태를 새로 만듭니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset(loop)
+
+    @staticmethod
+    def _get_exchange_name(route_itinerary_id: int) -> str:
+        """Exchange 이름 생성 (rabbitmq_client와 동일)"""
+        return f"sse_events_{route_itinerary_id}"
+
+    @staticmethod
+    def _get_queue_name(route_itinerary_id: int) -> str:
+        """
+        Worker별 Queue 이름 생성
+
+        재연결 시 aio-pika가 같은 이름으로 Queue를 다시 선언하므로
+        서버 생성 이름(amq.gen-*) 대신 직접 만든 이름을 사용합니다.
+        """
+        return (
+            f"sse_hub.{socket.gethostname()}.{os.getpid()}."
+            f"{route_itinerary_id}.{uuid.uuid4().hex[:8]}"
+        )
+
+    async def _get_channel(self) -> AbstractRobustChannel:
+        """공유 채널 조회 (없으면 연결, 이후 끊김은 aio-pika가 자동 복구)"""
+        if self._channel is not None and not self._channel.is_closed:
+            return self._channel
+
+        if self._connection is None or self._connection.is_closed:
+            self._connection = await aio_pika.connect_robust(
+                host=settings.RABBITMQ_HOST,
+                port=settings.RABBITMQ_PORT,
+                login=settings.RABBITMQ_USER,
+                password=settings.RABBITMQ_PASSWORD,
+                heartbeat=60,
+                client_properties={"connection_name": f"sse-hub-{os.getpid()}"},
+            )
+            logger.info(f"SSE 허브 RabbitMQ 연결: pid={os.getpid()}")
+
+        self._channel = await self._connection.channel()
+        return self._channel
+
+    async def _bind(self, subscription: _Subscription) -> None:
+        """경주 Exchange에 Worker 전용 Queue를 바인딩하고 수신 시작"""
+        channel = await self._get_channel()
+        route_itinerary_id = subscription.route_itinerary_id
+
+        # 발행 측과 같은 설정으로 선언 (먼저 접속한 쪽이 생성)
+        exchange = await channel.declare_exchange(
+            self._get_exchange_name(route_itinerary_id),
+            aio_pika.ExchangeType.FANOUT,
+            durable=False,
+            auto_delete=True,
+        )
+        # exclusive: 이 연결에서만 사용, auto_delete: 수신 해제 시 삭제
+        queue = await channel.declare_queue(
+            self._get_queue_name(route_itinerary_id),
+            exclusive=True,
+            auto_delete=True,
+        )
+        await queue.bind(exchange)
+
+        async def on_message(message: AbstractIncomingMessage) -> None:
+            self._dispatch(subscription, message.body)
+
+        subscription.queue = queue
+        subscription.consumer_tag = await queue.consume(on_message, no_ack=True)
+        metrics.incr(SUBSCRIPTIONS_METRIC, event="bind")
+        logger.info(f"SSE 허브 구독 시작: route_itinerary_id={route_itinerary_id}")
+
+    async def _unbind(self, route_itinerary_id: int) -> None:
+        """클라이언트가 남지 않은 경주의 수신 해제 (그사이 다시 접속했으면 유지)"""
+        async with self._lock:
+            subscription = self._subscriptions.get(route_itinerary_id)
+            if subscription is None or subscription.clients:
+                return
+            del self._subscriptions[route_itinerary_id]
+
+            if subscription.queue is None or subscription.consumer_tag is None:
+                return
+            try:
+                await subscription.queue.cancel(subscription.consumer_tag)
+            except (AMQPError, ConnectionError) as e:
+                logger.warning(
+                    f"SSE 허브 구독 해제 실패: "
+                    f"route_itinerary_id={route_itinerary_id}, error={e}"
+                )
+            metrics.incr(SUBSCRIPTIONS_METRIC, event="unbind")
+            logger.info(f"SSE 허브 구독 해제: route_itinerary_id={route_itinerary_id}")
+
+    def _dispatch(self, subscription: _Subscription, body: bytes) -> None:
+        """
+        수신 이벤트를 클라이언트 버퍼로 분배
+
+        버퍼에 넣기만 하므로 느린 클라이언트가 다른 클라이언트와 허브 수신을 막지 않습니다.
+        """
+        try:
+            event = codec.loads(body)
+        except codec.DECODE_ERRORS as e:
+            logger.warning(f"SSE 허브 메시지 디코딩 실패: {e}")
+            return
+
+        for client in tuple(subscription.clients):
+            client.put(event)
+
+    async def subscribe(self, route_itinerary_id: int) -> ClientEventBuffer:
+        """
+        경주 이벤트 구독 (클라이언트 1명)
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+
+        Returns:
+            이벤트 딕셔너리 { "event": str, "data": dict }가 들어오는 클라이언트 버퍼
+
+        Raises:
+            AMQPError, ConnectionError: 첫 연결/구독 실패 시
+        """
+        self._bind_loop()
+        client = ClientEventBuffer(
+            maxsize=settings.SSE_CLIENT_QUEUE_SIZE,
+            rate=settings.SSE_CLIENT_MAX_EVENTS_PER_SEC,
+            burst=settings.SSE_CLIENT_EVENT_BURST,
+        )
+
+        async with self._lock:
+            subscription = self._subscriptions.get(route_itinerary_id)
+            if subscription is None:
+                subscription = _Subscription(route_itinerary_id)
+                await self._bind(subscription)
+                self._subscriptions[route_itinerary_id] = subscription
+            subscription.clients.add(client)
+
+        return client
+
+    def unsubscribe(self, route_itinerary_id: int, client: ClientEventBuffer) -> None:
+        """
+        경주 이벤트 구독 해제 (클라이언트 1명)
+
+        연결 종료로 태스크가 취소되는 중에도 호출되므로 await 없이
+        클라이언트만 즉시 제거하고, 수신 해제는 별도 태스크로 처리합니다.
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+            client: subscribe()가 반환한 버퍼
+        """
+        subscription = self._subscriptions.get(route_itinerary_id)
+        if subscription is None:
+            return
+        subscription.clients.discard(client)
+        if not subscription.clients:
+            task = asyncio.get_running_loop().create_task(
+                self._unbind(route_itinerary_id)
+            )
+            self._unbind_tasks.add(task)
+            task.add_done_callback(self._unbind_tasks.discard)
+
+    @asynccontextmanager
+    async def listen(
+        self, route_itinerary_id: int
+    ) -> AsyncGenerator[ClientEventBuffer, None]:
+        """
+        경주 이벤트 구독 (async with 블록 동안)
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+
+        Yields:
+            클라이언트 버퍼
+        """
+        client = await self.subscribe(route_itinerary_id)
+        try:
+            yield client
+        finally:
+            self.unsubscribe(route_itinerary_id, client)
+
+
+# 싱글톤 인스턴스 (ASGI Worker 프로세스마다 1개)
+sse_hub = SSEHub()
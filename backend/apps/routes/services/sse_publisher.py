@@ -11,25 +11,67 @@ SSE 이벤트 발행 서비스 (v3)
 - bot_alighting: 봇 하차
 - participant_finished: 참가자 도착
 - route_ended: 경주 종료
+- user_bus_arrival: 유저가 탈 버스 도착 정보 (monitor_user_buses Task)
 
 주의:
 - rabbitmq_client.publish()는 route_itinerary_id를 사용합니다.
 - 같은 경주의 모든 참가자가 동일한 Exchange를 구독합니다.
+- heartbeat/error를 제외한 이벤트는 경주별 이벤트 로그(Redis Stream)에 먼저 기록하고,
+  Stream ID를 SSE 이벤트 ID로 함께 발행합니다. (재연결 시 Last-Event-ID 이후 재전송)
+- timestamp는 epoch 밀리초 정수, 좌표는 소수점 6자리로 보냅니다. (utils.codec)
 """
 
 import logging
 from typing import Optional
 
-from django.utils import timezone
+from django.conf import settings
 
+from ..utils import codec
 from ..utils.rabbitmq_client import rabbitmq_client
+from ..utils.redis_client import RedisConnectionError, redis_client
 
 logger = logging.getLogger(__name__)
 
+# 이벤트 로그에 남기지 않는 이벤트 (재연결 시 재전송할 필요 없음)
+UNLOGGED_EVENTS = frozenset({"heartbeat", "error"})
 
-def get_seoul_timestamp() -> str:
-    """서울 시간대 타임스탬프 반환"""
-    return timezone.localtime(timezone.now()).isoformat()
+
+def _publish(route_itinerary_id: int, event_type: str, data: dict) -> bool:
+    """
+    이벤트 로그 기록 후 RabbitMQ 발행
+
+    로그 기록에 실패해도 실시간 발행은 진행합니다. (ID 없이 발행)
+
+    Args:
+        route_itinerary_id: 경로 탐색 결과 ID
+        event_type: 이벤트 타입
+        data: 이벤트 데이터
+
+    Returns:
+        발행 성공 여부
+    """
+    event_id = None
+    if event_type not in UNLOGGED_EVENTS:
+        try:
+            event_id = redis_client.append_sse_event(
+                route_itinerary_id,
+                event_type,
+                data,
+                maxlen=settings.SSE_EVENT_LOG_MAXLEN,
+                ttl=settings.SSE_EVENT_LOG_TTL,
+            )
+        except RedisConnectionError as e:
+            logger.warning(
+                f"SSE 이벤트 로그 기록 실패: "
+                f"route_itinerary_id={route_itinerary_id}, event={event_type}, error={e}"
+            )
+
+    return rabbitmq_client.publish(
+        route_itinerary_id=route_itinerary_id,
+        event_type=event_type,
+        data=data,
+        event_id=event_id,
+    )
 
 
 class SSEPublisher:
@@ -59,20 +101,25 @@ class SSEPublisher:
             "progress_percent": bot_state.get("progress_percent"),
             "arrival_time": bot_state.get("arrival_time"),
             "next_update_in": next_update_in,
-            "timestamp": get_seoul_timestamp(),
+            "timestamp": codec.epoch_ms(),
         }
 
         if vehicle_info:
+            if vehicle_info.get("position"):
+                vehicle_info = {
+                    **vehicle_info,
+                    "position": codec.compact_position(vehicle_info["position"]),
+                }
             data["vehicle"] = vehicle_info
 
         if bot_state.get("current_position"):
-            data["position"] = bot_state["current_position"]
+            data["position"] = codec.compact_position(bot_state["current_position"])
 
         logger.info(
             f"SSE 발행: route_itinerary_id={route_itinerary_id}, "
             f"event=bot_status_update, route_id={data['route_id']}"
         )
-        result = rabbitmq_client.publish(
+        result = _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="bot_status_update",
             data=data,
@@ -102,7 +149,7 @@ class SSEPublisher:
                 trainNo: 열차번호 (지하철)
             }
         """
-        rabbitmq_client.publish(
+        _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="bot_boarding",
             data={
@@ -110,7 +157,7 @@ class SSEPublisher:
                 "bot_id": bot_id,
                 "station_name": station_name,
                 "vehicle": vehicle,
-                "timestamp": get_seoul_timestamp(),
+                "timestamp": codec.epoch_ms(),
             },
         )
 
@@ -130,7 +177,7 @@ class SSEPublisher:
             bot_id: 봇 ID
             station_name: 하차 정류소/역 이름
         """
-        rabbitmq_client.publish(
+        _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="bot_alighting",
             data={
@@ -138,7 +185,7 @@ class SSEPublisher:
                 "bot_id": bot_id,
                 "station_name": station_name,
                 "next_action": "WALKING",
-                "timestamp": get_seoul_timestamp(),
+                "timestamp": codec.epoch_ms(),
             },
         )
 
@@ -162,14 +209,14 @@ class SSEPublisher:
             rank: 도착 순위
             duration: 소요 시간 (초)
         """
-        rabbitmq_client.publish(
+        _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="participant_finished",
             data={
                 "participant": participant,
                 "rank": rank,
                 "duration": duration,
-                "timestamp": get_seoul_timestamp(),
+                "timestamp": codec.epoch_ms(),
             },
         )
 
@@ -185,16 +232,31 @@ class SSEPublisher:
             route_itinerary_id: 경로 탐색 결과 ID (Exchange 식별용)
             reason: 종료 사유 ("all_finished", "canceled", "timeout")
         """
-        rabbitmq_client.publish(
+        _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="route_ended",
             data={
                 "route_itinerary_id": route_itinerary_id,
                 "reason": reason,
-                "timestamp": get_seoul_timestamp(),
+                "timestamp": codec.epoch_ms(),
             },
         )
 
+    @staticmethod
+    def publish_user_bus_arrival(route_itinerary_id: int, bus_info: dict) -> None:
+        """
+        유저 버스 도착 정보 이벤트 발행
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID (Exchange 식별용)
+            bus_info: UserBusMonitor.check_arrival() 결과
+        """
+        _publish(
+            route_itinerary_id=route_itinerary_id,
+            event_type="user_bus_arrival",
+            data=bus_info,
+        )
+
     @staticmethod
     def publish_heartbeat(route_itinerary_id: int) -> None:
         """
@@ -205,12 +267,12 @@ class SSEPublisher:
         Args:
             route_itinerary_id: 경로 탐색 결과 ID (Exchange 식별용)
         """
-        rabbitmq_client.publish(
+        _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="heartbeat",
             data={
                 "route_itinerary_id": route_itinerary_id,
-                "timestamp": get_seoul_timestamp(),
+                "timestamp": codec.epoch_ms(),
             },
         )
 
@@ -228,13 +290,13 @@ class SSEPublisher:
             error_code: 에러 코드
             error_message: 에러 메시지
         """
-        rabbitmq_client.publish(
+        _publish(
             route_itinerary_id=route_itinerary_id,
             event_type="error",
             data={
                 "route_itinerary_id": route_itinerary_id,
                 "error_code": error_code,
                 "error_message": error_message,
-                "timestamp": get_seoul_timestamp(),
+                "timestamp": codec.epoch_ms(),
             },
         )
@@ -1,11 +1,13 @@
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 from typing import Any, Dict, Optional
 
-from django.utils import timezone
-
 from apps.routes.models import Route
+from apps.routes.services.realtime_cache import RealtimeCache
+from apps.routes.utils import clock
 from apps.routes.utils.bus_api_client import bus_api_client
+from apps.routes.utils.redis_client import RedisConnectionError, redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +20,17 @@ class UserBusMonitor:
     1. 정류장 도착 예정 시간(ETA) 기준 -3분 ~ +1분 사이에만 API 호출
     2. 호출 활성화 구간에서도 10초 주기로 제한 (Throttle)
     3. 테스트 모드에서는 계획된 도보 시간을 기준으로 ETA 계산
+    4. 경주 생성 시 register()로 등록하면 monitor_user_buses Task가 유저 경주마다
+       한 번씩 조회해 user_bus_arrival 이벤트로 발행 (SSE 연결 수와 무관)
+    5. 버스 번호 + 정류소 → 공공데이터 노선/정류소 ID 변환 결과는 Redis에 공유
     """
 
     def __init__(self, route_id: int):
         self.route_id = route_id
+        self.route_itinerary_id = None
         self.is_initialized = False
+        # 조회 종료 (조회 구간 종료 또는 노선/정류소 변환 실패)
+        self.is_done = False
 
         # 정적 정보 캐싱
         self.bus_name = None
@@ -38,13 +46,76 @@ class UserBusMonitor:
         self.last_call_time = None  # 마지막 API 호출 시각
         self.call_interval = 10  # 호출 주기 (초)
 
-    def initialize(self) -> bool:
-        """초기화: 노선 정보 및 도착 예정 시간(ETA) 계산"""
-        try:
-            route = Route.objects.select_related("route_leg").get(id=self.route_id)
-        except Route.DoesNotExist:
-            logger.error(f"[UserBusMonitor] Route {self.route_id} not found.")
-            return False
+    @classmethod
+    def register(cls, route: Route) -> Optional["UserBusMonitor"]:
+        """
+        유저 경주 모니터 등록 (경주 생성 시, API 호출 없음)
+
+        Args:
+            route: 유저 Route (route_leg 포함)
+
+        Returns:
+            등록된 모니터 또는 None (버스 구간 없음)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        monitor = cls(route.id)
+        if not monitor.prepare(route):
+            return None
+        redis_client.set_user_bus_monitor(route.id, monitor.to_dict())
+        logger.info(
+            f"[UserBusMonitor] 등록: route_id={route.id}, bus={monitor.bus_name}, "
+            f"station={monitor.start_station_name}, ETA={monitor.arrival_eta}"
+        )
+        return monitor
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Redis 저장용 상태 (시각은 epoch 초)"""
+        return {
+            "route_itinerary_id": self.route_itinerary_id,
+            "is_initialized": self.is_initialized,
+            "bus_name": self.bus_name,
+            "public_route_id": self.public_route_id,
+            "station_id": self.station_id,
+            "station_ord": self.station_ord,
+            "start_station_name": self.start_station_name,
+            "station_lon": self.station_lon,
+            "station_lat": self.station_lat,
+            "arrival_eta": self.arrival_eta.timestamp() if self.arrival_eta else None,
+            "last_call_time": (
+                self.last_call_time.timestamp() if self.last_call_time else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, route_id: int, state: Dict[str, Any]) -> "UserBusMonitor":
+        """to_dict() 결과로 모니터 복원"""
+        monitor = cls(route_id)
+        for name in (
+            "route_itinerary_id",
+            "is_initialized",
+            "bus_name",
+            "public_route_id",
+            "station_id",
+            "station_ord",
+            "start_station_name",
+            "station_lon",
+            "station_lat",
+        ):
+            setattr(monitor, name, state.get(name))
+        for name in ("arrival_eta", "last_call_time"):
+            if state.get(name) is not None:
+                setattr(
+                    monitor,
+                    name,
+                    datetime.fromtimestamp(state[name], tz=dt_timezone.utc),
+                )
+        return monitor
+
+    def prepare(self, route: Route) -> bool:
+        """경로에서 탑승 버스/정류장 및 도착 예정 시간(ETA) 계산 (API 호출 없음)"""
+        self.route_itinerary_id = route.route_itinerary_id
 
         # 1. 버스 구간 및 도보 시간 추출
         raw_data = route.route_leg.raw_data
@@ -82,23 +153,27 @@ class UserBusMonitor:
         logger.info(
             f"[UserBusMonitor] Walk Time: {accumulated_seconds}s, ETA: {self.arrival_eta}"
         )
+        return True
 
-        # 4. 공공데이터 노선 ID 조회
+    def _find_target(self) -> Optional[Dict[str, Any]]:
+        """버스 번호 + 정류소 이름 → 공공데이터 노선/정류소 ID (API 조회)"""
+        # 1. 공공데이터 노선 ID 조회
+        public_route_id = None
         route_list = bus_api_client.get_bus_route_list(self.bus_name)
         if route_list:
             for r in route_list:
                 if r.get("busRouteNm") == self.bus_name:
-                    self.public_route_id = r.get("busRouteId")
+                    public_route_id = r.get("busRouteId")
                     break
 
-        if not self.public_route_id and route_list:
-            self.public_route_id = route_list[0].get("busRouteId")
+        if not public_route_id and route_list:
+            public_route_id = route_list[0].get("busRouteId")
 
-        if not self.public_route_id:
-            return False
+        if not public_route_id:
+            return None
 
-        # 5. 정류소 ID 조회
-        stations = bus_api_client.get_station_by_route(self.public_route_id)
+        # 2. 정류소 ID 조회
+        stations = bus_api_client.get_station_by_route(public_route_id)
         target_station = None
         for st in stations:
             st_name = st.get("stationNm") or st.get("stNm")
@@ -110,30 +185,69 @@ class UserBusMonitor:
                 break
 
         if not target_station:
-            return False
+            return None
 
-        self.station_id = (
-            target_station.get("station")
-            or target_station.get("stationId")
-            or target_station.get("stId")
-        )
         seq = (
             target_station.get("seq")
             or target_station.get("staOrder")
             or target_station.get("stationSeq")
         )
-        self.station_ord = int(seq) if seq else None
+        return {
+            "public_route_id": public_route_id,
+            "station_id": (
+                target_station.get("station")
+                or target_station.get("stationId")
+                or target_station.get("stId")
+            ),
+            "station_ord": int(seq) if seq else None,
+        }
 
+    def resolve_target(self) -> bool:
+        """공공데이터 노선/정류소 ID 변환 (Redis 공유 캐시 → API 순, 성공 시만 저장)"""
+        try:
+            target = redis_client.get_user_bus_target(
+                self.bus_name, self.start_station_name
+            )
+        except RedisConnectionError as e:
+            logger.warning(f"[UserBusMonitor] 노선/정류소 캐시 사용 불가: error={e}")
+            target = None
+
+        if target is None:
+            target = self._find_target()
+            if target is None:
+                return False
+            try:
+                redis_client.set_user_bus_target(
+                    self.bus_name, self.start_station_name, target
+                )
+            except RedisConnectionError as e:
+                logger.warning(
+                    f"[UserBusMonitor] 노선/정류소 캐시 저장 실패: error={e}"
+                )
+
+        self.public_route_id = target["public_route_id"]
+        self.station_id = target["station_id"]
+        self.station_ord = target["station_ord"]
         self.is_initialized = True
         return True
 
+    def initialize(self) -> bool:
+        """초기화: 노선 정보 및 도착 예정 시간(ETA) 계산"""
+        try:
+            route = Route.objects.select_related("route_leg").get(id=self.route_id)
+        except Route.DoesNotExist:
+            logger.error(f"[UserBusMonitor] Route {self.route_id} not found.")
+            return False
+
+        return self.prepare(route) and self.resolve_target()
+
     def check_arrival(self) -> Optional[Dict[str, Any]]:
         """실시간 도착 정보 조회 (최적화 로직 적용)"""
-        if not self.is_initialized:
-            if not self.initialize():
-                return None
+        if self.arrival_eta is None and not self.initialize():
+            self.is_done = True
+            return None
 
-        now = timezone.now()
+        now = clock.now()
 
         # 1. 호출 윈도우 체크 (ETA 기준 -3분 ~ +1분)
         start_window = self.arrival_eta - timedelta(minutes=3)
@@ -154,6 +268,7 @@ class UserBusMonitor:
 
         if now > end_window:
             # 이미 버스 시간이 지남
+            self.is_done = True
             return {
                 "bus_name": self.bus_name,
                 "station_name": self.start_station_name,
@@ -165,7 +280,12 @@ class UserBusMonitor:
                 "vehicle_id": None,
             }
 
-        # 2. 호출 주기 체크 (10초 Throttle)
+        # 2. 노선/정류소 ID 변환 (조회 구간에 들어온 뒤 1회)
+        if not self.is_initialized and not self.resolve_target():
+            self.is_done = True
+            return None
+
+        # 3. 호출 주기 체크 (10초 Throttle)
         if (
             self.last_call_time
             and (now - self.last_call_time).total_seconds() < self.call_interval
@@ -173,13 +293,13 @@ class UserBusMonitor:
             # 아직 10초 안 지남 (Skip API call)
             return None
 
-        # 3. 실제 API 호출
+        # 4. 실제 API 호출
         self.last_call_time = now
         logger.info(
             "[UserBusMonitor] Calling Bus API (Window: -3m ~ +1m, Interval: 10s)"
         )
 
-        arrival_info = bus_api_client.get_arrival_info(
+        arrival_info = RealtimeCache.get_bus_arrival(
             self.station_id, self.public_route_id, self.station_ord
         )
 
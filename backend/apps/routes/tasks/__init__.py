@@ -1,15 +1,22 @@
 """
 routes 앱 Celery Task 모듈
 
-- bot_simulation: 봇 위치 업데이트 Task (v3 - 동적 주기)
+- bot_simulation: 봇 위치 업데이트 Task (v3 - 동적 주기, chain/batch 모드)
 - bus_positions: 버스 실시간 위치 캐싱 Task
+- subway_positions: 지하철 노선별 열차 위치 스냅샷 수집 Task
+- user_bus_monitor: 유저 버스 도착 정보 조회 Task (user_bus_arrival 발행)
 """
 
-from .bot_simulation import update_bot_position
+from .bot_simulation import process_due_bot_ticks, update_bot_position
 from .bus_positions import fetch_all_bus_positions, get_cached_bus_positions
+from .subway_positions import collect_subway_positions
+from .user_bus_monitor import monitor_user_buses
 
 __all__ = [
     "update_bot_position",
+    "process_due_bot_ticks",
     "fetch_all_bus_positions",
     "get_cached_bus_positions",
+    "collect_subway_positions",
+    "monitor_user_buses",
 ]
@@ -10,12 +10,20 @@
 주기:
 - 기본: 30초
 - 도착 임박 (2분 이내): 15초
+
+실행 모드 (settings.BOT_TICK_MODE):
+- chain: 봇마다 update_bot_position Task가 다음 Task를 예약
+- batch: process_due_bot_ticks Task가 실행 시각이 된 봇을 한 번에 처리
 """
 
 import logging
+from bisect import bisect_right
+from collections.abc import Generator
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Optional
 
+from django.conf import settings
 from django.utils import timezone
 
 from celery import shared_task
@@ -23,10 +31,14 @@ from celery.exceptions import SoftTimeLimitExceeded
 
 from ..models import Route
 from ..services.bot_state import BotStateManager, BotStatus
+from ..services.leg_geometry import LegGeometryCache
+from ..services.realtime_cache import RealtimeCache
+from ..services.route_cache import RouteCache
 from ..services.sse_publisher import SSEPublisher
-from ..utils.bus_api_client import bus_api_client
+from ..utils import clock, metrics
 from ..utils.geo_utils import calculate_distance
-from ..utils.redis_client import RedisConnectionError, redis_client
+from ..utils.path_geometry import CompiledPath, SnapResult
+from ..utils.redis_client import BotTickSession, RedisConnectionError, redis_client
 from ..utils.subway_api_client import subway_api_client
 
 logger = logging.getLogger(__name__)
@@ -36,56 +48,25 @@ MAX_API_RETRIES = 3  # API 재시도 횟수
 API_RETRY_INTERVAL = 10  # 10초 간격
 MAX_WAITING_TIME = 30 * 60  # 버스 최대 대기 시간: 30분 (초 단위)
 
+# 배치 모드 claim 유지 시간 (process_due_bot_ticks의 time_limit보다 길게)
+BOT_TICK_CLAIM_LEASE = 90
+
+# 경로 스냅핑 탐색 윈도우 (직전 매칭 세그먼트부터 앞쪽 세그먼트 수)
+SNAP_WINDOW_SEGMENTS = 50
+# 윈도우 탐색 결과가 이 거리(미터)보다 멀면 앞쪽으로 넓혀 다시 탐색
+SNAP_WINDOW_MAX_OFFSET_M = 60
+# 넓힌 탐색 범위 (윈도우 배수) / 직전 위치에서 최대 전진 거리 (미터, 틱 간격 동안 버스 이동 상한)
+# 순환/왕복 노선의 나중 구간에 붙어 앞으로 튀지 않도록 둘 중 짧은 쪽까지만 탐색
+SNAP_FALLBACK_WINDOWS = 4
+SNAP_FALLBACK_MAX_ADVANCE_M = 1500
+
 
 def is_night_time() -> bool:
     """심야 시간대 확인 (00:00~05:00)"""
-    hour = timezone.now().hour
+    hour = clock.now().hour
     return 0 <= hour < 5
 
 
-def _parse_pass_shape(pass_shape) -> list:
-    """
-    pass_shape 데이터를 좌표 배열로 파싱
-
-    Args:
-        pass_shape: 다양한 형태의 pass_shape 데이터
-            - 문자열: "lon,lat lon,lat lon,lat ..."
-            - 리스트: [[lon, lat], [lon, lat], ...]
-            - None
-
-    Returns:
-        좌표 배열 [[lon, lat], [lon, lat], ...] 또는 빈 리스트
-    """
-    if not pass_shape:
-        return []
-
-    # 이미 리스트인 경우
-    if isinstance(pass_shape, list):
-        # 첫 번째 요소가 리스트/튜플인지 확인
-        if pass_shape and isinstance(pass_shape[0], (list, tuple)):
-            return pass_shape
-        return []
-
-    # 문자열인 경우 파싱
-    if isinstance(pass_shape, str):
-        try:
-            coords = []
-            # 공백으로 구분된 좌표들
-            for coord_str in pass_shape.strip().split():
-                if "," in coord_str:
-                    parts = coord_str.split(",")
-                    if len(parts) >= 2:
-                        lon = float(parts[0])
-                        lat = float(parts[1])
-                        coords.append([lon, lat])
-            return coords
-        except (ValueError, IndexError) as e:
-            logger.warning(f"pass_shape 파싱 실패: {e}, value={pass_shape[:100]}...")
-            return []
-
-    return []
-
-
 def _estimate_current_station(
     elapsed: float, section_time: int, pass_stops: List
 ) -> Optional[str]:
@@ -150,6 +131,165 @@ def _calculate_total_progress(
     return min(progress, 100)
 
 
+def _run_bot_tick(route_id: int) -> dict:
+    """
+    봇 1회 틱 처리 (상태 조회 → 상태별 핸들러 실행)
+
+    다음 틱 예약은 호출하는 쪽(chain/batch 모드)에서 담당합니다.
+
+    Args:
+        route_id: 경주 ID
+
+    Returns:
+        실행 결과 딕셔너리 (status가 "updated"이면 next_interval 포함)
+    """
+    # 0. 경주 상태 확인 (CANCELED/FINISHED 체크) - Task 조기 종료
+    #    Redis 플래그 우선, 없으면 DB 조회
+    try:
+        route_status = RouteCache.get_status(route_id)
+        if route_status in ["CANCELED", "FINISHED"]:
+            logger.info(
+                f"경주 종료됨 (Task 중단): route_id={route_id}, status={route_status}"
+            )
+            # 봇 상태 정리
+            BotStateManager.delete(route_id)
+            return {
+                "status": "route_ended",
+                "route_id": route_id,
+                "reason": route_status,
+            }
+    except Route.DoesNotExist:
+        logger.warning(f"경주를 찾을 수 없음 (Task 중단): route_id={route_id}")
+        BotStateManager.delete(route_id)
+        return {"status": "route_not_found", "route_id": route_id}
+
+    # 1. 봇 상태 조회
+    bot_state = BotStateManager.get(route_id)
+    if not bot_state:
+        logger.warning(f"봇 상태 없음: route_id={route_id}")
+        return {"status": "no_state", "route_id": route_id}
+
+    # 2. 이미 종료된 경우
+    if bot_state["status"] == BotStatus.FINISHED.value:
+        logger.info(f"봇 이미 종료됨: route_id={route_id}")
+        return {"status": "already_finished", "route_id": route_id}
+
+    # 3. 경로 데이터 + 공공데이터 ID 조회 (Worker 프로세스 내 캐시)
+    try:
+        route_context = RouteCache.get(route_id)
+    except Route.DoesNotExist:
+        logger.error(f"경주를 찾을 수 없음: route_id={route_id}")
+        return {"status": "route_not_found", "route_id": route_id}
+
+    if route_context is None:
+        logger.warning(f"공공데이터 ID 없음: route_id={route_id}")
+        return {"status": "no_public_ids", "route_id": route_id}
+
+    legs = route_context.legs
+    route_itinerary_id = route_context.route_itinerary_id
+    public_ids = route_context.public_ids
+
+    current_leg_index = bot_state["current_leg_index"]
+
+    # 인덱스 범위 체크
+    if current_leg_index >= len(legs):
+        _finish_bot(route_id, route_itinerary_id, bot_state, legs)
+        return {"status": "finished", "route_id": route_id}
+
+    current_leg = legs[current_leg_index]
+    current_public_leg = public_ids["legs"][current_leg_index]
+
+    # 4. 상태별 처리 + 다음 폴링 간격 결정
+    next_interval = 30  # 기본값
+
+    if bot_state["status"] == BotStatus.WALKING.value:
+        next_interval = _handle_walking(
+            route_id, route_itinerary_id, bot_state, current_leg, legs, public_ids
+        )
+
+    elif bot_state["status"] == BotStatus.WAITING_BUS.value:
+        next_interval = _handle_waiting_bus(
+            route_id,
+            route_itinerary_id,
+            bot_state,
+            current_leg,
+            current_public_leg,
+            legs,
+        )
+
+    elif bot_state["status"] == BotStatus.RIDING_BUS.value:
+        next_interval = _handle_riding_bus(
+            route_id,
+            route_itinerary_id,
+            bot_state,
+            current_leg,
+            current_public_leg,
+            legs,
+            public_ids,
+        )
+
+    elif bot_state["status"] == BotStatus.WAITING_SUBWAY.value:
+        next_interval = _handle_waiting_subway(
+            route_id,
+            route_itinerary_id,
+            bot_state,
+            current_leg,
+            current_public_leg,
+            legs,
+        )
+
+    elif bot_state["status"] == BotStatus.RIDING_SUBWAY.value:
+        next_interval = _handle_riding_subway(
+            route_id,
+            route_itinerary_id,
+            bot_state,
+            current_leg,
+            current_public_leg,
+            legs,
+            public_ids,
+        )
+
+    return {
+        "status": "updated",
+        "route_id": route_id,
+        "next_interval": next_interval,
+    }
+
+
+@contextmanager
+def _bot_tick_session(route_id: int) -> Generator[BotTickSession, None, None]:
+    """
+    봇 틱 1회를 Redis 작업 단위로 실행 (BOT_TICK_REDIS_PIPELINE)
+
+    틱 종료 후 Redis 왕복 수를 메트릭으로 남깁니다.
+
+    Args:
+        route_id: 경주 ID
+
+    Yields:
+        BotTickSession
+    """
+    pipeline = "on" if settings.BOT_TICK_REDIS_PIPELINE else "off"
+    with redis_client.bot_tick(
+        route_id, buffered=settings.BOT_TICK_REDIS_PIPELINE
+    ) as session:
+        yield session
+    metrics.incr("hadbetter_bot_ticks_total", pipeline=pipeline)
+    metrics.incr(
+        "hadbetter_bot_tick_redis_round_trips_total",
+        session.round_trips,
+        pipeline=pipeline,
+    )
+
+
+def _should_schedule_next_tick(route_id: int, result: dict) -> bool:
+    """틱 처리 후에도 봇이 진행 중인지 확인 (다음 틱 예약 여부)"""
+    if result.get("status") != "updated":
+        return False
+    updated_state = BotStateManager.get(route_id)
+    return bool(updated_state) and updated_state["status"] != BotStatus.FINISHED.value
+
+
 @shared_task(
     bind=True,
     max_retries=3,
@@ -159,7 +299,7 @@ def _calculate_total_progress(
 )
 def update_bot_position(self, route_id: int) -> dict:
     """
-    봇 위치 업데이트 Task (v3 - 동적 주기)
+    봇 위치 업데이트 Task (v3 - 동적 주기, chain 모드)
 
     이 Task는 실행 후 다음 Task를 동적 주기로 예약합니다.
     - 기본: 30초
@@ -172,133 +312,26 @@ def update_bot_position(self, route_id: int) -> dict:
         실행 결과 딕셔너리
     """
     try:
-        # 0. 경주 상태 확인 (CANCELED/FINISHED 체크) - Task 조기 종료
-        try:
-            route_check = Route.objects.only("id", "status").get(id=route_id)
-            if route_check.status in ["CANCELED", "FINISHED"]:
-                logger.info(
-                    f"경주 종료됨 (Task 중단): route_id={route_id}, status={route_check.status}"
-                )
-                # 봇 상태 정리
-                BotStateManager.delete(route_id)
-                return {
-                    "status": "route_ended",
-                    "route_id": route_id,
-                    "reason": route_check.status,
-                }
-        except Route.DoesNotExist:
-            logger.warning(f"경주를 찾을 수 없음 (Task 중단): route_id={route_id}")
-            BotStateManager.delete(route_id)
-            return {"status": "route_not_found", "route_id": route_id}
-
-        # 1. 봇 상태 조회
-        bot_state = BotStateManager.get(route_id)
-        if not bot_state:
-            logger.warning(f"봇 상태 없음: route_id={route_id}")
-            return {"status": "no_state", "route_id": route_id}
-
-        # 2. 이미 종료된 경우
-        if bot_state["status"] == BotStatus.FINISHED.value:
-            logger.info(f"봇 이미 종료됨: route_id={route_id}")
-            return {"status": "already_finished", "route_id": route_id}
-
-        # 3. 공공데이터 ID 조회
-        public_ids = redis_client.get_public_ids(route_id)
-        if not public_ids:
-            logger.warning(f"공공데이터 ID 없음: route_id={route_id}")
-            return {"status": "no_public_ids", "route_id": route_id}
-
-        # 4. 경로 데이터 조회
-        try:
-            route = Route.objects.select_related("route_leg").get(id=route_id)
-            legs = route.route_leg.raw_data.get("legs", [])
-            route_itinerary_id = route.route_itinerary_id
-        except Route.DoesNotExist:
-            logger.error(f"경주를 찾을 수 없음: route_id={route_id}")
-            return {"status": "route_not_found", "route_id": route_id}
-
-        current_leg_index = bot_state["current_leg_index"]
-
-        # 인덱스 범위 체크
-        if current_leg_index >= len(legs):
-            _finish_bot(route_id, route_itinerary_id, bot_state, legs)
-            return {"status": "finished", "route_id": route_id}
-
-        current_leg = legs[current_leg_index]
-        current_public_leg = public_ids["legs"][current_leg_index]
-
-        # 5. 상태별 처리 + 다음 폴링 간격 결정
-        next_interval = 30  # 기본값
-
-        if bot_state["status"] == BotStatus.WALKING.value:
-            next_interval = _handle_walking(
-                route_id, route_itinerary_id, bot_state, current_leg, legs, public_ids
-            )
-
-        elif bot_state["status"] == BotStatus.WAITING_BUS.value:
-            next_interval = _handle_waiting_bus(
-                route_id,
-                route_itinerary_id,
-                bot_state,
-                current_leg,
-                current_public_leg,
-                legs,
-            )
-
-        elif bot_state["status"] == BotStatus.RIDING_BUS.value:
-            next_interval = _handle_riding_bus(
-                route_id,
-                route_itinerary_id,
-                bot_state,
-                current_leg,
-                current_public_leg,
-                legs,
-                public_ids,
-            )
+        with _bot_tick_session(route_id):
+            result = _run_bot_tick(route_id)
 
-        elif bot_state["status"] == BotStatus.WAITING_SUBWAY.value:
-            next_interval = _handle_waiting_subway(
-                route_id,
-                route_itinerary_id,
-                bot_state,
-                current_leg,
-                current_public_leg,
-                legs,
-            )
-
-        elif bot_state["status"] == BotStatus.RIDING_SUBWAY.value:
-            next_interval = _handle_riding_subway(
-                route_id,
-                route_itinerary_id,
-                bot_state,
-                current_leg,
-                current_public_leg,
-                legs,
-                public_ids,
-            )
-
-        # 6. 다음 Task 예약 (종료되지 않은 경우)
-        updated_state = BotStateManager.get(route_id)
-        if updated_state and updated_state["status"] != BotStatus.FINISHED.value:
-            result = update_bot_position.apply_async(
-                args=[route_id], countdown=next_interval
-            )
-            # Task ID 저장 (즉시 취소용)
-            redis_client.set_task_id(route_id, result.id)
+            # 다음 Task 예약 (종료되지 않은 경우)
+            if _should_schedule_next_tick(route_id, result):
+                task = update_bot_position.apply_async(
+                    args=[route_id], countdown=result["next_interval"]
+                )
+                # Task ID 저장 (즉시 취소용)
+                redis_client.set_task_id(route_id, task.id)
 
-        return {
-            "status": "updated",
-            "route_id": route_id,
-            "next_interval": next_interval,
-        }
+        return result
 
     except SoftTimeLimitExceeded:
         # 소프트 타임아웃: Task가 너무 오래 걸림 (60초 초과)
         logger.warning(f"봇 위치 업데이트 타임아웃: route_id={route_id}")
         # 다음 Task는 예약하고 현재 Task는 종료
-        result = update_bot_position.apply_async(args=[route_id], countdown=30)
+        task = update_bot_position.apply_async(args=[route_id], countdown=30)
         # Task ID 저장 (즉시 취소용)
-        redis_client.set_task_id(route_id, result.id)
+        redis_client.set_task_id(route_id, task.id)
         return {"status": "timeout", "route_id": route_id}
 
     except RedisConnectionError as e:
@@ -311,29 +344,116 @@ def update_bot_position(self, route_id: int) -> dict:
         # 재시도
         raise self.retry(exc=e, countdown=30)
 
+    finally:
+        # 틱 동안 모인 카운터 반영
+        metrics.flush()
+
+
+def schedule_bot_tick(route_id: int, countdown: float = 0) -> None:
+    """
+    봇 다음 틱 예약 (BOT_TICK_MODE에 따라 chain/batch 분기)
+
+    Args:
+        route_id: 경주 ID
+        countdown: 실행까지 대기 시간 (초)
+    """
+    if settings.BOT_TICK_MODE == "batch":
+        redis_client.schedule_bot_tick(route_id, clock.time() + countdown)
+        return
+
+    task = update_bot_position.apply_async(args=[route_id], countdown=countdown)
+    # Task ID 저장 (즉시 취소용)
+    redis_client.set_task_id(route_id, task.id)
+
+
+def _reschedule_bot_tick(route_id: int, countdown: float) -> None:
+    """배치 모드 틱 재예약 (실패 시 claim lease 만료 후 자동 재처리)"""
+    try:
+        redis_client.schedule_bot_tick(route_id, clock.time() + countdown)
+    except RedisConnectionError as e:
+        logger.warning(f"봇 틱 재예약 실패: route_id={route_id}, error={e}")
+
+
+@shared_task(
+    soft_time_limit=50,  # 소프트 타임아웃: 50초 (남은 봇은 다음 배치로)
+    time_limit=80,  # 하드 타임아웃: 80초 (claim lease보다 짧게)
+)
+def process_due_bot_ticks() -> dict:
+    """
+    실행 시각이 된 봇들을 한 번에 처리하는 Task (batch 모드)
+
+    Celery Beat가 1초마다 실행합니다.
+    Sorted Set에서 실행 시각이 지난 봇을 claim한 뒤 상태별 핸들러를 그대로 실행하고,
+    핸들러가 결정한 주기(5초/10초/15초/30초)로 다음 틱을 다시 예약합니다.
 
-def _calculate_walking_position(current_leg: dict, progress: float) -> tuple:
+    Returns:
+        실행 결과 딕셔너리
+    """
+    try:
+        route_ids = redis_client.claim_due_bot_ticks(
+            clock.time(),
+            limit=settings.BOT_TICK_BATCH_SIZE,
+            lease=BOT_TICK_CLAIM_LEASE,
+        )
+    except RedisConnectionError as e:
+        logger.warning(f"봇 틱 claim 실패: error={e}")
+        return {"status": "redis_error", "processed": 0}
+
+    processed = 0
+    for index, route_id in enumerate(route_ids):
+        try:
+            with _bot_tick_session(route_id):
+                result = _run_bot_tick(route_id)
+                if _should_schedule_next_tick(route_id, result):
+                    _reschedule_bot_tick(route_id, result["next_interval"])
+                else:
+                    redis_client.unschedule_bot_tick(route_id)
+            processed += 1
+
+        except SoftTimeLimitExceeded:
+            # 남은 봇은 다음 배치에서 바로 처리
+            logger.warning(
+                f"봇 틱 배치 타임아웃: processed={processed}, "
+                f"remaining={len(route_ids) - index}"
+            )
+            for remaining_id in route_ids[index:]:
+                _reschedule_bot_tick(remaining_id, 0)
+            break
+
+        except RedisConnectionError as e:
+            logger.warning(
+                f"Redis 연결 오류 (10초 후 재시도): route_id={route_id}, error={e}"
+            )
+            _reschedule_bot_tick(route_id, 10)
+
+        except Exception as e:
+            logger.exception(f"봇 위치 업데이트 실패: route_id={route_id}, error={e}")
+            _reschedule_bot_tick(route_id, 30)
+
+    # 배치 동안 모인 카운터 반영
+    metrics.flush()
+    return {"status": "processed", "claimed": len(route_ids), "processed": processed}
+
+
+def _calculate_walking_position(
+    route_id: int, leg_index: int, current_leg: dict, progress: float
+) -> tuple:
     """
     도보 구간에서 진행률 기반 현재 위치 계산
 
     Args:
+        route_id: 경주 ID
+        leg_index: 현재 leg 인덱스
         current_leg: 현재 leg 데이터
         progress: 현재 leg 내 진행률 (0.0 ~ 1.0)
 
     Returns:
         (lon, lat) 튜플 또는 None
     """
-    # pass_shape가 있으면 경로 위에서 보간
-    pass_shape = current_leg.get("passShape", {})
-    linestring = pass_shape.get("linestring") if isinstance(pass_shape, dict) else None
-
-    if linestring:
-        coords = _parse_pass_shape(linestring)
-        if coords and len(coords) >= 2:
-            # 진행률에 해당하는 좌표 인덱스 계산
-            idx = int(progress * (len(coords) - 1))
-            idx = max(0, min(idx, len(coords) - 1))
-            return coords[idx][0], coords[idx][1]
+    # 경로선이 있으면 경로 위에서 보간 (거리 기준)
+    path = LegGeometryCache.get(route_id, leg_index, current_leg)
+    if path is not None:
+        return path.point_at_fraction(progress)
 
     # pass_shape가 없으면 start/end 선형 보간
     start = current_leg.get("start", {})
@@ -367,7 +487,7 @@ def _handle_walking(
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
 
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
     section_time = current_leg.get("sectionTime", 0)
 
     # 도보 구간 완료 여부 체크
@@ -399,7 +519,9 @@ def _handle_walking(
         leg_progress = min(elapsed / section_time, 1.0) if section_time > 0 else 0
 
         # 현재 위치 계산 및 업데이트
-        position = _calculate_walking_position(current_leg, leg_progress)
+        position = _calculate_walking_position(
+            route_id, bot_state["current_leg_index"], current_leg, leg_progress
+        )
         if position:
             BotStateManager.update_position(route_id, lon=position[0], lat=position[1])
 
@@ -507,7 +629,7 @@ def _handle_waiting_bus_fallback(
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
 
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
 
     # TMAP 예상 시간의 20%를 대기 시간으로 사용 (최소 60초, 최대 300초)
     section_time = current_leg.get("sectionTime", 300)
@@ -579,7 +701,7 @@ def _handle_riding_bus_fallback(
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
 
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
     section_time = current_leg.get("sectionTime", 600)
     distance = current_leg.get("distance", 0)
 
@@ -680,17 +802,12 @@ def _handle_riding_bus_fallback(
     pass_stops = public_leg.get("pass_stops", [])
     current_station = _estimate_current_station(elapsed, section_time, pass_stops)
 
-    # 버스 위치 추정 (pass_shape 기반 보간)
+    # 버스 위치 추정 (경로선 기반 보간)
     leg_progress = min(elapsed / section_time, 1.0) if section_time > 0 else 0
-    pass_shape = public_leg.get("pass_shape")
-    if pass_shape:
-        coords = _parse_pass_shape(pass_shape)
-        if coords and len(coords) >= 2:
-            idx = int(leg_progress * (len(coords) - 1))
-            idx = max(0, min(idx, len(coords) - 1))
-            BotStateManager.update_position(
-                route_id, lon=coords[idx][0], lat=coords[idx][1]
-            )
+    path = LegGeometryCache.get(route_id, bot_state["current_leg_index"], current_leg)
+    if path is not None:
+        lon, lat = path.point_at_fraction(leg_progress)
+        BotStateManager.update_position(route_id, lon=lon, lat=lat)
 
     # 업데이트된 봇 상태 조회 (current_position 포함)
     updated_bot_state = BotStateManager.get(route_id) or bot_state
@@ -745,7 +862,7 @@ def _handle_waiting_subway_fallback(
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
 
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
     wait_time = 120  # 2분 대기
 
     if elapsed >= wait_time:
@@ -808,7 +925,7 @@ def _handle_riding_subway_fallback(
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
 
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
     section_time = current_leg.get("sectionTime", 600)
     distance = current_leg.get("distance", 0)
 
@@ -877,17 +994,12 @@ def _handle_riding_subway_fallback(
     pass_stops = public_leg.get("pass_stops", [])
     current_station = _estimate_current_station(elapsed, section_time, pass_stops)
 
-    # 지하철 위치 추정 (pass_shape 기반 보간)
+    # 지하철 위치 추정 (경로선 기반 보간)
     leg_progress = min(elapsed / section_time, 1.0) if section_time > 0 else 0
-    pass_shape = public_leg.get("pass_shape")
-    if pass_shape:
-        coords = _parse_pass_shape(pass_shape)
-        if coords and len(coords) >= 2:
-            idx = int(leg_progress * (len(coords) - 1))
-            idx = max(0, min(idx, len(coords) - 1))
-            BotStateManager.update_position(
-                route_id, lon=coords[idx][0], lat=coords[idx][1]
-            )
+    path = LegGeometryCache.get(route_id, bot_state["current_leg_index"], current_leg)
+    if path is not None:
+        lon, lat = path.point_at_fraction(leg_progress)
+        BotStateManager.update_position(route_id, lon=lon, lat=lat)
 
     # 업데이트된 봇 상태 조회 (current_position 포함)
     updated_bot_state = BotStateManager.get(route_id) or bot_state
@@ -958,7 +1070,7 @@ def _handle_waiting_bus(
     logger.info(
         f"버스 API 호출: route_id={route_id}, st_id={st_id}, bus_route_id={bus_route_id}"
     )
-    arrival_info = bus_api_client.get_arrival_info(st_id, bus_route_id)
+    arrival_info = RealtimeCache.get_bus_arrival(st_id, bus_route_id)
     logger.info(
         f"버스 API 응답: route_id={route_id}, arrival_info={'있음' if arrival_info else '없음'}"
     )
@@ -1020,7 +1132,8 @@ def _handle_waiting_bus(
             )
 
     # API 성공 → 재시도 카운터 리셋
-    BotStateManager.reset_retry_count(route_id)
+    if bot_state.get("api_retry_count"):
+        BotStateManager.reset_retry_count(route_id)
 
     # 첫 번째 버스 확인
     veh_id = arrival_info.get("vehId1")
@@ -1040,7 +1153,7 @@ def _handle_waiting_bus(
     # 버스 위치 조회 (vehId가 있을 때)
     bus_position = None
     if veh_id and veh_id != "0":
-        pos = bus_api_client.get_bus_position(veh_id)
+        pos = RealtimeCache.get_bus_position(veh_id)
         if pos:
             try:
                 bus_position = {
@@ -1068,7 +1181,7 @@ def _handle_waiting_bus(
                     from dateutil import parser
 
                     started_time = parser.isoparse(leg_started_at)
-                    elapsed = (timezone.now() - started_time).total_seconds()
+                    elapsed = (clock.now() - started_time).total_seconds()
 
                     if elapsed < MAX_WAITING_TIME:
                         logger.info(
@@ -1158,6 +1271,53 @@ def _handle_waiting_bus(
     return next_interval
 
 
+def _snap_forward(
+    path: CompiledPath, bot_state: dict, lon: float, lat: float
+) -> SnapResult:
+    """
+    직전에 매칭된 세그먼트부터 앞쪽 윈도우만 탐색하는 경로 스냅핑
+
+    봇은 경로선을 따라 앞으로만 이동하므로 매 틱 전체 경로를 탐색하지 않고,
+    GPS 오차로 이전 구간이나 평행한 구간에 붙는 것도 막습니다.
+    윈도우 안에서 가까운 점을 못 찾으면 앞쪽으로 넓힌 범위
+    (SNAP_FALLBACK_WINDOWS개 윈도우, 최대 SNAP_FALLBACK_MAX_ADVANCE_M 전진)를 1회 더 탐색하고,
+    결과가 직전 위치보다 뒤라면 직전 위치를 유지합니다.
+
+    Args:
+        path: 현재 leg 경로선
+        bot_state: 봇 상태 (snap_leg_index, snap_segment_index, snap_along_m)
+        lon: GPS 경도
+        lat: GPS 위도
+
+    Returns:
+        SnapResult
+    """
+    if bot_state.get("snap_leg_index") == bot_state["current_leg_index"]:
+        last_segment = bot_state.get("snap_segment_index") or 0
+        last_along = bot_state.get("snap_along_m") or 0.0
+    else:
+        last_segment, last_along = 0, 0.0
+
+    result = path.snap_detail(
+        lon, lat, start=last_segment, end=last_segment + SNAP_WINDOW_SEGMENTS
+    )
+    if result.distance_m > SNAP_WINDOW_MAX_OFFSET_M:
+        end = min(
+            last_segment + SNAP_WINDOW_SEGMENTS * SNAP_FALLBACK_WINDOWS,
+            bisect_right(path.cum_m, last_along + SNAP_FALLBACK_MAX_ADVANCE_M),
+        )
+        wide_result = path.snap_detail(lon, lat, start=last_segment, end=end)
+        if wide_result.distance_m < result.distance_m:
+            result = wide_result
+
+    if result.along_m < last_along:
+        held_lon, held_lat = path.point_at_distance(last_along)
+        result = SnapResult(
+            held_lon, held_lat, last_segment, last_along, result.distance_m
+        )
+    return result
+
+
 def _handle_riding_bus(
     route_id: int,
     route_itinerary_id: int,
@@ -1188,7 +1348,7 @@ def _handle_riding_bus(
     leg_started_at = datetime.fromisoformat(bot_state["leg_started_at"])
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
 
     # 디버깅: current_leg 데이터 확인
     logger.info(
@@ -1202,13 +1362,17 @@ def _handle_riding_bus(
     # leg 기준 진행률 (하차 판정용)
     leg_progress = min((elapsed / section_time) * 100, 100) if section_time > 0 else 0
 
-    # 전체 경로 기준 진행률 (SSE용)
-    progress_percent = _calculate_total_progress(
-        legs, bot_state["current_leg_index"], elapsed, section_time
+    # 전체 경로 기준 진행률 (SSE용, 이전에 보고한 값보다 줄어들지 않음)
+    reported_progress = bot_state.get("progress_percent") or 0
+    progress_percent = max(
+        reported_progress,
+        _calculate_total_progress(
+            legs, bot_state["current_leg_index"], elapsed, section_time
+        ),
     )
 
     # 버스 위치 조회
-    pos = bus_api_client.get_bus_position(veh_id)
+    pos = RealtimeCache.get_bus_position(veh_id)
     if not pos:
         # API 응답 없을 때 시간 기반 하차 판정 (leg 기준 100%)
         if leg_progress >= 100:
@@ -1252,24 +1416,45 @@ def _handle_riding_bus(
 
     # 버스 위치로 봇 위치 업데이트 (경로 스냅핑 적용)
     if bus_lon and bus_lat:
-        # 경로 스냅핑: 버스 GPS를 pass_shape 경로선에 투영
-        pass_shape = public_leg.get("pass_shape")
-        if pass_shape:
-            coords = _parse_pass_shape(pass_shape)
-            if coords and len(coords) >= 2:
-                snapped_lon, snapped_lat = _snap_to_path(bus_lon, bus_lat, coords)
-                # 스냅핑 거리가 큰 경우에만 로그 (디버깅용)
-                snap_distance = calculate_distance(
-                    bus_lat, bus_lon, snapped_lat, snapped_lon
+        # 경로 스냅핑: 버스 GPS를 경로선에 투영
+        path = LegGeometryCache.get(
+            route_id, bot_state["current_leg_index"], current_leg
+        )
+        if path is not None:
+            snapped = _snap_forward(path, bot_state, bus_lon, bus_lat)
+            # 스냅핑 거리가 큰 경우에만 로그 (디버깅용)
+            snap_distance = calculate_distance(
+                bus_lat, bus_lon, snapped.lat, snapped.lon
+            )
+            if snap_distance > 100:
+                logger.info(
+                    f"버스 위치 스냅핑: route_id={route_id}, "
+                    f"보정거리={int(snap_distance)}m"
                 )
-                if snap_distance > 100:
-                    logger.info(
-                        f"버스 위치 스냅핑: route_id={route_id}, "
-                        f"보정거리={int(snap_distance)}m"
-                    )
-                bus_lon, bus_lat = snapped_lon, snapped_lat
-
-        BotStateManager.update_position(route_id, lon=bus_lon, lat=bus_lat)
+            bus_lon, bus_lat = snapped.lon, snapped.lat
+
+            # 경로선 위 이동 거리 기준 진행률
+            leg_fraction = snapped.along_m / path.total_m if path.total_m > 0 else 0
+            progress_percent = max(
+                reported_progress,
+                _calculate_total_progress(
+                    legs,
+                    bot_state["current_leg_index"],
+                    leg_fraction * section_time,
+                    section_time,
+                ),
+            )
+            BotStateManager.update_snapped_position(
+                route_id,
+                lon=bus_lon,
+                lat=bus_lat,
+                leg_index=bot_state["current_leg_index"],
+                segment_index=snapped.segment_index,
+                along_m=snapped.along_m,
+                progress_percent=progress_percent,
+            )
+        else:
+            BotStateManager.update_position(route_id, lon=bus_lon, lat=bus_lat)
 
     # 하차 정류소 도착 확인 (거리 기반만 사용)
     end_station = public_leg.get("end_station", {})
@@ -1391,9 +1576,6 @@ def _alight_from_bus(
         station_name=end_station.get("name", "") if end_station else "",
     )
 
-    # pending_alight 플래그 제거
-    BotStateManager.update(route_id, pending_alight=False)
-
     next_leg_index = bot_state["current_leg_index"] + 1
 
     if next_leg_index >= len(legs):
@@ -1455,13 +1637,13 @@ def _handle_waiting_subway(
             route_id, route_itinerary_id, bot_state, current_leg, public_leg, legs
         )
 
-    # 도착정보 조회
-    arrivals = subway_api_client.get_arrival_info(start_station)
+    # 도착정보 조회 (역 기준 공유 스냅샷)
+    arrival_index = RealtimeCache.get_subway_arrivals(start_station)
 
     # 방향 필터링 (pass_stops 활용)
     pass_stops = public_leg.get("pass_stops", [])
-    target_train = subway_api_client.filter_by_direction(
-        arrivals, subway_line_id, end_station, pass_stops
+    target_train = subway_api_client.filter_indexed_by_direction(
+        arrival_index, subway_line_id, end_station, pass_stops
     )
 
     # 열차를 찾지 못하면 재시도 또는 fallback 사용
@@ -1510,7 +1692,8 @@ def _handle_waiting_subway(
             )
 
     # API 성공 → 재시도 카운터 리셋
-    BotStateManager.reset_retry_count(route_id)
+    if bot_state.get("api_retry_count"):
+        BotStateManager.reset_retry_count(route_id)
 
     train_no = target_train.get("btrainNo")
     arrival_time = int(target_train.get("barvlDt", 0) or 0)
@@ -1543,11 +1726,10 @@ def _handle_waiting_subway(
     # 대기 중 - 동적 주기 결정
     next_interval = BotStateManager.update_arrival_time(route_id, arrival_time)
 
-    # 열차 위치 조회
+    # 열차 위치 조회 (노선 스냅샷)
     train_position = None
     if train_no and subway_line:
-        positions = subway_api_client.get_train_position(subway_line)
-        pos = subway_api_client.filter_by_train_no(positions, train_no)
+        pos = RealtimeCache.get_subway_train_position(subway_line, train_no)
         if pos:
             train_position = {
                 "current_station": pos.get("statnNm"),
@@ -1636,7 +1818,7 @@ def _handle_riding_subway(
     leg_started_at = datetime.fromisoformat(bot_state["leg_started_at"])
     if leg_started_at.tzinfo is None:
         leg_started_at = timezone.make_aware(leg_started_at)
-    elapsed = (timezone.now() - leg_started_at).total_seconds()
+    elapsed = (clock.now() - leg_started_at).total_seconds()
 
     # 디버깅: current_leg 데이터 확인
     logger.info(
@@ -1655,9 +1837,8 @@ def _handle_riding_subway(
         legs, bot_state["current_leg_index"], elapsed, section_time
     )
 
-    # 열차 위치 조회
-    positions = subway_api_client.get_train_position(subway_line)
-    pos = subway_api_client.filter_by_train_no(positions, train_no)
+    # 열차 위치 조회 (노선 스냅샷)
+    pos = RealtimeCache.get_subway_train_position(subway_line, train_no)
 
     if not pos:
         # API 응답 없을 때 시간 기반 하차 판정 (leg 기준 100%)
@@ -1893,9 +2074,6 @@ def _alight_from_subway(
     elif next_leg["mode"] == "SUBWAY":
         BotStateManager.transition_to_waiting_subway(route_id, next_leg_index)
 
-    # pending_alight 플래그 제거
-    BotStateManager.update(route_id, pending_alight=False)
-
     # 🚇 상태 전환 후 즉시 bot_status_update 발행 (프론트엔드에서 새 좌표 적용)
     updated_bot_state = BotStateManager.get(route_id)
     if updated_bot_state:
@@ -1991,7 +2169,7 @@ def _finish_bot(
 
     try:
         route = Route.objects.get(id=route_id)
-        route.end_time = timezone.now()
+        route.end_time = clock.now()
 
         if route.start_time:
             route.duration = int((route.end_time - route.start_time).total_seconds())
@@ -2000,6 +2178,7 @@ def _finish_bot(
 
         route.status = Route.Status.FINISHED
         route.save()
+        RouteCache.set_status(route_id, Route.Status.FINISHED)
 
         # 순위 계산: 같은 경주(route_itinerary + start_time)에서 자신보다 먼저 도착한 참가자 수 + 1 (duration 기준)
         rank = (
@@ -2036,15 +2215,8 @@ def _finish_bot(
             f"봇 도착 SSE 발행: route_id={route_id}, bot_id={bot_state['bot_id']}, rank={rank}, duration={route.duration}"
         )
 
-        # 모든 참가자 완주 여부 확인 (같은 경주만)
-        unfinished = Route.objects.filter(
-            route_itinerary_id=route_itinerary_id,
-            start_time=route.start_time,
-            end_time__isnull=True,
-            deleted_at__isnull=True,
-        ).count()
-
-        if unfinished == 0:
+        # 모든 참가자 완주 여부 확인 (마지막 참가자면 경주 종료)
+        if RouteCache.finish_participant(route):
             SSEPublisher.publish_route_ended(route_itinerary_id)
             logger.info(f"경주 종료 SSE 발행: route_itinerary_id={route_itinerary_id}")
 
@@ -2053,63 +2225,3 @@ def _finish_bot(
 
     # 7. 봇 상태 정리 (마지막에 삭제)
     BotStateManager.delete(route_id)
-
-
-def _closest_point_on_segment(lon: float, lat: float, p1: list, p2: list) -> tuple:
-    """
-    선분에서 점까지의 최단 거리 점 계산 (투영)
-
-    Args:
-        lon, lat: 점의 좌표
-        p1, p2: 선분의 양 끝점 [lon, lat]
-
-    Returns:
-        (closest_lon, closest_lat)
-    """
-    # 벡터 계산
-    dx = p2[0] - p1[0]
-    dy = p2[1] - p1[1]
-
-    # 선분의 길이가 0인 경우
-    if dx == 0 and dy == 0:
-        return (p1[0], p1[1])
-
-    # 투영 비율 계산 (0~1 사이로 클램핑)
-    t = max(0, min(1, ((lon - p1[0]) * dx + (lat - p1[1]) * dy) / (dx * dx + dy * dy)))
-
-    # 최단 거리 점
-    return (p1[0] + t * dx, p1[1] + t * dy)
-
-
-def _snap_to_path(lon: float, lat: float, path_coords: list) -> tuple:
-    """
-    GPS 좌표를 경로선에서 가장 가까운 점으로 스냅핑
-
-    Args:
-        lon: 실제 경도
-        lat: 실제 위도
-        path_coords: 경로 좌표 배열 [[lon, lat], ...]
-
-    Returns:
-        (snapped_lon, snapped_lat)
-    """
-    if not path_coords or len(path_coords) < 2:
-        return (lon, lat)
-
-    min_distance = float("inf")
-    snapped_point = (lon, lat)
-
-    # 각 경로 세그먼트에서 최단 거리 점 찾기
-    for i in range(len(path_coords) - 1):
-        p1 = path_coords[i]
-        p2 = path_coords[i + 1]
-
-        # 점에서 선분까지의 최단 거리 점 계산
-        closest = _closest_point_on_segment(lon, lat, p1, p2)
-        dist = calculate_distance(lat, lon, closest[1], closest[0])
-
-        if dist < min_distance:
-            min_distance = dist
-            snapped_point = closest
-
-    return snapped_point
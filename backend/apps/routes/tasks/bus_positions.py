@@ -3,56 +3,55 @@ Celery 태스크 - 버스 실시간 위치 데이터 캐싱
 
 외부 API에서 버스 위치 데이터를 주기적으로 가져와 Redis에 캐싱합니다.
 Django API는 Redis에서 바로 읽어서 빠르게 응답할 수 있습니다.
+
+수집 노선은 매번 BusRouteDemand가 선정합니다.
+(진행 중 경주 노선 → 최근 조회 많은 노선 → 기본 노선, 최대 BUS_POSITION_ROUTE_BUDGET개)
+노선별 응답은 공유 캐시에도 저장해 track/realtime API 조회가 캐시에서 응답합니다.
+
+전체 목록과 함께 지도 타일별 인덱스(BusPositionIndex)도 저장해
+영역 조회는 화면과 겹치는 타일만 읽습니다.
+최근 수집 세대 대비 변경분(BusPositionFeed)도 미리 만들어 두어
+지도를 켜 둔 클라이언트는 바뀐 버스만 받습니다.
+차량별 최근 위치 기록(BusDeadReckoning)으로 수집 사이의 위치도 추정합니다.
 """
 
 import json
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from django.conf import settings
 from django.core.cache import cache
 
 from celery import shared_task
 
+from ..services.bus_dead_reckoning import BusDeadReckoning, BusRoutePath
+from ..services.bus_position_feed import BusPositionFeed
+from ..services.bus_position_index import BusPositionIndex
+from ..services.bus_route_demand import BusRouteDemand
+from ..services.realtime_cache import RealtimeCache
+from ..utils import clock
 from ..utils.bus_api_client import bus_api_client
+from ..utils.redis_client import RedisConnectionError
 
 logger = logging.getLogger(__name__)
 
 # 캐시 키
 BUS_POSITIONS_CACHE_KEY = "bus:positions:all"
-BUS_POSITIONS_CACHE_TTL = 65  # 65초 (60초 폴링 + 여유 5초)
-
-# 서울시 주요 버스 노선 목록 (15개로 축소 - API 제한 고려)
-# 60초마다 15개 노선 조회 = 분당 15회 = 시간당 900회 = 하루 21,600회
-# 공공데이터포털 기본 할당량(1,000회/일) 초과하므로 할당량 증가 신청 필요
-POPULAR_BUS_ROUTES = [
-    # 간선버스 (파랑) - 8개 (주요 노선)
-    ("100100057", "360"),  # 360번 (강남-마포)
-    ("100100118", "472"),  # 472번 (강남-신촌)
-    ("100100016", "151"),  # 151번 (중랑-여의도)
-    ("100100043", "261"),  # 261번 (마포-강남)
-    ("100100001", "100"),  # 100번 (용산-중구)
-    ("100100065", "402"),  # 402번 (종로-서초)
-    ("100100124", "501"),  # 501번 (방배-광화문)
-    ("100100019", "162"),  # 162번 (광진-여의도)
-    # 지선버스 (초록) - 5개
-    ("100100463", "5513"),  # 5513번
-    ("100100559", "6411"),  # 6411번
-    ("100100609", "7011"),  # 7011번
-    ("100100650", "7211"),  # 7211번
-    ("100100428", "5524"),  # 5524번
-    # 광역버스 (빨강) - 2개
-    ("100100260", "9401"),  # 9401번
-    ("100100261", "9402"),  # 9402번
-]
-
-
-def fetch_route_buses(route_info: tuple) -> list:
-    """단일 노선의 버스 위치 조회"""
+# 다음 수집까지 유지할 여유 시간 (초, 수집 주기 + 여유)
+BUS_POSITIONS_CACHE_TTL_MARGIN = 5
+
+
+def fetch_route_buses(route_info: tuple, ttl: int) -> list:
+    """단일 노선의 버스 위치 조회 (노선별 응답은 ttl초 동안 공유 캐시에 저장)"""
     route_id, bus_number = route_info
     result = []
 
     try:
         buses = bus_api_client.get_bus_positions_by_route(route_id)
+        try:
+            RealtimeCache.store_bus_route_positions(route_id, buses, ttl)
+        except RedisConnectionError as e:
+            logger.warning(f"노선 {route_id} 버스 위치 공유 캐시 저장 실패: {e}")
 
         for bus in buses:
             try:
@@ -85,25 +84,36 @@ def fetch_route_buses(route_info: tuple) -> list:
     except Exception as e:
         logger.warning(f"노선 {route_id} 버스 위치 조회 실패: {e}")
 
+    if result:
+        # 위치 추정용 노선 경로선 준비 (캐시에 없을 때만 정류소 API 호출)
+        # 실패해도 수집한 위치는 그대로 사용 (추정만 생략)
+        try:
+            BusRoutePath.get(route_id)
+        except RedisConnectionError as e:
+            logger.warning(f"노선 {route_id} 경로선 저장 실패: {e}")
+        except Exception as e:
+            logger.warning(f"노선 {route_id} 경로선 생성 실패: {e}")
+
     return result
 
 
 @shared_task(bind=True, name="apps.routes.tasks.fetch_all_bus_positions")
 def fetch_all_bus_positions(self):
     """
-    모든 인기 노선의 버스 위치를 조회하여 Redis에 캐싱
+    수요 기반으로 선정한 노선의 버스 위치를 조회하여 Redis에 캐싱
 
-    Celery Beat이 30초마다 이 태스크를 실행합니다.
+    Celery Beat이 BUS_POSITION_COLLECT_INTERVAL초마다 이 태스크를 실행합니다.
     """
-    logger.info("버스 위치 데이터 수집 시작...")
+    routes = BusRouteDemand.select_routes()
+    ttl = settings.BUS_POSITION_COLLECT_INTERVAL + BUS_POSITIONS_CACHE_TTL_MARGIN
+    logger.info(f"버스 위치 데이터 수집 시작... (노선 {len(routes)}개)")
 
     all_buses = []
 
     # 병렬로 모든 노선 조회 (최대 15개 스레드)
-    with ThreadPoolExecutor(max_workers=15) as executor:
+    with ThreadPoolExecutor(max_workers=max(1, min(len(routes), 15))) as executor:
         futures = {
-            executor.submit(fetch_route_buses, route): route
-            for route in POPULAR_BUS_ROUTES
+            executor.submit(fetch_route_buses, route, ttl): route for route in routes
         }
 
         for future in as_completed(futures):
@@ -117,21 +127,40 @@ def fetch_all_bus_positions(self):
     # Redis에 캐싱
     cache_data = {
         "buses": all_buses,
-        "routes_count": len(POPULAR_BUS_ROUTES),
+        "routes_count": len(routes),
         "total_buses": len(all_buses),
     }
 
-    cache.set(
-        BUS_POSITIONS_CACHE_KEY, json.dumps(cache_data), timeout=BUS_POSITIONS_CACHE_TTL
-    )
+    cache.set(BUS_POSITIONS_CACHE_KEY, json.dumps(cache_data), timeout=ttl)
+
+    # 변경분 피드 → 지도 영역 조회용 타일 인덱스 순으로 같은 버전 저장
+    # (타일 인덱스가 새 버전으로 바뀔 때 피드 본문이 이미 준비되어 있음)
+    version = BusPositionIndex.new_version()
+    try:
+        BusPositionFeed.publish(version, all_buses, ttl=ttl)
+    except RedisConnectionError as e:
+        logger.warning(f"버스 위치 변경분 피드 저장 실패: {e}")
+    try:
+        BusPositionIndex.store(
+            all_buses,
+            len(routes),
+            ttl=ttl,
+            version=version,
+        )
+    except RedisConnectionError as e:
+        logger.warning(f"버스 위치 타일 인덱스 저장 실패: {e}")
+    try:
+        BusDeadReckoning.update(all_buses, clock.time(), ttl=ttl)
+    except RedisConnectionError as e:
+        logger.warning(f"버스 위치 기록 저장 실패: {e}")
 
     logger.info(
-        f"버스 위치 데이터 캐싱 완료: {len(all_buses)}대 (노선 {len(POPULAR_BUS_ROUTES)}개)"
+        f"버스 위치 데이터 캐싱 완료: {len(all_buses)}대 (노선 {len(routes)}개)"
     )
 
     return {
         "total_buses": len(all_buses),
-        "routes_count": len(POPULAR_BUS_ROUTES),
+        "routes_count": len(routes),
     }
 
 
@@ -0,0 +1,56 @@
+"""
+Celery 태스크 - 지하철 노선별 열차 위치 스냅샷 수집
+
+realtimePosition API는 노선 전체 열차를 한 번에 응답하므로,
+봇마다 API를 호출하지 않고 활성 노선만 주기적으로 1회씩 조회해
+trainNo 기준 Hash로 Redis에 저장합니다.
+
+활성 노선: 최근 SUBWAY_ACTIVE_LINE_WINDOW초 안에 봇이 스냅샷을 조회한 노선
+(API 호출 수는 봇 수가 아닌 활성 노선 수에 비례)
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from celery import shared_task
+
+from ..services.realtime_cache import RealtimeCache
+from ..utils import clock
+from ..utils.redis_client import RedisConnectionError, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apps.routes.tasks.collect_subway_positions")
+def collect_subway_positions() -> dict:
+    """
+    활성 노선 열차 위치 스냅샷 수집
+
+    Celery Beat이 SUBWAY_POSITION_COLLECT_INTERVAL초마다 이 태스크를 실행합니다.
+    """
+    since = clock.time() - settings.SUBWAY_ACTIVE_LINE_WINDOW
+    try:
+        lines = redis_client.get_active_subway_lines(since)
+    except RedisConnectionError as e:
+        logger.warning(f"활성 지하철 노선 조회 실패: error={e}")
+        return {"status": "redis_error"}
+
+    if not lines:
+        return {"status": "idle", "lines": 0}
+
+    trains = 0
+    with ThreadPoolExecutor(max_workers=min(len(lines), 8)) as executor:
+        futures = {
+            executor.submit(RealtimeCache.refresh_subway_snapshot, line): line
+            for line in lines
+        }
+        for future, line in futures.items():
+            try:
+                trains += future.result()
+            except Exception as e:
+                logger.warning(f"지하철 위치 스냅샷 수집 실패: line={line}, error={e}")
+
+    logger.info(f"지하철 위치 스냅샷 수집: 노선 {len(lines)}개, 열차 {trains}대")
+    return {"status": "collected", "lines": len(lines), "trains": trains}
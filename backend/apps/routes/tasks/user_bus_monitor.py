@@ -0,0 +1,92 @@
+"""
+Celery 태스크 - 유저 버스 도착 정보 조회
+
+경주 생성 시 등록된 유저 경주(버스 구간 포함)마다 UserBusMonitor로 도착 정보를
+조회해 user_bus_arrival 이벤트로 발행합니다.
+
+SSE 연결마다 조회하지 않으므로 API 호출 수는 열린 탭 수가 아닌
+진행 중 유저 경주 수에 비례합니다.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from celery import shared_task
+
+from ..models import Route
+from ..services.route_cache import RouteCache
+from ..services.sse_publisher import SSEPublisher
+from ..services.user_bus_monitor import UserBusMonitor
+from ..utils.redis_client import RedisConnectionError, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def _check_user_bus(route_id: int, state: dict) -> bool:
+    """
+    유저 경주 1개 도착 정보 조회 및 발행
+
+    Returns:
+        user_bus_arrival 발행 여부
+    """
+    try:
+        route_status = RouteCache.get_status(route_id)
+    except Route.DoesNotExist:
+        route_status = None
+    if route_status != Route.Status.RUNNING:
+        redis_client.delete_user_bus_monitor(route_id)
+        return False
+
+    monitor = UserBusMonitor.from_dict(route_id, state)
+    bus_info = monitor.check_arrival()
+
+    if monitor.is_done:
+        redis_client.delete_user_bus_monitor(route_id)
+        logger.info(f"[UserBusMonitor] 조회 종료: route_id={route_id}")
+    else:
+        redis_client.set_user_bus_monitor(route_id, monitor.to_dict())
+
+    # ACTIVE 상태일 때만 이벤트 전송
+    if not bus_info or bus_info.get("status") != "ACTIVE":
+        return False
+
+    logger.info(
+        f"🚍 [User Bus Check] {bus_info['bus_name']} -> {bus_info['station_name']}, "
+        f"status={bus_info['arrival_message']}, "
+        f"time_left={bus_info['remaining_time']}s, vehicle_id={bus_info['vehicle_id']}"
+    )
+    SSEPublisher.publish_user_bus_arrival(monitor.route_itinerary_id, bus_info)
+    return True
+
+
+@shared_task(name="apps.routes.tasks.monitor_user_buses")
+def monitor_user_buses() -> dict:
+    """
+    등록된 유저 경주의 버스 도착 정보 조회
+
+    Celery Beat이 USER_BUS_MONITOR_INTERVAL초마다 이 태스크를 실행합니다.
+    """
+    try:
+        monitors = redis_client.get_user_bus_monitors()
+    except RedisConnectionError as e:
+        logger.warning(f"유저 버스 모니터 조회 실패: error={e}")
+        return {"status": "redis_error"}
+
+    if not monitors:
+        return {"status": "idle", "routes": 0}
+
+    published = 0
+    with ThreadPoolExecutor(max_workers=min(len(monitors), 8)) as executor:
+        futures = {
+            executor.submit(_check_user_bus, route_id, state): route_id
+            for route_id, state in monitors.items()
+        }
+        for future, route_id in futures.items():
+            try:
+                published += future.result()
+            except Exception as e:
+                logger.warning(
+                    f"유저 버스 도착 정보 조회 실패: route_id={route_id}, error={e}"
+                )
+
+    return {"status": "checked", "routes": len(monitors), "published": published}
@@ -1 +1,1456 @@
-# Create your tests here.
+import random
+
+import pytest
+
+from apps.routes.utils import path_geometry
+from apps.routes.utils.geo_utils import calculate_distance
+from apps.routes.utils.path_geometry import CompiledPath
+
+
+@pytest.fixture
+def fake_redis_server():
+    """테스트용 인메모리 Redis 서버 (connected=False로 장애 재현)"""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, fake_redis_server):
+    """redis_client를 인메모리 Redis로 교체 (등록된 Lua 스크립트 캐시도 초기화)"""
+    import fakeredis
+
+    from apps.routes.utils.redis_client import redis_client
+
+    client = fakeredis.FakeRedis(server=fake_redis_server)
+    monkeypatch.setattr(redis_client, "_client", client)
+    monkeypatch.setattr(redis_client, "_apply_bot_state", None, raising=False)
+    return client
+
+
+def _random_path(seed: int, vertices: int) -> CompiledPath:
+    """서울 근처 임의 경로선 생성"""
+    rng = random.Random(seed)
+    lon, lat = 126.95, 37.55
+    coords = []
+    for _ in range(vertices):
+        lon += rng.uniform(-0.0003, 0.0008)
+        lat += rng.uniform(-0.0005, 0.0005)
+        coords.append((lon, lat))
+    return CompiledPath.from_coords(coords)
+
+
+@pytest.mark.parametrize("grid_min_segments", [10**9, 1])
+def test_snap_matches_reference(monkeypatch, grid_min_segments):
+    """벡터화 스냅핑 결과가 기준 구현과 같은지 테스트 (격자 인덱스 사용/미사용)"""
+    monkeypatch.setattr(path_geometry, "GRID_MIN_SEGMENTS", grid_min_segments)
+    path = _random_path(seed=1, vertices=1500)
+    rng = random.Random(2)
+
+    for _ in range(300):
+        i = rng.randrange(len(path))
+        lon = path.lons[i] + rng.uniform(-0.005, 0.005)
+        lat = path.lats[i] + rng.uniform(-0.005, 0.005)
+        snapped_lon, snapped_lat = path.snap(lon, lat)
+        ref_lon, ref_lat = path.snap_reference(lon, lat)
+        assert calculate_distance(snapped_lat, snapped_lon, ref_lat, ref_lon) < 0.05
+
+
+def test_compiled_path_round_trip():
+    """CompiledPath 직렬화/보간 테스트"""
+    path = CompiledPath.from_linestring(
+        "127.0,37.5 127.001,37.5 127.001,37.5 127.002,37.5"
+    )
+    restored = CompiledPath.from_bytes(path.to_bytes())
+
+    assert len(restored) == 3
+    assert list(restored.cum_m) == list(path.cum_m)
+    assert restored.point_at_fraction(0.5) == pytest.approx((127.001, 37.5))
+
+
+def test_leg_geometry_cache_lookup_order(monkeypatch, fake_redis, fake_redis_server):
+    """Leg geometry를 LRU → Redis → 파싱 순으로 찾고, 파싱 결과를 두 캐시에 저장하는지 테스트"""
+    from apps.routes.services import leg_geometry
+    from apps.routes.services.leg_geometry import LegGeometryCache
+    from apps.routes.utils.lru_cache import LRUCache
+    from apps.routes.utils.redis_client import redis_client
+
+    monkeypatch.setattr(leg_geometry, "_local_cache", LRUCache())
+    bus_leg = {"passShape": {"linestring": "127.0,37.5 127.002,37.5"}}
+    walk_leg = {
+        "steps": [
+            {"linestring": "127.0,37.5 127.001,37.5"},
+            {"linestring": "127.001,37.5 127.001,37.501"},
+        ]
+    }
+
+    # 캐시에 없으면 파싱 후 LRU와 Redis에 저장 (도보 구간은 steps를 이어 붙임)
+    path = LegGeometryCache.get(1, 0, bus_leg)
+    assert path.point_at_fraction(0.5) == pytest.approx((127.001, 37.5))
+    assert redis_client.get_leg_geometry(1, 0) == path.to_bytes()
+    assert len(LegGeometryCache.get(1, 1, walk_leg)) == 3
+
+    # LRU hit는 Redis를 조회하지 않음
+    fake_redis_server.connected = False
+    assert LegGeometryCache.get(1, 0, {}) is path
+    fake_redis_server.connected = True
+
+    # 다른 Worker (LRU 비어 있음)는 leg 파싱 없이 Redis에서 복원
+    monkeypatch.setattr(leg_geometry, "_local_cache", LRUCache())
+    restored = LegGeometryCache.get(1, 0, {})
+    assert list(restored.cum_m) == list(path.cum_m)
+    assert leg_geometry._local_cache.get((1, 0)) is restored
+
+    # 경로선이 없는 leg는 None (저장하지 않음)
+    assert LegGeometryCache.get(1, 2, {"mode": "WALK"}) is None
+    assert redis_client.get_leg_geometry(1, 2) is None
+
+    LegGeometryCache.delete(1)
+    assert redis_client.get_leg_geometry(1, 0) is None
+    assert leg_geometry._local_cache.get((1, 0)) is None
+
+
+def test_snap_forward_is_monotonic():
+    """직전 매칭 위치보다 뒤로 스냅되지 않는지 테스트 (왕복 경로)"""
+    from apps.routes.tasks.bot_simulation import _snap_forward
+
+    # 동쪽으로 갔다가 20m 옆 평행 도로로 되돌아오는 경로
+    path = CompiledPath.from_coords(
+        [(127.0, 37.5), (127.01, 37.5), (127.01, 37.5002), (127.0, 37.5002)]
+    )
+    bot_state = {"current_leg_index": 1}
+
+    # 돌아오는 구간에서 매칭된 뒤에는 가는 구간으로 되돌아가지 않음
+    first = _snap_forward(path, bot_state, 127.005, 37.50025)
+    assert first.segment_index == 2
+    bot_state.update(
+        snap_leg_index=1,
+        snap_segment_index=first.segment_index,
+        snap_along_m=first.along_m,
+    )
+    second = _snap_forward(path, bot_state, 127.006, 37.49995)
+    assert second.along_m >= first.along_m
+
+
+def test_snap_forward_fallback_is_bounded_on_loop_route():
+    """윈도우 밖 GPS가 순환 노선의 나중 구간(반대편 차로)에 가까워도 멀리 앞으로 튀지 않는지 테스트"""
+    from apps.routes.tasks.bot_simulation import (
+        SNAP_FALLBACK_MAX_ADVANCE_M,
+        _snap_forward,
+    )
+
+    # 동쪽으로 약 1.8km (약 9m 간격) 갔다가 20m 옆 반대편 차로로 돌아오는 순환 노선
+    outbound = [(127.0 + i * 0.0001, 37.5) for i in range(201)]
+    inbound = [(127.02 - i * 0.0001, 37.5002) for i in range(201)]
+    path = CompiledPath.from_coords(outbound + inbound)
+    bot_state = {
+        "current_leg_index": 1,
+        "snap_leg_index": 1,
+        "snap_segment_index": 0,
+        "snap_along_m": 0.0,
+    }
+
+    # 가는 구간 약 530m 지점, 반대편 차로 쪽으로 치우친 GPS (윈도우 약 440m 밖)
+    result = _snap_forward(path, bot_state, 127.006, 37.50018)
+    assert result.along_m == pytest.approx(
+        calculate_distance(37.5, 127.0, 37.5, 127.006), abs=5
+    )
+    assert result.along_m <= SNAP_FALLBACK_MAX_ADVANCE_M
+
+    # 반대편 차로 끝(출발점 근처)에 가까운 GPS도 최대 전진 거리 밖으로는 붙지 않음
+    result = _snap_forward(path, bot_state, 127.0, 37.5002)
+    assert result.along_m <= SNAP_FALLBACK_MAX_ADVANCE_M
+
+
+def test_filter_indexed_by_direction(monkeypatch):
+    """호선/방향 인덱스 조회가 목록 순서상 첫 번째 열차를 고르는지 테스트"""
+    from apps.routes.utils.subway_api_client import (
+        subway_api_client,
+        subway_station_cache,
+    )
+
+    arrivals = [
+        {"subwayId": "1002", "updnLine": "외선", "btrainNo": "2101"},
+        {"subwayId": "1007", "updnLine": "상행", "btrainNo": "7001"},
+        {"subwayId": "1002", "updnLine": "내선", "btrainNo": "2156"},
+        {"subwayId": "1002", "updnLine": "내선", "btrainNo": "2160"},
+    ]
+    monkeypatch.setattr(
+        subway_station_cache,
+        "get_direction_from_pass_stops",
+        lambda pass_stops, line: "내선",
+    )
+
+    index = subway_api_client.index_arrivals(arrivals)
+    train = subway_api_client.filter_indexed_by_direction(
+        index, "1002", "당산", ["문래", "영등포구청", "당산"]
+    )
+
+    assert train["btrainNo"] == "2156"
+    assert index["1002"]["arrivals"][0]["btrainNo"] == "2101"
+
+
+def test_bot_state_transition_is_guarded(fake_redis):
+    """봇 상태 Hash 전환이 현재 상태를 확인하고 필드 타입을 유지하는지 테스트"""
+    from apps.routes.services.bot_state import BotStateManager, BotStatus
+
+    legs = [{"mode": "BUS", "start": {"lon": 127.0, "lat": 37.5}}]
+    BotStateManager.initialize(1, 10, legs)
+    BotStateManager.update_retry_count(1, 2)
+
+    assert BotStateManager.transition_to_riding_bus(1, "veh-1")
+    # 같은 탑승 전환이 중복 적용되지 않음
+    assert not BotStateManager.transition_to_riding_bus(1, "veh-2")
+
+    state = BotStateManager.get(1)
+    assert state["status"] == BotStatus.RIDING_BUS.value
+    assert state["vehicle_id"] == "veh-1"
+    assert state["api_retry_count"] == 0
+    assert state["current_position"] == {"lon": 127.0, "lat": 37.5}
+
+    assert BotStateManager.transition_to_finished(1)
+    assert not BotStateManager.transition_to_walking(1, 1)
+    # 삭제된 봇은 부분 업데이트로 다시 생기지 않음
+    BotStateManager.delete(1)
+    assert not BotStateManager.update_position(1, 127.1, 37.6)
+    assert BotStateManager.get(1) is None
+
+
+def test_bot_tick_batch_claims_reschedules_and_requeues(monkeypatch, fake_redis):
+    """배치 틱이 claim한 봇을 lease 동안 독점하고, 틱 결과대로 재예약/예약 삭제하며, 타임아웃 시 남은 봇을 다시 넣는지 테스트"""
+    from datetime import datetime
+    from datetime import timezone as dt_timezone
+
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    from apps.routes.tasks import bot_simulation
+    from apps.routes.utils import clock
+    from apps.routes.utils.redis_client import redis_client
+
+    virtual = clock.VirtualClock(datetime(2025, 1, 1, 9, 0, tzinfo=dt_timezone.utc))
+    now = virtual.time()
+    schedule = "bot_tick:schedule"
+
+    # lease 동안 같은 봇은 다른 배치에서 다시 claim되지 않음
+    redis_client.schedule_bot_tick(1, now - 1)
+    assert redis_client.claim_due_bot_ticks(now, lease=90) == [1]
+    assert redis_client.claim_due_bot_ticks(now, lease=90) == []
+    assert redis_client.client.zscore(schedule, "1") == now + 90
+    # 처리하던 Worker가 죽으면 lease 만료 후 다시 claim
+    assert redis_client.claim_due_bot_ticks(now + 91, lease=90) == [1]
+
+    for route_id, offset in [(1, -5), (2, -4), (3, -3), (5, -2), (4, 100)]:
+        redis_client.schedule_bot_tick(route_id, now + offset)
+
+    ticked = []
+
+    def fake_tick(route_id):
+        ticked.append(route_id)
+        if route_id == 3:
+            raise SoftTimeLimitExceeded()
+        if route_id == 2:
+            return {"status": "finished"}
+        return {"status": "updated", "next_interval": 15}
+
+    monkeypatch.setattr(bot_simulation, "_run_bot_tick", fake_tick)
+    monkeypatch.setattr(
+        bot_simulation,
+        "_should_schedule_next_tick",
+        lambda route_id, result: result.get("status") == "updated",
+    )
+
+    with clock.use_clock(virtual):
+        result = bot_simulation.process_due_bot_ticks()
+
+    assert result == {"status": "processed", "claimed": 4, "processed": 2}
+    # 타임아웃 이후 봇(5)은 실행하지 않음
+    assert ticked == [1, 2, 3]
+    assert redis_client.client.zscore(schedule, "1") == now + 15
+    assert redis_client.client.zscore(schedule, "2") is None
+    # 타임아웃에 걸린 봇과 남은 봇은 다음 배치에서 바로 처리
+    assert redis_client.client.zscore(schedule, "3") == now
+    assert redis_client.client.zscore(schedule, "5") == now
+    assert redis_client.client.zscore(schedule, "4") == now + 100
+
+
+def test_bot_tick_session_flushes_once(fake_redis):
+    """봇 틱 세션이 쓰기를 모았다가 종료 시 한 번에 반영하는지 테스트"""
+    from apps.routes.services.bot_state import BotStateManager, BotStatus
+    from apps.routes.utils.redis_client import redis_client
+
+    BotStateManager.initialize(1, 10, [{"mode": "WALK"}, {"mode": "BUS"}])
+    # Lua 스크립트 캐시 적재 (이후 틱은 EVALSHA만 사용)
+    BotStateManager.reset_retry_count(1)
+
+    with redis_client.bot_tick(1) as session:
+        BotStateManager.update_position(1, 127.0, 37.5)
+        BotStateManager.transition_to_waiting_bus(1, 1)
+        redis_client.schedule_bot_tick(1, 100.0)
+        assert BotStateManager.get(1)["status"] == BotStatus.WAITING_BUS.value
+        # 틱 종료 전에는 Redis에 반영되지 않음
+        assert redis_client._read_bot_state(1)["status"] == BotStatus.WALKING.value
+
+    # 시작 일괄 조회 + 위의 확인용 조회 + 종료 시 반영
+    assert session.round_trips == 3
+    state = BotStateManager.get(1)
+    assert state["status"] == BotStatus.WAITING_BUS.value
+    assert state["current_position"] == {"lon": 127.0, "lat": 37.5}
+    assert redis_client.client.zscore("bot_tick:schedule", "1") == 100.0
+
+    # 예외로 끝난 틱의 변경은 버림
+    with pytest.raises(RuntimeError):
+        with redis_client.bot_tick(1):
+            BotStateManager.update_position(1, 0.0, 0.0)
+            raise RuntimeError
+    assert BotStateManager.get(1)["current_position"] == {"lon": 127.0, "lat": 37.5}
+
+
+def test_virtual_clock_never_goes_backwards():
+    """가상 시계가 과거 시각/음수 진행으로 되돌아가지 않고, use_clock 종료 시 복원되는지 테스트"""
+    from datetime import datetime
+    from datetime import timezone as dt_timezone
+
+    from apps.routes.utils import clock
+
+    start = datetime(2025, 1, 1, 9, 0, tzinfo=dt_timezone.utc)
+    virtual = clock.VirtualClock(start)
+    epoch = start.timestamp()
+
+    virtual.advance_to(epoch + 30)
+    assert virtual.time() == epoch + 30
+    virtual.advance_to(epoch + 10)
+    assert virtual.time() == epoch + 30
+    virtual.advance(-5)
+    assert virtual.time() == epoch + 30
+    virtual.advance(2.5)
+    assert virtual.now() == datetime.fromtimestamp(epoch + 32.5, tz=dt_timezone.utc)
+
+    previous = clock.get_clock()
+    with clock.use_clock(virtual):
+        assert clock.time() == epoch + 32.5
+    assert clock.get_clock() is previous
+
+
+def test_cassette_responder_picks_last_response_before_clock():
+    """재생 시 가상 시각 이전 마지막 응답을 쓰고, 없으면 API 기본값을 반환하는지 테스트"""
+    from datetime import datetime
+    from datetime import timezone as dt_timezone
+
+    from apps.routes.utils import api_replay, clock
+
+    start = datetime(2025, 1, 1, 9, 0, tzinfo=dt_timezone.utc).timestamp()
+    cassette = api_replay.ApiCassette()
+    for offset, response in [(30, [{"vehId": "2"}]), (0, [{"vehId": "1"}])]:
+        cassette.add(
+            {
+                "api": "bus.get_bus_positions_by_route",
+                "args": ["100100118"],
+                "kwargs": {},
+                "t": start + offset,
+                "response": response,
+            }
+        )
+    responder = api_replay.CassetteResponder(cassette)
+    args = ("bus.get_bus_positions_by_route", ("100100118",), {})
+    virtual = clock.VirtualClock(datetime.fromtimestamp(start - 10, tz=dt_timezone.utc))
+
+    with clock.use_clock(virtual):
+        # 첫 기록 이전: 기본값
+        assert responder(*args) == []
+        virtual.advance_to(start)
+        assert responder(*args) == [{"vehId": "1"}]
+        virtual.advance_to(start + 29)
+        assert responder(*args) == [{"vehId": "1"}]
+        virtual.advance_to(start + 30)
+        assert responder(*args) == [{"vehId": "2"}]
+        virtual.advance_to(start + 600)
+        assert responder(*args) == [{"vehId": "2"}]
+        # 기록되지 않은 호출: 기본값
+        assert responder("bus.get_arrival_info", ("1", "2", "3"), {}) is None
+
+    assert responder.misses == {
+        "bus.get_bus_positions_by_route": 1,
+        "bus.get_arrival_info": 1,
+    }
+
+
+def test_rabbitmq_publisher_pool_reuses_connection_and_reopens_channel(
+    monkeypatch, settings
+):
+    """발행 연결/채널과 선언한 Exchange를 재사용하고, 브로커가 채널을 닫으면 같은 연결에서 다시 여는지 테스트"""
+    import pika
+    from pika.exceptions import ChannelClosedByBroker
+
+    from apps.routes.utils.rabbitmq_client import RabbitMQClient
+
+    settings.RABBITMQ_PUBLISHER_POOL_SIZE = 2
+    settings.RABBITMQ_PUBLISHER_CONFIRMS = False
+    connections = []
+
+    class FakeChannel:
+        def __init__(self):
+            self.is_open = True
+            self.declared = []
+            self.published = []
+            self.close_next_publish = False
+
+        def exchange_declare(self, exchange, **kwargs):
+            self.declared.append(exchange)
+
+        def basic_publish(self, exchange, routing_key, body, properties):
+            if self.close_next_publish:
+                self.is_open = False
+                raise ChannelClosedByBroker(
+                    404, f"NOT_FOUND - no exchange '{exchange}'"
+                )
+            self.published.append(exchange)
+
+    class FakeConnection:
+        def __init__(self, parameters):
+            self.is_open = True
+            self.channels = []
+            connections.append(self)
+
+        def channel(self):
+            self.channels.append(FakeChannel())
+            return self.channels[-1]
+
+        def close(self):
+            self.is_open = False
+
+    monkeypatch.setattr(pika, "BlockingConnection", FakeConnection)
+    client = RabbitMQClient()
+
+    # 연결 1개/채널 1개 재사용, Exchange는 처음 한 번만 선언
+    for _ in range(3):
+        assert client.publish(1, "bot_status_update", {"route_id": 10})
+    assert client.publish(2, "bot_status_update", {"route_id": 20})
+    assert len(connections) == 1
+    channel = connections[0].channels[0]
+    assert channel.declared == ["sse_events_1", "sse_events_2"]
+    assert channel.published == ["sse_events_1"] * 3 + ["sse_events_2"]
+
+    # Exchange가 auto_delete되어 브로커가 채널을 닫으면 같은 연결에서 채널을 다시 열고 재선언
+    channel.close_next_publish = True
+    assert client.publish(1, "bot_boarding", {"route_id": 10})
+    assert len(connections) == 1
+    reopened = connections[0].channels[1]
+    assert reopened.declared == ["sse_events_1"]
+    assert reopened.published == ["sse_events_1"]
+
+    # 풀에 있는 동안 브로커가 채널을 닫아도 연결은 재사용하고 채널을 다시 열어 재선언
+    reopened.is_open = False
+    assert client.publish(1, "bot_status_update", {"route_id": 10})
+    assert len(connections) == 1
+    assert len(connections[0].channels) == 3
+    assert connections[0].channels[2].declared == ["sse_events_1"]
+    assert connections[0].channels[2].published == ["sse_events_1"]
+
+    # 끊긴 연결은 버리고 새로 연결
+    connections[0].is_open = False
+    assert client.publish(1, "bot_alighting", {"route_id": 10})
+    assert len(connections) == 2
+    assert connections[1].channels[0].published == ["sse_events_1"]
+
+
+def test_sse_hub_shares_one_subscription(monkeypatch):
+    """같은 경주의 SSE 클라이언트가 구독 1개를 공유하고, 모두 떠나면 해제되는지 테스트"""
+    pytest.importorskip("aio_pika")
+    import asyncio
+    import json
+
+    from apps.routes.services.sse_hub import SSEHub
+
+    hub = SSEHub()
+    binds = []
+
+    async def fake_bind(subscription):
+        binds.append(subscription.route_itinerary_id)
+
+    monkeypatch.setattr(hub, "_bind", fake_bind)
+
+    async def scenario():
+        first = await hub.subscribe(7)
+        second = await hub.subscribe(7)
+        assert binds == [7]
+
+        event = {"event": "bot_status_update", "data": {"route_id": 1}}
+        hub._dispatch(hub._subscriptions[7], json.dumps(event).encode())
+        assert await first.get() == event
+        assert await second.get() == event
+
+        hub.unsubscribe(7, first)
+        await asyncio.sleep(0)
+        assert 7 in hub._subscriptions
+
+        hub.unsubscribe(7, second)
+        await asyncio.sleep(0)
+        assert 7 not in hub._subscriptions
+
+    asyncio.run(scenario())
+
+
+def test_sse_event_log_replays_after_last_event_id(fake_redis):
+    """SSE 이벤트 로그가 Last-Event-ID 이후 이벤트만 재전송하고, 빠진 구간은 None인지 테스트"""
+    from apps.routes.utils.redis_client import redis_client
+
+    ids = [
+        redis_client.append_sse_event(3, "bot_boarding", {"route_id": i})
+        for i in range(3)
+    ]
+    redis_client.client.xtrim("sse_log:3", maxlen=2, approximate=False)
+
+    missed = redis_client.get_sse_events_after(3, ids[1])
+    assert missed == [(ids[2], {"event": "bot_boarding", "data": {"route_id": 2}})]
+    assert redis_client.get_sse_events_after(3, ids[2]) == []
+    # 로그에서 밀려난 ID / 잘못된 ID → 전체 상태 재전송 필요
+    assert redis_client.get_sse_events_after(3, ids[0]) is None
+    assert redis_client.get_sse_events_after(3, "invalid") is None
+
+
+def test_sse_stream_sends_live_events_out_of_id_order(monkeypatch):
+    """재전송 이후 수신 이벤트가 ID 역순으로 도착해도 모두 전송하고, 재전송분만 생략하는지 테스트"""
+    pytest.importorskip("aio_pika")
+    import asyncio
+    from contextlib import asynccontextmanager
+    from types import SimpleNamespace
+
+    from rest_framework.test import APIRequestFactory
+
+    from apps.routes import views
+    from apps.routes.utils.redis_client import redis_client
+
+    ids = ["1735693200000-0", "1735693200001-0", "1735693200002-0", "1735693200003-0"]
+    # 구독 중 XADD 순서와 RabbitMQ 발행 순서가 뒤바뀜 (ids[3] → ids[2]),
+    # ids[1]은 재전송과 겹친 발행
+    live = [
+        {"event": "bot_boarding", "data": {"route_id": 1}, "id": ids[1]},
+        {"event": "bot_boarding", "data": {"route_id": 3}, "id": ids[3]},
+        {"event": "bot_boarding", "data": {"route_id": 2}, "id": ids[2]},
+        {"event": "route_ended", "data": {"route_itinerary_id": 5}},
+    ]
+
+    @asynccontextmanager
+    async def listen(route_itinerary_id):
+        events = asyncio.Queue()
+        for event in live:
+            events.put_nowait(event)
+        yield events
+
+    monkeypatch.setattr(views.sse_hub, "listen", listen)
+    monkeypatch.setattr(views, "AccessToken", lambda token: {"user_id": 1})
+    monkeypatch.setattr(
+        views,
+        "RouteItinerary",
+        SimpleNamespace(
+            objects=SimpleNamespace(get=lambda **kwargs: None),
+            DoesNotExist=LookupError,
+        ),
+    )
+    # 재접속 시점의 로그에는 ids[1]까지만 기록됨
+    monkeypatch.setattr(
+        redis_client,
+        "get_sse_events_after",
+        lambda route_itinerary_id, last_event_id, count: [
+            (ids[1], {"event": "bot_boarding", "data": {"route_id": 1}})
+        ],
+    )
+
+    request = APIRequestFactory().get("/api/v1/sse/routes/5", HTTP_LAST_EVENT_ID=ids[0])
+    request.COOKIES["access_token"] = "token"
+    response = views.SSEStreamView.as_view()(request, route_itinerary_id=5)
+
+    async def collect():
+        return [chunk async for chunk in response.streaming_content]
+
+    sent_ids = [
+        line[len("id: ") :]
+        for chunk in asyncio.run(collect())
+        for line in chunk.decode().splitlines()
+        if line.startswith("id: ")
+    ]
+    assert sent_ids == [ids[1], ids[3], ids[2]]
+
+
+def test_client_event_buffer_coalesces_and_throttles():
+    """SSE 클라이언트 버퍼가 봇별 최신 상태만 남기고, 생명주기 이벤트 순서와 전송 속도를 지키는지 테스트"""
+    pytest.importorskip("aio_pika")
+    import asyncio
+
+    from apps.routes.services.sse_hub import ClientEventBuffer
+
+    def status(route_id, progress):
+        return {
+            "event": "bot_status_update",
+            "data": {"route_id": route_id, "progress_percent": progress},
+        }
+
+    boarding = {"event": "bot_boarding", "data": {"route_id": 1}}
+
+    async def scenario():
+        buffer = ClientEventBuffer(maxsize=10, rate=20, burst=1)
+        buffer.put(status(1, 10))
+        buffer.put(status(2, 10))
+        buffer.put(boarding)
+        buffer.put(status(1, 20))
+        assert len(buffer) == 3
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        received = [await buffer.get() for _ in range(3)]
+        assert received == [status(2, 10), boarding, status(1, 20)]
+        # 버스트 1개 이후 초당 20개 → 2개 추가 전송에 약 0.1초
+        assert loop.time() - started >= 0.09
+
+    asyncio.run(scenario())
+
+
+def test_client_event_buffer_overflow_keeps_lifecycle_events():
+    """SSE 클라이언트 버퍼가 넘치면 위치 업데이트만 버리고, 생명주기 이벤트만 남으면 스트림을 닫는지 테스트"""
+    pytest.importorskip("aio_pika")
+    import asyncio
+
+    from apps.routes.services.sse_hub import ClientBufferOverflow, ClientEventBuffer
+
+    def status(route_id):
+        return {"event": "bot_status_update", "data": {"route_id": route_id}}
+
+    def lifecycle(name):
+        return {"event": name, "data": {"route_id": 1}}
+
+    async def scenario():
+        buffer = ClientEventBuffer(maxsize=3)
+        buffer.put(status(1))
+        buffer.put(lifecycle("bot_boarding"))
+        buffer.put(status(2))
+        buffer.put(lifecycle("bot_alighting"))
+        # 가장 오래된 위치 업데이트(route 1)만 버려짐
+        assert not buffer.overflowed
+        assert [await buffer.get() for _ in range(3)] == [
+            lifecycle("bot_boarding"),
+            status(2),
+            lifecycle("bot_alighting"),
+        ]
+
+        buffer.put(lifecycle("bot_boarding"))
+        buffer.put(status(1))
+        buffer.put(lifecycle("bot_alighting"))
+        buffer.put(lifecycle("bot_arrived"))
+        buffer.put(lifecycle("route_ended"))
+        # 위치 업데이트를 버린 뒤에도 넘침 → 생명주기 이벤트는 버리지 않고 스트림 종료
+        assert buffer.overflowed
+        buffer.put(status(2))
+        assert len(buffer) == 0
+        with pytest.raises(ClientBufferOverflow):
+            await buffer.get()
+
+    asyncio.run(scenario())
+
+
+def test_route_cache_uses_lru_and_status_flag_before_db(monkeypatch, fake_redis):
+    """경주 데이터는 LRU, 경주 상태는 Redis 플래그를 먼저 쓰고 없을 때만 DB를 조회하는지 테스트"""
+    from types import SimpleNamespace
+
+    from apps.routes.services import route_cache
+    from apps.routes.services.route_cache import RouteCache
+    from apps.routes.utils.lru_cache import LRUCache
+    from apps.routes.utils.redis_client import redis_client
+
+    monkeypatch.setattr(route_cache, "_local_cache", LRUCache())
+    queries = []
+    legs = [{"mode": "WALK"}, {"mode": "BUS"}]
+
+    class FakeManager:
+        def select_related(self, *fields):
+            return self
+
+        def only(self, *fields):
+            return self
+
+        def get(self, id):
+            queries.append(id)
+            return SimpleNamespace(
+                id=id,
+                status="RUNNING",
+                route_itinerary_id=id * 10,
+                route_leg=SimpleNamespace(raw_data={"legs": legs}),
+            )
+
+    monkeypatch.setattr(route_cache, "Route", SimpleNamespace(objects=FakeManager()))
+
+    # 상태 플래그가 없으면 DB 조회 후 플래그 복구, 이후는 플래그만 사용
+    assert RouteCache.get_status(1) == "RUNNING"
+    assert RouteCache.get_status(1) == "RUNNING"
+    assert queries == [1]
+    RouteCache.set_status(1, "FINISHED")
+    assert RouteCache.get_status(1) == "FINISHED"
+    assert queries == [1]
+    # 플래그 만료 시 다시 DB 조회
+    redis_client.client.delete("route_status:1")
+    assert RouteCache.get_status(1) == "RUNNING"
+    assert queries == [1, 1]
+
+    # 공공데이터 ID가 없으면 DB를 조회하지 않음
+    queries.clear()
+    assert RouteCache.get(2) is None
+    assert queries == []
+
+    redis_client.set_public_ids(2, {"legs": []})
+    context = RouteCache.get(2)
+    assert context.legs == legs
+    assert context.route_itinerary_id == 20
+    assert RouteCache.get(2) is context
+    assert queries == [2]
+    RouteCache.evict(2)
+    assert RouteCache.get(2) == context
+    assert queries == [2, 2]
+
+
+def test_last_running_participant_ends_race_once(fake_redis):
+    """진행 중 참가자 Set에서 마지막 참가자를 제거한 호출만 경주 종료로 판단하는지 테스트"""
+    from apps.routes.utils.redis_client import redis_client
+
+    redis_client.add_running_participants(5, [10, 11])
+
+    assert redis_client.remove_running_participant(5, 10) is False
+    # 중복 기록(재시도 등)은 다른 참가자를 대신하지 않음
+    assert redis_client.remove_running_participant(5, 10) is False
+    assert redis_client.remove_running_participant(5, 11) is True
+    assert redis_client.remove_running_participant(5, 11) is False
+    # Set이 사라진 뒤 다른 참가자 기록도 종료 표시로 중복 종료하지 않음
+    assert redis_client.remove_running_participant(5, 12) is False
+
+
+def test_finish_participant_falls_back_to_db_without_running_set(
+    monkeypatch, fake_redis
+):
+    """진행 중 참가자 Set이 없으면 (등록 실패/만료) DB 조회로 경주 종료를 판단하는지 테스트"""
+    from datetime import datetime
+    from types import SimpleNamespace
+
+    from apps.routes.services import route_cache
+    from apps.routes.services.route_cache import RouteCache
+    from apps.routes.utils.redis_client import redis_client
+
+    unfinished = {"count": 1}
+    queries = []
+
+    class FakeQuerySet:
+        def exists(self):
+            return unfinished["count"] > 0
+
+    def fake_filter(**kwargs):
+        queries.append(kwargs)
+        return FakeQuerySet()
+
+    monkeypatch.setattr(
+        route_cache,
+        "Route",
+        SimpleNamespace(objects=SimpleNamespace(filter=fake_filter)),
+    )
+    route = SimpleNamespace(
+        id=20, route_itinerary_id=7, start_time=datetime(2025, 1, 1, 9, 0)
+    )
+
+    assert redis_client.remove_running_participant(7, 20) is None
+    assert RouteCache.finish_participant(route) is False
+    unfinished["count"] = 0
+    assert RouteCache.finish_participant(route) is True
+    assert queries[-1]["route_itinerary_id"] == 7
+
+    # Set이 있으면 DB를 조회하지 않음
+    queries.clear()
+    redis_client.add_running_participants(7, [20])
+    assert RouteCache.finish_participant(route) is True
+    assert queries == []
+
+
+def test_shared_fetch_calls_api_once_for_concurrent_callers(fake_redis):
+    """동시에 조회한 Worker 중 하나만 API를 호출하고 나머지는 결과를 기다려 재사용하는지 테스트"""
+    import threading
+    import time
+
+    from apps.routes.utils.redis_client import redis_client
+
+    calls = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def fetcher():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"buses": [1, 2]}
+
+    def worker():
+        barrier.wait()
+        results.append(redis_client.get_or_fetch_json("rt:test", 10, fetcher))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(value == {"buses": [1, 2]} for value, _ in results)
+    kinds = [kind for _, kind in results]
+    assert kinds.count("miss") == 1
+    assert set(kinds) - {"miss"} <= {"wait", "hit"}
+    # 조회가 끝나면 락 해제, 이후 조회는 캐시 hit
+    assert redis_client.client.get("rt:test:lock") is None
+    assert redis_client.get_or_fetch_json("rt:test", 10, fetcher)[1] == "hit"
+    assert len(calls) == 1
+
+
+def test_shared_fetch_fallback_and_lock_release(fake_redis, fake_redis_server):
+    """대기 시간 초과 시 직접 조회하고, 실패/만료 시에도 본인 락만 해제하며, Redis 장애 시 API를 직접 호출하는지 테스트"""
+    from apps.routes.services.realtime_cache import _get_or_fetch
+    from apps.routes.utils.redis_client import redis_client
+
+    client = redis_client.client
+
+    # 다른 Worker가 락을 쥔 채 결과를 저장하지 않음 → 대기 후 직접 조회
+    client.set("rt:slow:lock", "other", ex=10)
+    value, kind = redis_client.get_or_fetch_json(
+        "rt:slow", 10, lambda: "direct", wait_timeout=0.1
+    )
+    assert (value, kind) == ("direct", "fallback")
+    assert client.get("rt:slow:lock") == b"other"
+    assert client.get("rt:slow") is None
+
+    # fetcher 실패 시 락 해제, 결과는 저장하지 않음
+    def failing():
+        raise RuntimeError("api down")
+
+    with pytest.raises(RuntimeError):
+        redis_client.get_or_fetch_json("rt:fail", 10, failing)
+    assert client.get("rt:fail:lock") is None
+    assert client.get("rt:fail") is None
+
+    # 조회 중 락이 만료되어 다른 Worker가 가져가면 그 락은 지우지 않음
+    def slow_expired():
+        client.set("rt:expired:lock", "other")
+        return [1]
+
+    assert redis_client.get_or_fetch_json("rt:expired", 10, slow_expired) == (
+        [1],
+        "miss",
+    )
+    assert client.get("rt:expired:lock") == b"other"
+
+    # None 결과는 none_ttl 동안만 캐시 (동시 대기자만 공유, 다음 재시도는 재조회)
+    assert redis_client.get_or_fetch_json("rt:none", 10, lambda: None) == (
+        None,
+        "miss",
+    )
+    assert 0 < fake_redis.pttl("rt:none") <= 1000
+    assert redis_client.get_or_fetch_json("rt:none", 10, lambda: "again") == (
+        None,
+        "hit",
+    )
+    fake_redis.delete("rt:none")
+    assert redis_client.get_or_fetch_json("rt:none", 10, lambda: "again") == (
+        "again",
+        "miss",
+    )
+    assert fake_redis.ttl("rt:none") > 1
+
+    # Redis 장애 시 API 직접 호출
+    fake_redis_server.connected = False
+    assert _get_or_fetch("bus_position", "rt:down", 10, lambda: "api") == "api"
+
+
+def test_station_ord_lookup_order_and_memoization(
+    monkeypatch, fake_redis, fake_redis_server
+):
+    """정류소 순번을 LRU → Redis → API 순으로 찾고, 찾은 값만 저장하는지 테스트"""
+    from apps.routes.services import realtime_cache
+    from apps.routes.services.realtime_cache import RealtimeCache
+    from apps.routes.utils.bus_api_client import bus_api_client
+    from apps.routes.utils.lru_cache import LRUCache
+    from apps.routes.utils.redis_client import redis_client
+
+    monkeypatch.setattr(realtime_cache, "_station_ord_cache", LRUCache())
+    api_calls = []
+
+    def fake_find(st_id, bus_route_id):
+        api_calls.append((st_id, bus_route_id))
+        return 7 if st_id == "S1" else None
+
+    monkeypatch.setattr(bus_api_client, "find_station_ord", fake_find)
+
+    # 1. API로 찾은 순번은 LRU와 Redis에 저장
+    assert RealtimeCache.get_station_ord("S1", "R1") == 7
+    assert api_calls == [("S1", "R1")]
+    assert redis_client.get_bus_station_ord("R1", "S1") == 7
+
+    # 2. LRU hit는 Redis도 조회하지 않음
+    fake_redis_server.connected = False
+    assert RealtimeCache.get_station_ord("S1", "R1") == 7
+    fake_redis_server.connected = True
+
+    # 3. 다른 Worker (LRU 비어 있음)는 Redis에서 읽고 API를 호출하지 않음
+    monkeypatch.setattr(realtime_cache, "_station_ord_cache", LRUCache())
+    assert RealtimeCache.get_station_ord("S1", "R1") == 7
+    assert realtime_cache._station_ord_cache.get(("R1", "S1")) == 7
+    assert len(api_calls) == 1
+
+    # 4. 찾지 못한 순번은 저장하지 않음 (짧은 공유 캐시로 동시 재조회만 방지)
+    assert RealtimeCache.get_station_ord("S2", "R1") is None
+    assert RealtimeCache.get_station_ord("S2", "R1") is None
+    assert api_calls.count(("S2", "R1")) == 1
+    assert redis_client.get_bus_station_ord("R1", "S2") is None
+    assert realtime_cache._station_ord_cache.get(("R1", "S2")) is None
+    redis_client.client.delete("rt:bus_ord:R1:S2")
+    assert RealtimeCache.get_station_ord("S2", "R1") is None
+    assert api_calls.count(("S2", "R1")) == 2
+
+
+def test_subway_collector_refreshes_only_active_lines(
+    monkeypatch, settings, fake_redis
+):
+    """최근 SUBWAY_ACTIVE_LINE_WINDOW초 안에 조회된 노선만 수집하고, 봇 조회는 스냅샷에서 응답하는지 테스트"""
+    from datetime import datetime
+    from datetime import timezone as dt_timezone
+
+    from apps.routes.services.realtime_cache import RealtimeCache
+    from apps.routes.tasks.subway_positions import collect_subway_positions
+    from apps.routes.utils import clock
+    from apps.routes.utils.redis_client import redis_client
+    from apps.routes.utils.subway_api_client import subway_api_client
+
+    settings.SUBWAY_ACTIVE_LINE_WINDOW = 60
+    api_calls = []
+
+    def fake_positions(subway_line):
+        api_calls.append(subway_line)
+        return [
+            {"trainNo": "2101", "statnNm": "강남"},
+            {"trainNo": "2102", "statnNm": "역삼"},
+        ]
+
+    monkeypatch.setattr(subway_api_client, "get_train_position", fake_positions)
+    virtual = clock.VirtualClock(datetime(2025, 1, 1, 9, 0, tzinfo=dt_timezone.utc))
+    now = virtual.time()
+
+    with clock.use_clock(virtual):
+        # 조회된 노선이 없으면 API 호출 없음
+        assert collect_subway_positions() == {"status": "idle", "lines": 0}
+        assert api_calls == []
+
+        # 봇이 조회한 시각으로 노선 활성 표시 (1호선은 집계 구간 밖)
+        redis_client.get_subway_train_position("2호선", "2101", now - 10)
+        redis_client.get_subway_train_position("1호선", "1001", now - 65)
+
+        assert collect_subway_positions() == {
+            "status": "collected",
+            "lines": 1,
+            "trains": 2,
+        }
+        assert api_calls == ["2호선"]
+        assert redis_client.get_active_subway_lines(now - 60) == ["2호선"]
+
+        # 봇 조회는 스냅샷에서 응답 (API 호출 없음)
+        assert RealtimeCache.get_subway_train_position("2호선", "2102") == {
+            "trainNo": "2102",
+            "statnNm": "역삼",
+        }
+        assert api_calls == ["2호선"]
+
+
+def test_user_bus_monitor_task_publishes_once_per_route(monkeypatch, fake_redis):
+    """유저 버스 모니터 Task가 유저 경주마다 한 번 조회·발행하고, 노선/정류소 변환은 재사용하는지 테스트"""
+    from datetime import datetime, timedelta
+    from datetime import timezone as dt_timezone
+    from types import SimpleNamespace
+
+    from apps.routes.models import Route
+    from apps.routes.services.realtime_cache import RealtimeCache
+    from apps.routes.services.route_cache import RouteCache
+    from apps.routes.services.sse_publisher import SSEPublisher
+    from apps.routes.services.user_bus_monitor import UserBusMonitor
+    from apps.routes.tasks.user_bus_monitor import monitor_user_buses
+    from apps.routes.utils import clock
+    from apps.routes.utils.bus_api_client import bus_api_client
+    from apps.routes.utils.redis_client import redis_client
+
+    start = datetime(2025, 1, 1, 9, 0, tzinfo=dt_timezone.utc)
+    legs = [
+        {"mode": "WALK", "sectionTime": 120},
+        {"mode": "BUS", "route": "간선:6625", "start": {"name": "목동역"}},
+    ]
+
+    def register(route_id):
+        UserBusMonitor.register(
+            SimpleNamespace(
+                id=route_id,
+                route_itinerary_id=route_id * 10,
+                start_time=start,
+                route_leg=SimpleNamespace(raw_data={"legs": legs}),
+            )
+        )
+
+    api_calls = []
+    published = []
+    monkeypatch.setattr(
+        bus_api_client,
+        "get_bus_route_list",
+        lambda name: api_calls.append(name)
+        or [{"busRouteNm": "6625", "busRouteId": "R"}],
+    )
+    monkeypatch.setattr(
+        bus_api_client,
+        "get_station_by_route",
+        lambda route_id: [{"stationNm": "목동역", "station": "S", "seq": "3"}],
+    )
+    monkeypatch.setattr(
+        RealtimeCache,
+        "get_bus_arrival",
+        staticmethod(lambda *args: {"arrmsg1": "곧 도착", "traTime1": "30"}),
+    )
+    monkeypatch.setattr(
+        SSEPublisher,
+        "publish_user_bus_arrival",
+        staticmethod(lambda itinerary_id, info: published.append(itinerary_id)),
+    )
+    monkeypatch.setattr(
+        RouteCache, "get_status", staticmethod(lambda route_id: Route.Status.RUNNING)
+    )
+
+    register(1)
+    with clock.use_clock(clock.VirtualClock(start + timedelta(seconds=60))):
+        assert monitor_user_buses()["published"] == 1
+    # 같은 버스/정류소의 다른 경주는 변환 결과 재사용, 10초 이내 재조회는 생략
+    register(2)
+    with clock.use_clock(clock.VirtualClock(start + timedelta(seconds=65))):
+        assert monitor_user_buses()["published"] == 1
+    assert published == [10, 20]
+    assert api_calls == ["6625"]
+
+    # 조회 구간이 끝나면 등록 해제
+    with clock.use_clock(clock.VirtualClock(start + timedelta(minutes=10))):
+        monitor_user_buses()
+    assert redis_client.get_user_bus_monitors() == {}
+
+
+def test_codec_switch_keeps_bot_state_readable(settings, fake_redis):
+    """직렬화 형식을 바꿔도 저장된 봇 상태를 읽고 상태 전환이 유지되는지 테스트"""
+    pytest.importorskip("msgpack")
+    from apps.routes.services.bot_state import BotStateManager, BotStatus
+    from apps.routes.utils import codec
+
+    value = {"lon": 127.12345678, "name": "정류장", "flags": [None, True]}
+    packed = codec.dumps_msgpack(value)
+    assert packed[:1] == codec.MSGPACK_MARKER
+    assert codec.loads(packed) == codec.loads(codec.dumps_json(value))
+    assert (
+        codec.compact_position({"lon": 127.12345678, "lat": 37.5})["lon"] == 127.123457
+    )
+
+    legs = [{"mode": "BUS", "start": {"lon": 127.0, "lat": 37.5}}]
+
+    # JSON으로 저장 → msgpack으로 전환 후 전환/조회
+    settings.SERIALIZATION_FORMAT = "json"
+    BotStateManager.initialize(1, 10, legs)
+    settings.SERIALIZATION_FORMAT = "msgpack"
+    assert BotStateManager.transition_to_riding_bus(1, "veh-1")
+    assert not BotStateManager.transition_to_riding_bus(1, "veh-2")
+    assert fake_redis.hget("bot_state:1", "status")[:1] == codec.MSGPACK_MARKER
+
+    # msgpack으로 저장된 상태 → JSON으로 되돌린 후 전환/조회
+    settings.SERIALIZATION_FORMAT = "json"
+    assert BotStateManager.transition_to_finished(1)
+    state = BotStateManager.get(1)
+    assert state["status"] == BotStatus.FINISHED.value
+    assert state["vehicle_id"] == "veh-1"
+
+
+def test_bot_status_delta_rebuilds_full_state():
+    """델타 모드 이벤트를 순서대로 합치면 전체 상태와 같고, 주기마다 keyframe인지 테스트"""
+    from apps.routes.services.sse_delta import DELTA_EVENT, BotStatusDeltaEncoder
+
+    def apply(state, delta):
+        for key, value in delta.items():
+            if value is None:
+                state.pop(key, None)
+            elif isinstance(value, dict) and isinstance(state.get(key), dict):
+                apply(state[key], value)
+            else:
+                state[key] = value
+
+    encoder = BotStatusDeltaEncoder(keyframe_interval=4)
+    client_state = {}
+    shape = " ".join(f"127.{i:06d},37.5" for i in range(50))
+    for tick in range(10):
+        data = {
+            "route_id": 1,
+            "status": "RIDING_BUS" if tick < 6 else "WALKING",
+            "position": {"lon": 127.0 + tick / 1000, "lat": 37.5},
+            "timestamp": 1768179960000 + tick * 5000,
+        }
+        if tick < 6:
+            data["vehicle"] = {"vehId": "v1", "pass_shape": shape, "stopFlag": "0"}
+
+        event_type, payload = encoder.encode(data)
+        assert payload["seq"] == tick + 1
+        if tick % 4 == 0:
+            assert event_type == "bot_status_update" and payload["keyframe"]
+            client_state = {
+                k: v for k, v in payload.items() if k not in ("seq", "keyframe")
+            }
+        else:
+            assert event_type == DELTA_EVENT
+            # 바뀌지 않은 경로선은 다시 보내지 않음
+            assert "pass_shape" not in str(payload)
+            apply(client_state, {k: v for k, v in payload.items() if k != "seq"})
+        assert client_state == data
+
+
+def test_bus_position_index_reads_only_visible_tiles(monkeypatch, fake_redis):
+    """영역 조회가 겹치는 타일만 읽고, 같은 세대/타일 요청은 304와 저장된 압축 본문을 쓰는지 테스트"""
+    import gzip
+
+    from rest_framework.test import APIRequestFactory
+
+    from apps.routes.services.bus_position_index import BusPositionIndex
+    from apps.routes.utils import codec
+    from apps.routes.views_bus import BusAllPositionsView
+
+    rng = random.Random(7)
+    buses = [
+        {
+            "veh_id": str(i),
+            "coordinates": [rng.uniform(126.8, 127.15), rng.uniform(37.45, 37.68)],
+        }
+        for i in range(2000)
+    ]
+    assert BusPositionIndex.store(buses, routes_count=15, ttl=60)
+
+    mget_sizes = []
+    mget = fake_redis.mget
+    monkeypatch.setattr(
+        fake_redis,
+        "mget",
+        lambda keys: mget_sizes.append(len(keys)) or mget(keys),
+    )
+
+    # 좁은 영역 → z14 몇 개 타일, 서울 전체 → z12
+    for sw, ne, zoom in (
+        ((126.97, 37.55), (126.99, 37.57), 14),
+        ((126.7, 37.4), (127.2, 37.7), 12),
+    ):
+        snapshot = BusPositionIndex.snapshot(*sw, *ne)
+        assert snapshot.zoom == zoom
+        body, encoding = BusPositionIndex.body(snapshot, "identity")
+        found = {bus["veh_id"] for bus in codec.loads(body)["data"]}
+        visible = {
+            bus["veh_id"]
+            for bus in buses
+            if sw[0] <= bus["coordinates"][0] <= ne[0]
+            and sw[1] <= bus["coordinates"][1] <= ne[1]
+        }
+        assert visible <= found
+        assert len(found) < len(buses) or zoom == 12
+    assert mget_sizes[0] <= 4
+
+    view = BusAllPositionsView.as_view()
+    factory = APIRequestFactory()
+    url = "/api/v1/bus/positions/area?sw=126.97,37.55&ne=126.99,37.57"
+
+    response = view(factory.get(url, HTTP_ACCEPT_ENCODING="gzip"))
+    assert response.status_code == 200 and response["Content-Encoding"] == "gzip"
+    assert codec.loads(gzip.decompress(response.content))["meta"]["zoom"] == 14
+    etag = response["ETag"]
+
+    # 같은 세대/타일 재요청은 본문을 다시 만들지 않음
+    calls = len(mget_sizes)
+    response = view(factory.get(url, HTTP_ACCEPT_ENCODING="gzip"))
+    assert response["ETag"] == etag and len(mget_sizes) == calls
+    assert view(factory.get(url, HTTP_IF_NONE_MATCH=etag)).status_code == 304
+
+    # 새로 수집하면 ETag가 바뀌고 이전 세대 타일은 보이지 않음
+    assert BusPositionIndex.store(buses[:10], routes_count=15, ttl=60)
+    response = view(factory.get(url, HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 200 and response["ETag"] != etag
+    snapshot = BusPositionIndex.snapshot(126.7, 37.4, 127.2, 37.7)
+    body, _ = BusPositionIndex.body(snapshot, "identity")
+    assert codec.loads(body)["meta"]["total_buses"] == 10
+
+
+def test_bus_area_bounds_are_validated_and_clamped(monkeypatch):
+    """넓은/잘못된 영역이 타일 목록을 만들지 않고 서비스 영역으로 잘리거나 400인지 테스트"""
+    from rest_framework.test import APIRequestFactory
+
+    from apps.routes.services import bus_position_index
+    from apps.routes.services.bus_position_index import (
+        SERVICE_AREA_NE,
+        SERVICE_AREA_SW,
+        BusPositionIndex,
+        clamp_bounds,
+    )
+    from apps.routes.views_bus import BusAllPositionsView
+
+    # 세계 전체 → 서비스 영역, 뒤집힘/NaN/영역 밖 → None
+    assert clamp_bounds([-180, -85], [180, 85]) == (*SERVICE_AREA_SW, *SERVICE_AREA_NE)
+    assert clamp_bounds([127.1, 37.5], [127.0, 37.6]) is None
+    assert clamp_bounds(["nan", 37.5], [127.0, 37.6]) is None
+    assert clamp_bounds([100, 20], [110, 30]) is None
+    assert clamp_bounds("127,37", None) is None
+
+    # z12로도 타일이 너무 많으면 목록을 만들지 않고 None (전체 목록 캐시로 대체)
+    built = []
+    tiles_in_bounds = bus_position_index.tiles_in_bounds
+    monkeypatch.setattr(
+        bus_position_index,
+        "tiles_in_bounds",
+        lambda *args: built.append(args) or tiles_in_bounds(*args),
+    )
+    assert BusPositionIndex.choose_zoom(100, 20, 140, 50) is None
+    assert BusPositionIndex.choose_zoom(*SERVICE_AREA_SW, *SERVICE_AREA_NE) is None
+    assert built == []
+    assert BusPositionIndex.choose_zoom(126.97, 37.55, 126.99, 37.57)[0] == 14
+
+    view = BusAllPositionsView.as_view()
+    factory = APIRequestFactory()
+    for query in (
+        "sw=127.1,37.5&ne=127.0,37.6",
+        "sw=nan,37.5&ne=127.0,37.6",
+        "sw=127.0&ne=127.1,37.6",
+        "sw=100,20&ne=110,30",
+    ):
+        response = view(factory.get(f"/api/v1/bus/positions/area?{query}"))
+        assert response.status_code == 400
+    response = view(
+        factory.post(
+            "/api/v1/bus/positions/area",
+            {"bounds": {"sw": [127.1, 37.5], "ne": "x"}},
+            format="json",
+        )
+    )
+    assert response.status_code == 400
+
+
+def test_bus_position_feed_deltas_track_positions(settings, fake_redis):
+    """변경분을 이어 적용하면 위치 오차가 격자 한 칸 이내로 유지되고, 오래된 since는 전체 목록인지 테스트"""
+    from rest_framework.test import APIRequestFactory
+
+    from apps.routes.services.bus_position_feed import BusPositionFeed
+    from apps.routes.services.bus_position_index import BusPositionIndex
+    from apps.routes.utils import codec
+    from apps.routes.views_bus import BusPositionsDeltaView
+
+    settings.BUS_FEED_RING_SIZE = 3
+    settings.BUS_FEED_MOVE_THRESHOLD_M = 15
+    view = BusPositionsDeltaView.as_view()
+    factory = APIRequestFactory()
+
+    def poll(since=None, **headers):
+        url = "/api/v1/bus/positions/delta" + (f"?since={since}" if since else "")
+        return view(factory.get(url, **headers))
+
+    rng = random.Random(3)
+    buses = {
+        str(i): [rng.uniform(126.9, 127.1), rng.uniform(37.5, 37.6)] for i in range(300)
+    }
+    client, version, versions = {}, None, []
+    for step in range(6):
+        # 대부분 조금씩(0~3m) 이동, 일부 운행 종료/신규 투입
+        for veh_id in list(buses)[:5]:
+            del buses[veh_id]
+        for i in range(5):
+            buses[f"new-{step}-{i}"] = [rng.uniform(126.9, 127.1), 37.55]
+        for coords in buses.values():
+            coords[0] += rng.uniform(0, 3) / 88_000
+        snapshot = [
+            {"veh_id": veh_id, "coordinates": list(coords)}
+            for veh_id, coords in buses.items()
+        ]
+        new_version = BusPositionIndex.new_version()
+        assert BusPositionFeed.publish(new_version, snapshot, ttl=60)
+        BusPositionIndex.store(snapshot, 1, ttl=60, version=new_version)
+        versions.append(new_version)
+
+        response = poll(version)
+        data = codec.loads(response.content)["data"]
+        assert data["version"] == new_version
+        assert data["full"] == (version is None)
+        if not data["full"]:
+            # 조금씩 움직인 대부분의 버스는 보내지 않음
+            assert len(data["moved"]) < len(buses) / 3
+        for bus in data["added"]:
+            client[bus["veh_id"]] = bus["coordinates"]
+        for bus in data["moved"]:
+            client[bus["veh_id"]] = bus["coordinates"]
+        for veh_id in data["removed"]:
+            del client[veh_id]
+        version = new_version
+
+        assert client.keys() == buses.keys()
+        for veh_id, coords in buses.items():
+            assert abs(client[veh_id][0] - coords[0]) * 88_000 < 30
+
+    # 같은 버전 재요청은 304, 링 밖의 오래된 since는 전체 목록
+    etag = poll(version)["ETag"]
+    assert poll(version, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    data = codec.loads(poll(versions[0]).content)["data"]
+    assert data["full"] and len(data["added"]) == len(buses)
+
+
+def test_bus_collector_selects_routes_by_demand(monkeypatch, settings, fake_redis):
+    """경주 노선 → 조회 많은 노선 → 기본 노선 순으로 예산만큼 수집하고, 수집한 노선 조회는 캐시 hit인지 테스트"""
+    from apps.routes.services.bus_route_demand import BusRouteDemand
+    from apps.routes.services.realtime_cache import RealtimeCache
+    from apps.routes.tasks.bus_positions import fetch_route_buses
+    from apps.routes.utils.bus_api_client import bus_api_client
+    from apps.routes.utils.redis_client import redis_client
+
+    api_calls = []
+
+    def fake_positions(route_id):
+        api_calls.append(route_id)
+        if route_id == "100100999":
+            return []
+        return [{"vehId": f"{route_id}-1", "gpsX": "127.0", "gpsY": "37.5"}]
+
+    monkeypatch.setattr(bus_api_client, "get_bus_positions_by_route", fake_positions)
+    settings.BUS_POSITION_ROUTE_BUDGET = 4
+
+    # 조회/경주가 없고 기본 노선도 없으면 수집하지 않음
+    assert BusRouteDemand.select_routes() == []
+
+    settings.BUS_POSITION_BASELINE_ROUTES = "100100001:1,100100002:202,100100003:3"
+    redis_client.set_public_ids(
+        1,
+        {"legs": [{"mode": "WALK"}, {"mode": "BUS", "bus_route_id": "100100101"}]},
+    )
+    for _ in range(3):
+        RealtimeCache.get_bus_route_positions("100100002", "202")
+    RealtimeCache.get_bus_route_positions("100100303", "303")
+    # 형식이 다른 ID / 운행 버스가 없는 노선은 수요로 기록하지 않음
+    for _ in range(5):
+        RealtimeCache.get_bus_route_positions("x" * 64, "spam")
+        RealtimeCache.get_bus_route_positions("100100999", "999")
+    assert set(redis_client.client.hkeys("bus_routes:names")) == {
+        b"100100002",
+        b"100100303",
+    }
+
+    routes = BusRouteDemand.select_routes()
+    assert routes == [
+        ("100100101", "100100101"),
+        ("100100002", "202"),
+        ("100100303", "303"),
+        ("100100001", "1"),
+    ]
+
+    # 수집한 노선은 다음 조회가 API 호출 없이 캐시에서 응답
+    api_calls.clear()
+    for route in routes:
+        fetch_route_buses(route, ttl=65)
+    assert len(api_calls) == len(routes)
+    assert RealtimeCache.get_bus_route_positions("100100001")[0]["vehId"] == (
+        "100100001-1"
+    )
+    assert len(api_calls) == len(routes)
+
+    # 경주가 끝나면 경주 노선은 빠짐
+    redis_client.delete_public_ids(1)
+    assert "100100101" not in dict(BusRouteDemand.select_routes())
+
+
+def test_bus_dead_reckoning_projects_along_route(monkeypatch, settings, fake_redis):
+    """최근 두 위치의 속도로 노선 경로선을 따라 위치를 추정하고, 최대 추정 시간에서 멈추는지 테스트"""
+    from apps.routes.services import bus_dead_reckoning
+    from apps.routes.services.bus_dead_reckoning import (
+        BusDeadReckoning,
+        BusRoutePath,
+        parse_data_time,
+    )
+    from apps.routes.utils.bus_api_client import bus_api_client
+    from apps.routes.utils.lru_cache import LRUCache
+
+    monkeypatch.setattr(bus_dead_reckoning, "_path_cache", LRUCache())
+    station_calls = []
+
+    def fake_stations(route_id):
+        station_calls.append(route_id)
+        # 동쪽으로 곧게 뻗은 노선 (정류소 약 880m 간격)
+        return [
+            {"seq": str(i + 1), "gpsX": str(127.0 + i * 0.01), "gpsY": "37.5"}
+            for i in range(6)
+        ]
+
+    monkeypatch.setattr(bus_api_client, "get_station_by_route", fake_stations)
+    settings.BUS_PROJECTION_MAX_SECONDS = 90
+    settings.BUS_PROJECTION_STEP = 1
+
+    def collect(lon, data_time):
+        # 수집 Task처럼 노선 경로선을 먼저 준비 (캐시에 있으면 정류소 API 호출 없음)
+        BusRoutePath.get("R1")
+        bus = {
+            "veh_id": "v1",
+            "route_id": "R1",
+            "bus_number": "100",
+            "coordinates": [lon, 37.5001],
+            "sect_ord": 1,
+            "data_time": data_time,
+        }
+        BusDeadReckoning.update([bus], now=0, ttl=65)
+
+    # 60초 동안 600m 이동 (10m/s)
+    start_lon = 127.001
+    moved_lon = start_lon + 600 / (calculate_distance(37.5, 127.0, 37.5, 127.01) / 0.01)
+    collect(start_lon, "20260101120000")
+    collect(moved_lon, "20260101120100")
+    assert station_calls == ["R1"]
+
+    fixed_at = parse_data_time("20260101120100")
+    at, positions = BusDeadReckoning.positions(fixed_at + 30)
+    (bus,) = positions
+    assert bus["speed"] == pytest.approx(10, abs=0.1)
+    assert bus["projected_s"] == 30
+    lon, lat = bus["coordinates"]
+    assert lat == pytest.approx(37.5001)
+    assert calculate_distance(37.5, moved_lon, 37.5, lon) == pytest.approx(300, abs=5)
+
+    # 마지막 GPS 이후 BUS_PROJECTION_MAX_SECONDS가 지나면 더 이동하지 않음
+    _, (bus,) = BusDeadReckoning.positions(fixed_at + 600)
+    assert bus["projected_s"] == 90
+    assert calculate_distance(
+        37.5, moved_lon, 37.5, bus["coordinates"][0]
+    ) == pytest.approx(900, abs=10)
+
+
+def test_bus_route_path_failure_keeps_collected_positions(monkeypatch, fake_redis):
+    """노선 경로선 생성이 실패해도 수집한 버스 위치는 그대로 반환하고, 추정만 생략하는지 테스트"""
+    from apps.routes.services import bus_dead_reckoning
+    from apps.routes.services.bus_dead_reckoning import BusDeadReckoning
+    from apps.routes.tasks.bus_positions import fetch_route_buses
+    from apps.routes.utils.bus_api_client import bus_api_client
+    from apps.routes.utils.lru_cache import LRUCache
+    from apps.routes.utils.redis_client import redis_client
+
+    monkeypatch.setattr(bus_dead_reckoning, "_path_cache", LRUCache())
+    station_calls = []
+
+    def failing_stations(route_id):
+        station_calls.append(route_id)
+        raise RuntimeError("station api down")
+
+    monkeypatch.setattr(bus_api_client, "get_station_by_route", failing_stations)
+    monkeypatch.setattr(
+        bus_api_client,
+        "get_bus_positions_by_route",
+        lambda route_id: [
+            {"vehId": "v1", "gpsX": "127.0", "gpsY": "37.5", "sectOrd": "3"},
+            {"vehId": "v2", "gpsX": "127.01", "gpsY": "37.5"},
+        ],
+    )
+
+    buses = fetch_route_buses(("100100001", "100"), ttl=65)
+    assert [bus["veh_id"] for bus in buses] == ["v1", "v2"]
+    assert station_calls == ["100100001"]
+
+    # 경로선이 없으면 기록만 남기고 정류소 API를 다시 호출하지 않음
+    assert BusDeadReckoning.update(buses, now=0, ttl=65) == 2
+    assert station_calls == ["100100001"]
+    assert redis_client.get_bus_tracks()["v1"]["fixes"] == []
@@ -6,10 +6,17 @@ routes 앱 유틸리티 모듈
 - bus_api_client: 서울시 버스 API 클라이언트
 - subway_api_client: 서울시 지하철 API 클라이언트
 - geo_utils: 좌표 계산 유틸리티
+- path_geometry: 경로선 파싱/보간/스냅핑 (CompiledPath)
+- lru_cache: 프로세스 내 LRU 캐시
+- metrics: Worker 공유 카운터 (/metrics 노출)
+- clock: 봇 틱 경로 시계 (벤치마크 시 가상 시계로 교체)
+- api_replay: 외부 API 호출 기록/재생 (cassette)
 """
 
 from .bus_api_client import bus_api_client
 from .geo_utils import calculate_distance, find_closest_station
+from .lru_cache import LRUCache
+from .path_geometry import CompiledPath
 from .rabbitmq_client import rabbitmq_client
 from .redis_client import redis_client
 from .subway_api_client import subway_api_client
@@ -21,4 +28,6 @@ __all__ = [
     "subway_api_client",
     "calculate_distance",
     "find_closest_station",
+    "CompiledPath",
+    "LRUCache",
 ]
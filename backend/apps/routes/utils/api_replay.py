@@ -0,0 +1,289 @@
+"""
+외부 API 호출 기록/재생 (cassette)
+
+역할:
+- 서울시 버스/지하철 API, TMAP 경로 탐색 API 클라이언트 메서드를 가로채
+  호출 인자와 응답을 JSON Lines 파일(cassette)에 기록
+- 기록된 cassette를 가상 시계(clock) 기준으로 재생 (같은 호출의 응답이
+  여러 개면 현재 시각 이전의 마지막 응답 사용)
+- API별 호출 수 집계 (벤치마크의 봇·분당 API 호출 수)
+
+기록:
+    API_RECORD_PATH 환경변수를 설정하면 Django/Celery 프로세스 시작 시
+    모든 대상 API 호출을 해당 파일에 추가합니다.
+
+재생:
+    with intercept_api_calls(CassetteResponder(ApiCassette.load(path))) as stats:
+        ...
+"""
+
+import importlib
+import json
+import logging
+import threading
+from bisect import insort
+from collections import Counter, defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import clock
+
+logger = logging.getLogger(__name__)
+
+# 가로챌 API: 이름 → (모듈, 클래스, 메서드, 응답 없을 때 기본값)
+API_TARGETS: Dict[str, Tuple[str, str, str, Any]] = {
+    "bus.get_bus_route_list": (
+        "apps.routes.utils.bus_api_client",
+        "SeoulBusAPIClient",
+        "get_bus_route_list",
+        [],
+    ),
+    "bus.get_station_by_name": (
+        "apps.routes.utils.bus_api_client",
+        "SeoulBusAPIClient",
+        "get_station_by_name",
+        [],
+    ),
+    "bus.get_station_by_route": (
+        "apps.routes.utils.bus_api_client",
+        "SeoulBusAPIClient",
+        "get_station_by_route",
+        [],
+    ),
+    "bus.get_arrival_info": (
+        "apps.routes.utils.bus_api_client",
+        "SeoulBusAPIClient",
+        "get_arrival_info",
+        None,
+    ),
+    "bus.get_bus_position": (
+        "apps.routes.utils.bus_api_client",
+        "SeoulBusAPIClient",
+        "get_bus_position",
+        None,
+    ),
+    "bus.get_bus_positions_by_route": (
+        "apps.routes.utils.bus_api_client",
+        "SeoulBusAPIClient",
+        "get_bus_positions_by_route",
+        [],
+    ),
+    "subway.get_arrival_info": (
+        "apps.routes.utils.subway_api_client",
+        "SeoulSubwayAPIClient",
+        "get_arrival_info",
+        [],
+    ),
+    "subway.get_train_position": (
+        "apps.routes.utils.subway_api_client",
+        "SeoulSubwayAPIClient",
+        "get_train_position",
+        [],
+    ),
+    "tmap.search_routes": (
+        "apps.itineraries.services",
+        "TmapTransitService",
+        "search_routes",
+        {},
+    ),
+}
+
+# 재생 응답 함수: (API 이름, args, kwargs) → 응답
+Responder = Callable[[str, tuple, dict], Any]
+
+
+def _call_key(args: tuple, kwargs: dict) -> str:
+    """호출 인자 → cassette 조회 키"""
+    return json.dumps(
+        [list(args), kwargs], sort_keys=True, ensure_ascii=False, default=str
+    )
+
+
+class ApiCassette:
+    """기록된 API 응답 모음"""
+
+    def __init__(self):
+        # (API 이름, 호출 키) → [(기록 시각, 응답), ...] (시각 오름차순)
+        self._entries: Dict[Tuple[str, str], List[Tuple[float, Any]]] = defaultdict(
+            list
+        )
+        self.records: List[Dict] = []
+
+    @classmethod
+    def load(cls, path: str) -> "ApiCassette":
+        """
+        cassette 파일 로드
+
+        Args:
+            path: JSON Lines 파일 경로
+
+        Returns:
+            ApiCassette
+        """
+        cassette = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    cassette.add(json.loads(line))
+        return cassette
+
+    def add(self, record: Dict) -> None:
+        """기록 1건 추가 ({api, args, kwargs, t, response}, 시각 순서 유지)"""
+        self.records.append(record)
+        key = (record["api"], _call_key(record["args"], record["kwargs"]))
+        insort(
+            self._entries[key],
+            (record["t"], record["response"]),
+            key=lambda entry: entry[0],
+        )
+
+    def lookup(
+        self, api: str, args: tuple, kwargs: dict, at: float
+    ) -> Tuple[bool, Any]:
+        """
+        at 시각 기준 응답 조회
+
+        Args:
+            api: API 이름
+            args: 위치 인자
+            kwargs: 키워드 인자
+            at: 조회 시각 (epoch 초)
+
+        Returns:
+            (at 이전 기록 존재 여부, at 이전 마지막 응답)
+        """
+        entries = self._entries.get((api, _call_key(args, kwargs)))
+        if not entries or entries[0][0] > at:
+            return False, None
+
+        response = None
+        for recorded_at, recorded in entries:
+            if recorded_at > at:
+                break
+            response = recorded
+        return True, response
+
+    def start_time(self, api_prefix: str = "") -> Optional[float]:
+        """api_prefix로 시작하는 API의 첫 기록 시각"""
+        times = [r["t"] for r in self.records if r["api"].startswith(api_prefix)]
+        return min(times) if times else None
+
+
+class CassetteResponder:
+    """
+    cassette 재생 응답 함수 (가상 시계 기준)
+
+    현재 시각 이전에 기록된 응답이 없으면 API별 기본값을 반환하고 misses에 집계합니다.
+    """
+
+    def __init__(self, cassette: ApiCassette):
+        self.cassette = cassette
+        self.misses: Counter = Counter()
+
+    def __call__(self, api: str, args: tuple, kwargs: dict) -> Any:
+        found, response = self.cassette.lookup(api, args, kwargs, clock.time())
+        if not found:
+            self.misses[api] += 1
+            return API_TARGETS[api][3]
+        return response
+
+
+class JsonLinesRecorder:
+    """API 호출을 JSON Lines 파일에 추가 기록 (스레드 안전)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, api: str, args: tuple, kwargs: dict, response: Any) -> None:
+        line = json.dumps(
+            {
+                "api": api,
+                "args": list(args),
+                "kwargs": kwargs,
+                "t": clock.time(),
+                "response": response,
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+        # 한 줄을 한 번에 append (여러 Worker 프로세스가 같은 파일에 기록)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _wrap(
+    api: str,
+    original: Callable,
+    stats: Counter,
+    responder: Optional[Responder],
+    recorder: Optional[Callable],
+) -> Callable:
+    def wrapper(self, *args, **kwargs):
+        stats[api] += 1
+        if responder is not None:
+            return responder(api, args, kwargs)
+
+        response = original(self, *args, **kwargs)
+        if recorder is not None:
+            try:
+                recorder(api, args, kwargs, response)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"API 호출 기록 실패: api={api}, error={e}")
+        return response
+
+    wrapper.__wrapped__ = original
+    return wrapper
+
+
+def _install(
+    responder: Optional[Responder], recorder: Optional[Callable]
+) -> Tuple[Counter, List[Tuple[type, str, Callable]]]:
+    stats: Counter = Counter()
+    originals = []
+    for api, (module_path, class_name, method_name, _) in API_TARGETS.items():
+        cls = getattr(importlib.import_module(module_path), class_name)
+        original = getattr(cls, method_name)
+        originals.append((cls, method_name, original))
+        setattr(cls, method_name, _wrap(api, original, stats, responder, recorder))
+    return stats, originals
+
+
+@contextmanager
+def intercept_api_calls(
+    responder: Optional[Responder] = None, recorder: Optional[Callable] = None
+) -> Generator[Counter, None, None]:
+    """
+    외부 API 호출 가로채기 (with 블록 동안)
+
+    Args:
+        responder: 지정 시 실제 API 대신 응답 함수 사용 (재생/합성 데이터)
+        recorder: 지정 시 실제 API 응답을 기록
+
+    Yields:
+        API 이름별 호출 수 Counter
+    """
+    stats, originals = _install(responder, recorder)
+    try:
+        yield stats
+    finally:
+        for cls, method_name, original in originals:
+            setattr(cls, method_name, original)
+
+
+_recording_stats: Optional[Counter] = None
+
+
+def start_recording(path: str) -> None:
+    """
+    프로세스 전체 API 호출 기록 시작 (settings.API_RECORD_PATH, 1회)
+
+    Args:
+        path: cassette 파일 경로
+    """
+    global _recording_stats
+    if _recording_stats is not None:
+        return
+    _recording_stats, _ = _install(None, JsonLinesRecorder(path))
+    logger.warning(f"외부 API 호출 기록 중: path={path}")
@@ -198,8 +198,67 @@ class SeoulBusAPIClient:
             )
             return []
 
+    def find_station_ord(self, st_id: str, bus_route_id: str) -> Optional[int]:
+        """
+        노선 정류소 목록에서 정류소 순번(ord) 검색
+
+        노선 전체 정류소 목록을 내려받으므로 결과는 호출하는 쪽에서 캐시해야 합니다.
+
+        Args:
+            st_id: 정류소 ID
+            bus_route_id: 노선 ID
+
+        Returns:
+            정류소 순번 또는 None
+        """
+        logger.info(
+            f"ord 없음, 노선 정류소 목록에서 검색: "
+            f"st_id={st_id}, bus_route_id={bus_route_id}"
+        )
+        stations = self.get_station_by_route(bus_route_id)
+
+        for i, station in enumerate(stations):
+            # 가능한 모든 필드명 시도 (API 문서마다 필드명이 다를 수 있음)
+            station_id_fields = ["stationId", "stId", "station"]
+            seq_fields = ["seq", "staOrder", "stationSeq"]
+
+            station_id = None
+            for field in station_id_fields:
+                if field in station:
+                    station_id = station.get(field)
+                    break
+
+            if i < 3:  # 처음 3개만 디버깅 출력
+                logger.info(
+                    f"정류소 #{i}: station_id={station_id}, st_id_target={st_id}, "
+                    f"keys={list(station.keys())[:10]}"
+                )
+
+            if station_id == st_id:
+                # seq 찾기
+                for field in seq_fields:
+                    if field in station:
+                        ord = int(station.get(field, 0))
+                        logger.info(
+                            f"ord 찾음: st_id={st_id}, "
+                            f"stationNm={station.get('stationNm') or station.get('stNm')}, "
+                            f"ord={ord}, seq_field={field}"
+                        )
+                        return ord
+                break
+
+        logger.warning(
+            f"ord를 찾을 수 없음: st_id={st_id}, bus_route_id={bus_route_id}, "
+            f"노선 정류소 개수={len(stations)}"
+        )
+        return None
+
     def get_arrival_info(
-        self, st_id: str, bus_route_id: str, ord: Optional[int] = None
+        self,
+        st_id: str,
+        bus_route_id: str,
+        ord: Optional[int] = None,
+        resolve_ord: bool = True,
     ) -> Optional[Dict]:
         """
         버스 도착정보 조회 (JSON 형식)
@@ -208,6 +267,8 @@ class SeoulBusAPIClient:
             st_id: 정류소 ID
             bus_route_id: 노선 ID
             ord: 정류소 순번 (선택사항, None이면 자동 검색)
+            resolve_ord: ord가 None일 때 노선 정류소 목록에서 검색할지 여부
+                (이미 검색에 실패한 경우 False로 전체 정류소 조회만 수행)
 
         Returns:
             도착정보 {
@@ -219,54 +280,9 @@ class SeoulBusAPIClient:
                 ...
             } 또는 None
         """
-        # ord가 없으면 노선 정류소 목록에서 찾기
-        if ord is None:
-            logger.info(
-                f"ord 없음, 노선 정류소 목록에서 검색: "
-                f"st_id={st_id}, bus_route_id={bus_route_id}"
-            )
-            stations = self.get_station_by_route(bus_route_id)
-
-            # 디버깅: 찾는 중인 st_id와 비교
-            found = False
-            for i, station in enumerate(stations):
-                # 가능한 모든 필드명 시도 (API 문서마다 필드명이 다를 수 있음)
-                station_id_fields = ["stationId", "stId", "station"]
-                seq_fields = ["seq", "staOrder", "stationSeq"]
-
-                station_id = None
-                for field in station_id_fields:
-                    if field in station:
-                        station_id = station.get(field)
-                        break
-
-                if i < 3:  # 처음 3개만 디버깅 출력
-                    logger.info(
-                        f"정류소 #{i}: station_id={station_id}, st_id_target={st_id}, "
-                        f"keys={list(station.keys())[:10]}"
-                    )
-
-                if station_id == st_id:
-                    # seq 찾기
-                    for field in seq_fields:
-                        if field in station:
-                            ord = int(station.get(field, 0))
-                            logger.info(
-                                f"ord 찾음: st_id={st_id}, "
-                                f"stationNm={station.get('stationNm') or station.get('stNm')}, "
-                                f"ord={ord}, seq_field={field}"
-                            )
-                            found = True
-                            break
-                    break
-
-            if not found:
-                logger.warning(
-                    f"ord를 찾을 수 없음: st_id={st_id}, bus_route_id={bus_route_id}, "
-                    f"노선 정류소 개수={len(stations)}"
-                )
-                # ord 없이 시도
-                ord = None
+        # ord가 없으면 노선 정류소 목록에서 찾기 (없으면 ord 없이 시도)
+        if ord is None and resolve_ord:
+            ord = self.find_station_ord(st_id, bus_route_id)
 
         # ord가 있으면 getArrInfoByRoute (단일 정류소), 없으면 getArrInfoByRouteAll 사용
         if ord is not None:
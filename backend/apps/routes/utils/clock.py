@@ -0,0 +1,100 @@
+"""
+봇 시뮬레이션 시계
+
+역할:
+- 봇 틱 경로에서 현재 시각을 조회하는 단일 진입점 (timezone.now() / time.time() 대신 사용)
+- 벤치마크/API 재생 시 가상 시계로 교체해 실제 대기 없이 경주를 진행
+
+사용법:
+    from ..utils import clock
+
+    elapsed = (clock.now() - leg_started_at).total_seconds()
+    redis_client.schedule_bot_tick(route_id, clock.time() + countdown)
+"""
+
+import time as _time
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Optional
+
+from django.utils import timezone
+
+
+class SystemClock:
+    """실제 시각 (기본값)"""
+
+    def now(self) -> datetime:
+        return timezone.now()
+
+    def time(self) -> float:
+        return _time.time()
+
+
+class VirtualClock:
+    """
+    가상 시각 (수동으로만 진행)
+
+    벤치마크는 다음 틱 예정 시각으로 advance_to()를 호출해
+    30초 간격 틱도 대기 없이 연속 실행합니다.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        start = start or timezone.now()
+        if timezone.is_naive(start):
+            start = timezone.make_aware(start)
+        self._epoch = start.timestamp()
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._epoch, tz=dt_timezone.utc)
+
+    def time(self) -> float:
+        return self._epoch
+
+    def advance(self, seconds: float) -> None:
+        """seconds초만큼 진행"""
+        self._epoch += max(0.0, seconds)
+
+    def advance_to(self, epoch: float) -> None:
+        """epoch 시각까지 진행 (과거 시각이면 그대로 유지)"""
+        self._epoch = max(self._epoch, epoch)
+
+
+_clock = SystemClock()
+
+
+def now() -> datetime:
+    """현재 시각 (timezone-aware)"""
+    return _clock.now()
+
+
+def time() -> float:
+    """현재 시각 (epoch 초)"""
+    return _clock.time()
+
+
+def get_clock():
+    """현재 사용 중인 시계"""
+    return _clock
+
+
+@contextmanager
+def use_clock(clock) -> Generator[None, None, None]:
+    """
+    시계 교체 (with 블록 동안)
+
+    프로세스 전역 시계를 바꾸므로 단일 스레드 전용입니다.
+    (다른 스레드의 clock.now()/time()도 같은 시계를 보며, 중첩 없이 여러 스레드에서
+    동시에 사용하면 복원 순서가 꼬임 — 벤치마크처럼 한 스레드에서만 사용)
+
+    Args:
+        clock: now()/time()을 제공하는 시계 (예: VirtualClock)
+    """
+    global _clock
+    previous = _clock
+    _clock = clock
+    try:
+        yield
+    finally:
+        _clock = previous
@@ -0,0 +1,138 @@
+"""
+직렬화 코덱 (Redis 값, RabbitMQ 메시지, SSE data)
+
+역할:
+- JSON: orjson이 설치되어 있으면 사용 (표준 json 대비 인코딩/디코딩 수 배 빠름)
+- MessagePack: SERIALIZATION_FORMAT=msgpack이면 내부 구간(Redis 값, RabbitMQ 메시지)에 사용
+  (브라우저로 보내는 SSE data는 항상 JSON)
+- 읽기는 형식을 자동 판별 → 형식을 바꿔도 이미 저장된 값을 그대로 읽음
+- 좌표는 소수점 6자리(약 0.1m), 이벤트 시각은 epoch 밀리초 정수로 압축
+
+사용법:
+    from ..utils import codec
+
+    pipe.set(key, codec.dumps(value))     # 내부 구간 (설정 형식)
+    value = codec.loads(data)             # JSON/MessagePack 자동 판별
+    text = codec.dumps_text(data)         # SSE data (JSON 문자열)
+"""
+
+import json
+from typing import Any, List, Optional, Union
+
+from django.conf import settings
+
+from . import clock
+
+try:
+    import orjson
+except ImportError:  # 표준 json 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # SERIALIZATION_FORMAT=msgpack이어도 JSON 사용
+    msgpack = None
+
+# MessagePack 값 앞에 붙이는 구분 바이트 (MessagePack에서 쓰지 않는 0xc1, JSON 시작 문자와도 겹치지 않음)
+MSGPACK_MARKER = b"\xc1"
+
+# 좌표 소수점 자릿수 (6자리 ≈ 0.1m)
+COORD_PRECISION = 6
+
+# loads() 실패 시 발생하는 예외 (json.JSONDecodeError, orjson/msgpack 오류 포함)
+DECODE_ERRORS = (ValueError, TypeError, UnicodeDecodeError)
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def dumps_json(value: Any) -> bytes:
+    """JSON 인코딩 (UTF-8 bytes, 한글 그대로)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(value, ensure_ascii=False, default=str).encode()
+
+
+def dumps_text(value: Any) -> str:
+    """JSON 인코딩 (str, SSE data 등 텍스트 구간)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def dumps_msgpack(value: Any) -> bytes:
+    """MessagePack 인코딩 (구분 바이트 포함, msgpack 미설치 시 JSON)"""
+    if msgpack is None:
+        return dumps_json(value)
+    return MSGPACK_MARKER + msgpack.packb(value, use_bin_type=True, default=str)
+
+
+def uses_msgpack() -> bool:
+    """내부 구간 MessagePack 사용 여부"""
+    return msgpack is not None and settings.SERIALIZATION_FORMAT == "msgpack"
+
+
+def dumps(value: Any) -> bytes:
+    """
+    내부 구간 인코딩 (settings.SERIALIZATION_FORMAT: json | msgpack)
+
+    Args:
+        value: 인코딩할 값
+
+    Returns:
+        인코딩된 bytes
+    """
+    if uses_msgpack():
+        return dumps_msgpack(value)
+    return dumps_json(value)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    디코딩 (JSON/MessagePack 자동 판별)
+
+    Args:
+        data: dumps()/dumps_json()/dumps_msgpack() 결과 또는 기존 JSON 문자열
+
+    Returns:
+        디코딩된 값
+
+    Raises:
+        DECODE_ERRORS 중 하나: 형식 오류 시
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+        if data[:1] == MSGPACK_MARKER:
+            if msgpack is None:
+                raise ValueError("msgpack이 설치되지 않아 값을 읽을 수 없습니다.")
+            return msgpack.unpackb(data[1:], raw=False, strict_map_key=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encodings(value: Any) -> List[bytes]:
+    """
+    값의 가능한 모든 인코딩 (저장된 값과 바이트 비교용, 예: Lua 상태 검사)
+
+    형식 전환 중에는 JSON/MessagePack 값이 섞여 있으므로 둘 다 반환합니다.
+    """
+    result = [dumps_json(value)]
+    if msgpack is not None:
+        result.append(dumps_msgpack(value))
+    return result
+
+
+def compact_position(position: Optional[dict]) -> Optional[dict]:
+    """좌표 {lon, lat}을 소수점 COORD_PRECISION자리로 반올림"""
+    if not position or position.get("lon") is None or position.get("lat") is None:
+        return position
+    return {
+        **position,
+        "lon": round(float(position["lon"]), COORD_PRECISION),
+        "lat": round(float(position["lat"]), COORD_PRECISION),
+    }
+
+
+def epoch_ms() -> int:
+    """현재 시각 (epoch 밀리초, 봇 시뮬레이션 시계 기준)"""
+    return int(clock.time() * 1000)
@@ -4,10 +4,14 @@
 역할:
 - 두 좌표 사이의 거리 계산 (Haversine 공식)
 - TMAP 좌표와 가장 가까운 정류소 찾기 (상행/하행 구분)
+- 좌표 → 지도 타일(slippy map, z/x/y) 변환, 영역과 겹치는 타일 목록
 """
 
 import math
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# Web Mercator 위도 한계
+MAX_TILE_LAT = 85.05112878
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -107,3 +111,66 @@ def find_closest_station(
             )
 
     return closest
+
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    """
+    좌표 → 지도 타일 번호 (slippy map, Web Mercator)
+
+    Args:
+        lon: 경도
+        lat: 위도
+        zoom: 줌 레벨
+
+    Returns:
+        (x, y) 타일 번호
+    """
+    n = 1 << zoom
+    lat = max(-MAX_TILE_LAT, min(MAX_TILE_LAT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_range(
+    sw_lon: float, sw_lat: float, ne_lon: float, ne_lat: float, zoom: int
+) -> Tuple[int, int, int, int]:
+    """
+    영역(남서/북동 좌표)과 겹치는 타일 번호 범위
+
+    Returns:
+        (min_x, max_x, min_y, max_y) - 양 끝 포함
+    """
+    min_x, max_y = lonlat_to_tile(sw_lon, sw_lat, zoom)
+    max_x, min_y = lonlat_to_tile(ne_lon, ne_lat, zoom)
+    return min_x, max_x, min_y, max_y
+
+
+def count_tiles_in_bounds(
+    sw_lon: float, sw_lat: float, ne_lon: float, ne_lat: float, zoom: int
+) -> int:
+    """영역과 겹치는 타일 수 (목록을 만들지 않고 범위로 계산)"""
+    min_x, max_x, min_y, max_y = tile_range(sw_lon, sw_lat, ne_lon, ne_lat, zoom)
+    return max(0, max_x - min_x + 1) * max(0, max_y - min_y + 1)
+
+
+def tiles_in_bounds(
+    sw_lon: float, sw_lat: float, ne_lon: float, ne_lat: float, zoom: int
+) -> List[Tuple[int, int]]:
+    """
+    영역(남서/북동 좌표)과 겹치는 타일 목록
+
+    넓은 영역은 목록이 매우 커지므로 count_tiles_in_bounds()로 먼저 확인합니다.
+
+    Args:
+        sw_lon: 남서 경도
+        sw_lat: 남서 위도
+        ne_lon: 북동 경도
+        ne_lat: 북동 위도
+        zoom: 줌 레벨
+
+    Returns:
+        [(x, y), ...]
+    """
+    min_x, max_x, min_y, max_y = tile_range(sw_lon, sw_lat, ne_lon, ne_lat, zoom)
+    return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
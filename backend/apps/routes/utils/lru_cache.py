@@ -0,0 +1,56 @@
+"""
+프로세스 내 LRU 캐시
+
+역할:
+- Celery Worker / ASGI Worker 프로세스 안에서 자주 쓰는 값을 보관
+- 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """스레드 안전한 LRU 캐시"""
+
+    def __init__(self, max_size: int = 512):
+        self._max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """값 조회 (조회한 항목은 최근 사용으로 이동)"""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값 저장 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """값 삭제"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate) -> None:
+        """조건에 맞는 키 모두 삭제"""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,178 @@
+"""
+공유 카운터 메트릭
+
+역할:
+- Celery Worker / ASGI Worker에서 증가시킨 카운터를 Redis Hash에 누적
+- Django /metrics(django_prometheus)에서 scrape 시점에 Redis 값을 읽어 노출
+
+Worker 프로세스마다 값을 메모리에 모았다가 FLUSH_INTERVAL마다 한 번의
+파이프라인으로 Redis에 반영합니다. (매 이벤트마다 Redis 왕복하지 않음)
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Tuple
+
+import redis
+
+from .redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = "metrics:counters"
+FLUSH_INTERVAL = 5.0  # 초
+
+# 메트릭 이름 → 설명 (Prometheus HELP)
+METRIC_DESCRIPTIONS: Dict[str, str] = {
+    "hadbetter_realtime_cache_requests_total": (
+        "실시간 API 공유 캐시 조회 수 "
+        "(kind=bus_position/bus_route_positions/bus_arrival/bus_station_ord/"
+        "subway_arrival/subway_position, "
+        "result=hit/miss/wait/fallback)"
+    ),
+    "hadbetter_bot_ticks_total": "봇 틱 처리 수 (pipeline=on/off)",
+    "hadbetter_rabbitmq_publish_total": (
+        "SSE 이벤트 발행 수 (result=ok/retried/failed)"
+    ),
+    "hadbetter_rabbitmq_publish_seconds_total": (
+        "SSE 이벤트 발행 소요 시간 합계 (초, 발행 수로 나누면 평균 지연)"
+    ),
+    "hadbetter_rabbitmq_publisher_connections_total": (
+        "발행용 RabbitMQ 연결 생성/종료 수 "
+        "(event=opened/closed, reason=closed/stale/error/pool_full)"
+    ),
+    "hadbetter_bot_tick_redis_round_trips_total": (
+        "봇 틱 동안의 Redis 왕복 수 (pipeline=on/off, 틱 처리 수로 나누면 틱당 왕복 수)"
+    ),
+    "hadbetter_sse_hub_subscriptions_total": (
+        "SSE 허브 경주 Exchange 구독/해제 수 (event=bind/unbind)"
+    ),
+    "hadbetter_sse_hub_dropped_events_total": (
+        "SSE 클라이언트 버퍼가 가득 차 버린 이벤트 수"
+    ),
+    "hadbetter_sse_coalesced_events_total": (
+        "SSE 클라이언트 버퍼에서 같은 봇의 최신 상태로 교체된 bot_status_update 수"
+    ),
+    "hadbetter_bus_positions_responses_total": (
+        "버스 영역 위치 응답 수 (result=not_modified/cached/built, "
+        "encoding=br/gzip/identity/none)"
+    ),
+    "hadbetter_bus_positions_delta_responses_total": (
+        "버스 위치 변경분 응답 수 (result=delta/full/unchanged)"
+    ),
+    "hadbetter_bus_projections_total": (
+        "버스 추정 위치 조회 수 (result=hit/miss/wait/fallback/error)"
+    ),
+    "hadbetter_sse_sent_bytes_total": "SSE 스트림 전송 바이트 (mode=full/delta)",
+    "hadbetter_sse_stream_seconds_total": (
+        "SSE 스트림 연결 시간 합계 (초, mode=full/delta, "
+        "전송 바이트를 나누고 60을 곱하면 연결 1개의 분당 바이트)"
+    ),
+}
+
+_pending: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _encode_field(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Hash field 인코딩: name|k=v,k=v"""
+    return name + "|" + ",".join(f"{k}={v}" for k, v in labels)
+
+
+def _decode_field(field: str) -> Tuple[str, Dict[str, str]]:
+    name, _, label_str = field.partition("|")
+    labels = dict(item.split("=", 1) for item in label_str.split(",") if "=" in item)
+    return name, labels
+
+
+def incr(name: str, amount: float = 1, **labels) -> None:
+    """
+    카운터 증가 (프로세스 내 버퍼에 누적)
+
+    Args:
+        name: 메트릭 이름 (METRIC_DESCRIPTIONS에 등록된 이름)
+        amount: 증가량
+        **labels: 라벨
+    """
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _pending_lock:
+        _pending[key] += amount
+    if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
+
+
+def flush() -> None:
+    """버퍼에 모인 카운터를 Redis에 반영"""
+    global _last_flush
+
+    with _pending_lock:
+        if not _pending:
+            _last_flush = time.monotonic()
+            return
+        items = list(_pending.items())
+        _pending.clear()
+        _last_flush = time.monotonic()
+
+    try:
+        pipe = redis_client.client.pipeline(transaction=False)
+        for (name, labels), amount in items:
+            pipe.hincrbyfloat(METRICS_KEY, _encode_field(name, labels), amount)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"메트릭 반영 실패 (다음 flush에 재시도): error={e}")
+        with _pending_lock:
+            for key, amount in items:
+                _pending[key] += amount
+
+
+class RedisCounterCollector:
+    """Redis에 누적된 카운터를 Prometheus 메트릭으로 노출하는 Collector"""
+
+    def describe(self):
+        # 등록 시점에 collect()로 Redis를 조회하지 않도록 빈 목록 반환
+        return []
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily
+
+        try:
+            raw = redis_client.client.hgetall(METRICS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"메트릭 조회 실패: error={e}")
+            return
+
+        families: Dict[str, CounterMetricFamily] = {}
+        for field, value in raw.items():
+            name, labels = _decode_field(field.decode())
+            if name not in METRIC_DESCRIPTIONS:
+                continue
+            family = families.get(name)
+            if family is None:
+                # prometheus_client가 _total 접미사를 붙이므로 제거
+                family = CounterMetricFamily(
+                    name.removesuffix("_total"),
+                    METRIC_DESCRIPTIONS[name],
+                    labels=sorted(labels),
+                )
+                families[name] = family
+            family.add_metric([labels[k] for k in sorted(labels)], float(value))
+
+        yield from families.values()
+
+
+_collector_registered = False
+
+
+def register_collector() -> None:
+    """Django 프로세스 기본 Registry에 Collector 등록 (1회)"""
+    global _collector_registered
+    if _collector_registered:
+        return
+
+    from prometheus_client import REGISTRY
+
+    REGISTRY.register(RedisCounterCollector())
+    _collector_registered = True
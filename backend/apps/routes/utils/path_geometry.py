@@ -0,0 +1,421 @@
+"""
+경로선(Polyline) geometry 유틸리티
+
+역할:
+- TMAP linestring ("lon,lat lon,lat ...")을 한 번만 파싱해 packed float 배열로 보관
+- 누적 거리(미터) 사전 계산 → 진행률 기반 위치 보간을 배열 조회로 처리
+- Redis 저장용 바이트 직렬화/역직렬화
+- NumPy 벡터화 스냅핑 (+ 긴 경로선은 세그먼트 격자 인덱스)
+"""
+
+import math
+import struct
+from array import array
+from bisect import bisect_right
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geo_utils import calculate_distance
+
+# 직렬화 헤더: 버전(1바이트) + 좌표 개수(uint32)
+_HEADER = struct.Struct("<BI")
+_FORMAT_VERSION = 1
+
+# 위도 1도당 거리 (미터, geo_utils.calculate_distance와 같은 지구 반지름 사용)
+_METERS_PER_DEGREE = 6371000 * math.pi / 180
+
+# 세그먼트 수가 이 값 이상이면 격자 인덱스 사용
+GRID_MIN_SEGMENTS = 8000
+# 격자 셀 크기 (미터)
+GRID_CELL_SIZE_M = 250.0
+# 격자 탐색 최대 고리 수 (넘으면 전체 벡터화 탐색으로 전환)
+GRID_MAX_RINGS = 4
+
+
+class SnapResult(NamedTuple):
+    """스냅핑 결과"""
+
+    lon: float
+    lat: float
+    segment_index: int  # 투영된 세그먼트 인덱스 (lons[i] → lons[i + 1])
+    along_m: float  # 시작점부터 투영점까지 경로 거리 (미터)
+    distance_m: float  # 원래 좌표와 투영점 사이 거리 (미터, 근사)
+
+
+class _SegmentArrays:
+    """
+    벡터화 스냅핑용 세그먼트 배열
+
+    투영 비율 t는 기존 구현과 같이 경위도(degree) 공간에서 계산하고,
+    후보 간 거리 비교만 경로 중심 위도 기준 등장방형(equirectangular) 근사로 처리합니다.
+    """
+
+    __slots__ = ("x1", "y1", "dx", "dy", "len2", "seg_m", "kx", "ky")
+
+    def __init__(self, path: "CompiledPath"):
+        lons = np.frombuffer(path.lons, dtype=np.float64)
+        lats = np.frombuffer(path.lats, dtype=np.float64)
+        cum_m = np.frombuffer(path.cum_m, dtype=np.float64)
+
+        self.x1 = lons[:-1]
+        self.y1 = lats[:-1]
+        self.dx = np.diff(lons)
+        self.dy = np.diff(lats)
+        self.len2 = self.dx * self.dx + self.dy * self.dy
+        self.seg_m = np.diff(cum_m)
+
+        lat0 = math.radians(float(lats.mean()))
+        self.kx = _METERS_PER_DEGREE * math.cos(lat0)
+        self.ky = _METERS_PER_DEGREE
+
+    def project(self, lon: float, lat: float, index) -> Tuple:
+        """index(slice 또는 정수 배열) 세그먼트들에 대한 투영 비율/투영점/거리 제곱"""
+        x1, y1 = self.x1[index], self.y1[index]
+        dx, dy = self.dx[index], self.dy[index]
+        t = ((lon - x1) * dx + (lat - y1) * dy) / self.len2[index]
+        np.clip(t, 0.0, 1.0, out=t)
+        px = x1 + t * dx
+        py = y1 + t * dy
+        dist2 = ((px - lon) * self.kx) ** 2 + ((py - lat) * self.ky) ** 2
+        return t, px, py, dist2
+
+
+class _SegmentGrid:
+    """
+    세그먼트 격자 인덱스 (긴 경로선용)
+
+    등장방형 평면을 GRID_CELL_SIZE_M 크기 셀로 나누고, 각 세그먼트를 bbox가 겹치는 셀에 등록합니다.
+    조회 시 점이 속한 셀부터 고리(ring) 단위로 넓혀 가며 후보 세그먼트만 투영합니다.
+    """
+
+    __slots__ = ("origin_x", "origin_y", "cols", "rows", "cells")
+
+    def __init__(self, seg: _SegmentArrays):
+        x1 = seg.x1 * seg.kx
+        y1 = seg.y1 * seg.ky
+        x2 = (seg.x1 + seg.dx) * seg.kx
+        y2 = (seg.y1 + seg.dy) * seg.ky
+
+        self.origin_x = float(min(x1.min(), x2.min()))
+        self.origin_y = float(min(y1.min(), y2.min()))
+        min_cx = ((np.minimum(x1, x2) - self.origin_x) // GRID_CELL_SIZE_M).astype(int)
+        max_cx = ((np.maximum(x1, x2) - self.origin_x) // GRID_CELL_SIZE_M).astype(int)
+        min_cy = ((np.minimum(y1, y2) - self.origin_y) // GRID_CELL_SIZE_M).astype(int)
+        max_cy = ((np.maximum(y1, y2) - self.origin_y) // GRID_CELL_SIZE_M).astype(int)
+        self.cols = int(max_cx.max()) + 1
+        self.rows = int(max_cy.max()) + 1
+
+        cells: dict = {}
+        for i in range(len(x1)):
+            for cx in range(min_cx[i], max_cx[i] + 1):
+                for cy in range(min_cy[i], max_cy[i] + 1):
+                    cells.setdefault((cx, cy), []).append(i)
+        self.cells = {key: np.array(ids, dtype=np.intp) for key, ids in cells.items()}
+
+    def nearest(
+        self, seg: _SegmentArrays, lon: float, lat: float
+    ) -> Optional[Tuple[int, float]]:
+        """
+        가장 가까운 세그먼트 탐색
+
+        Returns:
+            (세그먼트 인덱스, 투영 비율 t) 또는 None (경로선에서 너무 멀어 확정하지 못한 경우)
+        """
+        cx = int((lon * seg.kx - self.origin_x) // GRID_CELL_SIZE_M)
+        cy = int((lat * seg.ky - self.origin_y) // GRID_CELL_SIZE_M)
+        # 격자 밖의 점이면 격자 경계까지의 고리는 비어 있으므로 그만큼 건너뜀
+        start_ring = max(0, -cx, cx - self.cols + 1, -cy, cy - self.rows + 1)
+        max_ring = max(cx, self.cols - 1 - cx, cy, self.rows - 1 - cy)
+
+        if start_ring > GRID_MAX_RINGS:
+            return None
+
+        best_i, best_t, best_d2 = -1, 0.0, math.inf
+        for ring in range(start_ring, min(max_ring, GRID_MAX_RINGS) + 1):
+            candidates = [
+                self.cells[key]
+                for key in self._ring_cells(cx, cy, ring)
+                if key in self.cells
+            ]
+            if candidates:
+                ids = np.unique(np.concatenate(candidates))
+                t, _, _, dist2 = seg.project(lon, lat, ids)
+                k = int(np.argmin(dist2))
+                if dist2[k] < best_d2 or (dist2[k] == best_d2 and ids[k] < best_i):
+                    best_i, best_t, best_d2 = int(ids[k]), float(t[k]), float(dist2[k])
+
+            # 아직 보지 않은 셀은 모두 ring * 셀 크기 이상 떨어져 있음
+            if best_i >= 0 and (
+                ring == max_ring or best_d2 <= (ring * GRID_CELL_SIZE_M) ** 2
+            ):
+                return best_i, best_t
+
+        return None
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        """(cx, cy)를 중심으로 한 체비쇼프 거리 ring 위의 셀"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield (x, cy - ring)
+            yield (x, cy + ring)
+        for y in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, y)
+            yield (cx + ring, y)
+
+
+class CompiledPath:
+    """
+    파싱이 끝난 경로선
+
+    lons/lats는 꼭짓점 좌표, cum_m는 시작점부터 각 꼭짓점까지의 누적 거리(미터)입니다.
+    """
+
+    __slots__ = ("lons", "lats", "cum_m", "_segments", "_grid")
+
+    def __init__(self, lons: array, lats: array, cum_m: array):
+        self.lons = lons
+        self.lats = lats
+        self.cum_m = cum_m
+        # 스냅핑용 배열/격자 인덱스 (첫 스냅핑 시 생성)
+        self._segments: Optional[_SegmentArrays] = None
+        self._grid: Optional[_SegmentGrid] = None
+
+    def __len__(self) -> int:
+        return len(self.lons)
+
+    @property
+    def total_m(self) -> float:
+        """경로 전체 길이 (미터)"""
+        return self.cum_m[-1] if self.cum_m else 0.0
+
+    # =========================================================================
+    # 생성
+    # =========================================================================
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[Sequence[float]]) -> Optional["CompiledPath"]:
+        """
+        좌표 배열로 생성
+
+        Args:
+            coords: [[lon, lat], ...]
+
+        Returns:
+            CompiledPath 또는 None (좌표가 2개 미만인 경우)
+        """
+        lons = array("d")
+        lats = array("d")
+        for coord in coords:
+            lon, lat = float(coord[0]), float(coord[1])
+            # 연속 중복 좌표는 길이 0 선분이므로 제거
+            if lons and lons[-1] == lon and lats[-1] == lat:
+                continue
+            lons.append(lon)
+            lats.append(lat)
+
+        if len(lons) < 2:
+            return None
+
+        cum_m = array("d", [0.0])
+        for i in range(1, len(lons)):
+            cum_m.append(
+                cum_m[-1]
+                + calculate_distance(lats[i - 1], lons[i - 1], lats[i], lons[i])
+            )
+        return cls(lons, lats, cum_m)
+
+    @classmethod
+    def from_linestring(cls, linestring: Optional[str]) -> Optional["CompiledPath"]:
+        """
+        TMAP linestring 문자열로 생성
+
+        Args:
+            linestring: "lon,lat lon,lat ..."
+
+        Returns:
+            CompiledPath 또는 None (파싱 실패 또는 좌표 부족)
+        """
+        if not linestring or not isinstance(linestring, str):
+            return None
+
+        coords = []
+        for coord_str in linestring.split():
+            parts = coord_str.split(",")
+            if len(parts) < 2:
+                continue
+            try:
+                coords.append((float(parts[0]), float(parts[1])))
+            except ValueError:
+                continue
+        return cls.from_coords(coords)
+
+    # =========================================================================
+    # 직렬화 (Redis 저장용)
+    # =========================================================================
+
+    def to_bytes(self) -> bytes:
+        """바이트로 직렬화 (헤더 + lons + lats + cum_m, little-endian double)"""
+        return (
+            _HEADER.pack(_FORMAT_VERSION, len(self.lons))
+            + self.lons.tobytes()
+            + self.lats.tobytes()
+            + self.cum_m.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional["CompiledPath"]:
+        """
+        to_bytes() 결과로 복원
+
+        Returns:
+            CompiledPath 또는 None (형식이 맞지 않는 경우)
+        """
+        if not data or len(data) < _HEADER.size:
+            return None
+        version, count = _HEADER.unpack_from(data)
+        size = count * 8
+        if version != _FORMAT_VERSION or len(data) != _HEADER.size + size * 3:
+            return None
+
+        offset = _HEADER.size
+        parts = []
+        for _ in range(3):
+            values = array("d")
+            values.frombytes(data[offset : offset + size])
+            parts.append(values)
+            offset += size
+        return cls(*parts)
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def point_at_distance(self, distance_m: float) -> Tuple[float, float]:
+        """
+        시작점으로부터 distance_m 떨어진 경로 위 좌표
+
+        Args:
+            distance_m: 경로를 따라 이동한 거리 (미터)
+
+        Returns:
+            (lon, lat)
+        """
+        if distance_m <= 0:
+            return self.lons[0], self.lats[0]
+        if distance_m >= self.total_m:
+            return self.lons[-1], self.lats[-1]
+
+        i = bisect_right(self.cum_m, distance_m) - 1
+        seg_len = self.cum_m[i + 1] - self.cum_m[i]
+        t = (distance_m - self.cum_m[i]) / seg_len if seg_len > 0 else 0.0
+        return (
+            self.lons[i] + (self.lons[i + 1] - self.lons[i]) * t,
+            self.lats[i] + (self.lats[i + 1] - self.lats[i]) * t,
+        )
+
+    def point_at_fraction(self, fraction: float) -> Tuple[float, float]:
+        """
+        진행률(0.0 ~ 1.0)에 해당하는 경로 위 좌표 (거리 기준)
+
+        Args:
+            fraction: 진행률
+
+        Returns:
+            (lon, lat)
+        """
+        return self.point_at_distance(self.total_m * fraction)
+
+    def _get_segments(self) -> _SegmentArrays:
+        if self._segments is None:
+            self._segments = _SegmentArrays(self)
+            if len(self.lons) - 1 >= GRID_MIN_SEGMENTS:
+                self._grid = _SegmentGrid(self._segments)
+        return self._segments
+
+    def _snap_result(self, lon: float, lat: float, i: int, t: float) -> SnapResult:
+        seg = self._get_segments()
+        px = self.lons[i] + t * float(seg.dx[i])
+        py = self.lats[i] + t * float(seg.dy[i])
+        distance_m = math.hypot((px - lon) * seg.kx, (py - lat) * seg.ky)
+        return SnapResult(
+            px, py, i, self.cum_m[i] + t * float(seg.seg_m[i]), distance_m
+        )
+
+    def snap_detail(
+        self, lon: float, lat: float, start: int = 0, end: Optional[int] = None
+    ) -> SnapResult:
+        """
+        좌표를 경로선에서 가장 가까운 점으로 스냅핑 (벡터화)
+
+        start/end를 주면 해당 세그먼트 범위 [start, end)만 탐색합니다.
+        전체 탐색이고 경로선이 길면 격자 인덱스로 후보 세그먼트만 투영합니다.
+
+        Args:
+            lon: 경도
+            lat: 위도
+            start: 탐색 시작 세그먼트 인덱스
+            end: 탐색 끝 세그먼트 인덱스 (미포함, 기본 마지막까지)
+
+        Returns:
+            SnapResult
+        """
+        seg = self._get_segments()
+        segment_count = len(seg.x1)
+        start = max(0, min(start, segment_count - 1))
+        end = segment_count if end is None else max(start + 1, min(end, segment_count))
+
+        if self._grid is not None and start == 0 and end == segment_count:
+            found = self._grid.nearest(seg, lon, lat)
+            if found is not None:
+                return self._snap_result(lon, lat, *found)
+
+        t, _, _, dist2 = seg.project(lon, lat, slice(start, end))
+        k = int(np.argmin(dist2))
+        return self._snap_result(lon, lat, start + k, float(t[k]))
+
+    def snap(self, lon: float, lat: float) -> Tuple[float, float]:
+        """
+        좌표를 경로선에서 가장 가까운 점으로 스냅핑
+
+        Args:
+            lon: 경도
+            lat: 위도
+
+        Returns:
+            (snapped_lon, snapped_lat)
+        """
+        result = self.snap_detail(lon, lat)
+        return result.lon, result.lat
+
+    def snap_reference(self, lon: float, lat: float) -> Tuple[float, float]:
+        """
+        스냅핑 기준 구현 (세그먼트마다 Haversine 계산, 비교/벤치마크용)
+
+        Args:
+            lon: 경도
+            lat: 위도
+
+        Returns:
+            (snapped_lon, snapped_lat)
+        """
+        lons, lats = self.lons, self.lats
+        min_distance = float("inf")
+        snapped_point = (lon, lat)
+
+        for i in range(len(lons) - 1):
+            x1, y1 = lons[i], lats[i]
+            dx = lons[i + 1] - x1
+            dy = lats[i + 1] - y1
+            t = ((lon - x1) * dx + (lat - y1) * dy) / (dx * dx + dy * dy)
+            t = max(0.0, min(1.0, t))
+            closest = (x1 + t * dx, y1 + t * dy)
+            dist = calculate_distance(lat, lon, closest[1], closest[0])
+            if dist < min_distance:
+                min_distance = dist
+                snapped_point = closest
+
+        return snapped_point
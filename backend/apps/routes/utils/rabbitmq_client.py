@@ -2,13 +2,14 @@
 RabbitMQ 클라이언트 (SSE Pub/Sub)
 
 역할:
-- Fanout Exchange를 통한 SSE 이벤트 발행
-- SSE View에서 이벤트 구독 (Generator)
+- Fanout Exchange를 통한 SSE 이벤트 발행 (프로세스별 연결 풀 재사용)
+- 동기 이벤트 구독 (Generator, SSE View는 services.sse_hub의 asyncio 구독 사용)
 - 메시지 유실 방지 (재시도 로직, 연결 복구)
 """
 
-import json
 import logging
+import os
+import queue
 import time
 from collections.abc import Generator
 from contextlib import contextmanager
@@ -17,7 +18,15 @@ from typing import Dict, Optional
 from django.conf import settings
 
 import pika
-from pika.exceptions import AMQPChannelError, AMQPConnectionError
+from pika.exceptions import (
+    AMQPChannelError,
+    AMQPConnectionError,
+    AMQPError,
+    ChannelClosedByBroker,
+)
+
+from . import codec, metrics
+from .lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +34,48 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # 초
 
+# 풀에서 꺼낸 연결이 이 시간(초) 이상 쉬었으면 heartbeat/종료 프레임 먼저 처리
+PUBLISHER_IDLE_CHECK = 30
+
+PUBLISH_METRIC = "hadbetter_rabbitmq_publish_total"
+PUBLISH_SECONDS_METRIC = "hadbetter_rabbitmq_publish_seconds_total"
+CONNECTIONS_METRIC = "hadbetter_rabbitmq_publisher_connections_total"
+
+
+class _Publisher:
+    """발행용 연결 + 채널 (프로세스 내 풀에서 재사용)"""
+
+    def __init__(self, parameters: pika.ConnectionParameters, confirms: bool):
+        self.connection = pika.BlockingConnection(parameters)
+        self.confirms = confirms
+        self.pid = os.getpid()
+        self.open_channel()
+
+    def open_channel(self) -> None:
+        """채널 열기 (브로커가 채널을 닫은 경우 같은 연결에서 다시 열기)"""
+        self.channel = self.connection.channel()
+        if self.confirms:
+            self.channel.confirm_delivery()
+        self.last_used = time.monotonic()
+
+    @property
+    def is_connected(self) -> bool:
+        return self.pid == os.getpid() and self.connection.is_open
+
+    @property
+    def is_usable(self) -> bool:
+        return self.is_connected and self.channel.is_open
+
+    def close(self) -> None:
+        # fork 이전 연결은 부모 프로세스 소켓이므로 닫지 않고 버림
+        if self.pid != os.getpid():
+            return
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except AMQPError:
+            pass
+
 
 class RabbitMQClient:
     """RabbitMQ 클라이언트 (SSE Pub/Sub)"""
@@ -34,6 +85,18 @@ class RabbitMQClient:
         self.port = settings.RABBITMQ_PORT
         self.user = settings.RABBITMQ_USER
         self.password = settings.RABBITMQ_PASSWORD
+        self._reset_publishers()
+        # Celery prefork 자식 프로세스는 부모의 연결을 물려받지 않고 새로 연결
+        os.register_at_fork(after_in_child=self._reset_publishers)
+
+    def _reset_publishers(self) -> None:
+        """발행 연결 풀/선언한 Exchange 목록 초기화 (fork 직후)"""
+        self._publishers: "queue.LifoQueue[_Publisher]" = queue.LifoQueue(
+            maxsize=settings.RABBITMQ_PUBLISHER_POOL_SIZE
+        )
+        # 이 프로세스에서 이미 선언한 Exchange (재선언 왕복 생략)
+        self._declared_exchanges = LRUCache(max_size=1024)
+        self._pool_pid = os.getpid()
 
     def _get_connection_parameters(self) -> pika.ConnectionParameters:
         """RabbitMQ 연결 파라미터 생성"""
@@ -79,60 +142,159 @@ class RabbitMQClient:
         """
         return f"sse_events_{route_itinerary_id}"
 
+    # =========================================================================
+    # 발행 연결 풀
+    # =========================================================================
+
+    def _acquire_publisher(self) -> _Publisher:
+        """
+        풀에서 발행 연결 꺼내기 (없으면 새로 연결)
+
+        Raises:
+            AMQPConnectionError: 연결 실패 시
+        """
+        if self._pool_pid != os.getpid():
+            self._reset_publishers()
+
+        while True:
+            try:
+                publisher = self._publishers.get_nowait()
+            except queue.Empty:
+                break
+            if publisher.is_connected and not publisher.channel.is_open:
+                # 브로커가 채널만 닫음 (삭제된 Exchange 등): 연결은 유지하고 채널만 다시 열기
+                self._declared_exchanges.clear()
+                try:
+                    publisher.open_channel()
+                except AMQPError:
+                    self._discard_publisher(publisher, reason="error")
+                    continue
+            if not publisher.is_usable:
+                self._discard_publisher(publisher, reason="closed")
+                continue
+            if time.monotonic() - publisher.last_used >= PUBLISHER_IDLE_CHECK:
+                # 쉬는 동안 쌓인 heartbeat/연결 종료 프레임 처리 (끊겼으면 여기서 예외)
+                try:
+                    publisher.connection.process_data_events(time_limit=0)
+                except AMQPError:
+                    self._discard_publisher(publisher, reason="stale")
+                    continue
+            return publisher
+
+        publisher = _Publisher(
+            self._get_connection_parameters(), settings.RABBITMQ_PUBLISHER_CONFIRMS
+        )
+        metrics.incr(CONNECTIONS_METRIC, event="opened")
+        return publisher
+
+    def _release_publisher(self, publisher: _Publisher) -> None:
+        """발행 연결 반납 (풀이 가득 차면 닫기)"""
+        publisher.last_used = time.monotonic()
+        try:
+            self._publishers.put_nowait(publisher)
+        except queue.Full:
+            self._discard_publisher(publisher, reason="pool_full")
+
+    def _discard_publisher(self, publisher: Optional[_Publisher], reason: str) -> None:
+        """발행 연결 닫기"""
+        if publisher is None:
+            return
+        publisher.close()
+        metrics.incr(CONNECTIONS_METRIC, event="closed", reason=reason)
+
+    def _ensure_exchange(self, publisher: _Publisher, exchange_name: str) -> None:
+        """Exchange 선언 (이 프로세스에서 이미 선언했으면 생략)"""
+        if self._declared_exchanges.get(exchange_name):
+            return
+        # Fanout Exchange 선언
+        # durable=False: 메모리에만 유지 (개발 환경용)
+        # auto_delete=True: 마지막 Queue 언바인딩 시 자동 삭제
+        publisher.channel.exchange_declare(
+            exchange=exchange_name,
+            exchange_type="fanout",
+            durable=False,
+            auto_delete=True,
+        )
+        self._declared_exchanges.set(exchange_name, True)
+
     # =========================================================================
     # 이벤트 발행 (Publisher)
     # =========================================================================
 
-    def publish(self, route_itinerary_id: int, event_type: str, data: dict) -> bool:
+    def publish(
+        self,
+        route_itinerary_id: int,
+        event_type: str,
+        data: dict,
+        event_id: Optional[str] = None,
+    ) -> bool:
         """
         SSE 이벤트 발행 (재시도 로직 포함)
 
+        프로세스별 풀의 연결/채널을 재사용하고, Exchange는 처음 한 번만 선언합니다.
+        구독자가 모두 떠나 auto_delete된 Exchange로 발행해 채널이 닫히면
+        선언 기록을 비우고 새 채널에서 다시 선언 후 발행합니다.
+
         Args:
             route_itinerary_id: 경로 탐색 결과 ID
             event_type: 이벤트 타입 (bot_status_update, bot_boarding 등)
             data: 이벤트 데이터
+            event_id: SSE 이벤트 ID (이벤트 로그 Stream ID, 없으면 생략)
 
         Returns:
             발행 성공 여부
         """
+        exchange_name = self._get_exchange_name(route_itinerary_id)
+        message = {"event": event_type, "data": data}
+        if event_id:
+            message["id"] = event_id
+        body = codec.dumps(message)
+
+        # 메시지 영속성 설정
+        properties = pika.BasicProperties(
+            delivery_mode=2,  # 메시지 영속성 (디스크에 저장)
+            content_type=(
+                "application/x-msgpack" if codec.uses_msgpack() else "application/json"
+            ),
+        )
+
+        started = time.perf_counter()
         last_error = None
 
         for attempt in range(MAX_RETRIES):
+            publisher = None
             try:
-                with self.get_connection() as connection:
-                    channel = connection.channel()
-
-                    exchange_name = self._get_exchange_name(route_itinerary_id)
-
-                    # Fanout Exchange 선언
-                    # durable=False: 메모리에만 유지 (개발 환경용)
-                    # auto_delete=True: 마지막 Queue 언바인딩 시 자동 삭제
-                    channel.exchange_declare(
-                        exchange=exchange_name,
-                        exchange_type="fanout",
-                        durable=False,
-                        auto_delete=True,
-                    )
-
-                    message = {"event": event_type, "data": data}
-
-                    # 메시지 영속성 설정
-                    properties = pika.BasicProperties(
-                        delivery_mode=2,  # 메시지 영속성 (디스크에 저장)
-                        content_type="application/json",
-                    )
+                publisher = self._acquire_publisher()
+                self._ensure_exchange(publisher, exchange_name)
+                publisher.channel.basic_publish(
+                    exchange=exchange_name,
+                    routing_key="",  # fanout은 routing_key 무시
+                    body=body,
+                    properties=properties,
+                )
+                self._release_publisher(publisher)
 
-                    channel.basic_publish(
-                        exchange=exchange_name,
-                        routing_key="",  # fanout은 routing_key 무시
-                        body=json.dumps(message, ensure_ascii=False),
-                        properties=properties,
-                    )
+                metrics.incr(PUBLISH_METRIC, result="ok" if attempt == 0 else "retried")
+                metrics.incr(PUBLISH_SECONDS_METRIC, time.perf_counter() - started)
+                return True
 
-                    return True
+            except ChannelClosedByBroker as e:
+                # 삭제된 Exchange 등으로 브로커가 채널을 닫음: 연결은 유지하고 채널만 다시 열기
+                last_error = e
+                self._declared_exchanges.clear()
+                logger.info(
+                    f"RabbitMQ 채널 재생성 (시도 {attempt + 1}/{MAX_RETRIES}): "
+                    f"route_itinerary_id={route_itinerary_id}, error={e}"
+                )
+                try:
+                    publisher.open_channel()
+                    self._release_publisher(publisher)
+                except AMQPError:
+                    self._discard_publisher(publisher, reason="error")
 
             except (AMQPConnectionError, AMQPChannelError) as e:
                 last_error = e
+                self._discard_publisher(publisher, reason="error")
                 logger.warning(
                     f"RabbitMQ 발행 실패 (시도 {attempt + 1}/{MAX_RETRIES}): "
                     f"route_itinerary_id={route_itinerary_id}, event={event_type}, error={e}"
@@ -140,6 +302,7 @@ class RabbitMQClient:
                 if attempt < MAX_RETRIES - 1:
                     time.sleep(RETRY_DELAY)
 
+        metrics.incr(PUBLISH_METRIC, result="failed")
         logger.error(
             f"RabbitMQ 발행 최종 실패: route_itinerary_id={route_itinerary_id}, "
             f"event={event_type}, error={last_error}"
@@ -207,14 +370,14 @@ class RabbitMQClient:
                     ):
                         if body:
                             try:
-                                message = json.loads(body)
+                                message = codec.loads(body)
                                 yield message
 
                                 # 경주 종료 시 구독 종료
                                 if message.get("event") == "route_ended":
                                     return
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"메시지 JSON 파싱 실패: {e}")
+                            except codec.DECODE_ERRORS as e:
+                                logger.warning(f"메시지 디코딩 실패: {e}")
                                 continue
                         else:
                             # Heartbeat (타임아웃 시 None 반환)
@@ -261,6 +424,7 @@ class RabbitMQClient:
                 channel = connection.channel()
                 exchange_name = self._get_exchange_name(route_itinerary_id)
                 channel.exchange_delete(exchange=exchange_name)
+                self._declared_exchanges.delete(exchange_name)
                 logger.info(f"Exchange 삭제 완료: {exchange_name}")
                 return True
         except (AMQPConnectionError, AMQPChannelError) as e:
@@ -2,24 +2,35 @@
 Redis 클라이언트 (봇 상태 캐시 전용)
 
 역할:
-- 봇 상태 저장/조회/삭제
+- 봇 상태 저장/조회/삭제 (Hash, 필드 단위 업데이트)
 - 5초마다 Celery Task에서 읽기/쓰기
 - 보간 로직을 위한 API 호출 시간 관리
-- 분산 락을 통한 동시성 제어
+- Lua 스크립트를 통한 원자적 상태 전환
+- 봇 틱 세션 (틱 시작 일괄 조회, 종료 시 MULTI/EXEC 1회 반영)
+- 배치 모드 봇 틱 스케줄 (Sorted Set)
+- 지하철 노선별 열차 위치 스냅샷 (Hash)
+- SSE 이벤트 로그 (Stream, 재연결 시 재전송)
+- 경주 진행 중 참가자 (Set, 마지막 참가자 종료 시 경주 종료)
+- 버스 위치 타일 인덱스 (지도 영역에 걸친 타일만 조회)
+- 버스 위치 변경분 피드 (최근 수집 세대 링)
+- 버스 위치 수집 노선 수요 (분 단위 Sorted Set, 진행 중 경주 공공데이터 ID 목록)
+- 버스 위치 추정용 노선 경로선 / 차량별 최근 위치 기록
 """
 
-import json
 import logging
 import time
 import uuid
 from collections.abc import Generator
 from contextlib import contextmanager
-from typing import Dict, Optional
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.conf import settings
 
 import redis
 
+from . import codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +46,36 @@ class LockAcquisitionError(Exception):
     pass
 
 
+class BotTickSession:
+    """
+    봇 틱 1회 동안의 Redis 작업 단위 (RedisClient.bot_tick 참고)
+
+    Attributes:
+        route_id: 경주 ID
+        buffered: 읽기 일괄 조회/쓰기 버퍼링 사용 여부
+        round_trips: 틱 동안 발생한 Redis 왕복 수
+    """
+
+    def __init__(self, route_id: int, buffered: bool):
+        self.route_id = route_id
+        self.buffered = buffered
+        self.round_trips = 0
+        self.route_status: Optional[str] = None
+        self.state: Optional[Dict] = None
+        self.loaded_status: Optional[str] = None
+        # 틱 종료 시 반영할 봇 상태 필드 / 상태 전환 여부
+        self.pending: Dict[str, Any] = {}
+        self.transitioned = False
+        # 틱 종료 시 같은 트랜잭션에서 실행할 쓰기 (pipe → None)
+        self.deferred: List[Callable] = []
+
+
+# 현재 실행 중인 봇 틱 (스레드/Task별)
+_current_tick: ContextVar[Optional[BotTickSession]] = ContextVar(
+    "bot_tick_session", default=None
+)
+
+
 class RedisClient:
     """Redis 클라이언트 (싱글톤)"""
 
@@ -87,13 +128,65 @@ class RedisClient:
     # 봇 상태 캐시
     # =========================================================================
 
+    # 봇 상태는 Hash로 저장 (field = 상태 키, value = codec 인코딩 값)
+    #
+    # 부분 업데이트/상태 전환을 한 번의 EVALSHA로 원자 적용합니다.
+    # - KEYS[1]: 봇 상태 키
+    # - ARGV[1]: TTL (초)
+    # - ARGV[2]: 허용 현재 상태 개수 n (0이면 검사 안 함)
+    # - ARGV[3..2+n]: 허용 현재 상태 (JSON/MessagePack 인코딩 모두)
+    # - 나머지: field, value 쌍
+    # 반환: 1 = 적용, 0 = 상태 없음, -1 = 현재 상태가 허용 목록에 없음
+    _APPLY_BOT_STATE_LUA = """
+    local status = redis.call("hget", KEYS[1], "status")
+    if not status then
+        return 0
+    end
+    local n = tonumber(ARGV[2])
+    if n > 0 then
+        local allowed = false
+        for i = 3, 2 + n do
+            if status == ARGV[i] then
+                allowed = true
+                break
+            end
+        end
+        if not allowed then
+            return -1
+        end
+    end
+    if #ARGV > 2 + n then
+        redis.call("hset", KEYS[1], unpack(ARGV, 3 + n))
+    end
+    redis.call("expire", KEYS[1], ARGV[1])
+    return 1
+    """
+
     def _get_bot_state_key(self, route_id: int) -> str:
         """봇 상태 키 생성"""
         return f"bot_state:{route_id}"
 
+    @staticmethod
+    def _encode_bot_state(fields: dict) -> Dict[str, str]:
+        """봇 상태 필드 → Hash 값 (codec 인코딩으로 타입 유지)"""
+        return {field: codec.dumps(value) for field, value in fields.items()}
+
+    @staticmethod
+    def _decode_bot_state(data: Dict[bytes, bytes]) -> Dict:
+        """Hash 값 → 봇 상태 딕셔너리"""
+        return {field.decode(): codec.loads(value) for field, value in data.items()}
+
+    def _apply_bot_state_script(self):
+        """봇 상태 적용 스크립트 (EVALSHA, 스크립트 캐시에 없으면 자동 로드)"""
+        script = getattr(self, "_apply_bot_state", None)
+        if script is None:
+            script = self._client.register_script(self._APPLY_BOT_STATE_LUA)
+            self._apply_bot_state = script
+        return script
+
     def set_bot_state(self, route_id: int, state: dict, ttl: int = 3600) -> bool:
         """
-        봇 상태 저장
+        봇 상태 저장 (전체 교체)
 
         Args:
             route_id: 경주 ID (봇의 Route ID)
@@ -107,12 +200,15 @@ class RedisClient:
             RedisConnectionError: 연결 오류 시
         """
         key = self._get_bot_state_key(route_id)
+
+        def replace(pipe):
+            pipe.delete(key)
+            pipe.hset(key, mapping=self._encode_bot_state(state))
+            pipe.expire(key, ttl)
+            return pipe.execute()
+
         result = self._safe_execute(
-            f"set_bot_state:{route_id}",
-            self._client.setex,
-            key,
-            ttl,
-            json.dumps(state, ensure_ascii=False),
+            f"set_bot_state:{route_id}", replace, self._client.pipeline()
         )
         return result is not None
 
@@ -129,15 +225,47 @@ class RedisClient:
         Raises:
             RedisConnectionError: 연결 오류 시
         """
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            return dict(session.state) if session.state is not None else None
+        return self._read_bot_state(route_id)
+
+    def _read_bot_state(self, route_id: int) -> Optional[Dict]:
+        """Redis에서 봇 상태 조회 (틱 세션 무시)"""
+        key = self._get_bot_state_key(route_id)
+        try:
+            data = self._client.hgetall(key)
+        except redis.ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                logger.error(f"Redis 오류 (get_bot_state:{route_id}): {e}")
+                return None
+            # 배포 전 JSON 문자열로 저장된 상태 → Hash로 변환
+            return self._migrate_legacy_bot_state(route_id)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis 연결 오류 (get_bot_state:{route_id}): {e}")
+            raise RedisConnectionError(f"Redis 연결 실패: {e}") from e
+        if not data:
+            return None
+        try:
+            return self._decode_bot_state(data)
+        except codec.DECODE_ERRORS:
+            logger.warning(f"봇 상태 디코딩 실패: route_id={route_id}")
+            return None
+
+    def _migrate_legacy_bot_state(self, route_id: int) -> Optional[Dict]:
+        """JSON 문자열 봇 상태를 Hash로 변환 (남은 TTL 유지)"""
         key = self._get_bot_state_key(route_id)
         data = self._safe_execute(f"get_bot_state:{route_id}", self._client.get, key)
         if data is None:
             return None
         try:
-            return json.loads(data)
-        except (json.JSONDecodeError, TypeError):
+            state = codec.loads(data)
+        except codec.DECODE_ERRORS:
             logger.warning(f"봇 상태 JSON 파싱 실패: route_id={route_id}")
             return None
+        ttl = self._safe_execute(f"ttl_bot_state:{route_id}", self._client.ttl, key)
+        self.set_bot_state(route_id, state, ttl if ttl and ttl > 0 else 3600)
+        return state
 
     def delete_bot_state(self, route_id: int) -> bool:
         """
@@ -149,6 +277,11 @@ class RedisClient:
         Returns:
             삭제 성공 여부
         """
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            session.state = None
+            session.pending.clear()
+
         key = self._get_bot_state_key(route_id)
         try:
             self._client.delete(key)
@@ -157,99 +290,76 @@ class RedisClient:
             logger.warning(f"봇 상태 삭제 실패: route_id={route_id}, error={e}")
             return False
 
-    def _get_lock_key(self, route_id: int) -> str:
-        """봇 상태 락 키 생성"""
-        return f"bot_state_lock:{route_id}"
-
-    @contextmanager
-    def bot_state_lock(
-        self, route_id: int, timeout: int = 10, blocking_timeout: int = 5
-    ) -> Generator[bool, None, None]:
-        """
-        봇 상태 업데이트를 위한 분산 락
-
-        Args:
-            route_id: 경주 ID
-            timeout: 락 자동 해제 시간 (초, 기본 10초)
-            blocking_timeout: 락 획득 대기 시간 (초, 기본 5초)
-
-        Yields:
-            락 획득 성공 여부
-
-        Usage:
-            with redis_client.bot_state_lock(route_id) as acquired:
-                if acquired:
-                    # 안전하게 상태 업데이트
-                    state = redis_client.get_bot_state(route_id)
-                    state['field'] = 'value'
-                    redis_client.set_bot_state(route_id, state)
+    def apply_bot_state(
+        self,
+        route_id: int,
+        fields: dict,
+        allowed_from: Optional[List[str]] = None,
+        ttl: int = 3600,
+    ) -> Optional[bool]:
         """
-        lock_key = self._get_lock_key(route_id)
-        lock_value = str(uuid.uuid4())
-        acquired = False
-
-        try:
-            # 락 획득 시도 (SET NX EX)
-            end_time = time.time() + blocking_timeout
-            while time.time() < end_time:
-                result = self._client.set(lock_key, lock_value, nx=True, ex=timeout)
-                if result:
-                    acquired = True
-                    break
-                time.sleep(0.1)  # 100ms 대기 후 재시도
-
-            yield acquired
+        봇 상태 필드 원자 적용 (Lua 1회 왕복, 락 없음)
 
-        except redis.RedisError as e:
-            logger.warning(f"락 획득 중 오류: route_id={route_id}, error={e}")
-            yield False
-
-        finally:
-            # 락 해제 (본인이 획득한 락만 해제)
-            if acquired:
-                try:
-                    # Lua 스크립트로 원자적 삭제 (본인 락만)
-                    lua_script = """
-                    if redis.call("get", KEYS[1]) == ARGV[1] then
-                        return redis.call("del", KEYS[1])
-                    else
-                        return 0
-                    end
-                    """
-                    self._client.eval(lua_script, 1, lock_key, lock_value)
-                except redis.RedisError as e:
-                    logger.warning(f"락 해제 중 오류: route_id={route_id}, error={e}")
-
-    def update_bot_state(
-        self, route_id: int, ttl: int = 3600, **kwargs
-    ) -> Optional[Dict]:
-        """
-        봇 상태 부분 업데이트
+        상태가 없으면 적용하지 않습니다. (삭제된 봇의 일부 필드만 다시 생기는 것 방지)
+        봇 틱 세션 중이면 메모리 상태에만 반영하고 틱 종료 시 한 번에 저장합니다.
 
         Args:
             route_id: 경주 ID
-            ttl: Time To Live (기본 1시간)
-            **kwargs: 업데이트할 필드들
+            fields: 변경할 필드들
+            allowed_from: 지정 시 현재 status가 이 목록에 있을 때만 적용
+            ttl: Time To Live (기본 1시간, 적용 시 갱신)
 
         Returns:
-            업데이트된 봇 상태 또는 None
+            True: 적용, False: 상태 없음 또는 현재 상태 불일치, None: Redis 오류
 
         Raises:
             RedisConnectionError: 연결 오류 시
         """
-        state = self.get_bot_state(route_id)
-        if state:
-            state.update(kwargs)
-            self.set_bot_state(route_id, state, ttl)
-        return state
-
-    def update_bot_state_atomic(
-        self, route_id: int, ttl: int = 3600, **kwargs
-    ) -> Optional[Dict]:
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            if session.state is None:
+                return False
+            if allowed_from and session.state.get("status") not in allowed_from:
+                result = -1
+            else:
+                session.state.update(fields)
+                session.pending.update(fields)
+                session.transitioned = session.transitioned or bool(allowed_from)
+                return True
+        else:
+            result = self._safe_execute(
+                f"apply_bot_state:{route_id}",
+                self._apply_bot_state_script(),
+                keys=[self._get_bot_state_key(route_id)],
+                args=self._apply_bot_state_args(fields, allowed_from, ttl),
+                client=self._client,
+            )
+        if result is None:
+            return None
+        if result == -1:
+            logger.warning(
+                f"봇 상태 전환 거부 (현재 상태 불일치): route_id={route_id}, "
+                f"allowed_from={allowed_from}, status={fields.get('status')}"
+            )
+        return result == 1
+
+    def _apply_bot_state_args(
+        self, fields: dict, allowed_from: Optional[List[str]], ttl: int
+    ) -> list:
+        """봇 상태 적용 스크립트 ARGV 생성"""
+        allowed = [
+            encoded
+            for status in allowed_from or []
+            for encoded in codec.encodings(status)
+        ]
+        args = [ttl, len(allowed), *allowed]
+        for field, value in self._encode_bot_state(fields).items():
+            args.extend((field, value))
+        return args
+
+    def update_bot_state(self, route_id: int, ttl: int = 3600, **kwargs) -> bool:
         """
-        봇 상태 원자적 업데이트 (분산 락 사용)
-
-        동시성 문제가 우려되는 경우 이 메서드를 사용합니다.
+        봇 상태 부분 업데이트 (HSET + EXPIRE 원자 적용)
 
         Args:
             route_id: 경주 ID
@@ -257,18 +367,12 @@ class RedisClient:
             **kwargs: 업데이트할 필드들
 
         Returns:
-            업데이트된 봇 상태 또는 None (락 획득 실패 시)
-        """
-        with self.bot_state_lock(route_id) as acquired:
-            if not acquired:
-                logger.warning(f"봇 상태 락 획득 실패: route_id={route_id}")
-                return None
+            업데이트 여부 (상태가 없으면 False)
 
-            state = self.get_bot_state(route_id)
-            if state:
-                state.update(kwargs)
-                self.set_bot_state(route_id, state, ttl)
-            return state
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        return bool(self.apply_bot_state(route_id, kwargs, ttl=ttl))
 
     def exists_bot_state(self, route_id: int) -> bool:
         """
@@ -287,6 +391,146 @@ class RedisClient:
             logger.warning(f"봇 상태 존재 확인 실패: route_id={route_id}, error={e}")
             return False
 
+    # =========================================================================
+    # 봇 틱 세션 (틱 단위 읽기 일괄 조회 + 쓰기 버퍼링)
+    # =========================================================================
+
+    @contextmanager
+    def bot_tick(
+        self, route_id: int, buffered: bool = True
+    ) -> Generator[BotTickSession, None, None]:
+        """
+        봇 틱 1회를 하나의 Redis 작업 단위로 실행
+
+        - 시작: 경주 상태 플래그 + 봇 상태를 파이프라인 1회로 조회
+        - 진행: 봇 상태 조회/변경은 메모리에서 처리, 틱 예약/Task ID 저장은 보류
+        - 종료: 변경 필드 + 보류한 쓰기를 MULTI/EXEC 1회로 반영
+
+        예외로 끝난 틱의 변경은 반영하지 않습니다. (다음 틱이 저장된 상태에서 다시 진행)
+
+        Args:
+            route_id: 경주 ID
+            buffered: False면 버퍼링 없이 기존처럼 즉시 실행 (왕복 수 측정만)
+
+        Yields:
+            BotTickSession (round_trips로 틱 동안의 Redis 왕복 수 확인)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        self._count_round_trips()
+        session = BotTickSession(route_id, buffered)
+        token = _current_tick.set(session)
+        try:
+            if buffered:
+                self._load_tick(session)
+            yield session
+            if session.buffered:
+                self._flush_tick(session)
+        finally:
+            _current_tick.reset(token)
+
+    def _buffered_tick(self, route_id: int) -> Optional[BotTickSession]:
+        """route_id의 버퍼링 중인 틱 세션 (없으면 None)"""
+        session = _current_tick.get()
+        if session is None or not session.buffered or session.route_id != route_id:
+            return None
+        return session
+
+    def _count_round_trips(self) -> None:
+        """
+        연결 풀에서 연결을 꺼낼 때마다 현재 틱 세션의 왕복 수 증가
+
+        단일 명령/파이프라인 모두 실행마다 연결을 한 번 꺼내므로 왕복 수와 같습니다.
+        """
+        pool = self._client.connection_pool
+        if getattr(pool, "_counts_bot_tick_round_trips", False):
+            return
+        get_connection = pool.get_connection
+
+        def get_counted_connection(*args, **kwargs):
+            session = _current_tick.get()
+            if session is not None:
+                session.round_trips += 1
+            return get_connection(*args, **kwargs)
+
+        pool.get_connection = get_counted_connection
+        pool._counts_bot_tick_round_trips = True
+
+    def _load_tick(self, session: BotTickSession) -> None:
+        """틱 시작 시 경주 상태 플래그 + 봇 상태 일괄 조회"""
+        route_id = session.route_id
+        pipe = self._client.pipeline(transaction=False)
+        pipe.get(self._get_route_status_key(route_id))
+        pipe.hgetall(self._get_bot_state_key(route_id))
+        result = self._safe_execute(
+            f"load_bot_tick:{route_id}", pipe.execute, raise_on_error=False
+        )
+        if result is None:
+            session.buffered = False
+            return
+
+        status, state = result
+        if not isinstance(status, Exception) and status is not None:
+            session.route_status = status.decode()
+        if isinstance(state, Exception):
+            # 배포 전 JSON 문자열 상태 등: 일반 조회로 처리
+            session.state = self._read_bot_state(route_id)
+        elif state:
+            try:
+                session.state = self._decode_bot_state(state)
+            except codec.DECODE_ERRORS:
+                logger.warning(f"봇 상태 디코딩 실패: route_id={route_id}")
+        if session.state is not None:
+            session.loaded_status = session.state.get("status")
+
+    def _flush_tick(self, session: BotTickSession) -> None:
+        """틱 종료 시 변경 필드 + 보류한 쓰기를 트랜잭션 1회로 반영"""
+        if not session.pending and not session.deferred:
+            return
+
+        route_id = session.route_id
+        script = self._apply_bot_state_script()
+        state_args = None
+        if session.pending:
+            # 상태 전환이 있었으면 틱 시작 시 읽은 상태일 때만 적용 (다른 틱과 경합 방지)
+            allowed_from = [session.loaded_status] if session.transitioned else None
+            state_args = self._apply_bot_state_args(
+                session.pending, allowed_from, ttl=3600
+            )
+
+        def flush(pipe):
+            if state_args is not None:
+                pipe.evalsha(
+                    script.sha, 1, self._get_bot_state_key(route_id), *state_args
+                )
+            for write in session.deferred:
+                write(pipe)
+            return pipe.execute(raise_on_error=False)
+
+        results = self._safe_execute(
+            f"flush_bot_tick:{route_id}", flush, self._client.pipeline()
+        )
+        if not results or state_args is None:
+            return
+
+        applied = results[0]
+        if isinstance(applied, redis.exceptions.NoScriptError):
+            # Redis 재시작 등으로 스크립트 캐시가 비었으면 스크립트 로드 후 재시도
+            applied = self._safe_execute(
+                f"apply_bot_state:{route_id}",
+                script,
+                keys=[self._get_bot_state_key(route_id)],
+                args=state_args,
+                client=self._client,
+            )
+        if isinstance(applied, Exception):
+            logger.error(f"봇 상태 반영 실패: route_id={route_id}, error={applied}")
+        elif applied == -1:
+            logger.warning(
+                f"봇 상태 반영 거부 (틱 중 다른 곳에서 상태 변경): route_id={route_id}"
+            )
+
     # =========================================================================
     # API 호출 시간 관리 (보간 로직용)
     # =========================================================================
@@ -312,7 +556,7 @@ class RedisClient:
         """
         key = self._get_api_call_key(route_id, api_type)
         try:
-            self._client.setex(key, ttl, json.dumps(data, ensure_ascii=False))
+            self._client.setex(key, ttl, codec.dumps(data))
             return True
         except redis.RedisError as e:
             logger.warning(
@@ -336,8 +580,8 @@ class RedisClient:
             data = self._client.get(key)
             if data is None:
                 return None
-            return json.loads(data)
-        except (redis.RedisError, json.JSONDecodeError) as e:
+            return codec.loads(data)
+        except (redis.RedisError, *codec.DECODE_ERRORS) as e:
             logger.warning(
                 f"API 호출 캐시 조회 실패: route_id={route_id}, api_type={api_type}, error={e}"
             )
@@ -367,6 +611,8 @@ class RedisClient:
     # 공공데이터 ID 캐시 (TMAP → 공공데이터 ID 변환 결과)
     # =========================================================================
 
+    _ACTIVE_PUBLIC_IDS_KEY = "public_ids:active"
+
     def _get_public_ids_key(self, route_id: int) -> str:
         """공공데이터 ID 캐시 키 생성"""
         return f"public_ids:{route_id}"
@@ -402,13 +648,11 @@ class RedisClient:
             RedisConnectionError: 연결 오류 시
         """
         key = self._get_public_ids_key(route_id)
-        result = self._safe_execute(
-            f"set_public_ids:{route_id}",
-            self._client.setex,
-            key,
-            ttl,
-            json.dumps(public_ids, ensure_ascii=False),
-        )
+        pipe = self._client.pipeline(transaction=False)
+        pipe.setex(key, ttl, codec.dumps(public_ids))
+        # 진행 중 경주 목록 (score = 만료 시각, 버스 위치 수집 노선 선정용)
+        pipe.zadd(self._ACTIVE_PUBLIC_IDS_KEY, {str(route_id): time.time() + ttl})
+        result = self._safe_execute(f"set_public_ids:{route_id}", pipe.execute)
         return result is not None
 
     def get_public_ids(self, route_id: int) -> Optional[Dict]:
@@ -429,11 +673,44 @@ class RedisClient:
         if data is None:
             return None
         try:
-            return json.loads(data)
-        except (json.JSONDecodeError, TypeError):
-            logger.warning(f"공공데이터 ID JSON 파싱 실패: route_id={route_id}")
+            return codec.loads(data)
+        except codec.DECODE_ERRORS:
+            logger.warning(f"공공데이터 ID 디코딩 실패: route_id={route_id}")
             return None
 
+    def get_active_public_ids(self) -> Dict[int, Dict]:
+        """
+        진행 중 경주 전체의 공공데이터 ID 조회 (만료된 경주는 목록에서 정리)
+
+        Returns:
+            {경주 ID: 변환된 ID 정보}
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(self._ACTIVE_PUBLIC_IDS_KEY, "-inf", time.time())
+        pipe.zrange(self._ACTIVE_PUBLIC_IDS_KEY, 0, -1)
+        result = self._safe_execute("get_active_public_ids", pipe.execute)
+        route_ids = [int(member) for member in result[1]] if result else []
+        if not route_ids:
+            return {}
+
+        values = self._safe_execute(
+            "get_active_public_ids:mget",
+            self._client.mget,
+            [self._get_public_ids_key(route_id) for route_id in route_ids],
+        )
+        public_ids = {}
+        for route_id, data in zip(route_ids, values or []):
+            if data is None:
+                continue
+            try:
+                public_ids[route_id] = codec.loads(data)
+            except codec.DECODE_ERRORS:
+                logger.warning(f"공공데이터 ID 디코딩 실패: route_id={route_id}")
+        return public_ids
+
     def delete_public_ids(self, route_id: int) -> bool:
         """
         공공데이터 ID 삭제
@@ -446,12 +723,232 @@ class RedisClient:
         """
         key = self._get_public_ids_key(route_id)
         try:
-            self._client.delete(key)
+            pipe = self._client.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.zrem(self._ACTIVE_PUBLIC_IDS_KEY, str(route_id))
+            pipe.execute()
             return True
         except redis.RedisError as e:
             logger.warning(f"공공데이터 ID 삭제 실패: route_id={route_id}, error={e}")
             return False
 
+    # =========================================================================
+    # 경주 상태 플래그 (봇 Task의 DB 상태 조회 대체)
+    # =========================================================================
+
+    def _get_route_status_key(self, route_id: int) -> str:
+        """경주 상태 플래그 키 생성"""
+        return f"route_status:{route_id}"
+
+    def set_route_status(self, route_id: int, status: str, ttl: int = 3600) -> bool:
+        """
+        경주 상태 플래그 저장
+
+        Args:
+            route_id: 경주 ID
+            status: 경주 상태 (RUNNING/FINISHED/CANCELED)
+            ttl: Time To Live (기본 1시간)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            session.route_status = status
+
+        key = self._get_route_status_key(route_id)
+        result = self._safe_execute(
+            f"set_route_status:{route_id}", self._client.setex, key, ttl, status
+        )
+        return result is not None
+
+    def get_route_status(self, route_id: int) -> Optional[str]:
+        """
+        경주 상태 플래그 조회
+
+        Args:
+            route_id: 경주 ID
+
+        Returns:
+            경주 상태 또는 None (플래그 없음)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        session = self._buffered_tick(route_id)
+        if session is not None and session.route_status is not None:
+            return session.route_status
+
+        key = self._get_route_status_key(route_id)
+        data = self._safe_execute(f"get_route_status:{route_id}", self._client.get, key)
+        return data.decode() if data is not None else None
+
+    # =========================================================================
+    # 경주 진행 중 참가자 (경주 종료 감지, 경로 탐색 결과별 Set)
+    # =========================================================================
+
+    # 참가자 제거 후 남은 참가자가 없으면 1 (이 호출이 경주를 끝냄), 아니면 0
+    # Set이므로 같은 참가자를 두 번 제거해도 한 번만 반영
+    # 1: 마지막 참가자 제거 (경주 종료 표시 저장), 0: 남은 참가자 있음/이미 종료,
+    # -1: 참가자 Set 없음 (등록 실패/만료 → 호출 측에서 DB 조회)
+    _REMOVE_RUNNING_PARTICIPANT_LUA = """
+    if redis.call('SREM', KEYS[1], ARGV[1]) == 1 then
+        if redis.call('SCARD', KEYS[1]) == 0 then
+            redis.call('SET', KEYS[2], 1, 'EX', ARGV[2])
+            return 1
+        end
+        return 0
+    end
+    if redis.call('EXISTS', KEYS[1]) == 1 or redis.call('EXISTS', KEYS[2]) == 1 then
+        return 0
+    end
+    return -1
+    """
+
+    # 경주 종료 표시 유지 시간 (초, 진행 중 참가자 Set 기본 TTL과 같음)
+    _RACE_ENDED_TTL = 21600
+
+    def _get_running_participants_key(self, route_itinerary_id: int) -> str:
+        """진행 중 참가자 키 생성"""
+        return f"race_running:{route_itinerary_id}"
+
+    def _get_race_ended_key(self, route_itinerary_id: int) -> str:
+        """경주 종료 표시 키 생성 (마지막 참가자 제거 후 Set이 사라져도 중복 종료 방지)"""
+        return f"race_ended:{route_itinerary_id}"
+
+    def add_running_participants(
+        self, route_itinerary_id: int, route_ids: List[int], ttl: int = 21600
+    ) -> bool:
+        """
+        진행 중 참가자 등록 (경주 생성 시)
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+            route_ids: 참가자 경주 ID 목록 (유저 + 봇)
+            ttl: Time To Live (기본 6시간)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_running_participants_key(route_itinerary_id)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.sadd(key, *route_ids)
+        pipe.expire(key, ttl)
+        # 같은 경로로 새 경주 시작 시 이전 경주 종료 표시 제거
+        pipe.delete(self._get_race_ended_key(route_itinerary_id))
+        result = self._safe_execute(
+            f"add_running_participants:{route_itinerary_id}", pipe.execute
+        )
+        return result is not None
+
+    def remove_running_participant(
+        self, route_itinerary_id: int, route_id: int
+    ) -> Optional[bool]:
+        """
+        진행 중 참가자 제거 (완주/취소 시)
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+            route_id: 참가자 경주 ID
+
+        Returns:
+            True (마지막 참가자 → 경주 종료), False (남은 참가자 있음/이미 종료됨),
+            None (진행 중 참가자 Set이 없음/오류 시 → DB로 판단)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"remove_running_participant:{route_itinerary_id}",
+            self._client.eval,
+            self._REMOVE_RUNNING_PARTICIPANT_LUA,
+            2,
+            self._get_running_participants_key(route_itinerary_id),
+            self._get_race_ended_key(route_itinerary_id),
+            route_id,
+            self._RACE_ENDED_TTL,
+        )
+        if result is None or result < 0:
+            return None
+        return bool(result)
+
+    # =========================================================================
+    # Leg 경로 geometry 캐시 (CompiledPath 직렬화 바이트)
+    # =========================================================================
+
+    def _get_leg_geometry_key(self, route_id: int) -> str:
+        """Leg geometry 키 생성 (Hash, field = leg 인덱스)"""
+        return f"leg_geometry:{route_id}"
+
+    def set_leg_geometries(
+        self, route_id: int, geometries: Dict[int, bytes], ttl: int = 3600
+    ) -> bool:
+        """
+        Leg geometry 저장
+
+        Args:
+            route_id: 경주 ID
+            geometries: {leg 인덱스: 직렬화된 geometry}
+            ttl: Time To Live (기본 1시간)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        if not geometries:
+            return True
+        key = self._get_leg_geometry_key(route_id)
+        pipe = self._client.pipeline()
+        pipe.hset(key, mapping={str(i): data for i, data in geometries.items()})
+        pipe.expire(key, ttl)
+        result = self._safe_execute(f"set_leg_geometries:{route_id}", pipe.execute)
+        return result is not None
+
+    def get_leg_geometry(self, route_id: int, leg_index: int) -> Optional[bytes]:
+        """
+        Leg geometry 조회
+
+        Args:
+            route_id: 경주 ID
+            leg_index: leg 인덱스
+
+        Returns:
+            직렬화된 geometry 또는 None
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_leg_geometry_key(route_id)
+        return self._safe_execute(
+            f"get_leg_geometry:{route_id}", self._client.hget, key, str(leg_index)
+        )
+
+    def delete_leg_geometries(self, route_id: int) -> bool:
+        """
+        Leg geometry 삭제
+
+        Args:
+            route_id: 경주 ID
+
+        Returns:
+            삭제 성공 여부
+        """
+        key = self._get_leg_geometry_key(route_id)
+        try:
+            self._client.delete(key)
+            return True
+        except redis.RedisError as e:
+            logger.warning(f"Leg geometry 삭제 실패: route_id={route_id}, error={e}")
+            return False
+
     # =========================================================================
     # Celery Task ID 관리 (즉시 취소용)
     # =========================================================================
@@ -464,6 +961,8 @@ class RedisClient:
         """
         Celery Task ID 저장
 
+        봇 틱 세션 중이면 틱 종료 시 상태 변경과 함께 반영합니다.
+
         Args:
             route_id: 경주 ID
             task_id: Celery Task ID
@@ -473,6 +972,10 @@ class RedisClient:
             저장 성공 여부
         """
         key = self._get_task_id_key(route_id)
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            session.deferred.append(lambda pipe: pipe.setex(key, ttl, task_id))
+            return True
         try:
             self._client.setex(key, ttl, task_id)
             return True
@@ -518,6 +1021,1008 @@ class RedisClient:
             logger.warning(f"Task ID 삭제 실패: route_id={route_id}, error={e}")
             return False
 
+    # =========================================================================
+    # 봇 틱 스케줄 (배치 모드)
+    # =========================================================================
+
+    _BOT_TICK_SCHEDULE_KEY = "bot_tick:schedule"
+
+    # 마감 시각이 지난 route_id를 꺼내면서 score를 lease 만료 시각으로 옮김
+    # (처리 중 Worker가 죽어도 lease가 끝나면 다시 claim 대상이 됨)
+    _CLAIM_DUE_BOT_TICKS_LUA = """
+    local ids = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+    for _, id in ipairs(ids) do
+        redis.call("zadd", KEYS[1], ARGV[3], id)
+    end
+    return ids
+    """
+
+    def schedule_bot_tick(self, route_id: int, due_at: float) -> bool:
+        """
+        봇 다음 틱 예약 (Sorted Set, score = 실행 예정 시각)
+
+        봇 틱 세션 중이면 틱 종료 시 상태 변경과 함께 반영합니다.
+
+        Args:
+            route_id: 경주 ID
+            due_at: 실행 예정 시각 (epoch 초)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            session.deferred.append(
+                lambda pipe: pipe.zadd(
+                    self._BOT_TICK_SCHEDULE_KEY, {str(route_id): due_at}
+                )
+            )
+            return True
+
+        result = self._safe_execute(
+            f"schedule_bot_tick:{route_id}",
+            self._client.zadd,
+            self._BOT_TICK_SCHEDULE_KEY,
+            {str(route_id): due_at},
+        )
+        return result is not None
+
+    def claim_due_bot_ticks(
+        self, now: float, limit: int = 200, lease: int = 90
+    ) -> List[int]:
+        """
+        실행 시각이 지난 봇 틱 claim
+
+        claim된 봇은 lease 동안 다른 배치에서 다시 꺼내지지 않습니다.
+        처리 후 schedule_bot_tick() 또는 unschedule_bot_tick()으로 정리해야 합니다.
+
+        Args:
+            now: 현재 시각 (epoch 초)
+            limit: 한 번에 가져올 최대 봇 수
+            lease: claim 유지 시간 (초)
+
+        Returns:
+            route_id 목록
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            "claim_due_bot_ticks",
+            self._client.eval,
+            self._CLAIM_DUE_BOT_TICKS_LUA,
+            1,
+            self._BOT_TICK_SCHEDULE_KEY,
+            now,
+            limit,
+            now + lease,
+        )
+        return [int(route_id) for route_id in result or []]
+
+    def unschedule_bot_tick(self, route_id: int) -> bool:
+        """
+        봇 틱 예약 삭제
+
+        봇 틱 세션 중이면 틱 종료 시 상태 변경과 함께 반영합니다.
+
+        Args:
+            route_id: 경주 ID
+
+        Returns:
+            삭제 성공 여부
+        """
+        session = self._buffered_tick(route_id)
+        if session is not None:
+            session.deferred.append(
+                lambda pipe: pipe.zrem(self._BOT_TICK_SCHEDULE_KEY, str(route_id))
+            )
+            return True
+        try:
+            self._client.zrem(self._BOT_TICK_SCHEDULE_KEY, str(route_id))
+            return True
+        except redis.RedisError as e:
+            logger.warning(f"봇 틱 예약 삭제 실패: route_id={route_id}, error={e}")
+            return False
+
+    # =========================================================================
+    # 지하철 노선별 열차 위치 스냅샷 (노선당 1회 API 호출 공유)
+    # =========================================================================
+
+    _ACTIVE_SUBWAY_LINES_KEY = "subway_lines:active"
+    _SNAPSHOT_FETCHED_AT_FIELD = "__fetched_at"
+
+    def _get_subway_snapshot_key(self, subway_line: str) -> str:
+        """열차 위치 스냅샷 키 생성 (Hash, field = trainNo)"""
+        return f"subway_pos:{subway_line}"
+
+    def get_subway_train_position(
+        self, subway_line: str, train_no: str, now: float
+    ) -> Tuple[Optional[float], Optional[Dict]]:
+        """
+        스냅샷에서 열차 위치 조회 + 노선 활성 표시 (1회 왕복)
+
+        Args:
+            subway_line: 호선명 (예: "2호선")
+            train_no: 열차번호
+            now: 현재 시각 (epoch 초, 활성 노선 score)
+
+        Returns:
+            (스냅샷 수집 시각 또는 None(스냅샷 없음), 열차 위치 또는 None)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_subway_snapshot_key(subway_line)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zadd(self._ACTIVE_SUBWAY_LINES_KEY, {subway_line: now})
+        pipe.hmget(key, self._SNAPSHOT_FETCHED_AT_FIELD, train_no)
+        result = self._safe_execute(
+            f"get_subway_train_position:{subway_line}:{train_no}", pipe.execute
+        )
+        if not result:
+            return None, None
+
+        fetched_at, data = result[1]
+        if fetched_at is None:
+            return None, None
+        return float(fetched_at), codec.loads(data) if data is not None else None
+
+    def set_subway_snapshot(
+        self, subway_line: str, positions: List[Dict], fetched_at: float, ttl: int
+    ) -> bool:
+        """
+        노선 열차 위치 스냅샷 교체 (trainNo 기준 인덱싱)
+
+        이전 스냅샷 삭제와 새 스냅샷 저장을 MULTI로 묶어
+        조회 측에서 두 스냅샷이 섞여 보이지 않게 합니다.
+
+        Args:
+            subway_line: 호선명
+            positions: realtimePosition 응답 목록
+            fetched_at: 수집 시각 (epoch 초)
+            ttl: Time To Live (수집 중단 시 스냅샷 만료)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        mapping = {
+            pos["trainNo"]: codec.dumps(pos) for pos in positions if pos.get("trainNo")
+        }
+        mapping[self._SNAPSHOT_FETCHED_AT_FIELD] = fetched_at
+
+        key = self._get_subway_snapshot_key(subway_line)
+        pipe = self._client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ttl)
+        result = self._safe_execute(f"set_subway_snapshot:{subway_line}", pipe.execute)
+        return result is not None
+
+    def get_active_subway_lines(self, since: float) -> List[str]:
+        """
+        활성 노선 목록 조회 (since 이후 봇이 조회한 노선)
+
+        since 이전에 마지막으로 조회된 노선은 목록에서 정리합니다.
+
+        Args:
+            since: 기준 시각 (epoch 초)
+
+        Returns:
+            호선명 목록
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(self._ACTIVE_SUBWAY_LINES_KEY, "-inf", f"({since}")
+        pipe.zrange(self._ACTIVE_SUBWAY_LINES_KEY, 0, -1)
+        result = self._safe_execute("get_active_subway_lines", pipe.execute)
+        return [line.decode() for line in result[1]] if result else []
+
+    # =========================================================================
+    # 버스 정류소 순번(ord) 캐시 (노선 정류소 목록 재조회 방지)
+    # =========================================================================
+
+    _BUS_STATION_ORD_KEY = "bus_station_ord"
+
+    def get_bus_station_ord(self, bus_route_id: str, st_id: str) -> Optional[int]:
+        """
+        노선 내 정류소 순번 조회
+
+        Args:
+            bus_route_id: 노선 ID
+            st_id: 정류소 ID
+
+        Returns:
+            정류소 순번 또는 None (캐시 없음)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        data = self._safe_execute(
+            f"get_bus_station_ord:{bus_route_id}:{st_id}",
+            self._client.hget,
+            self._BUS_STATION_ORD_KEY,
+            f"{bus_route_id}:{st_id}",
+        )
+        return int(data) if data is not None else None
+
+    def set_bus_station_ord(self, bus_route_id: str, st_id: str, ord: int) -> bool:
+        """
+        노선 내 정류소 순번 저장 (만료 없음)
+
+        Args:
+            bus_route_id: 노선 ID
+            st_id: 정류소 ID
+            ord: 정류소 순번
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"set_bus_station_ord:{bus_route_id}:{st_id}",
+            self._client.hset,
+            self._BUS_STATION_ORD_KEY,
+            f"{bus_route_id}:{st_id}",
+            ord,
+        )
+        return result is not None
+
+    # =========================================================================
+    # 유저 버스 도착 모니터 (Beat Task가 진행 중 유저 경주를 한 번씩 조회)
+    # =========================================================================
+
+    _USER_BUS_MONITORS_KEY = "user_bus_monitors"
+    _USER_BUS_TARGET_KEY = "user_bus_target"
+
+    def set_user_bus_monitor(self, route_id: int, state: Dict) -> bool:
+        """
+        유저 버스 모니터 상태 저장 (Hash, field = 유저 경주 ID)
+
+        Args:
+            route_id: 유저 경주 ID
+            state: UserBusMonitor.to_dict() 결과
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"set_user_bus_monitor:{route_id}",
+            self._client.hset,
+            self._USER_BUS_MONITORS_KEY,
+            str(route_id),
+            codec.dumps(state),
+        )
+        return result is not None
+
+    def get_user_bus_monitors(self) -> Dict[int, Dict]:
+        """
+        전체 유저 버스 모니터 상태 조회
+
+        Returns:
+            {유저 경주 ID: 상태}
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        data = self._safe_execute(
+            "get_user_bus_monitors",
+            self._client.hgetall,
+            self._USER_BUS_MONITORS_KEY,
+        )
+        return {int(k): codec.loads(v) for k, v in (data or {}).items()}
+
+    def delete_user_bus_monitor(self, route_id: int) -> bool:
+        """
+        유저 버스 모니터 삭제 (조회 종료/경주 종료 시)
+
+        Args:
+            route_id: 유저 경주 ID
+
+        Returns:
+            삭제 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"delete_user_bus_monitor:{route_id}",
+            self._client.hdel,
+            self._USER_BUS_MONITORS_KEY,
+            str(route_id),
+        )
+        return result is not None
+
+    def get_user_bus_target(self, bus_name: str, station_name: str) -> Optional[Dict]:
+        """
+        버스 번호 + 정류소 이름 → 공공데이터 노선/정류소 조회
+
+        Args:
+            bus_name: 버스 번호 (예: "6625")
+            station_name: 탑승 정류소 이름
+
+        Returns:
+            {public_route_id, station_id, station_ord} 또는 None (캐시 없음)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        data = self._safe_execute(
+            f"get_user_bus_target:{bus_name}",
+            self._client.hget,
+            self._USER_BUS_TARGET_KEY,
+            f"{bus_name}:{station_name}",
+        )
+        return codec.loads(data) if data is not None else None
+
+    def set_user_bus_target(
+        self, bus_name: str, station_name: str, target: Dict
+    ) -> bool:
+        """
+        버스 번호 + 정류소 이름 → 공공데이터 노선/정류소 저장 (만료 없음)
+
+        Args:
+            bus_name: 버스 번호
+            station_name: 탑승 정류소 이름
+            target: {public_route_id, station_id, station_ord}
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"set_user_bus_target:{bus_name}",
+            self._client.hset,
+            self._USER_BUS_TARGET_KEY,
+            f"{bus_name}:{station_name}",
+            codec.dumps(target),
+        )
+        return result is not None
+
+    # =========================================================================
+    # 공유 조회 캐시 (single-flight)
+    # =========================================================================
+
+    # 본인이 획득한 조회 락만 해제
+    _RELEASE_LOCK_LUA = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    else
+        return 0
+    end
+    """
+
+    def get_or_fetch_json(
+        self,
+        key: str,
+        ttl: int,
+        fetcher: Callable[[], Any],
+        lock_ttl: int = 10,
+        wait_timeout: float = 3.0,
+        none_ttl: int = 1,
+    ) -> Tuple[Any, str]:
+        """
+        캐시 조회, 없으면 한 Worker만 fetcher를 호출 (single-flight)
+
+        락(SET NX)을 얻은 Worker만 fetcher를 호출해 결과를 저장하고,
+        나머지는 결과가 저장될 때까지 기다렸다가 재사용합니다.
+        fetcher 결과가 None(API 실패/일시 오류)이면 none_ttl초만 캐시합니다.
+        (동시에 기다리던 Worker만 공유하고, 봇의 다음 재시도는 다시 조회)
+
+        Args:
+            key: 캐시 키
+            ttl: 결과 유지 시간 (초)
+            fetcher: 실제 조회 함수 (JSON 직렬화 가능한 값 반환)
+            lock_ttl: 조회 락 유지 시간 (초, fetcher 타임아웃보다 길게)
+            wait_timeout: 다른 Worker 결과 대기 시간 (초)
+            none_ttl: None 결과 유지 시간 (초)
+
+        Returns:
+            (값, 결과 구분) - hit: 캐시 사용, miss: 직접 조회,
+            wait: 다른 Worker 조회 결과 대기 후 사용, fallback: 대기 실패로 직접 조회
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        cached = self._safe_execute(f"get_or_fetch:{key}", self._client.get, key)
+        if cached is not None:
+            return codec.loads(cached), "hit"
+
+        lock_key = f"{key}:lock"
+        lock_value = str(uuid.uuid4())
+        acquired = self._safe_execute(
+            f"get_or_fetch_lock:{key}",
+            self._client.set,
+            lock_key,
+            lock_value,
+            nx=True,
+            ex=lock_ttl,
+        )
+
+        if not acquired:
+            # 다른 Worker가 조회 중: 결과 저장까지 대기
+            end_time = time.monotonic() + wait_timeout
+            while time.monotonic() < end_time:
+                time.sleep(0.05)
+                cached = self._safe_execute(
+                    f"get_or_fetch_wait:{key}", self._client.get, key
+                )
+                if cached is not None:
+                    return codec.loads(cached), "wait"
+            return fetcher(), "fallback"
+
+        try:
+            value = fetcher()
+            self._safe_execute(
+                f"get_or_fetch_set:{key}",
+                self._client.setex,
+                key,
+                min(ttl, none_ttl) if value is None else ttl,
+                codec.dumps(value),
+            )
+            return value, "miss"
+        finally:
+            try:
+                self._client.eval(self._RELEASE_LOCK_LUA, 1, lock_key, lock_value)
+            except redis.RedisError as e:
+                logger.warning(f"조회 락 해제 실패: key={key}, error={e}")
+
+    def set_fetched_json(self, key: str, value: Any, ttl: int) -> bool:
+        """
+        공유 조회 캐시 값 직접 저장 (수집 Task가 조회 전에 미리 채움)
+
+        Args:
+            key: get_or_fetch_json()과 같은 캐시 키
+            value: 저장할 값 (JSON 직렬화 가능)
+            ttl: 결과 유지 시간 (초)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"set_fetched_json:{key}", self._client.setex, key, ttl, codec.dumps(value)
+        )
+        return result is not None
+
+    # =========================================================================
+    # SSE 이벤트 로그 (재연결 시 Last-Event-ID 이후 이벤트 재전송)
+    # =========================================================================
+
+    def _get_sse_log_key(self, route_itinerary_id: int) -> str:
+        """SSE 이벤트 로그 키 생성 (Stream, 경주별)"""
+        return f"sse_log:{route_itinerary_id}"
+
+    def append_sse_event(
+        self,
+        route_itinerary_id: int,
+        event_type: str,
+        data: dict,
+        maxlen: int = 1000,
+        ttl: int = 3600,
+    ) -> Optional[str]:
+        """
+        SSE 이벤트 로그 추가 (최근 maxlen개 유지)
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+            event_type: 이벤트 타입
+            data: 이벤트 데이터
+            maxlen: 유지할 최대 이벤트 수 (근사값, 초과분은 오래된 것부터 삭제)
+            ttl: Time To Live (기본 1시간, 추가할 때마다 갱신)
+
+        Returns:
+            이벤트 ID (Stream ID, 경주 내 단조 증가) 또는 None (오류 시)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_sse_log_key(route_itinerary_id)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.xadd(
+            key,
+            {"event": event_type, "data": codec.dumps(data)},
+            maxlen=maxlen,
+            approximate=True,
+        )
+        pipe.expire(key, ttl)
+        result = self._safe_execute(
+            f"append_sse_event:{route_itinerary_id}", pipe.execute
+        )
+        return result[0].decode() if result else None
+
+    def get_sse_events_after(
+        self, route_itinerary_id: int, last_event_id: str, count: int = 1000
+    ) -> Optional[List[Tuple[str, Dict]]]:
+        """
+        last_event_id 이후 SSE 이벤트 조회
+
+        last_event_id가 로그에 남아 있어야 빠진 이벤트가 없다고 보고 결과를 반환합니다.
+        (만료/삭제되었거나 잘못된 ID면 None → 호출 측에서 전체 상태 재전송)
+
+        Args:
+            route_itinerary_id: 경로 탐색 결과 ID
+            last_event_id: 클라이언트가 마지막으로 받은 이벤트 ID
+            count: 최대 조회 수
+
+        Returns:
+            [(이벤트 ID, { "event": str, "data": dict }), ...] 또는 None
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_sse_log_key(route_itinerary_id)
+        entries = self._safe_execute(
+            f"get_sse_events_after:{route_itinerary_id}",
+            self._client.xrange,
+            key,
+            min=last_event_id,
+            max="+",
+            count=count + 1,
+        )
+        if not entries or entries[0][0].decode() != last_event_id:
+            return None
+
+        return [
+            (
+                entry_id.decode(),
+                {
+                    "event": fields[b"event"].decode(),
+                    "data": codec.loads(fields[b"data"]),
+                },
+            )
+            for entry_id, fields in entries[1:]
+        ]
+
+    # =========================================================================
+    # 버스 위치 타일 인덱스 (지도 영역 조회)
+    # =========================================================================
+
+    # 수집할 때마다 새 세대(generation) 키에 타일별 버스 목록을 저장하고,
+    # 모두 저장한 뒤 현재 세대 정보를 교체합니다. (조회 측에서 세대가 섞이지 않음)
+    # 이전 세대 타일은 TTL로 만료됩니다.
+    _BUS_TILES_CURRENT_KEY = "bus_tiles:current"
+
+    def _get_bus_tile_key(self, generation: str, tile: str) -> str:
+        """버스 위치 타일 키 생성 (tile = "z/x/y")"""
+        return f"bus_tile:{generation}:{tile}"
+
+    def set_bus_tiles(
+        self,
+        generation: str,
+        tiles: Dict[str, List[Dict]],
+        meta: Dict[str, Any],
+        ttl: int,
+    ) -> bool:
+        """
+        버스 위치 타일 인덱스 교체
+
+        Args:
+            generation: 새 세대 (수집 버전)
+            tiles: { "z/x/y": [버스 위치, ...] }
+            meta: 수집 정보 (routes_count, total_buses 등)
+            ttl: Time To Live (수집 중단 시 만료)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        pipe = self._client.pipeline(transaction=False)
+        for tile, buses in tiles.items():
+            pipe.set(
+                self._get_bus_tile_key(generation, tile), codec.dumps(buses), ex=ttl
+            )
+        # 타일 저장 후 마지막에 교체 (파이프라인 명령은 순서대로 실행)
+        pipe.set(
+            self._BUS_TILES_CURRENT_KEY,
+            codec.dumps({**meta, "generation": generation}),
+            ex=ttl,
+        )
+        result = self._safe_execute("set_bus_tiles", pipe.execute)
+        return result is not None
+
+    def get_bus_tiles_current(self) -> Optional[Dict[str, Any]]:
+        """
+        현재 타일 인덱스 세대 정보 조회
+
+        Returns:
+            { "generation", "routes_count", "total_buses" } 또는 None (인덱스 없음)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        current = self._safe_execute(
+            "get_bus_tiles_current", self._client.get, self._BUS_TILES_CURRENT_KEY
+        )
+        return codec.loads(current) if current is not None else None
+
+    def get_bus_tiles(self, generation: str, tiles: List[str]) -> List[Dict]:
+        """
+        타일 목록의 버스 위치 조회 (MGET 1회)
+
+        Args:
+            generation: 타일 인덱스 세대
+            tiles: ["z/x/y", ...]
+
+        Returns:
+            버스 위치 목록
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        if not tiles:
+            return []
+        keys = [self._get_bus_tile_key(generation, tile) for tile in tiles]
+        values = self._safe_execute("get_bus_tiles", self._client.mget, keys) or []
+        buses = []
+        for value in values:
+            if value is not None:
+                buses.extend(codec.loads(value))
+        return buses
+
+    def _get_bus_tiles_body_key(self, generation: str, body_key: str) -> str:
+        """타일 묶음 응답 본문 키 생성"""
+        return f"bus_tiles_body:{generation}:{body_key}"
+
+    def get_bus_tiles_body(
+        self, generation: str, body_key: str, encoding: str
+    ) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """
+        미리 압축한 응답 본문 조회
+
+        Args:
+            generation: 타일 인덱스 세대
+            body_key: 타일 묶음 식별자
+            encoding: 압축 방식 (gzip, br, identity)
+
+        Returns:
+            (encoding 본문, 비압축 본문) - 없으면 None
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"get_bus_tiles_body:{body_key}",
+            self._client.hmget,
+            self._get_bus_tiles_body_key(generation, body_key),
+            encoding,
+            "identity",
+        )
+        return tuple(result) if result else (None, None)
+
+    def set_bus_tiles_body(
+        self, generation: str, body_key: str, bodies: Dict[str, bytes], ttl: int
+    ) -> bool:
+        """
+        압축 방식별 응답 본문 저장 (세대가 바뀌면 TTL로 만료)
+
+        Args:
+            generation: 타일 인덱스 세대
+            body_key: 타일 묶음 식별자
+            bodies: { 압축 방식: 본문 }
+            ttl: Time To Live
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_bus_tiles_body_key(generation, body_key)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hset(key, mapping=bodies)
+        pipe.expire(key, ttl)
+        result = self._safe_execute(f"set_bus_tiles_body:{body_key}", pipe.execute)
+        return result is not None
+
+    # =========================================================================
+    # 버스 위치 변경분 피드 (최근 수집 세대 링)
+    # =========================================================================
+
+    # 최근 수집 세대 목록 (최신이 앞) + 세대별 버스 격자 위치
+    # + (이전 세대 → 새 세대) 변경분 본문 / 새 세대 전체 본문 (압축 방식별 Hash)
+    _BUS_FEED_VERSIONS_KEY = "bus_feed:versions"
+
+    def _get_bus_feed_cells_key(self, version: str) -> str:
+        """세대별 버스 격자 위치 키 생성"""
+        return f"bus_feed_cells:{version}"
+
+    def _get_bus_feed_body_key(self, since: str, version: str) -> str:
+        """변경분 본문 키 생성 (since = 이전 세대 또는 "full")"""
+        return f"bus_feed_body:{since}:{version}"
+
+    def get_bus_feed_ring(self) -> List[Tuple[str, Optional[Dict]]]:
+        """
+        최근 수집 세대와 세대별 버스 격자 위치 조회 (2회 왕복)
+
+        Returns:
+            [(세대, { veh_id: [격자 x, 격자 y] } 또는 None(만료)), ...] (최신 순)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        versions = self._safe_execute(
+            "get_bus_feed_versions",
+            self._client.lrange,
+            self._BUS_FEED_VERSIONS_KEY,
+            0,
+            -1,
+        )
+        if not versions:
+            return []
+        versions = [version.decode() for version in versions]
+        values = self._safe_execute(
+            "get_bus_feed_cells",
+            self._client.mget,
+            [self._get_bus_feed_cells_key(version) for version in versions],
+        ) or [None] * len(versions)
+        return [
+            (version, codec.loads(value) if value is not None else None)
+            for version, value in zip(versions, values)
+        ]
+
+    def set_bus_feed(
+        self,
+        version: str,
+        cells: Dict[str, List[int]],
+        bodies: Dict[str, Dict[str, bytes]],
+        ring_size: int,
+        ttl: int,
+    ) -> bool:
+        """
+        새 세대 피드 저장 (변경분 본문 → 격자 위치 → 세대 목록 순)
+
+        Args:
+            version: 새 세대
+            cells: { veh_id: [격자 x, 격자 y] }
+            bodies: { 이전 세대 또는 "full": { 압축 방식: 본문 } }
+            ring_size: 유지할 세대 수
+            ttl: 본문 Time To Live (세대 목록/격자 위치는 ttl × ring_size)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        ring_ttl = ttl * ring_size
+        pipe = self._client.pipeline(transaction=False)
+        for since, encoded in bodies.items():
+            key = self._get_bus_feed_body_key(since, version)
+            pipe.hset(key, mapping=encoded)
+            pipe.expire(key, ttl)
+        pipe.set(self._get_bus_feed_cells_key(version), codec.dumps(cells), ex=ring_ttl)
+        pipe.lpush(self._BUS_FEED_VERSIONS_KEY, version)
+        pipe.ltrim(self._BUS_FEED_VERSIONS_KEY, 0, ring_size - 1)
+        pipe.expire(self._BUS_FEED_VERSIONS_KEY, ring_ttl)
+        result = self._safe_execute(f"set_bus_feed:{version}", pipe.execute)
+        return result is not None
+
+    def get_bus_feed_body(
+        self, since: str, version: str, encoding: str
+    ) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """
+        변경분(또는 전체) 본문 조회
+
+        Args:
+            since: 이전 세대 또는 "full"
+            version: 현재 세대
+            encoding: 압축 방식 (gzip, br, identity)
+
+        Returns:
+            (encoding 본문, 비압축 본문) - 없으면 None
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"get_bus_feed_body:{since}:{version}",
+            self._client.hmget,
+            self._get_bus_feed_body_key(since, version),
+            encoding,
+            "identity",
+        )
+        return tuple(result) if result else (None, None)
+
+    # =========================================================================
+    # 버스 위치 수집 노선 수요 (최근 조회 노선 → 수집 노선 선정)
+    # =========================================================================
+
+    _BUS_ROUTE_NAMES_KEY = "bus_routes:names"
+    # 수요 집계 단위 (초, 이 구간마다 Sorted Set 1개)
+    BUS_ROUTE_DEMAND_BUCKET = 60
+
+    def _get_bus_route_demand_key(self, bucket: int) -> str:
+        """노선 조회 수 키 생성 (Sorted Set, member = 노선 ID, score = 조회 수)"""
+        return f"bus_routes:demand:{bucket}"
+
+    def record_bus_route_demand(
+        self, bus_route_id: str, route_name: Optional[str], now: float, window: int
+    ) -> bool:
+        """
+        노선 조회 1회 기록
+
+        노선 번호 Hash는 TTL이 없으므로 형식을 확인한 실제 노선만 기록하세요.
+        (BusRouteDemand.record 참고)
+
+        Args:
+            bus_route_id: 노선 ID
+            route_name: 노선 번호 (모르면 None)
+            now: 현재 시각 (epoch 초)
+            window: 수요 집계 구간 (초, 지난 구간은 만료)
+
+        Returns:
+            기록 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        key = self._get_bus_route_demand_key(int(now // self.BUS_ROUTE_DEMAND_BUCKET))
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zincrby(key, 1, bus_route_id)
+        pipe.expire(key, window + self.BUS_ROUTE_DEMAND_BUCKET)
+        if route_name:
+            pipe.hset(self._BUS_ROUTE_NAMES_KEY, bus_route_id, route_name)
+        result = self._safe_execute(
+            f"record_bus_route_demand:{bus_route_id}", pipe.execute
+        )
+        return result is not None
+
+    def get_bus_route_demand(
+        self, now: float, window: int
+    ) -> List[Tuple[str, float, Optional[str]]]:
+        """
+        최근 window초 동안의 노선별 조회 수 (많은 순)
+
+        Args:
+            now: 현재 시각 (epoch 초)
+            window: 수요 집계 구간 (초)
+
+        Returns:
+            [(노선 ID, 조회 수, 노선 번호 또는 None), ...]
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        last = int(now // self.BUS_ROUTE_DEMAND_BUCKET)
+        first = int((now - window) // self.BUS_ROUTE_DEMAND_BUCKET) + 1
+        keys = [
+            self._get_bus_route_demand_key(bucket) for bucket in range(first, last + 1)
+        ]
+        counts = self._safe_execute(
+            "get_bus_route_demand", self._client.zunion, keys, withscores=True
+        )
+        if not counts:
+            return []
+
+        counts.sort(key=lambda item: -item[1])
+        route_ids = [member.decode() for member, _ in counts]
+        names = self._safe_execute(
+            "get_bus_route_demand:names",
+            self._client.hmget,
+            self._BUS_ROUTE_NAMES_KEY,
+            route_ids,
+        )
+        return [
+            (route_id, score, name.decode() if name else None)
+            for route_id, (_, score), name in zip(route_ids, counts, names)
+        ]
+
+    # =========================================================================
+    # 버스 위치 추정 (노선 경로선 + 차량별 최근 위치)
+    # =========================================================================
+
+    _BUS_TRACKS_KEY = "bus_tracks"
+
+    def _get_bus_route_path_key(self, bus_route_id: str) -> str:
+        """노선 경로선 키 생성 (CompiledPath.to_bytes())"""
+        return f"bus_route_path:{bus_route_id}"
+
+    def get_bus_route_path(self, bus_route_id: str) -> Optional[bytes]:
+        """
+        노선 경로선 조회
+
+        Args:
+            bus_route_id: 노선 ID
+
+        Returns:
+            CompiledPath.to_bytes() 결과 또는 None
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        return self._safe_execute(
+            f"get_bus_route_path:{bus_route_id}",
+            self._client.get,
+            self._get_bus_route_path_key(bus_route_id),
+        )
+
+    def set_bus_route_path(self, bus_route_id: str, data: bytes, ttl: int) -> bool:
+        """
+        노선 경로선 저장
+
+        Args:
+            bus_route_id: 노선 ID
+            data: CompiledPath.to_bytes() 결과
+            ttl: Time To Live (노선 변경 반영 주기)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            f"set_bus_route_path:{bus_route_id}",
+            self._client.setex,
+            self._get_bus_route_path_key(bus_route_id),
+            ttl,
+            data,
+        )
+        return result is not None
+
+    def get_bus_tracks(self) -> Dict[str, Dict]:
+        """
+        차량별 최근 위치 기록 조회
+
+        Returns:
+            { veh_id: 기록 } (없으면 빈 딕셔너리)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        data = self._safe_execute(
+            "get_bus_tracks", self._client.get, self._BUS_TRACKS_KEY
+        )
+        if data is None:
+            return {}
+        try:
+            return codec.loads(data)
+        except codec.DECODE_ERRORS:
+            logger.warning("버스 위치 기록 디코딩 실패")
+            return {}
+
+    def set_bus_tracks(self, tracks: Dict[str, Dict], ttl: int) -> bool:
+        """
+        차량별 최근 위치 기록 교체 (이번 수집에 없는 차량은 제거됨)
+
+        Args:
+            tracks: { veh_id: 기록 }
+            ttl: Time To Live (수집 중단 시 만료)
+
+        Returns:
+            저장 성공 여부
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        result = self._safe_execute(
+            "set_bus_tracks",
+            self._client.setex,
+            self._BUS_TRACKS_KEY,
+            ttl,
+            codec.dumps(tracks),
+        )
+        return result is not None
+
     # =========================================================================
     # 연결 테스트
     # =========================================================================
@@ -198,6 +198,31 @@ class SeoulSubwayAPIClient:
             return train_line_nm.split("행")[0].strip()
         return ""
 
+    @staticmethod
+    def index_arrivals(arrivals: List[Dict]) -> Dict[str, Dict]:
+        """
+        도착 열차 목록을 호선/방향 기준으로 인덱싱 (JSON 직렬화 가능)
+
+        Args:
+            arrivals: get_arrival_info() 결과
+
+        Returns:
+            {subwayId: {
+                arrivals: 해당 호선 열차 목록 (API 응답 순서 유지),
+                directions: {updnLine: arrivals 내 첫 번째 열차 인덱스},
+            }}
+        """
+        index: Dict[str, Dict] = {}
+        for arrival in arrivals or []:
+            line = index.setdefault(
+                arrival.get("subwayId"), {"arrivals": [], "directions": {}}
+            )
+            line["directions"].setdefault(
+                arrival.get("updnLine", ""), len(line["arrivals"])
+            )
+            line["arrivals"].append(arrival)
+        return index
+
     def filter_by_direction(
         self,
         arrivals: List[Dict],
@@ -217,6 +242,32 @@ class SeoulSubwayAPIClient:
             destination_station: 하차역명
             pass_stops: 경유역 목록 (예: ["신논현", "고속터미널", ..., "여의도"])
 
+        Returns:
+            해당 방향 첫 번째 열차 또는 None
+        """
+        return self.filter_indexed_by_direction(
+            self.index_arrivals(arrivals),
+            subway_line_id,
+            destination_station,
+            pass_stops,
+        )
+
+    def filter_indexed_by_direction(
+        self,
+        arrival_index: Dict[str, Dict],
+        subway_line_id: str,
+        destination_station: str,
+        pass_stops: List[str] = None,
+    ) -> Optional[Dict]:
+        """
+        방향으로 열차 필터링 (index_arrivals() 결과 사용)
+
+        Args:
+            arrival_index: index_arrivals() 결과
+            subway_line_id: 호선 ID (예: "1002")
+            destination_station: 하차역명
+            pass_stops: 경유역 목록
+
         Returns:
             해당 방향 첫 번째 열차 또는 None
         """
@@ -242,18 +293,16 @@ class SeoulSubwayAPIClient:
                 f"방향 판단: pass_stops[0]={pass_stops[0]} → pass_stops[-1]={pass_stops[-1]} = {target_direction}"
             )
 
-            # updnLine으로 필터링
-            for arrival in arrivals:
-                if arrival.get("subwayId") != subway_line_id:
-                    continue
-
-                updn_line = arrival.get("updnLine", "")
-                if updn_line == target_direction:
-                    logger.info(
-                        f"방향 매칭 성공 (updnLine): updnLine={updn_line}, "
-                        f"trainLineNm={arrival.get('trainLineNm')}"
-                    )
-                    return arrival
+            # updnLine으로 필터링 (인덱스 조회)
+            line = arrival_index.get(subway_line_id)
+            position = line["directions"].get(target_direction) if line else None
+            if position is not None:
+                arrival = line["arrivals"][position]
+                logger.info(
+                    f"방향 매칭 성공 (updnLine): updnLine={target_direction}, "
+                    f"trainLineNm={arrival.get('trainLineNm')}"
+                )
+                return arrival
 
             logger.warning(
                 f"updnLine 방향({target_direction})에 맞는 열차 없음, "
@@ -261,13 +310,17 @@ class SeoulSubwayAPIClient:
             )
 
         # Fallback: 기존 trainLineNm 기반 매칭
+        line = arrival_index.get(subway_line_id)
         return self._filter_by_train_line_nm(
-            arrivals, subway_line_id, destination_station, pass_stops
+            line["arrivals"] if line else [],
+            subway_line_id,
+            destination_station,
+            pass_stops,
         )
 
     def _filter_by_train_line_nm(
         self,
-        arrivals: List[Dict],
+        same_line_arrivals: List[Dict],
         subway_line_id: str,
         destination_station: str,
         pass_stops: List[str],
@@ -287,11 +340,6 @@ class SeoulSubwayAPIClient:
         # 다음 정차역들만 추출 (승차역 제외)
         next_stops = normalized_stops[1:] if len(normalized_stops) > 1 else []
 
-        # 같은 호선 열차만 필터링
-        same_line_arrivals = [
-            a for a in arrivals if a.get("subwayId") == subway_line_id
-        ]
-
         if not same_line_arrivals:
             logger.warning(f"같은 호선({subway_line_id}) 열차 없음")
             return None
@@ -10,9 +10,10 @@ API 엔드포인트:
 """
 
 import asyncio
-import json
 import logging
+from typing import Optional
 
+from django.conf import settings
 from django.db import transaction
 from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
@@ -36,10 +37,15 @@ from .serializers import (
 )
 from .services.bot_state import BotStateManager
 from .services.id_converter import PublicAPIIdConverter
+from .services.leg_geometry import LegGeometryCache
+from .services.route_cache import RouteCache
+from .services.sse_delta import BotStatusDeltaEncoder, SSEStreamMeter
+from .services.sse_hub import ClientBufferOverflow, sse_hub
 from .services.sse_publisher import SSEPublisher
-from .tasks.bot_simulation import update_bot_position
-from .utils.rabbitmq_client import rabbitmq_client
-from .utils.redis_client import redis_client
+from .services.user_bus_monitor import UserBusMonitor
+from .tasks.bot_simulation import schedule_bot_tick
+from .utils import codec
+from .utils.redis_client import RedisConnectionError, redis_client
 
 
 def to_seoul_time(dt):
@@ -341,12 +347,27 @@ class RouteListCreateView(APIView):
                 participants.append(bot_route)
                 bot_routes.append((bot_route, bot_leg, bot, public_ids))
 
+        # 진행 중 참가자 등록 (마지막 참가자 종료 시 route_ended 발행)
+        RouteCache.start_race(route_itinerary.id, [p.id for p in participants])
+
+        # 유저 버스 도착 정보 조회 등록 (monitor_user_buses Task가 user_bus_arrival 발행)
+        try:
+            UserBusMonitor.register(user_route)
+        except RedisConnectionError as e:
+            logger.warning(
+                f"유저 버스 모니터 등록 실패: route_id={user_route.id}, error={e}"
+            )
+
         # 봇 시뮬레이션 시작 (v3)
         for bot_route, bot_leg, bot, public_ids in bot_routes:
             try:
                 # 미리 검증된 public_ids 사용
                 legs = bot_leg.raw_data.get("legs", [])
                 redis_client.set_public_ids(bot_route.id, public_ids)
+                # 경로선 geometry 미리 파싱 (매 틱 문자열 파싱 방지)
+                LegGeometryCache.build(bot_route.id, legs)
+                # 경주 상태 플래그 (봇 Task가 DB 대신 조회)
+                RouteCache.set_status(bot_route.id, Route.Status.RUNNING)
 
                 # 봇 초기 상태 생성 (첫 번째 leg mode에 따라 상태/위치 결정)
                 initial_state = BotStateManager.initialize(
@@ -416,16 +437,11 @@ class RouteListCreateView(APIView):
                     next_update_in=5,  # 첫 번째 업데이트까지 5초
                 )
 
-                # 첫 번째 Task 즉시 실행 (경주 시작 직후 빠른 업데이트)
-                result = update_bot_position.apply_async(
-                    args=[bot_route.id],
-                    countdown=0,
-                )
-                # Task ID 저장 (즉시 취소용)
-                redis_client.set_task_id(bot_route.id, result.id)
+                # 첫 번째 틱 즉시 실행 (경주 시작 직후 빠른 업데이트)
+                schedule_bot_tick(bot_route.id, countdown=0)
 
                 logger.info(
-                    f"봇 시뮬레이션 시작: route_id={bot_route.id}, bot_id={bot.id}, task_id={result.id}"
+                    f"봇 시뮬레이션 시작: route_id={bot_route.id}, bot_id={bot.id}, mode={settings.BOT_TICK_MODE}"
                 )
 
             except Exception as e:
@@ -582,6 +598,7 @@ class RouteStatusUpdateView(APIView):
             route.duration = int(duration_delta.total_seconds())
 
         route.save()
+        RouteCache.set_status(route.id, new_status)
 
         # FINISHED인 경우 SSE 이벤트 발행 (순위 계산 포함)
         if new_status == Route.Status.FINISHED:
@@ -621,15 +638,8 @@ class RouteStatusUpdateView(APIView):
                 f"유저 도착 SSE 발행: route_id={route.id}, rank={rank}, duration={route.duration}"
             )
 
-            # 모든 참가자 완주 여부 확인
-            unfinished = Route.objects.filter(
-                route_itinerary=route.route_itinerary,
-                start_time=route.start_time,
-                end_time__isnull=True,
-                deleted_at__isnull=True,
-            ).count()
-
-            if unfinished == 0:
+            # 모든 참가자 완주 여부 확인 (마지막 참가자면 경주 종료)
+            if RouteCache.finish_participant(route):
                 SSEPublisher.publish_route_ended(route.route_itinerary_id)
                 logger.info(
                     f"경주 종료 SSE 발행: route_itinerary_id={route.route_itinerary_id}"
@@ -680,11 +690,24 @@ class RouteStatusUpdateView(APIView):
                 r.rank = rank
                 r.is_win = rank == 1
                 r.save()
+                RouteCache.set_status(r.id, Route.Status.CANCELED)
 
                 logger.info(
                     f"경주 취소 - 참가자 결과 저장: route_id={r.id}, type={item['type']}, progress={item['progress']}%, rank={rank}, is_win={r.is_win}"
                 )
 
+            # 취소된 참가자 종료 기록 → 남은 참가자가 없으면 경주 종료 발행
+            race_ended = [
+                RouteCache.finish_participant(r["route"]) for r in progress_list
+            ]
+            if any(race_ended):
+                SSEPublisher.publish_route_ended(
+                    route.route_itinerary_id, reason="canceled"
+                )
+                logger.info(
+                    f"경주 취소 SSE 발행: route_itinerary_id={route.route_itinerary_id}"
+                )
+
             # 봇 Celery Task 취소 및 Redis 정리
             for bot_route in bot_routes:
                 # Celery Task 즉시 취소 (revoke)
@@ -909,10 +932,12 @@ class SSEStreamView(APIView):
 **이벤트 타입:**
 - `connected`: 연결 성공
 - `bot_status_update`: 봇 상태 업데이트 (5초 주기)
+- `bot_status_delta`: 봇 상태 변경 필드만 (`?delta=1`로 연결한 경우)
 - `bot_boarding`: 봇 탑승 (버스/지하철)
 - `bot_alighting`: 봇 하차
 - `participant_finished`: 참가자 도착
 - `route_ended`: 경주 종료
+- `user_bus_arrival`: 유저가 탈 버스 도착 정보
 - `heartbeat`: 연결 유지 (30초 주기)
 - `error`: 에러 발생
 
@@ -924,6 +949,12 @@ eventSource.addEventListener('bot_status_update', (e) => {
     console.log('Bot status:', data);
 });
 ```
+
+**델타 모드 (`?delta=1`):**
+- 봇별 첫 이벤트와 `SSE_DELTA_KEYFRAME_INTERVAL`번째마다 `bot_status_update` (전체 상태, `seq`, `keyframe: true`)
+- 그 사이에는 `bot_status_delta` (`route_id`, `seq` + 바뀐 필드만)
+- 델타 적용: 객체는 재귀적으로 합치고 그 외 값은 교체, `null`은 필드 삭제
+- 봇별 `seq`가 건너뛰면 재연결 (재연결 후 첫 이벤트는 keyframe)
         """,
         responses={200: None, 404: None},
         tags=["Routes"],
@@ -977,13 +1008,37 @@ eventSource.addEventListener('bot_status_update', (e) => {
                 status=404,
             )
 
+        # 재연결 시 EventSource가 보내는 마지막 이벤트 ID (없으면 전체 상태 전송)
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+            "last_event_id"
+        )
+
+        # ?delta=1: bot_status_update를 봇별 변경 필드만 전송 (주기적 keyframe)
+        delta_mode = request.GET.get("delta") in ("1", "true")
+        delta_encoder = (
+            BotStatusDeltaEncoder(settings.SSE_DELTA_KEYFRAME_INTERVAL)
+            if delta_mode
+            else None
+        )
+        meter = SSEStreamMeter("delta" if delta_mode else "full")
+
+        def format_event(
+            event_type: str, data: dict, event_id: Optional[str] = None
+        ) -> str:
+            """SSE 이벤트 포맷팅 (델타 모드 적용 + 전송 바이트 기록)"""
+            if delta_encoder is not None and event_type == "bot_status_update":
+                event_type, data = delta_encoder.encode(data)
+            message = _format_sse_event(event_type, data, event_id)
+            meter.sent(message)
+            return message
+
         async def event_stream():
             """SSE 이벤트 스트림 비동기 Generator (ASGI 호환)"""
             # 연결 성공 이벤트 (즉시 전송)
             logger.info(
                 f"SSE connected 이벤트 전송: route_itinerary_id={route_itinerary_id}"
             )
-            yield _format_sse_event(
+            yield format_event(
                 "connected",
                 {
                     "route_itinerary_id": route_itinerary_id,
@@ -1006,151 +1061,175 @@ eventSource.addEventListener('bot_status_update', (e) => {
                         states.append(bot_state)
                 return states
 
-            initial_bot_states = await asyncio.to_thread(get_initial_bot_states)
-            for bot_state in initial_bot_states:
-                logger.info(
-                    f"SSE 초기 봇 상태 전송: route_id={bot_state.get('route_id')}, "
-                    f"status={bot_state.get('status')}"
-                )
-                yield _format_sse_event(
-                    "bot_status_update",
-                    {
-                        "route_id": bot_state.get("route_id"),
-                        "bot_id": bot_state.get("bot_id"),
-                        "status": bot_state.get("status"),
-                        "leg_index": bot_state.get("current_leg_index"),
-                        "progress_percent": bot_state.get("progress_percent", 0),
-                        "position": bot_state.get("current_position"),
-                        "next_update_in": 30,
-                        "timestamp": timezone.localtime(timezone.now()).isoformat(),
-                    },
-                )
-
-            # 테스트용: 1초 대기 후 heartbeat 전송
-            await asyncio.sleep(1)
-            logger.info(
-                f"SSE heartbeat 이벤트 전송: route_itinerary_id={route_itinerary_id}"
-            )
-            yield _format_sse_event(
-                "heartbeat",
-                {
-                    "route_itinerary_id": route_itinerary_id,
-                },
-            )
-
-            # RabbitMQ 구독 (동기 함수를 별도 스레드에서 실행)
-            try:
-                # subscribe generator를 스레드에서 실행
-                def get_next_event(gen):
-                    try:
-                        return next(gen)
-                    except StopIteration:
-                        return "STOP"
-
-                # subscribe generator 생성 (타임아웃 5초로 단축하여 버스 체크 주기 확보)
-                subscribe_gen = rabbitmq_client.subscribe(route_itinerary_id, timeout=5)
-
-                # 경주 상태 확인 함수 (DB 조회)
-                def check_route_status():
-                    """모든 참가자가 종료되었는지 확인"""
-                    active_count = Route.objects.filter(
-                        route_itinerary_id=route_itinerary_id,
-                        status="RUNNING",
-                    ).count()
-                    return active_count == 0
-
-                # 유저 버스 모니터 초기화
-                from .services.user_bus_monitor import UserBusMonitor
-
-                user_bus_monitor = None
-
-                # 유저의 Route 찾기
-                user_route = await asyncio.to_thread(
-                    lambda: Route.objects.filter(
-                        route_itinerary_id=route_itinerary_id,
-                        participant_type=Route.ParticipantType.USER,
-                        status=Route.Status.RUNNING,
-                    ).first()
-                )
-
-                if user_route:
-                    user_bus_monitor = UserBusMonitor(user_route.id)
-                    logger.info(
-                        f"SSE: UserBusMonitor initialized for route {user_route.id}"
+            # 재연결 시 놓친 이벤트 조회 (로그에 없으면 None → 초기 상태 전송)
+            def get_missed_events():
+                try:
+                    return redis_client.get_sse_events_after(
+                        route_itinerary_id,
+                        last_event_id,
+                        count=settings.SSE_EVENT_LOG_MAXLEN,
                     )
+                except RedisConnectionError as e:
+                    logger.warning(f"SSE 이벤트 로그 조회 실패: error={e}")
+                    return None
+
+            # 경주 상태 확인 함수 (DB 조회)
+            # 경주 종료는 마지막 참가자 종료 시 발행되는 route_ended로 감지하고,
+            # 이 조회는 이벤트 유실 대비로 SSE_RACE_RECONCILE_INTERVAL마다만 실행
+            def check_route_status():
+                """모든 참가자가 종료되었는지 확인"""
+                active_count = Route.objects.filter(
+                    route_itinerary_id=route_itinerary_id,
+                    status="RUNNING",
+                ).count()
+                return active_count == 0
 
-                while True:
-                    # 이벤트 수신 (blocking 호출을 스레드에서)
-                    # timeout이 5초이므로, 5초마다 None이 반환되어 루프가 돕니다.
-                    event = await asyncio.to_thread(get_next_event, subscribe_gen)
-
-                    # --- 유저 버스 도착 정보 확인 및 로그 출력 ---
-                    if user_bus_monitor:
-                        bus_info = await asyncio.to_thread(
-                            user_bus_monitor.check_arrival
+            try:
+                # RabbitMQ 구독 (Worker 공유 허브, 이벤트는 클라이언트 Queue로 수신)
+                # 재전송/초기 상태 조회 중 발행된 이벤트도 놓치지 않도록 먼저 구독
+                async with sse_hub.listen(route_itinerary_id) as events:
+                    missed_events = None
+                    if last_event_id:
+                        missed_events = await asyncio.to_thread(get_missed_events)
+
+                    # 재전송한 마지막 이벤트 ID (이후 수신한 이벤트 중 재전송분만 제거)
+                    # Stream ID는 XADD 순서대로 증가하고 RabbitMQ 발행은 XADD 이후라
+                    # 이 ID 이하의 수신 이벤트는 모두 재전송에 포함됨. 수신 이벤트는
+                    # 발행 순서가 ID 순서와 다를 수 있으므로 이 값은 수신 중 갱신하지 않음
+                    replayed_until = None
+                    last_sent_id = None
+                    if missed_events is not None:
+                        logger.info(
+                            f"SSE 재연결 이벤트 재전송: route_itinerary_id={route_itinerary_id}, "
+                            f"last_event_id={last_event_id}, count={len(missed_events)}"
                         )
-                        # ACTIVE 상태일 때만 로그 출력 및 이벤트 전송
-                        if bus_info and bus_info.get("status") == "ACTIVE":
-                            logger.info("=" * 50)
+                        replayed_until = last_event_id
+                        for event_id, event in missed_events:
+                            yield format_event(event["event"], event["data"], event_id)
+                            replayed_until = event_id
+                            if event["event"] == "route_ended":
+                                return
+                        last_sent_id = replayed_until
+                    else:
+                        initial_bot_states = await asyncio.to_thread(
+                            get_initial_bot_states
+                        )
+                        for bot_state in initial_bot_states:
                             logger.info(
-                                f"🚍 [User Bus Check] {bus_info['bus_name']} -> {bus_info['station_name']}"
+                                f"SSE 초기 봇 상태 전송: route_id={bot_state.get('route_id')}, "
+                                f"status={bot_state.get('status')}"
                             )
-                            logger.info(f"   Status: {bus_info['arrival_message']}")
-                            logger.info(
-                                f"   Time Left: {bus_info['remaining_time']} sec"
+                            yield format_event(
+                                "bot_status_update",
+                                {
+                                    "route_id": bot_state.get("route_id"),
+                                    "bot_id": bot_state.get("bot_id"),
+                                    "status": bot_state.get("status"),
+                                    "leg_index": bot_state.get("current_leg_index"),
+                                    "progress_percent": bot_state.get(
+                                        "progress_percent", 0
+                                    ),
+                                    "position": codec.compact_position(
+                                        bot_state.get("current_position")
+                                    ),
+                                    "next_update_in": 30,
+                                    "timestamp": codec.epoch_ms(),
+                                },
                             )
-                            logger.info(f"   Vehicle ID: {bus_info['vehicle_id']}")
-                            logger.info("=" * 50)
-
-                            # 프론트엔드로 실시간 이벤트 전송
-                            yield _format_sse_event("user_bus_arrival", bus_info)
-                    # ---------------------------------------------
 
-                    if event == "STOP":
-                        break
-                    elif event is None:
-                        # Timeout (Heartbeat & Status Check)
-                        is_ended = await asyncio.to_thread(check_route_status)
+                        # 테스트용: 1초 대기 후 heartbeat 전송
+                        await asyncio.sleep(1)
+                        logger.info(
+                            f"SSE heartbeat 이벤트 전송: route_itinerary_id={route_itinerary_id}"
+                        )
+                        yield format_event(
+                            "heartbeat",
+                            {
+                                "route_itinerary_id": route_itinerary_id,
+                            },
+                        )
 
-                        if is_ended:
-                            # 모든 참가자 종료 → route_ended 이벤트 발행 후 종료
-                            logger.info(
-                                f"SSE 경주 종료 감지: route_itinerary_id={route_itinerary_id}"
-                            )
-                            yield _format_sse_event(
-                                "route_ended",
-                                {
-                                    "route_itinerary_id": route_itinerary_id,
-                                    "reason": "all_finished",
-                                },
+                    # 첫 타임아웃에서 한 번 확인 (이미 끝난 경주에 접속한 경우)
+                    loop = asyncio.get_running_loop()
+                    reconciled_at = loop.time() - settings.SSE_RACE_RECONCILE_INTERVAL
+
+                    while True:
+                        # 이벤트 대기 (5초 동안 없으면 None → heartbeat)
+                        try:
+                            event = await asyncio.wait_for(events.get(), timeout=5)
+                        except asyncio.TimeoutError:
+                            event = None
+                        except ClientBufferOverflow:
+                            # 전송이 밀려 버퍼가 넘침 → 스트림 종료
+                            # (클라이언트가 Last-Event-ID로 재접속해 놓친 이벤트 재전송)
+                            logger.warning(
+                                f"SSE 클라이언트 버퍼 초과로 스트림 종료: "
+                                f"route_itinerary_id={route_itinerary_id}, "
+                                f"last_event_id={last_sent_id}"
                             )
                             break
-                        else:
-                            # 진행 중 → heartbeat 전송
-                            yield _format_sse_event(
-                                "heartbeat",
-                                {
-                                    "route_itinerary_id": route_itinerary_id,
-                                },
-                            )
-                    else:
-                        event_type = event.get("event", "unknown")
-                        data = event.get("data", {})
-                        logger.info(f"SSE 이벤트 수신: type={event_type}")
-                        yield _format_sse_event(event_type, data)
 
-                        # 경주 종료 시 스트림 종료
-                        if event_type == "route_ended":
-                            break
+                        if event is None:
+                            # Timeout (Heartbeat, 가끔 DB로 경주 상태 재확인)
+                            is_ended = False
+                            if (
+                                loop.time() - reconciled_at
+                                >= settings.SSE_RACE_RECONCILE_INTERVAL
+                            ):
+                                reconciled_at = loop.time()
+                                is_ended = await asyncio.to_thread(check_route_status)
+
+                            if is_ended:
+                                # 모든 참가자 종료 → route_ended 이벤트 발행 후 종료
+                                logger.info(
+                                    f"SSE 경주 종료 감지: route_itinerary_id={route_itinerary_id}"
+                                )
+                                yield format_event(
+                                    "route_ended",
+                                    {
+                                        "route_itinerary_id": route_itinerary_id,
+                                        "reason": "all_finished",
+                                    },
+                                )
+                                break
+                            else:
+                                # 진행 중 → heartbeat 전송
+                                yield format_event(
+                                    "heartbeat",
+                                    {
+                                        "route_itinerary_id": route_itinerary_id,
+                                    },
+                                )
+                        else:
+                            event_type = event.get("event", "unknown")
+                            data = event.get("data", {})
+                            event_id = event.get("id")
+                            # 재전송으로 이미 보낸 이벤트는 생략
+                            if (
+                                event_id
+                                and replayed_until
+                                and not _is_newer_event_id(event_id, replayed_until)
+                            ):
+                                continue
+                            if event_id:
+                                last_sent_id = event_id
+                            logger.info(f"SSE 이벤트 수신: type={event_type}")
+                            yield format_event(event_type, data, event_id)
+
+                            # 경주 종료 시 스트림 종료
+                            if event_type == "route_ended":
+                                break
 
             except Exception as e:
                 logger.error(f"SSE 스트림 에러: {e}")
-                yield _format_sse_event(
+                yield format_event(
                     "error",
                     {
                         "message": "SSE 스트림 에러 발생",
                     },
                 )
+            finally:
+                meter.close()
 
         response = StreamingHttpResponse(
             event_stream(),
@@ -1162,6 +1241,21 @@ eventSource.addEventListener('bot_status_update', (e) => {
         return response
 
 
-def _format_sse_event(event_type: str, data: dict) -> str:
-    """SSE 이벤트 포맷팅"""
-    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+def _format_sse_event(
+    event_type: str, data: dict, event_id: Optional[str] = None
+) -> str:
+    """SSE 이벤트 포맷팅 (event_id가 있으면 id 필드 포함 → 재연결 시 Last-Event-ID)"""
+    message = f"event: {event_type}\ndata: {codec.dumps_text(data)}\n\n"
+    if event_id:
+        message = f"id: {event_id}\n" + message
+    return message
+
+
+def _is_newer_event_id(event_id: str, last_event_id: str) -> bool:
+    """이벤트 ID(Redis Stream ID "ms-seq") 순서 비교"""
+    try:
+        return tuple(map(int, event_id.split("-"))) > tuple(
+            map(int, last_event_id.split("-"))
+        )
+    except ValueError:
+        return True
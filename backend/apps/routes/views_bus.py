@@ -12,6 +12,7 @@ from typing import List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -20,7 +21,20 @@ from rest_framework.views import APIView
 import requests
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 
+from .services.bus_dead_reckoning import BusDeadReckoning
+from .services.bus_position_feed import BusPositionFeed
+from .services.bus_position_index import (
+    RESPONSES_METRIC,
+    AreaSnapshot,
+    BusPositionIndex,
+    clamp_bounds,
+    etag_matches,
+    negotiate_encoding,
+)
+from .services.realtime_cache import RealtimeCache
+from .utils import clock, metrics
 from .utils.bus_api_client import bus_api_client
+from .utils.redis_client import RedisConnectionError, redis_client
 
 # 버스 위치 캐시 키 (tasks.py와 동일)
 BUS_POSITIONS_CACHE_KEY = "bus:positions:all"
@@ -559,12 +573,44 @@ class BusAllPositionsView(APIView):
     """
     서울시 전체 버스 실시간 위치 조회 API (화면 영역 기반)
 
+    GET /api/v1/bus/positions/area?sw=경도,위도&ne=경도,위도
     POST /api/v1/bus/positions/area
-    특정 영역(bounds) 내의 모든 버스 위치를 반환
+    특정 영역(bounds)과 겹치는 지도 타일의 모든 버스 위치를 반환
+
+    수집 세대(version) + 타일 묶음마다 ETag를 붙이고 If-None-Match가 같으면 304,
+    본문은 세대마다 한 번만 만들어 압축한 gzip/br 본문을 그대로 보냅니다.
+    (GET은 브라우저가 ETag로 자동 재검증)
     """
 
     permission_classes = [AllowAny]
 
+    @extend_schema(
+        summary="영역 내 전체 버스 실시간 위치 조회 (캐시 가능)",
+        description=(
+            "지도 화면 영역과 겹치는 타일의 모든 버스 실시간 위치를 반환합니다. "
+            "ETag/If-None-Match(304)와 gzip/br 압축을 지원합니다."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="sw", type=str, description="남서 좌표 (경도,위도)", required=False
+            ),
+            OpenApiParameter(
+                name="ne", type=str, description="북동 좌표 (경도,위도)", required=False
+            ),
+        ],
+        responses={200: None, 304: None, 400: None},
+        tags=["Bus"],
+    )
+    def get(self, request):
+        """영역 내 버스 위치 조회 (쿼리 파라미터)"""
+        bounds = None
+        if request.query_params.get("sw") and request.query_params.get("ne"):
+            bounds = {
+                corner: request.query_params[corner].split(",")
+                for corner in ("sw", "ne")
+            }
+        return self._area_response(request, bounds)
+
     @extend_schema(
         summary="영역 내 전체 버스 실시간 위치 조회",
         description="지도 화면 영역(bounds) 내의 모든 버스 실시간 위치를 반환합니다.",
@@ -596,13 +642,15 @@ class BusAllPositionsView(APIView):
                 },
             }
         },
-        responses={200: None},
+        responses={200: None, 304: None, 400: None},
         tags=["Bus"],
     )
     def post(self, request):
         """영역 내 버스 위치 조회 (Redis 캐시 전용 - 외부 API 직접 호출 안함)"""
-        bounds = request.data.get("bounds")
+        return self._area_response(request, request.data.get("bounds"))
 
+    def _area_response(self, request, bounds: Optional[dict]):
+        """영역 조회 공통 처리 (타일 인덱스 → 전체 목록 캐시 순)"""
         # bounds가 없으면 서울 전체 영역 사용
         if not bounds:
             bounds = {
@@ -610,10 +658,31 @@ class BusAllPositionsView(APIView):
                 "ne": [127.2, 37.7],  # 서울 북동
             }
 
-        sw_lng, sw_lat = bounds["sw"]
-        ne_lng, ne_lat = bounds["ne"]
+        # 형식/NaN/뒤집힌 영역은 거부하고 서비스 영역으로 자름
+        # (공개 API이므로 세계 전체 같은 영역으로 타일 목록을 만들지 않도록)
+        clamped = (
+            clamp_bounds(bounds.get("sw"), bounds.get("ne"))
+            if isinstance(bounds, dict)
+            else None
+        )
+        if clamped is None:
+            return error_response(
+                "INVALID_BOUNDS",
+                "sw, ne는 '경도,위도' 형식의 서비스 영역 안 좌표여야 합니다. "
+                "(sw는 ne보다 남서쪽)",
+                status.HTTP_400_BAD_REQUEST,
+            )
+        sw_lng, sw_lat, ne_lng, ne_lat = clamped
+
+        # 타일 인덱스에서 영역과 겹치는 타일만 조회 (Celery가 수집할 때마다 교체)
+        try:
+            snapshot = BusPositionIndex.snapshot(sw_lng, sw_lat, ne_lng, ne_lat)
+            if snapshot is not None:
+                return self._snapshot_response(request, snapshot)
+        except RedisConnectionError as e:
+            logger.warning(f"버스 위치 타일 인덱스 조회 실패: {e}")
 
-        # Redis 캐시에서만 조회 (Celery가 30초마다 갱신)
+        # 인덱스가 없으면 (배포 직후 등) 전체 목록 캐시에서 조회
         cached_data = cache.get(BUS_POSITIONS_CACHE_KEY)
 
         if cached_data:
@@ -655,6 +724,145 @@ class BusAllPositionsView(APIView):
             },
         )
 
+    def _snapshot_response(self, request, snapshot: AreaSnapshot) -> HttpResponse:
+        """
+        타일 인덱스 응답 (304 또는 미리 압축한 본문)
+
+        Raises:
+            RedisConnectionError: 연결 오류 시
+        """
+        if etag_matches(request.headers.get("If-None-Match"), snapshot.etag):
+            metrics.incr(RESPONSES_METRIC, result="not_modified", encoding="none")
+            response = HttpResponseNotModified()
+        else:
+            body, encoding = BusPositionIndex.body(
+                snapshot, negotiate_encoding(request.headers.get("Accept-Encoding"))
+            )
+            response = HttpResponse(body, content_type="application/json")
+            if encoding != "identity":
+                response["Content-Encoding"] = encoding
+
+        response["ETag"] = snapshot.etag
+        response["Vary"] = "Accept-Encoding"
+        # 캐시는 하되 매번 재검증 (수집 주기와 무관하게 최신 세대 확인)
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class BusPositionsDeltaView(APIView):
+    """
+    버스 위치 변경분 조회 API
+
+    GET /api/v1/bus/positions/delta?since=<version>
+    since 버전 이후 추가/이동/제거된 버스만 반환 (since가 없거나 너무 오래되면 전체 목록)
+
+    본문은 수집할 때마다 최근 세대별로 미리 만들어 압축해 두므로 요청마다 계산하지 않습니다.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="버스 위치 변경분 조회",
+        description=(
+            "since 버전 이후 추가(added)/이동(moved)/제거(removed)된 버스만 반환합니다. "
+            "응답의 version을 다음 요청의 since로 사용합니다. "
+            "since가 최근 수집 세대에 없으면 full=true와 함께 전체 목록(added)을 반환합니다."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                type=str,
+                description="마지막으로 받은 버전 (없으면 전체 목록)",
+                required=False,
+            ),
+        ],
+        responses={200: None, 304: None},
+        tags=["Bus"],
+    )
+    def get(self, request):
+        """버스 위치 변경분 조회 (Redis 전용 - 외부 API 직접 호출 안함)"""
+        since = request.query_params.get("since") or None
+        try:
+            current = redis_client.get_bus_tiles_current()
+            feed = (
+                BusPositionFeed.body(
+                    since,
+                    current["generation"],
+                    negotiate_encoding(request.headers.get("Accept-Encoding")),
+                )
+                if current is not None
+                else None
+            )
+        except RedisConnectionError as e:
+            logger.warning(f"버스 위치 변경분 조회 실패: {e}")
+            feed = None
+
+        if feed is None:
+            # 아직 수집 전 - 다음 요청도 전체 목록부터
+            return success_response(
+                {
+                    "version": None,
+                    "since": since,
+                    "full": True,
+                    "added": [],
+                    "moved": [],
+                    "removed": [],
+                },
+                meta={
+                    "cache": "miss",
+                    "message": "버스 데이터 로딩 중입니다. 잠시 후 다시 시도해주세요.",
+                },
+            )
+
+        body, encoding, kind = feed
+        etag = f'W/"{kind}-{current["generation"]}"'
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type="application/json")
+            if encoding != "identity":
+                response["Content-Encoding"] = encoding
+
+        response["ETag"] = etag
+        response["Vary"] = "Accept-Encoding"
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class BusProjectedPositionsView(APIView):
+    """
+    버스 추정 위치 조회 API
+
+    GET /api/v1/bus/positions/projected
+    수집 사이(30~60초)의 현재 버스 위치를 최근 속도로 노선 경로선을 따라 추정해 반환
+
+    추정은 BUS_PROJECTION_STEP초마다 한 번만 계산해 공유하므로
+    자주 조회해도 공공 API를 호출하지 않습니다.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="버스 추정 위치 조회",
+        description=(
+            "수집한 버스 위치와 최근 속도로 현재 위치를 추정해 반환합니다. "
+            "projected_s는 마지막 GPS 이후 추정한 시간(초)입니다."
+        ),
+        responses={200: None},
+        tags=["Bus"],
+    )
+    def get(self, request):
+        """버스 추정 위치 조회 (Redis 전용 - 외부 API 직접 호출 안함)"""
+        at, positions = BusDeadReckoning.positions(clock.time())
+        response = success_response(
+            positions,
+            meta={"total_buses": len(positions), "at": int(at * 1000)},
+        )
+        response["Cache-Control"] = (
+            f"max-age={max(1, int(settings.BUS_PROJECTION_STEP))}"
+        )
+        return response
+
 
 class BusRealtimePositionsView(APIView):
     """
@@ -674,8 +882,8 @@ class BusRealtimePositionsView(APIView):
     )
     def get(self, request, route_id):
         """노선 버스 실시간 위치 조회"""
-        # 실시간 버스 위치 조회
-        buses = bus_api_client.get_bus_positions_by_route(route_id)
+        # 실시간 버스 위치 조회 (수집 중인 노선은 공유 캐시에서 응답)
+        buses = RealtimeCache.get_bus_route_positions(route_id)
 
         # 정류소 정보도 함께 조회 (버스가 향하는 정류소 이름 표시용)
         stations = bus_api_client.get_station_by_route(route_id)
@@ -817,8 +1025,8 @@ class BusTrackPositionsView(APIView):
                 }
             )
 
-            # 2. 해당 노선의 버스 위치 조회
-            buses = bus_api_client.get_bus_positions_by_route(route_id)
+            # 2. 해당 노선의 버스 위치 조회 (수집 중인 노선은 공유 캐시에서 응답)
+            buses = RealtimeCache.get_bus_route_positions(route_id, route_name)
 
             for bus in buses:
                 try:
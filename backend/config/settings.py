@@ -216,14 +216,24 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30분
 
 # Celery Beat 스케줄 설정
-# 버스 위치 전체 조회 태스크 비활성화 - 사용자 지정 버스만 추적하는 방식으로 변경
-# API 호출량 절감: 15개 노선 × 60초 = 일 21,600회 → 사용자 지정 5개 × 30초 = 일 14,400회
-CELERY_BEAT_SCHEDULE = {
-    # "fetch-bus-positions-every-60-seconds": {
-    #     "task": "apps.routes.tasks.fetch_all_bus_positions",
-    #     "schedule": 60.0,
-    # },
-}
+CELERY_BEAT_SCHEDULE = {}
+
+# 봇 시뮬레이션 틱 모드
+# - chain: 봇마다 update_bot_position Task가 스스로 다음 Task를 예약 (기존 방식)
+# - batch: Redis Sorted Set에 다음 실행 시각을 저장하고,
+#          process_due_bot_ticks Task가 1초마다 실행 시각이 된 봇을 한 번에 처리
+BOT_TICK_MODE = os.getenv("BOT_TICK_MODE", "chain")
+BOT_TICK_BATCH_SIZE = int(os.getenv("BOT_TICK_BATCH_SIZE", "200"))
+# 틱 단위 Redis 파이프라인 (시작 시 일괄 조회, 종료 시 MULTI/EXEC 1회 반영)
+# False면 명령마다 즉시 실행 (틱당 Redis 왕복 수 비교용)
+BOT_TICK_REDIS_PIPELINE = os.getenv("BOT_TICK_REDIS_PIPELINE", "True").lower() == "true"
+
+if BOT_TICK_MODE == "batch":
+    CELERY_BEAT_SCHEDULE["process-due-bot-ticks-every-second"] = {
+        "task": "apps.routes.tasks.bot_simulation.process_due_bot_ticks",
+        "schedule": 1.0,
+        "options": {"expires": 5},  # 밀린 배치는 버림 (다음 배치가 처리)
+    }
 
 
 # Redis 설정 (봇 상태 캐시)
@@ -242,6 +252,27 @@ RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "localhost")
 RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", "5672"))
 RABBITMQ_USER = os.getenv("RABBITMQ_USER", "guest")
 RABBITMQ_PASSWORD = os.getenv("RABBITMQ_PASSWORD", "guest")
+# 발행용 연결 풀 (프로세스별, 연결/채널 재사용)
+RABBITMQ_PUBLISHER_POOL_SIZE = int(os.getenv("RABBITMQ_PUBLISHER_POOL_SIZE", "4"))
+# Publisher Confirms (브로커 수신 확인까지 대기, 발행 지연 증가)
+RABBITMQ_PUBLISHER_CONFIRMS = (
+    os.getenv("RABBITMQ_PUBLISHER_CONFIRMS", "False").lower() == "true"
+)
+# SSE 클라이언트별 이벤트 버퍼 (가득 차면 오래된 위치 업데이트부터 버리고, 생명주기 이벤트만 남으면 스트림 종료)
+SSE_CLIENT_QUEUE_SIZE = int(os.getenv("SSE_CLIENT_QUEUE_SIZE", "256"))
+# SSE 클라이언트별 최대 전송 속도 (초당 이벤트 수, 0이면 제한 없음) / 순간 허용량
+SSE_CLIENT_MAX_EVENTS_PER_SEC = float(os.getenv("SSE_CLIENT_MAX_EVENTS_PER_SEC", "10"))
+SSE_CLIENT_EVENT_BURST = int(os.getenv("SSE_CLIENT_EVENT_BURST", "20"))
+# 경주별 SSE 이벤트 로그 (재연결 시 Last-Event-ID 이후 이벤트 재전송)
+SSE_EVENT_LOG_MAXLEN = int(os.getenv("SSE_EVENT_LOG_MAXLEN", "1000"))
+SSE_EVENT_LOG_TTL = int(os.getenv("SSE_EVENT_LOG_TTL", "3600"))  # 초
+# SSE 스트림의 경주 종료 DB 재확인 주기 (초, route_ended 이벤트 유실 대비)
+SSE_RACE_RECONCILE_INTERVAL = int(os.getenv("SSE_RACE_RECONCILE_INTERVAL", "60"))
+# SSE 델타 모드(?delta=1)에서 봇별 전체 상태(keyframe)를 보내는 주기 (업데이트 수)
+SSE_DELTA_KEYFRAME_INTERVAL = int(os.getenv("SSE_DELTA_KEYFRAME_INTERVAL", "20"))
+# Redis 값/RabbitMQ 메시지 직렬화 형식 (json | msgpack, SSE data는 항상 JSON)
+# 읽기는 형식을 자동 판별하므로 운영 중 전환 가능 (msgpack 미설치 시 json)
+SERIALIZATION_FORMAT = os.getenv("SERIALIZATION_FORMAT", "json").lower()
 
 
 # External API Keys
@@ -252,6 +283,75 @@ MAPBOX_ACCESS_TOKEN = os.getenv("MAPBOX_ACCESS_TOKEN", "")
 BUS_API_KEY = os.getenv("BUS_API_KEY", "")
 SUBWAY_API_KEY = os.getenv("SUBWAY_API_KEY", "")
 
+# 버스 위치 수집 (fetch_all_bus_positions) - 수요 기반 노선 선정
+# 진행 중 경주 노선 → 최근 조회(track/realtime) 많은 노선 → 기본 노선 순으로
+# 수집 1회 최대 BUS_POSITION_ROUTE_BUDGET개 (노선당 API 1회)
+# 조회/경주가 없으면 호출 없음, 최대 15개 노선 × 60초 = 일 21,600회
+# (기본 노선을 지정하면 사용자가 없어도 그만큼 호출하므로 할당량 확인 필요)
+BUS_POSITION_COLLECT_INTERVAL = int(os.getenv("BUS_POSITION_COLLECT_INTERVAL", "60"))
+BUS_POSITION_ROUTE_BUDGET = int(os.getenv("BUS_POSITION_ROUTE_BUDGET", "15"))
+# 최근 조회 수 집계 구간 (초)
+BUS_POSITION_DEMAND_WINDOW = int(os.getenv("BUS_POSITION_DEMAND_WINDOW", "600"))
+# 항상 수집할 기본 노선 ("노선ID:노선번호" 쉼표 구분, 기본값 없음)
+# 예: "100100057:360,100100118:472"
+BUS_POSITION_BASELINE_ROUTES = os.getenv("BUS_POSITION_BASELINE_ROUTES", "")
+
+CELERY_BEAT_SCHEDULE["fetch-bus-positions"] = {
+    "task": "apps.routes.tasks.fetch_all_bus_positions",
+    "schedule": float(BUS_POSITION_COLLECT_INTERVAL),
+    "options": {"expires": BUS_POSITION_COLLECT_INTERVAL},
+}
+
+# 버스 위치 변경분 피드 (/api/v1/bus/positions/delta)
+# 변경분을 제공할 최근 수집 세대 수 (더 오래된 since는 전체 목록으로 대체)
+BUS_FEED_RING_SIZE = int(os.getenv("BUS_FEED_RING_SIZE", "10"))
+# 이동으로 볼 최소 거리 (미터, 이 크기 격자가 바뀐 버스만 전송)
+BUS_FEED_MOVE_THRESHOLD_M = float(os.getenv("BUS_FEED_MOVE_THRESHOLD_M", "15"))
+
+# 버스 위치 추정 (/api/v1/bus/positions/projected)
+# 차량별 보관할 최근 위치 수 (경로선 방향 속도 계산용)
+BUS_PROJECTION_HISTORY_SIZE = int(os.getenv("BUS_PROJECTION_HISTORY_SIZE", "5"))
+# 마지막 GPS 이후 최대 추정 시간 (초, 넘으면 그 위치에 멈춤)
+BUS_PROJECTION_MAX_SECONDS = float(os.getenv("BUS_PROJECTION_MAX_SECONDS", "90"))
+# 추정 위치 계산 단위 (초, 같은 구간 요청은 Worker 간 계산 결과 공유)
+BUS_PROJECTION_STEP = float(os.getenv("BUS_PROJECTION_STEP", "1"))
+
+# 실시간 API 공유 캐시 TTL (초) - 같은 차량을 여러 봇이 조회해도 API는 1회만 호출
+REALTIME_BUS_POSITION_TTL = int(os.getenv("REALTIME_BUS_POSITION_TTL", "10"))
+# 버스 도착정보는 정류소/노선 기준으로 공유 (API 갱신 주기에 맞춤)
+REALTIME_BUS_ARRIVAL_TTL = int(os.getenv("REALTIME_BUS_ARRIVAL_TTL", "15"))
+# 지하철 도착정보는 역 기준으로 공유 (같은 역 대기 봇이 많음)
+REALTIME_SUBWAY_ARRIVAL_TTL = int(os.getenv("REALTIME_SUBWAY_ARRIVAL_TTL", "10"))
+
+# 지하철 열차 위치 스냅샷 - 봇이 탑승 중인 노선만 노선당 1회씩 주기적으로 수집
+SUBWAY_POSITION_COLLECT_INTERVAL = int(
+    os.getenv("SUBWAY_POSITION_COLLECT_INTERVAL", "10")
+)
+# 마지막 조회 후 이 시간(초)이 지난 노선은 수집 중단
+SUBWAY_ACTIVE_LINE_WINDOW = int(os.getenv("SUBWAY_ACTIVE_LINE_WINDOW", "60"))
+# 수집이 멈춘 스냅샷 만료 시간 (초)
+SUBWAY_SNAPSHOT_TTL = SUBWAY_POSITION_COLLECT_INTERVAL * 3
+
+CELERY_BEAT_SCHEDULE["collect-subway-positions"] = {
+    "task": "apps.routes.tasks.collect_subway_positions",
+    "schedule": float(SUBWAY_POSITION_COLLECT_INTERVAL),
+    "options": {"expires": SUBWAY_POSITION_COLLECT_INTERVAL},
+}
+
+# 유저 버스 도착 정보 조회 주기 (초) - 유저 경주마다 1회씩 조회해 SSE로 발행
+# (UserBusMonitor가 API 호출은 10초 간격으로 제한)
+USER_BUS_MONITOR_INTERVAL = int(os.getenv("USER_BUS_MONITOR_INTERVAL", "5"))
+
+CELERY_BEAT_SCHEDULE["monitor-user-buses"] = {
+    "task": "apps.routes.tasks.monitor_user_buses",
+    "schedule": float(USER_BUS_MONITOR_INTERVAL),
+    "options": {"expires": USER_BUS_MONITOR_INTERVAL},
+}
+
+# 외부 API 호출 기록 (설정 시 버스/지하철/TMAP 응답을 JSON Lines로 추가 기록)
+# 기록한 파일은 benchmark_bot_simulation --cassette로 재생
+API_RECORD_PATH = os.getenv("API_RECORD_PATH", "")
+
 
 # Logging 설정
 LOGGING = {
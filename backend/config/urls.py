@@ -15,6 +15,8 @@ from apps.routes.views import RouteListCreateView
 from apps.routes.views_bus import (
     BusAllPositionsView,
     BusMultipleRoutesView,
+    BusPositionsDeltaView,
+    BusProjectedPositionsView,
     BusRealtimePositionsView,
     BusRoutePathView,
     BusRouteSearchView,
@@ -82,6 +84,16 @@ urlpatterns = [
         BusAllPositionsView.as_view(),
         name="bus-positions-area",
     ),
+    path(
+        "api/v1/bus/positions/delta",
+        BusPositionsDeltaView.as_view(),
+        name="bus-positions-delta",
+    ),
+    path(
+        "api/v1/bus/positions/projected",
+        BusProjectedPositionsView.as_view(),
+        name="bus-positions-projected",
+    ),
     path(
         "api/v1/bus/positions/track",
         BusTrackPositionsView.as_view(),
@@ -242,8 +242,42 @@ export const getBusRealtimePositions = async (routeId: string): Promise<BusRealt
 };
 
 // 영역 내 전체 버스 실시간 위치 조회
+// GET으로 조회해 브라우저가 ETag로 재검증 (데이터가 그대로면 304, 본문 재전송 없음)
 export const getBusPositionsByArea = async (bounds?: MapBounds): Promise<BusAreaPosition[]> => {
-  const response = await api.post('/bus/positions/area', { bounds });
+  const params = bounds ? { sw: bounds.sw.join(','), ne: bounds.ne.join(',') } : undefined;
+  const response = await api.get('/bus/positions/area', { params });
+  return response.data.data || [];
+};
+
+// 전체 버스 위치 변경분 (since 이후 추가/이동/제거)
+// full=true면 added가 전체 목록이므로 기존 목록을 교체
+export interface BusPositionsDelta {
+  version: string | null;
+  since: string | null;
+  full: boolean;
+  added: BusAreaPosition[];
+  moved: Array<{ veh_id: string; coordinates: [number, number] }>;
+  removed: string[];
+}
+
+export const getBusPositionsDelta = async (since?: string | null): Promise<BusPositionsDelta> => {
+  const params = since ? { since } : undefined;
+  const response = await api.get('/bus/positions/delta', { params });
+  return response.data.data;
+};
+
+// 전체 버스 추정 위치 (수집 사이 위치를 서버가 노선을 따라 추정, 자주 조회해도 공공 API 호출 없음)
+export interface BusProjectedPosition {
+  veh_id: string;
+  route_id: string;
+  bus_number: string | null;
+  coordinates: [number, number];
+  speed: number; // m/s
+  projected_s: number; // 마지막 GPS 이후 추정 시간 (초)
+}
+
+export const getBusProjectedPositions = async (): Promise<BusProjectedPosition[]> => {
+  const response = await api.get('/bus/positions/projected');
   return response.data.data || [];
 };
 
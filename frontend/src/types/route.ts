@@ -384,7 +384,7 @@ export interface RouteInfo {
 
 // SSE 이벤트 기본 타입
 export interface SSEEventBase {
-  timestamp: string;
+  timestamp: number; // epoch 밀리초
 }
 
 // 차량 정보 (버스/지하철)